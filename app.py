@@ -1,54 +1,135 @@
 # app.py — Evaluación Cognitiva en Streamlit (export HTML + config)
 # Autor: ChatGPT (para Dante)
 # Requisitos: streamlit  (sin pandas, sin micropip)
+# Solo interfaz: la lógica está en el paquete cognitiva (sesion: puntaje,
+# autoguardado y artefactos; recursos: almacén, caché, diario, perfiles, normas).
 # Ejecutar:  streamlit run app.py
 
-import sys
-import csv
 import io
-import base64
-import random
-from dataclasses import dataclass
-from typing import List, Optional, Any, Dict
+import os
+import sys
+import tempfile
+import time
+import uuid
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Callable, Optional, Any, Dict, Iterator
 from datetime import datetime, date
 
 import streamlit as st
 
+from cognitiva import recursos, selftest, sesion
+from cognitiva.batch import ReportOptions
+from cognitiva.cache import clave
+from cognitiva.export import write_csv
+from cognitiva.fluency import ANIMAL, FUERA_DE_TIEMPO, NO_ANIMAL, REPETIDO, CapturaFluidez, Lexico
+from cognitiva.metrics import GLOBAL as METRICAS_GLOBAL, Metricas
+from cognitiva.profiles import ProfileSet
+from cognitiva.report import logo_to_base64, report_filename
+from cognitiva.scoring import DOMINIOS, ScoringConfig, normalize_list
+
 st.set_page_config(page_title="Evaluación Cognitiva", page_icon="🧠", layout="wide")
 st.title("🧠 Evaluación Cognitiva — Prototipo Clínico")
 st.caption("Prototipo educativo. No reemplaza una evaluación médica profesional.")
 
+# CPU del hilo que ejecuta este rerun (cada sesión corre en su propio hilo)
+_cpu_rerun = time.thread_time()
+_t_rerun = time.perf_counter()
+if "perf" not in st.session_state:
+    st.session_state.perf = {"reruns": 0, "cpu_s": 0.0}
+if "metricas" not in st.session_state:
+    # Histogramas de esta sesión; cada observación también va a METRICAS_GLOBAL
+    st.session_state.metricas = Metricas(activo=METRICAS_GLOBAL.activo, padre=METRICAS_GLOBAL)
+metricas: Metricas = st.session_state.metricas
+
 # ------------------------------------------------------------
 # UTILIDADES BÁSICAS
 # ------------------------------------------------------------
 
-def normalize_list(txt: str) -> List[str]:
-    return [t.strip().lower() for t in txt.split(",") if t.strip()]
+LOTE_MAX_MB = int(os.environ.get("COGNITIVA_LOTE_MAX_MB", "200"))
 
 
-def count_matches(user_words: List[str], target_words: List[str]) -> int:
-    target = [w.lower() for w in target_words]
-    return sum(1 for w in user_words if w in target)
+def archivo_temporal() -> io.FileIO:
+    # Sin buffer: st.download_button acepta io.RawIOBase, no SpooledTemporaryFile.
+    return tempfile.TemporaryFile(buffering=0)
 
 
 def file_to_base64(uploaded_file) -> Optional[str]:
+    # getvalue() no depende de la posición del archivo; la codificación se
+    # cachea por hash del contenido (ver cognitiva.report.logo_to_base64).
     if not uploaded_file:
         return None
-    data = uploaded_file.read()
-    return base64.b64encode(data).decode("utf-8")
+    return logo_to_base64(uploaded_file.getvalue())
+
+
+# ------------------------------------------------------------
+# RECURSOS DEL PROCESO (almacén, diario, caché, léxico, perfiles, normas;
+# uno por proceso para todas las sesiones y páginas, ver cognitiva.recursos)
+# ------------------------------------------------------------
+def cargar(aviso: str, cargador: Callable[[], Any], defecto: Any, errores=(OSError, ValueError, KeyError)) -> Any:
+    """Un recurso de cognitiva.recursos; si su archivo es inválido, avisa y usa `defecto`."""
+    try:
+        return cargador()
+    except errores as exc:
+        st.error(f"{aviso}: {exc}")
+        return defecto
+
+
+cargar("Banco de formas inválido", recursos.formas, None)  # se valida al iniciar; lo usa cognitiva.sesion
+LEXICO: Optional[Lexico] = cargar("Léxico de animales inválido", recursos.lexico, None)
+PERFILES: ProfileSet = cargar("Perfiles de configuración inválidos", recursos.perfiles, ProfileSet([]), errores=(ValueError,))
+NORMAS = cargar("Tabla normativa inválida", recursos.normas, None)  # numpy solo si hay tabla
+PERSONALIZADO = "Personalizado (sidebar)"
+SEMEJANZAS = recursos.semejanzas()
+CACHE = recursos.cache()
+store = recursos.store()
+diario = recursos.diario()
+escritor_metricas = recursos.salida_metricas()
 
 
 # ------------------------------------------------------------
-# BANCO DE PALABRAS (DEFAULT)
+# AUTOGUARDADO (diario por evaluación en COGNITIVA_DIARIO; "" lo apaga)
 # ------------------------------------------------------------
-DEFAULT_WORD_BANK = [
-    ["manzana", "llave", "libro", "perro", "puente"],
-    ["café", "planta", "reloj", "silla", "calle"],
-    ["azul", "ventana", "lápiz", "camisa", "nube"],
-]
+if "eval_uid" not in st.session_state:
+    # Identifica la evaluación de esta sesión: recalcular la actualiza en el almacén.
+    # Va en la URL (?evaluacion=...): al reconectar, o tras reiniciar el servidor,
+    # la sesión nueva retoma lo anotado desde el diario.
+    previa = st.query_params.get("evaluacion", "")
+    restaurado = diario.recuperar(previa) if diario is not None and previa else None
+    st.session_state.eval_uid = previa if restaurado else uuid.uuid4().hex
+    st.session_state.restaurado = restaurado or {}
+    st.query_params["evaluacion"] = st.session_state.eval_uid
+    if restaurado:
+        st.session_state.update(sesion.palabras_restauradas(restaurado))
+restaurado: Dict[str, Any] = st.session_state.restaurado
+if restaurado:
+    st.info("Evaluación retomada desde el autoguardado.")
+
+
+def autoguardado(fut: "Future[None]") -> None:
+    """Sigue el Future de un registro del diario. Esperarlo frenaría cada rerun
+    hasta el fsync: los que ya terminaron con error se avisan en el siguiente
+    (el diario reescribe el estado completo en el próximo registro)."""
+    pendientes = []
+    for previo in st.session_state.get("autoguardados", []):
+        if not previo.done():
+            pendientes.append(previo)
+        elif previo.exception() is not None:
+            st.warning(
+                f"No se pudo autoguardar la evaluación: {previo.exception()}. Se reintentará al seguir editando."
+            )
+    st.session_state.autoguardados = pendientes + [fut]
+
+
+def inicial(campo: str, defecto: Any) -> Any:
+    """Valor inicial de un widget: el del autoguardado si la sesión se retomó."""
+    return restaurado.get(campo, defecto)
+
 
 if "target_words" not in st.session_state:
-    st.session_state.target_words = random.choice(DEFAULT_WORD_BANK)
+    st.session_state.target_words = sesion.palabras_nuevas()
+    st.session_state.palabras_paciente = ""
+    st.session_state.palabras_personalizadas = False
     st.session_state.registered_words = False
     st.session_state.registration_time = None
 
@@ -56,23 +137,45 @@ if "target_words" not in st.session_state:
 # ------------------------------------------------------------
 # CONFIGURACIÓN (Sidebar)
 # ------------------------------------------------------------
-with st.sidebar:
+with st.sidebar, metricas.seccion("sidebar"):
     st.header("Configuración")
 
     st.subheader("Paciente")
-    id_paciente = st.text_input("ID/Historia Clínica")
-    nombre = st.text_input("Nombre")
-    fecha_eval = st.date_input("Fecha", value=date.today())
+    id_paciente = st.text_input("ID/Historia Clínica", value=inicial("p.id_paciente", ""))
+    clinica = st.text_input("Centro/Clínica", value=inicial("p.clinica", ""))
+    nombre = st.text_input("Nombre", value=inicial("p.nombre", ""))
+    fecha_eval = st.date_input("Fecha", value=date.fromisoformat(inicial("p.fecha", date.today().isoformat())))
+    edad = educacion = None
+    if NORMAS is not None:
+        edad = st.number_input("Edad", min_value=0, max_value=120, value=None, step=1)
+        educacion = st.number_input("Años de educación", min_value=0, max_value=30, value=None, step=1)
 
     st.divider()
     st.subheader("Parámetros de prueba")
 
+    perfil_sel = st.selectbox(
+        "Perfil de configuración",
+        [PERSONALIZADO] + PERFILES.claves(),
+        help="Un perfil fija máximos, fluidez, umbrales y tolerancia de tipeo; su versión se guarda con el resultado.",
+    )
+    perfil = None if perfil_sel == PERSONALIZADO else PERFILES.resolver(perfil_sel)
+    if perfil is not None and perfil.descripcion:
+        st.caption(perfil.descripcion)
+    # Con perfil, los widgets muestran sus valores y quedan bloqueados
+    base = perfil.config if perfil is not None else ScoringConfig()
+    bloqueado = perfil is not None
+
     # Palabras objetivo
     st.markdown("**Palabras para memoria** (5 sugeridas por defecto)")
     custom_words_txt = st.text_input(
         "Palabras personalizadas (separe por coma)",
         placeholder="p.ej.: sol, mapa, tren, vaso, árbol",
     )
+    max_typo_distance = st.number_input(
+        "Errores de tipeo tolerados por palabra", min_value=0, max_value=2, value=base.max_typo_distance, step=1,
+        disabled=bloqueado,
+        help="Se ignoran tildes. Las palabras de menos de 5 letras requieren coincidencia exacta.",
+    )
     colw1, colw2 = st.columns([1,1])
     with colw1:
         use_custom_words = st.checkbox("Usar palabras personalizadas", value=False)
@@ -80,35 +183,57 @@ with st.sidebar:
         if st.button("Aplicar palabras"):
             if use_custom_words and custom_words_txt.strip():
                 st.session_state.target_words = normalize_list(custom_words_txt)
-                st.session_state.registered_words = False
+                st.session_state.palabras_personalizadas = True
             else:
-                st.session_state.target_words = random.choice(DEFAULT_WORD_BANK)
-                st.session_state.registered_words = False
+                st.session_state.target_words = sesion.otra_forma(st.session_state.target_words, id_paciente.strip())
+                st.session_state.palabras_personalizadas = False
+            st.session_state.registered_words = False
+
+    # Paciente nuevo en la sesión y palabras aún sin leer: una forma que no haya visto
+    if (
+        id_paciente.strip() != st.session_state.palabras_paciente
+        and not st.session_state.registered_words
+        and not st.session_state.palabras_personalizadas
+    ):
+        st.session_state.palabras_paciente = id_paciente.strip()
+        otra = sesion.forma_para_paciente(st.session_state.target_words, id_paciente.strip())
+        if otra is not None:
+            st.session_state.target_words = otra
 
     st.caption("Palabras activas:")
     st.code(", ".join(st.session_state.target_words))
 
     st.markdown("**Fluidez (animales)**")
-    animals_per_point = st.number_input("Animales por punto", min_value=1, max_value=10, value=5, step=1)
-    max_fluency_points = st.number_input("Puntos máximos fluidez", min_value=1, max_value=10, value=4, step=1)
+    animals_per_point = st.number_input(
+        "Animales por punto", min_value=1, max_value=10, value=base.animals_per_point, step=1, disabled=bloqueado
+    )
+    max_fluency_points = st.number_input(
+        "Puntos máximos fluidez", min_value=1, max_value=10, value=base.max_fluency_points, step=1,
+        disabled=bloqueado,
+    )
 
     st.markdown("**Umbrales de interpretación**")
-    high_threshold = st.slider("% Alto rendimiento (≥)", min_value=50, max_value=100, value=90, step=1)
-    mid_threshold = st.slider("% Leve compromiso (≥)", min_value=50, max_value=99, value=75, step=1)
+    high_threshold = st.slider(
+        "% Alto rendimiento (≥)", min_value=50, max_value=100, value=base.high_threshold, step=1, disabled=bloqueado
+    )
+    mid_threshold = st.slider(
+        "% Leve compromiso (≥)", min_value=50, max_value=99, value=base.mid_threshold, step=1, disabled=bloqueado
+    )
     if mid_threshold >= high_threshold:
         st.warning("Sugerencia: ponga el umbral 'Leve' por debajo del 'Alto'.")
 
     st.markdown("**Puntajes máximos por dominio** (total sugerido: 46)")
     colm1, colm2 = st.columns(2)
+    bm = base.maximos
     with colm1:
-        max_ori = st.number_input("Orientación", 1, 20, 10)
-        max_aten = st.number_input("Atención", 1, 20, 10)
-        max_mem_inm = st.number_input("Memoria inmediata", 1, 10, 5)
-        max_len = st.number_input("Lenguaje/Ejecutivo", 1, 20, 8)
+        max_ori = st.number_input("Orientación", 1, 20, bm["Orientación"], disabled=bloqueado)
+        max_aten = st.number_input("Atención", 1, 20, bm["Atención"], disabled=bloqueado)
+        max_mem_inm = st.number_input("Memoria inmediata", 1, 10, bm["Memoria inmediata"], disabled=bloqueado)
+        max_len = st.number_input("Lenguaje/Ejecutivo", 1, 20, bm["Lenguaje/Ejecutivo"], disabled=bloqueado)
     with colm2:
-        max_viso = st.number_input("Visoconstrucción", 1, 10, 5)
-        max_mem_dif = st.number_input("Memoria diferida", 1, 10, 3)
-        max_abs = st.number_input("Abstracción", 1, 10, 4)
+        max_viso = st.number_input("Visoconstrucción", 1, 10, bm["Visoconstrucción"], disabled=bloqueado)
+        max_mem_dif = st.number_input("Memoria diferida", 1, 10, bm["Memoria diferida"], disabled=bloqueado)
+        max_abs = st.number_input("Abstracción", 1, 10, bm["Abstracción"], disabled=bloqueado)
 
     MAXIMOS = {
         "Orientación": int(max_ori),
@@ -119,7 +244,20 @@ with st.sidebar:
         "Memoria diferida": int(max_mem_dif),
         "Abstracción": int(max_abs),
     }
-    sum_max = sum(MAXIMOS.values())
+    if perfil is not None:
+        cfg = perfil.config  # compartida entre sesiones: no se modifica
+    else:
+        cfg = ScoringConfig(
+            maximos=MAXIMOS,
+            animals_per_point=int(animals_per_point),
+            max_fluency_points=int(max_fluency_points),
+            high_threshold=int(high_threshold),
+            mid_threshold=int(mid_threshold),
+            max_typo_distance=int(max_typo_distance),
+        )
+    MAXIMOS = cfg.maximos
+    perfil_clave = perfil.clave if perfil is not None else ""
+    sum_max = cfg.max_total
     st.info(f"Total máximo actual: {sum_max}")
 
     st.divider()
@@ -129,46 +267,162 @@ with st.sidebar:
     sig_rol = st.text_input("Cargo/Profesión")
     sig_matricula = st.text_input("Matrícula (opcional)")
 
+    st.divider()
+    st.subheader("Rendimiento")
+    modo_formulario = st.checkbox(
+        "Modo formulario (guardar por sección)",
+        value=os.environ.get("COGNITIVA_MODO_FORMULARIO", "0") == "1",
+        help="Cada dominio se confirma con su botón 'Guardar'; escribir no recarga la app.",
+    )
+    perf = st.session_state.perf
+    st.caption(
+        f"Sesión: {perf['reruns']} reruns, {perf['cpu_s'] * 1000:.0f} ms de CPU "
+        f"({perf['cpu_s'] * 1000 / max(perf['reruns'], 1):.1f} ms por rerun)"
+    )
+    cache_stats = CACHE.stats()
+    st.caption(
+        f"Caché: {cache_stats.aciertos} aciertos, {cache_stats.fallos} fallos "
+        f"({cache_stats.tasa_aciertos:.0%}), {cache_stats.entradas} entradas, {cache_stats.bytes / 1024:.0f} KiB"
+    )
+    if metricas.activo and metricas.nombres():
+        with st.expander("Tiempos por sección (esta sesión)"):
+            st.table([
+                {
+                    "Sección": nombre,
+                    "N": r["n"],
+                    **{k[:-2]: f"{r[k] * 1000:.1f} ms" for k in ("p50_s", "p95_s", "p99_s")},
+                }
+                for nombre, r in metricas.resumen().items()
+            ])
+
     st.divider()
     run_tests = st.checkbox("Ejecutar auto‑tests de scoring")
     st.caption("Los tests validan la lógica de puntajes sin paquetes externos.")
 
 
 # ------------------------------------------------------------
-# DOMINIOS (orden de render)
+# DOMINIOS (orden de render, ver cognitiva.scoring.DOMINIOS)
 # ------------------------------------------------------------
-DOMINIOS = [
-    "Orientación",
-    "Atención",
-    "Memoria inmediata",
-    "Lenguaje/Ejecutivo",
-    "Visoconstrucción",
-    "Memoria diferida",
-    "Abstracción",
-]
 
 # Contenedor de respuestas
 respuestas: Dict[str, Any] = {}
 
+
+@contextmanager
+def formulario(key: str, dominio: str) -> Iterator[None]:
+    """En modo formulario agrupa los widgets del dominio en un st.form.
+
+    Los widgets de un form devuelven el último valor guardado, así que
+    `respuestas` se llena igual; solo el botón 'Guardar' provoca un rerun.
+    """
+    if not modo_formulario:
+        yield
+        return
+    with st.form(f"form_{key}", border=False):
+        yield
+        st.form_submit_button(f"Guardar {dominio}")
+
+
+if modo_formulario:
+    st.caption("Modo formulario: guarde cada sección antes de calcular los puntajes.")
+
+def reiniciar_fluidez() -> None:
+    st.session_state.fluidez = CapturaFluidez(LEXICO, duracion=60, ancho_intervalo=15)
+    st.session_state.fluidez_inicio = None
+
+
+def iniciar_fluidez() -> None:
+    reiniciar_fluidez()
+    st.session_state.fluidez_inicio = time.monotonic()
+
+
+def agregar_animal() -> None:
+    texto = st.session_state.fluidez_texto
+    st.session_state.fluidez_texto = ""
+    if not texto.strip():
+        return
+    if st.session_state.fluidez_inicio is None:  # la primera entrada inicia el reloj
+        st.session_state.fluidez_inicio = time.monotonic()
+    t = time.monotonic() - st.session_state.fluidez_inicio
+    with metricas.seccion("fluidez_validar"):
+        st.session_state.fluidez.agregar(texto, t)
+    if diario is not None:
+        # El fragmento no vuelve a pasar por el autoguardado del final del script
+        captura: CapturaFluidez = st.session_state.fluidez
+        autoguardado(diario.actualizar(st.session_state.eval_uid, {
+            "r.len_animales": captura.validos,
+            "r.len_animales_registro": captura.registro(),
+        }))
+
+
+ESTADOS_FLUIDEZ = {ANIMAL: "✅", REPETIDO: "🔁 repetido", NO_ANIMAL: "❌ no es animal", FUERA_DE_TIEMPO: "⏱️ fuera de tiempo"}
+
+
+@st.fragment
+def captura_fluidez() -> None:
+    """Entrada cronometrada: cada Enter solo vuelve a ejecutar este fragmento."""
+    if "fluidez" not in st.session_state:
+        reiniciar_fluidez()
+        registro = restaurado.get("r.len_animales_registro")
+        if registro:
+            # Sesión retomada: se reproducen las entradas con sus tiempos; la prueba ya terminó.
+            for e in registro:
+                st.session_state.fluidez.agregar(e["texto"], e["t"])
+            st.session_state.fluidez_inicio = time.monotonic() - st.session_state.fluidez.duracion
+    captura: CapturaFluidez = st.session_state.fluidez
+    inicio = st.session_state.fluidez_inicio
+    c1, c2, c3 = st.columns([1, 1, 2])
+    c1.button("Iniciar 60 s", on_click=iniciar_fluidez, disabled=inicio is not None)
+    c2.button("Reiniciar", on_click=reiniciar_fluidez)
+    if inicio is None:
+        c3.caption("El reloj arranca con Iniciar o con el primer animal.")
+    else:
+        transcurrido = time.monotonic() - inicio
+        c3.caption(f"Transcurrido: {transcurrido:.0f} s de {captura.duracion:.0f} s")
+    st.text_input(
+        "Animal (Enter para registrar; admite varios separados por coma)", key="fluidez_texto", on_change=agregar_animal
+    )
+    st.write(f"**Animales válidos: {captura.validos}**")
+    st.caption(" · ".join(
+        f"{int(i * captura.ancho_intervalo)}-{int((i + 1) * captura.ancho_intervalo)} s: {n}"
+        for i, n in enumerate(captura.intervalos())
+    ))
+    if captura.entradas:
+        st.table([
+            {"Tiempo (s)": f"{e.t:.1f}", "Entrada": e.texto, "Animal": e.lema or "—", "Estado": ESTADOS_FLUIDEZ[e.estado]}
+            for e in reversed(captura.entradas)
+        ])
+
+
 # ----- ORIENTACIÓN -----
-with st.expander("Orientación", expanded=True):
+with st.expander("Orientación", expanded=True), metricas.seccion("Orientación"):
     st.markdown("**Tiempo y lugar**")
     hoy = date.today()
-    respuestas["ori_anio"] = st.number_input("Año actual", step=1, value=hoy.year)
-    respuestas["ori_mes"] = st.selectbox("Mes actual", list(range(1, 13)), index=hoy.month - 1)
-    respuestas["ori_dia"] = st.number_input("Día del mes", step=1, value=hoy.day)
-    respuestas["ori_ciudad"] = st.text_input("Ciudad/Localidad")
-    respuestas["ori_lugar"] = st.text_input("Lugar/Institución (p. ej., hospital, domicilio)")
+    with formulario("orientacion", "Orientación"):
+        respuestas["ori_anio"] = st.number_input("Año actual", step=1, value=inicial("r.ori_anio", hoy.year))
+        respuestas["ori_mes"] = st.selectbox(
+            "Mes actual", list(range(1, 13)), index=inicial("r.ori_mes", hoy.month) - 1
+        )
+        respuestas["ori_dia"] = st.number_input("Día del mes", step=1, value=inicial("r.ori_dia", hoy.day))
+        respuestas["ori_ciudad"] = st.text_input("Ciudad/Localidad", value=inicial("r.ori_ciudad", ""))
+        respuestas["ori_lugar"] = st.text_input(
+            "Lugar/Institución (p. ej., hospital, domicilio)", value=inicial("r.ori_lugar", "")
+        )
 
 # ----- ATENCIÓN -----
-with st.expander("Atención", expanded=True):
+with st.expander("Atención", expanded=True), metricas.seccion("Atención"):
     st.markdown("**Cálculo y series**")
     st.caption("Indique cinco resultados de restar 7 desde 100 (separados por coma). Ej.: 93,86,79,72,65")
-    respuestas["aten_s7"] = st.text_input("Resta de 7 en 7 desde 100 (5 valores)")
-    respuestas["aten_inversa"] = st.text_input("Deletree al revés la palabra 'casa' (ej.: 'asac')")
+    with formulario("atencion", "Atención"):
+        respuestas["aten_s7"] = st.text_input(
+            "Resta de 7 en 7 desde 100 (5 valores)", value=inicial("r.aten_s7", "")
+        )
+        respuestas["aten_inversa"] = st.text_input(
+            "Deletree al revés la palabra 'casa' (ej.: 'asac')", value=inicial("r.aten_inversa", "")
+        )
 
 # ----- MEMORIA INMEDIATA -----
-with st.expander("Memoria inmediata", expanded=True):
+with st.expander("Memoria inmediata", expanded=True), metricas.seccion("Memoria inmediata"):
     st.markdown("**Registro y retención inmediata**")
     st.info("Lea las siguientes palabras y pídale al evaluado que las repita: ")
     st.subheader(", ".join(st.session_state.target_words))
@@ -178,218 +432,80 @@ with st.expander("Memoria inmediata", expanded=True):
         st.success(
             "Palabras registradas. Continúe con el resto de la evaluación y recuerde pedirlas nuevamente al final."
         )
-    respuestas["mem_inmediata"] = st.text_input("Anote las palabras que repitió (separadas por coma)")
+    with formulario("mem_inmediata", "Memoria inmediata"):
+        respuestas["mem_inmediata"] = st.text_input(
+            "Anote las palabras que repitió (separadas por coma)", value=inicial("r.mem_inmediata", "")
+        )
 
 # ----- LENGUAJE / EJECUTIVO -----
-with st.expander("Lenguaje/Ejecutivo", expanded=True):
+with st.expander("Lenguaje/Ejecutivo", expanded=True), metricas.seccion("Lenguaje/Ejecutivo"):
     st.markdown("**Fluidez y órdenes**")
-    respuestas["len_animales"] = st.number_input("Cantidad de animales nombrados en 60 segundos", min_value=0, step=1)
-    respuestas["len_frase"] = st.text_input("Escriba una frase con sujeto y predicado")
-    st.caption("Órdenes de 3 pasos: Tome esta hoja, dóblela por la mitad y colóquela en la mesa.")
-    respuestas["len_orden_ok"] = st.checkbox("Ejecutó correctamente los 3 pasos")
+    cronometrada = LEXICO is not None and st.radio(
+        "Fluidez (animales)", ["Conteo manual", "Captura cronometrada"], horizontal=True, key="modo_fluidez",
+        index=1 if "r.len_animales_registro" in restaurado else 0,
+    ) == "Captura cronometrada"
+    if cronometrada:
+        # Fuera del formulario: cada entrada se valida y se marca con su tiempo al tipearla.
+        captura_fluidez()
+        captura: CapturaFluidez = st.session_state.fluidez
+        respuestas["len_animales"] = captura.validos
+        respuestas["len_animales_registro"] = captura.registro()
+    with formulario("lenguaje", "Lenguaje/Ejecutivo"):
+        if not cronometrada:
+            respuestas["len_animales"] = st.number_input(
+                "Cantidad de animales nombrados en 60 segundos", min_value=0, step=1,
+                value=inicial("r.len_animales", 0),
+            )
+        respuestas["len_frase"] = st.text_input(
+            "Escriba una frase con sujeto y predicado", value=inicial("r.len_frase", "")
+        )
+        st.caption("Órdenes de 3 pasos: Tome esta hoja, dóblela por la mitad y colóquela en la mesa.")
+        respuestas["len_orden_ok"] = st.checkbox(
+            "Ejecutó correctamente los 3 pasos", value=inicial("r.len_orden_ok", False)
+        )
 
 # ----- VISOCONSTRUCCIÓN -----
-with st.expander("Visoconstrucción", expanded=True):
+with st.expander("Visoconstrucción", expanded=True), metricas.seccion("Visoconstrucción"):
     st.markdown("**Copia de figuras y praxis**")
-    respuestas["viso_copia_ok"] = st.checkbox(
-        "Copia adecuada de dos pentágonos superpuestos / figura geométrica"
-    )
-    respuestas["viso_gestos_ok"] = st.checkbox(
-        "Realizó gestos por imitación (p. ej., encender una vela) correctamente"
-    )
+    with formulario("viso", "Visoconstrucción"):
+        respuestas["viso_copia_ok"] = st.checkbox(
+            "Copia adecuada de dos pentágonos superpuestos / figura geométrica",
+            value=inicial("r.viso_copia_ok", False),
+        )
+        respuestas["viso_gestos_ok"] = st.checkbox(
+            "Realizó gestos por imitación (p. ej., encender una vela) correctamente",
+            value=inicial("r.viso_gestos_ok", False),
+        )
 
 # ----- MEMORIA DIFERIDA -----
-with st.expander("Memoria diferida", expanded=True):
+with st.expander("Memoria diferida", expanded=True), metricas.seccion("Memoria diferida"):
     st.markdown("**Recuerdo de las mismas palabras al final**")
-    respuestas["mem_diferida"] = st.text_input("Recuerde las palabras iniciales (separadas por coma)")
+    if st.session_state.registration_time is not None:
+        minutos = (datetime.now() - st.session_state.registration_time).total_seconds() / 60
+        st.caption(
+            f"Palabras registradas a las {st.session_state.registration_time:%H:%M} (hace {minutos:.0f} min)."
+        )
+    with formulario("mem_diferida", "Memoria diferida"):
+        respuestas["mem_diferida"] = st.text_input(
+            "Recuerde las palabras iniciales (separadas por coma)", value=inicial("r.mem_diferida", "")
+        )
 
 # ----- ABSTRACCIÓN -----
-with st.expander("Abstracción", expanded=True):
+with st.expander("Abstracción", expanded=True), metricas.seccion("Abstracción"):
     st.markdown("**Semejanzas / Diferencias**")
-    respuestas["abs_barco_auto"] = st.text_input("¿En qué se parecen un barco y un coche?")
-    respuestas["abs_uva_manzana"] = st.text_input("¿En qué se parecen una uva y una manzana?")
-
-
-# ------------------------------------------------------------
-# SCORING
-# ------------------------------------------------------------
-
-def score_orientacion(r: Dict[str, Any]) -> int:
-    pts = 0
-    hoy = date.today()
-    if int(r.get("ori_anio", 0)) == hoy.year:
-        pts += 2
-    if int(r.get("ori_mes", 0)) == hoy.month:
-        pts += 2
-    if int(r.get("ori_dia", 0)) == hoy.day:
-        pts += 2
-    if str(r.get("ori_ciudad", "")).strip():
-        pts += 2
-    if str(r.get("ori_lugar", "")).strip():
-        pts += 2
-    return min(pts, MAXIMOS["Orientación"])
-
-
-def score_atencion(r: Dict[str, Any]) -> int:
-    pts = 0
-    try:
-        valores = [int(x) for x in normalize_list(str(r.get("aten_s7", "")))]
-        esperado = [93, 86, 79, 72, 65]
-        aciertos = sum(1 for i, v in enumerate(valores[:5]) if v == esperado[i])
-        pts += min(aciertos, 5)
-    except Exception:
-        pass
-    if str(r.get("aten_inversa", "")).strip().lower() == "asac":
-        pts += 5
-    return min(pts, MAXIMOS["Atención"])
-
-
-def score_memoria_inmediata(r: Dict[str, Any]) -> int:
-    if not st.session_state.registered_words:
-        return 0
-    user_words = normalize_list(str(r.get("mem_inmediata", "")))
-    aciertos = count_matches(user_words, st.session_state.target_words)
-    return min(aciertos, MAXIMOS["Memoria inmediata"])  # 1 punto por palabra
-
-
-def score_lenguaje(r: Dict[str, Any]) -> int:
-    pts = 0
-    try:
-        n = int(r.get("len_animales", 0))
-        pts += min(n // int(animals_per_point), int(max_fluency_points))
-    except Exception:
-        pass
-    frase = str(r.get("len_frase", "")).strip()
-    if len(frase.split()) >= 4:
-        pts += 2
-    if bool(r.get("len_orden_ok", False)):
-        pts += 2
-    return min(pts, MAXIMOS["Lenguaje/Ejecutivo"])
-
-
-def score_viso(r: Dict[str, Any]) -> int:
-    pts = 0
-    if bool(r.get("viso_copia_ok", False)):
-        pts += 3
-    if bool(r.get("viso_gestos_ok", False)):
-        pts += 2
-    return min(pts, MAXIMOS["Visoconstrucción"])
-
-
-def score_memoria_diferida(r: Dict[str, Any]) -> int:
-    user_words = normalize_list(str(r.get("mem_diferida", "")))
-    aciertos = count_matches(user_words, st.session_state.target_words)
-    return min(aciertos, MAXIMOS["Memoria diferida"])  # 1 punto por palabra
-
-
-def score_abstraccion(r: Dict[str, Any]) -> int:
-    pts = 0
-    barco_auto = str(r.get("abs_barco_auto", "")).lower()
-    if any(k in barco_auto for k in ["transporte", "vehículo", "vehiculo", "mover", "desplazarse"]):
-        pts += 2
-    uva_manzana = str(r.get("abs_uva_manzana", "")).lower()
-    if any(k in uva_manzana for k in ["fruta", "alimento", "comer"]):
-        pts += 2
-    return min(pts, MAXIMOS["Abstracción"])
-
-
-# ------------------------------------------------------------
-# EXPORT: CSV + HTML IMPRIMIBLE
-# ------------------------------------------------------------
+    with formulario("abstraccion", "Abstracción"):
+        for item in SEMEJANZAS.items:
+            respuestas[item.campo] = st.text_input(
+                item.pregunta, key=item.campo, value=inicial(f"r.{item.campo}", "")
+            )
 
-def build_results_dict(subtotales: Dict[str,int], maximos: Dict[str,int], total: int, porcentaje: float) -> Dict[str, Any]:
-    return {
-        "id_paciente": id_paciente,
-        "nombre": nombre,
-        "fecha": str(fecha_eval),
-        **{f"{k}_puntaje": v for k, v in subtotales.items()},
-        "total": total,
-        "max_total": sum(maximos.values()),
-        "porcentaje": round(porcentaje, 2),
-    }
-
-
-def results_to_csv(results: Dict[str, Any]) -> bytes:
-    buf = io.StringIO()
-    writer = csv.DictWriter(buf, fieldnames=list(results.keys()))
-    writer.writeheader()
-    writer.writerow(results)
-    return buf.getvalue().encode("utf-8")
-
-
-def render_html_report(
-    subtotales: Dict[str,int],
-    maximos: Dict[str,int],
-    total: int,
-    porcentaje: float,
-    logo_b64: Optional[str],
-    sig_nombre: str,
-    sig_rol: str,
-    sig_matricula: str,
-) -> str:
-    today_str = datetime.now().strftime("%Y-%m-%d %H:%M")
-    logo_html = f'<img src="data:image/png;base64,{logo_b64}" style="height:64px;" />' if logo_b64 else ""
-    rows_html = "".join(
-        f"<tr><td>{dom}</td><td>{subtotales.get(dom,0)}</td><td>{maximos.get(dom,0)}</td></tr>" for dom in DOMINIOS
-    )
-    firma_html = """
-      <div style='margin-top:40px;'>
-        <div style='border-top:1px solid #333; width:320px;'></div>
-        <div><strong>{sig_nombre}</strong></div>
-        <div>{sig_rol}</div>
-        <div>{sig_matricula}</div>
-      </div>
-    """.format(sig_nombre=sig_nombre or "", sig_rol=sig_rol or "", sig_matricula=sig_matricula or "")
-
-    html = f"""
-<!doctype html>
-<html lang='es'>
-<head>
-<meta charset='utf-8'/>
-<title>Evaluación Cognitiva — Informe</title>
-<style>
-  body {{ font-family: Arial, sans-serif; margin: 40px; }}
-  header {{ display:flex; align-items:center; justify-content:space-between; margin-bottom:24px; }}
-  h1 {{ font-size: 20px; margin: 0; }}
-  .meta {{ color:#555; font-size: 12px; }}
-  table {{ width:100%; border-collapse: collapse; margin-top: 16px; }}
-  th, td {{ border:1px solid #ccc; padding:8px; text-align:left; }}
-  th {{ background:#f5f5f5; }}
-  .totals {{ margin-top:16px; font-weight:bold; }}
-  .footer {{ margin-top:48px; font-size:12px; color:#666; }}
-</style>
-</head>
-<body>
-  <header>
-    <div>{logo_html}</div>
-    <div>
-      <h1>Evaluación Cognitiva — Informe</h1>
-      <div class='meta'>Generado: {today_str}</div>
-    </div>
-  </header>
-
-  <section>
-    <p><strong>Paciente:</strong> {nombre} — <strong>ID/HC:</strong> {id_paciente} — <strong>Fecha evaluación:</strong> {fecha_eval}</p>
-  </section>
-
-  <table>
-    <thead><tr><th>Dominio</th><th>Puntaje</th><th>Máximo</th></tr></thead>
-    <tbody>
-      {rows_html}
-    </tbody>
-  </table>
-
-  <div class='totals'>Total: {total} / {sum(maximos.values())} — {porcentaje:.2f}%</div>
-
-  {firma_html}
-
-  <div class='footer'>
-    <p>Herramienta educativa. No reemplaza evaluación médica profesional.</p>
-  </div>
-</body>
-</html>
-"""
-    return html
+# Autoguardado: solo lo que cambió desde el rerun anterior (ver cognitiva.journal)
+if diario is not None:
+    autoguardado(diario.registrar(st.session_state.eval_uid, sesion.estado_autoguardado(
+        respuestas,
+        {"id_paciente": id_paciente, "clinica": clinica, "nombre": nombre, "fecha": fecha_eval.isoformat()},
+        st.session_state,
+    )))
 
 
 # ------------------------------------------------------------
@@ -399,36 +515,96 @@ def render_html_report(
 col1, col2 = st.columns([1, 1])
 with col1:
     if st.button("Calcular puntajes"):
-        subtotales = {
-            "Orientación": score_orientacion(respuestas),
-            "Atención": score_atencion(respuestas),
-            "Memoria inmediata": score_memoria_inmediata(respuestas),
-            "Lenguaje/Ejecutivo": score_lenguaje(respuestas),
-            "Visoconstrucción": score_viso(respuestas),
-            "Memoria diferida": score_memoria_diferida(respuestas),
-            "Abstracción": score_abstraccion(respuestas),
-        }
-        total = sum(subtotales.values())
-        max_total = sum(MAXIMOS.values())
-        porcentaje = (total / max_total) * 100 if max_total else 0
+        with metricas.seccion("puntaje"):
+            # Puntos brutos (se guardan para re-puntuar); los subtotales los recortan
+            res = sesion.puntuar(
+                respuestas,
+                cfg,
+                st.session_state.target_words,
+                bool(st.session_state.registered_words),
+                perfil=perfil_clave,
+                medir=metricas.seccion if metricas.activo else None,
+            )
+        subtotales, total, max_total = res.subtotales, res.total, res.max_total
+        # Datos del paciente que aparecen en el CSV y el informe
+        clave_meta = clave(res.clave, id_paciente, nombre, fecha_eval)
 
         st.success(f"Puntaje total: {total} / {max_total}")
         st.write("**Detalle por dominio:**")
         rows = [{"Dominio": d, "Puntaje": subtotales[d], "Máximo": MAXIMOS[d]} for d in DOMINIOS]
+        normas = sesion.percentiles(subtotales, total, edad, educacion) if NORMAS is not None else None
+        if normas is not None:
+            rows.append({"Dominio": "Total", "Puntaje": total, "Máximo": max_total})
+            for fila, serie in zip(rows, DOMINIOS + ["total"]):
+                p, z = normas.get(serie, (None, None))
+                fila["Percentil"] = "—" if p is None else f"{p:.0f}"
+                fila["z"] = "—" if z is None else f"{z:+.2f}"
+            if edad is None or educacion is None:
+                st.caption("Complete edad y años de educación en el sidebar para ver percentiles.")
+            elif not normas:
+                st.caption("Sin norma para esta edad y educación.")
         st.table(rows)
 
+        coincidencias = SEMEJANZAS.coincidencias(respuestas)
+        st.caption(
+            "Abstracción — claves reconocidas: "
+            + "; ".join(f"{it.pregunta} {', '.join(coincidencias[it.campo]) or '—'}" for it in SEMEJANZAS.items)
+        )
+
         # Interpretación con umbrales configurables
-        if porcentaje >= high_threshold:
-            interp = "Dentro de parámetros esperados (alto rendimiento)."
-        elif porcentaje >= mid_threshold:
-            interp = "Leve compromiso o rendimiento limítrofe."
+        st.info(f"Interpretación: {res.interpretacion}")
+
+        # Persistencia (el escritor agrupa las escrituras de todas las sesiones)
+        uid = f"{st.session_state.eval_uid}:{id_paciente.strip()}:{fecha_eval}"
+        if id_paciente.strip() and st.session_state.get("ultimo_guardado") == (uid, clave_meta, clinica):
+            st.caption("Evaluación guardada (sin cambios).")
+        elif id_paciente.strip():
+            guardado = store.save(sesion.evaluacion(
+                uid,
+                res,
+                cfg,
+                respuestas,
+                st.session_state.target_words,
+                bool(st.session_state.registered_words),
+                id_paciente=id_paciente.strip(),
+                nombre=nombre,
+                clinica=clinica.strip(),
+                fecha=fecha_eval,
+                perfil=perfil_clave,
+            ))
+            try:
+                guardado.result(timeout=10)
+                st.session_state.ultimo_guardado = (uid, clave_meta, clinica)
+                st.caption("Evaluación guardada.")
+            except Exception as exc:
+                st.warning(f"No se pudo guardar la evaluación: {exc}")
+            historial = store.history(id_paciente.strip(), limit=10)
+            if len(historial) > 1:
+                st.write("**Historial del paciente (últimas 10):**")
+                st.table([
+                    {"Fecha": h["fecha"], "Total": h["total"], "Máximo": h["max_total"], "%": h["porcentaje"]}
+                    for h in historial
+                ])
+                tend = store.tendencias(id_paciente.strip())
+                st.write("**Tendencia del paciente:**")
+                st.table([
+                    {
+                        "Serie": "Total" if serie == "total" else serie,
+                        "N": t.n,
+                        "Basal": t.base,
+                        "Último": t.ultimo,
+                        "Cambio desde basal": t.cambio_desde_base,
+                        "Pendiente/año": None if t.pendiente_anual is None else round(t.pendiente_anual, 2),
+                    }
+                    for serie, t in ((s, tend.get(s)) for s in DOMINIOS + ["total"])
+                    if t is not None
+                ])
         else:
-            interp = "Sugerente de compromiso cognitivo, evaluar clínicamente."
-        st.info(f"Interpretación: {interp}")
+            st.caption("Complete el ID/Historia Clínica para guardar la evaluación.")
 
         # CSV
-        results = build_results_dict(subtotales, MAXIMOS, total, porcentaje)
-        csv_bytes = results_to_csv(results)
+        with metricas.seccion("csv"):
+            csv_bytes = sesion.csv_resultado(clave_meta, res, cfg, id_paciente, nombre, fecha_eval, perfil_clave)
         st.download_button(
             "Descargar resultados (CSV)",
             data=csv_bytes,
@@ -437,21 +613,21 @@ with col1:
         )
 
         # HTML imprimible (logo + firma)
-        logo_b64 = file_to_base64(logo_file)
-        html = render_html_report(
-            subtotales,
-            MAXIMOS,
-            total,
-            porcentaje,
-            logo_b64,
-            sig_nombre,
-            sig_rol,
-            sig_matricula,
-        )
+        with metricas.seccion("html"):
+            html_bytes = sesion.html_resultado(
+                clave(clave_meta, logo_file.file_id if logo_file else None, sig_nombre, sig_rol, sig_matricula),
+                res,
+                cfg,
+                lambda: file_to_base64(logo_file),
+                (sig_nombre, sig_rol, sig_matricula),
+                id_paciente=id_paciente,
+                nombre=nombre,
+                fecha=fecha_eval,
+            )
         st.download_button(
             "Descargar informe (HTML)",
-            data=html.encode("utf-8"),
-            file_name=f"informe_evaluacion_{(nombre or 'paciente').replace(' ', '_')}.html",
+            data=html_bytes,
+            file_name=report_filename(nombre),
             mime="text/html",
         )
 
@@ -466,62 +642,74 @@ with col2:
         """
     )
 
+    with st.expander("Exportar evaluaciones guardadas (CSV)"):
+        col_d, col_h = st.columns(2)
+        with col_d:
+            exp_desde = st.date_input("Desde", value=date.today().replace(day=1), key="exp_desde")
+        with col_h:
+            exp_hasta = st.date_input("Hasta", value=date.today(), key="exp_hasta")
+        exp_clinica = st.text_input("Centro/Clínica (vacío = todos)", key="exp_clinica")
+        exp_gzip = st.checkbox("Comprimir (gzip)", key="exp_gzip")
+        if st.button("Preparar exportación"):
+            # Las filas se leen del almacén por bloques y se escriben a un
+            # archivo temporal; nunca están todas en memoria.
+            csv_tmp = archivo_temporal()
+            n_bytes = write_csv(
+                store.iter_results(str(exp_desde), str(exp_hasta), exp_clinica.strip() or None),
+                csv_tmp,
+                gzip=exp_gzip,
+            )
+            csv_tmp.seek(0)
+            st.caption(f"{n_bytes / 1024:.0f} KiB")
+            st.download_button(
+                "Descargar exportación",
+                data=csv_tmp,
+                file_name=f"evaluaciones_{exp_desde}_{exp_hasta}.csv" + (".gz" if exp_gzip else ""),
+                mime="application/gzip" if exp_gzip else "text/csv",
+            )
+
+    with st.expander("Informes por lote (ZIP)"):
+        st.caption(
+            "Suba un JSONL/CSV de evaluaciones (ver `python -m cognitiva.batch --help`). "
+            "Se usa el logo y la firma del sidebar."
+        )
+        lote_file = st.file_uploader("Evaluaciones del día", type=["jsonl", "csv"], key="lote_file")
+        if lote_file is not None and st.button("Generar informes"):
+            fmt = "csv" if lote_file.name.lower().endswith(".csv") else "jsonl"
+            opts = ReportOptions(file_to_base64(logo_file), sig_nombre, sig_rol, sig_matricula)
+            # El ZIP se escribe a disco a medida que llegan los informes.
+            zip_tmp = archivo_temporal()
+            with io.TextIOWrapper(lote_file, encoding="utf-8", newline="") as fin:
+                n_ok, errores = sesion.informes_lote(fin, fmt, zip_tmp, opts, cfg, perfil_clave)
+            tamanio = zip_tmp.seek(0, io.SEEK_END)
+            zip_tmp.seek(0)
+            st.success(f"{n_ok} informes generados, {len(errores)} registros con errores.")
+            for lineno, error in errores[:20]:
+                st.caption(f"Línea {lineno}: {error}")
+            # El ZIP se arma en disco, pero st.download_button lo lee entero a memoria
+            # (Streamlit no sirve descargas en streaming): por encima del límite, la CLI.
+            if tamanio > LOTE_MAX_MB * 2**20:
+                st.warning(
+                    f"El ZIP ocupa {tamanio / 2**20:.0f} MiB (límite {LOTE_MAX_MB} MiB, COGNITIVA_LOTE_MAX_MB). "
+                    "Para lotes grandes use `python -m cognitiva.batch ... --reports-zip informes.zip`."
+                )
+            else:
+                st.download_button(
+                    "Descargar informes (ZIP)",
+                    data=zip_tmp,
+                    file_name=f"informes_{fecha_eval}.zip",
+                    mime="application/zip",
+                )
+
 st.divider()
 
 # ------------------------------------------------------------
 # AUTO‑TESTS (unit tests ligeros dentro de la app)
 # ------------------------------------------------------------
 
-def run_self_tests(MAXIMOS_local: Dict[str,int]):
-    """Ejecuta casos de prueba sobre las funciones de scoring. Muestra PASS/FAIL."""
-    results = []
-
-    # Preparación de estado para pruebas de memoria
-    st.session_state.target_words = ["manzana", "llave", "libro", "perro", "puente"]
-
-    # 1) Orientación — todo correcto
-    hoy = date.today()
-    r1 = {
-        "ori_anio": hoy.year,
-        "ori_mes": hoy.month,
-        "ori_dia": hoy.day,
-        "ori_ciudad": "Córdoba",
-        "ori_lugar": "Hospital",
-    }
-    exp1 = MAXIMOS_local["Orientación"]
-    results.append(("Orientación full", score_orientacion(r1), exp1))
-
-    # 2) Atención — serie + inversa correctas
-    r2 = {"aten_s7": "93,86,79,72,65", "aten_inversa": "asac"}
-    exp2 = MAXIMOS_local["Atención"]
-    results.append(("Atención full", score_atencion(r2), exp2))
-
-    # 3) Memoria inmediata — 5/5 (capado por máximo)
-    st.session_state.registered_words = True
-    r3 = {"mem_inmediata": ",".join(st.session_state.target_words)}
-    exp3 = MAXIMOS_local["Memoria inmediata"]
-    results.append(("Memoria inmediata full", score_memoria_inmediata(r3), exp3))
-
-    # 4) Lenguaje/Ejecutivo — 20 animales (depende de animals_per_point y max_fluency_points) + frase + orden
-    r4 = {"len_animales": animals_per_point * max_fluency_points, "len_frase": "El paciente escribe una oración completa", "len_orden_ok": True}
-    exp4 = min( max_fluency_points + 2 + 2, MAXIMOS_local["Lenguaje/Ejecutivo"] )
-    results.append(("Lenguaje/Ejecutivo full-ish", score_lenguaje(r4), exp4))
-
-    # 5) Visoconstrucción — ambos OK
-    r5 = {"viso_copia_ok": True, "viso_gestos_ok": True}
-    exp5 = MAXIMOS_local["Visoconstrucción"]
-    results.append(("Visoconstrucción full", score_viso(r5), exp5))
-
-    # 6) Memoria diferida — palabras completas (capado por máximo)
-    r6 = {"mem_diferida": ",".join(st.session_state.target_words)}
-    exp6 = MAXIMOS_local["Memoria diferida"]
-    results.append(("Memoria diferida full", score_memoria_diferida(r6), exp6))
-
-    # 7) Abstracción — con palabras clave
-    r7 = {"abs_barco_auto": "Ambos son medios de transporte", "abs_uva_manzana": "Ambas son fruta"}
-    exp7 = MAXIMOS_local["Abstracción"]
-    results.append(("Abstracción full", score_abstraccion(r7), exp7))
-
+def run_self_tests(cfg: ScoringConfig):
+    """Ejecuta los casos de cognitiva.selftest y muestra PASS/FAIL."""
+    results = selftest.casos(cfg)
     total_cases = len(results)
     passes = sum(1 for name, got, exp in results if got == exp)
     st.subheader("Resultados de auto‑tests")
@@ -530,62 +718,13 @@ def run_self_tests(MAXIMOS_local: Dict[str,int]):
     st.table(table_rows)
 
 if run_tests:
-    run_self_tests(MAXIMOS)
+    run_self_tests(cfg)
 
 st.caption("© 2025 — Prototipo educativo para entrenamiento.")
 
+st.session_state.perf["reruns"] += 1
+st.session_state.perf["cpu_s"] += time.thread_time() - _cpu_rerun
+metricas.observar("rerun", time.perf_counter() - _t_rerun)
+if escritor_metricas is not None:
+    escritor_metricas.escribir()
 
-# ==============================================
-# requirements.txt
-# ==============================================
-# Coloque este contenido en un archivo independiente llamado requirements.txt
-# streamlit==1.37.0
-
-# ==============================================
-# .gitignore
-# ==============================================
-# Coloque este contenido en un archivo independiente llamado .gitignore
-# .venv/
-# __pycache__/
-# *.pyc
-# .DS_Store
-
-# ==============================================
-# README.md
-# ==============================================
-# Coloque este contenido en un archivo independiente llamado README.md
-#
-# # Evaluación Cognitiva — Streamlit
-#
-# Prototipo educativo para administración de una evaluación cognitiva con puntajes por dominio, exportación a CSV/HTML y parámetros configurables.
-#
-# ## Requisitos
-# - Python 3.9+
-# - Streamlit
-#
-# ## Instalación
-# ```bash
-# python -m venv .venv
-# # Windows
-# .venv\Scripts\activate
-# # macOS/Linux
-# source .venv/bin/activate
-# pip install -r requirements.txt
-# ```
-#
-# ## Ejecutar
-# ```bash
-# streamlit run app.py
-# ```
-#
-# ## Configuración
-# - Sidebar: palabras de memoria, umbrales de interpretación, puntajes máximos por dominio, parámetros de fluidez.
-# - Suba un logo y complete los campos de firma para el reporte HTML imprimible.
-#
-# ## Despliegue en Streamlit Cloud
-# 1. Suba este repo a GitHub.
-# 2. En Streamlit Community Cloud, cree una app apuntando a `app.py`.
-# 3. Asegúrese de incluir `requirements.txt` (con `streamlit`).
-#
-# ## Notas
-# - Este prototipo no reemplaza evaluaciones médicas profesionales.
@@ -0,0 +1,168 @@
+# benchmarks/bench_archivo.py — Archivo columnar vs. SQLite y CSV
+# Ejecutar:  python benchmarks/bench_archivo.py --rows 200000
+#
+# Llena una base temporal con evaluaciones sintéticas (respuestas de
+# bench_vectorized, palabras objetivo y configuración por fila), la archiva
+# con cognitiva.archive y compara:
+#   - tamaño: archivo vs. base SQLite vs. CSV con resultados y respuestas;
+#   - estadísticas de cohorte: ArchivoColumnar.estadisticas() vs. la pasada
+#     sobre SQLite (cohort.calcular);
+#   - columnas de re-puntaje: columnas_puntaje() vs. decodificar JSON y
+#     columns_from_respuestas().
+# Informa también el pico de memoria de archivar, que escribe por tramos.
+# Verifica que las filas, las estadísticas y las columnas coincidan.
+
+import argparse
+import csv
+import json
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_cohorte import evaluacion  # noqa: E402
+from bench_vectorized import TARGET, generar  # noqa: E402
+
+from cognitiva import archive, cohort  # noqa: E402
+from cognitiva.scoring import DEFAULT_WORD_BANK, ScoringConfig  # noqa: E402
+from cognitiva.store import _COLS, ResultStore  # noqa: E402
+from cognitiva.vectorized import columns_from_respuestas, score_columns  # noqa: E402
+
+PALABRAS = [TARGET] + [list(p) for p in DEFAULT_WORD_BANK]
+
+
+def llenar(path: str, n: int) -> None:
+    ResultStore(path).close()  # esquema
+    rnd = random.Random(5)
+    cfg = ScoringConfig()
+    respuestas = generar(n, seed=5)
+    conn = sqlite3.connect(path)
+    sql = f"INSERT INTO evaluaciones ({', '.join(_COLS)}) VALUES ({', '.join('?' for _ in _COLS)})"
+    with conn:
+        for a in range(0, n, 50_000):
+            filas = []
+            for i in range(a, min(a + 50_000, n)):
+                ev = evaluacion(rnd, i, cfg)
+                ev.respuestas = next(respuestas)
+                ev.config = {
+                    **cfg.to_dict(),
+                    "target_words": rnd.choice(PALABRAS),
+                    "registered_words": rnd.random() < 0.9,
+                }
+                filas.append(ev.to_row())
+            conn.executemany(sql, filas)
+    conn.close()
+
+
+def volcar_csv(db: str, path: str) -> None:
+    """Referencia de tamaño: todas las columnas, respuestas y config como JSON."""
+    conn = sqlite3.connect(db)
+    cur = conn.execute(f"SELECT {', '.join(_COLS)} FROM evaluaciones")
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        w = csv.writer(fh)
+        w.writerow(_COLS)
+        while True:
+            filas = cur.fetchmany(10_000)
+            if not filas:
+                break
+            w.writerows(filas)
+    conn.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Mide cognitiva.archive sobre una base sintética.")
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = os.path.join(tmp, "evaluaciones.db")
+        llenar(db, args.rows)
+        csv_path = os.path.join(tmp, "completo.csv")
+        volcar_csv(db, csv_path)
+
+        destino = os.path.join(tmp, "archivo")
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        archive.archivar(db, destino)
+        t_archivar = time.perf_counter() - t0
+        pico_archivar = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        arch = archive.abrir(destino)
+        assert len(arch) == args.rows
+
+        # Filas: iguales a las de la base (muestra)
+        conn = sqlite3.connect(db)
+        conn.row_factory = sqlite3.Row
+        filas = conn.execute("SELECT * FROM evaluaciones ORDER BY fecha, id").fetchall()
+        for i in random.Random(1).sample(range(args.rows), min(2000, args.rows)):
+            esperado, obtenido = dict(filas[i]), arch.fila(i)
+            for c in _COLS:
+                e = json.loads(esperado[c]) if c in ("config", "respuestas") else esperado[c]
+                assert obtenido[c] == e, (i, c, obtenido[c], e)
+
+        # Estadísticas de cohorte
+        t0 = time.perf_counter()
+        est_sql = cohort.calcular(db, desde="2025-01-01", clinica="Norte", workers=1)
+        t_sql = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        est_arch = arch.estadisticas(desde="2025-01-01", clinica="Norte")
+        t_arch = time.perf_counter() - t0
+        resumen = est_arch.resumen()
+        for serie, fila in est_sql.resumen().items():
+            for k, v in fila.items():
+                w = resumen[serie][k]
+                assert v == w or abs(v - w) < 1e-9, (serie, k, v, w)  # orden de suma distinto
+        assert est_sql.interpretaciones == est_arch.interpretaciones
+
+        # Columnas de re-puntaje (cada fila con sus palabras objetivo)
+        t0 = time.perf_counter()
+        esperadas = {}
+        for palabras in PALABRAS:
+            idx, registros, registradas = [], [], []
+            for i, f in enumerate(filas):
+                config = json.loads(f["config"])
+                if config["target_words"] == palabras:
+                    idx.append(i)
+                    registros.append(json.loads(f["respuestas"]))
+                    registradas.append(config["registered_words"])
+            cols = columns_from_respuestas(registros, palabras)
+            cols["registered_words"] = np.array(registradas)
+            for k, v in cols.items():
+                esperadas.setdefault(k, np.zeros((args.rows,) + v.shape[1:], dtype=v.dtype))[idx] = v
+        t_dicts = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        columnas = arch.columnas_puntaje()
+        t_columnas = time.perf_counter() - t0
+        for k, v in esperadas.items():
+            assert np.array_equal(columnas[k], v), k
+        cfg = ScoringConfig()
+        hoy = score_columns(columnas, cfg)
+        assert np.array_equal(hoy["total"], score_columns(esperadas, cfg)["total"])
+        conn.close()
+
+        t_db = os.path.getsize(db)
+        t_csv = os.path.getsize(csv_path)
+        t_arch_bytes = archive.tamanio(destino)
+
+    print(f"filas:                              {args.rows:>12,}")
+    print(f"base SQLite:                        {t_db / 2**20:>10.1f} MiB")
+    print(f"CSV (resultados + respuestas):      {t_csv / 2**20:>10.1f} MiB")
+    print(f"archivo columnar:                   {t_arch_bytes / 2**20:>10.1f} MiB  ({t_arch_bytes / t_csv:.0%} del CSV)")
+    print(f"archivar:                           {t_archivar:>10.2f} s")
+    print(f"archivar, pico de memoria Python:   {pico_archivar / 2**20:>10.1f} MiB  (por tramos de {cohort.TRAMO:,} filas)")
+    print(f"cohorte, pasada SQLite:             {t_sql * 1000:>10.1f} ms")
+    print(f"cohorte, archivo (mmap):            {t_arch * 1000:>10.1f} ms")
+    print(f"columnas de puntaje, JSON + dicts:  {t_dicts:>10.2f} s")
+    print(f"columnas de puntaje, archivo:       {t_columnas:>10.2f} s")
+    print("resultados idénticos:               sí (filas, estadísticas y columnas)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+# benchmarks/bench_carga.py — Carga de sesiones concurrentes sobre app.py (AppTest)
+# Ejecutar:  python benchmarks/bench_carga.py [--sesiones 1,2,4,8] [--evaluaciones 3] [--pausa 0]
+#            python benchmarks/bench_carga.py --guardar carga.json
+#            python benchmarks/bench_carga.py --comparar carga.json [--umbral 0.25]
+#
+# Cada nivel de concurrencia N corre N profesionales simulados en un pool de N
+# procesos (AppTest ejecuta el script en el hilo que llama y reemplaza el
+# Runtime global de Streamlit, así que dos sesiones no pueden correr en hilos
+# del mismo proceso). Cada profesional completa `--evaluaciones` evaluaciones
+# seguidas, cada una en una sesión nueva: ID de paciente en el sidebar, todos
+# los expanders como en bench_reruns (un rerun por campo, con `--pausa`
+# segundos de "tipeo" entre campos), "Calcular puntajes" y las dos descargas
+# (CSV e informe HTML), que se leen del almacenamiento de medios de la corrida
+# como las pediría el navegador. Todos los procesos comparten base y diario
+# (temporales), como las sesiones de un servidor.
+#
+# Por nivel informa: latencia de cada rerun (p50/p90/p95/p99/máx), evaluaciones
+# por minuto, y memoria: RSS del proceso con una sesión (importaciones y
+# cachés) y cuánto suma cada sesión más que queda abierta. El codo es el
+# primer nivel a partir del cual duplicar sesiones mejora el throughput menos
+# de `--mejora` (por defecto 10 %): ahí se llenan las CPU.
+#
+# --guardar escribe todo como JSON. --comparar vuelve a medir y marca como
+# regresión los niveles cuyo p95 supera (1 + umbral) veces el de la línea base
+# o cuyo throughput cae por debajo de base / (1 + umbral); sale con código 1.
+# Solo son comparables corridas en la misma máquina (ver "meta").
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import streamlit  # noqa: E402
+from streamlit.testing.v1 import AppTest, app_test  # noqa: E402
+from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage  # noqa: E402
+
+from bench_reruns import APP, SECCIONES, _widget  # noqa: E402
+
+NIVELES = [1, 2, 4, 8]
+PERCENTILES = (50, 90, 95, 99)
+DESCARGAS = ("Descargar resultados (CSV)", "Descargar informe (HTML)")
+
+
+class _Medios(MemoryMediaFileStorage):
+    """Almacenamiento de medios de AppTest que queda accesible tras la corrida."""
+
+    ultimo: Optional["_Medios"] = None
+
+    def __init__(self, media_endpoint: str):
+        super().__init__(media_endpoint)
+        _Medios.ultimo = self
+
+
+def _rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:  # fuera de Linux: pico de RSS
+        import resource
+
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return maxrss / (2**20 if sys.platform == "darwin" else 2**10)
+
+
+def _percentiles(valores: List[float]) -> Dict[str, float]:
+    orden = sorted(valores)
+    out = {f"p{p}": orden[min(len(orden) - 1, len(orden) * p // 100)] * 1000 for p in PERCENTILES}
+    out["max"] = orden[-1] * 1000
+    return out
+
+
+def _descargar(at: AppTest, etiqueta: str) -> bytes:
+    """Contenido de un st.download_button, como lo pediría el navegador."""
+    for boton in at.get("download_button"):
+        if boton.proto.label == etiqueta:
+            nombre = boton.proto.url.rsplit("/", 1)[-1]
+            return _Medios.ultimo.get_file(nombre).content  # type: ignore[union-attr]
+    raise LookupError(f"No se encontró la descarga {etiqueta!r}")
+
+
+def _correr(at: AppTest, latencias: List[float]) -> None:
+    t0 = time.perf_counter()
+    at.run()
+    latencias.append(time.perf_counter() - t0)
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+
+
+def evaluacion(id_paciente: str, pausa: float, latencias: List[float]) -> AppTest:
+    """Una evaluación completa en una sesión nueva; devuelve la sesión (abierta)."""
+    at = AppTest.from_file(APP, default_timeout=120)
+    _correr(at, latencias)
+    _widget(at.sidebar, "text_input", "ID/Historia Clínica").set_value(id_paciente)
+    _correr(at, latencias)
+    palabras = ", ".join(at.session_state["target_words"])
+    for dominio, campos in SECCIONES:
+        if dominio == "Memoria inmediata":
+            _widget(at, "button", "Registrar palabras escuchadas ahora").click()
+            _correr(at, latencias)
+        for tipo, label, valor in campos:
+            time.sleep(pausa)
+            _widget(at, tipo, label).set_value(palabras if valor == "__palabras__" else valor)
+            _correr(at, latencias)
+    _widget(at, "button", "Calcular puntajes").click()
+    _correr(at, latencias)
+    csv_bytes, html_bytes = (_descargar(at, d) for d in DESCARGAS)
+    if id_paciente.encode() not in csv_bytes or not html_bytes.lstrip().lower().startswith(b"<!doctype html"):
+        raise RuntimeError(f"Descargas inesperadas para {id_paciente}")
+    if not any(s.value.startswith("Puntaje total") for s in at.success):
+        raise RuntimeError("Sin puntaje total")
+    return at
+
+
+def profesional(n: int, evaluaciones: int, pausa: float) -> Dict[str, Any]:
+    """Un profesional: `evaluaciones` sesiones seguidas en este proceso, todas abiertas."""
+    app_test.MemoryMediaFileStorage = _Medios  # type: ignore[misc]
+    latencias: List[float] = []
+    sesiones = []
+    rss = [_rss_mb()]
+    t0 = time.perf_counter()
+    for e in range(evaluaciones):
+        sesiones.append(evaluacion(f"HC-{os.getpid()}-{n}-{e}", pausa, latencias))
+        rss.append(_rss_mb())
+    return {
+        "segundos": time.perf_counter() - t0,
+        "latencias": latencias,
+        "rss_mb": rss,
+    }
+
+
+def _iniciar_proceso(db: str, diario: str) -> None:
+    os.environ["COGNITIVA_DB"] = db
+    os.environ["COGNITIVA_DIARIO"] = diario
+    os.environ["COGNITIVA_MODO_FORMULARIO"] = "0"
+
+
+def nivel(sesiones: int, evaluaciones: int, pausa: float, tmp: str) -> Dict[str, Any]:
+    db, diario = os.path.join(tmp, f"carga_{sesiones}.db"), os.path.join(tmp, f"diario_{sesiones}")
+    with ProcessPoolExecutor(sesiones, initializer=_iniciar_proceso, initargs=(db, diario)) as pool:
+        t0 = time.perf_counter()
+        corridas = list(pool.map(profesional, range(sesiones), [evaluaciones] * sesiones, [pausa] * sesiones))
+        segundos = time.perf_counter() - t0
+    latencias = [x for c in corridas for x in c["latencias"]]
+    # Memoria: con la primera sesión (importaciones y cachés) y lo que suma cada sesión más
+    base = statistics.median(c["rss_mb"][1] for c in corridas)
+    por_sesion = statistics.median(
+        (c["rss_mb"][-1] - c["rss_mb"][1]) / (evaluaciones - 1) for c in corridas
+    ) if evaluaciones > 1 else None
+    return {
+        "sesiones": sesiones,
+        "evaluaciones": sesiones * evaluaciones,
+        "reruns": len(latencias),
+        "segundos": segundos,
+        "evaluaciones_por_minuto": sesiones * evaluaciones * 60 / segundos,
+        "reruns_por_segundo": len(latencias) / segundos,
+        "latencia_ms": _percentiles(latencias),
+        "memoria_mb": {"proceso_con_una_sesion": base, "por_sesion_adicional": por_sesion},
+    }
+
+
+def codo(niveles: List[Dict[str, Any]], mejora: float) -> Optional[int]:
+    """Primer nivel después del cual más sesiones no mejoran el throughput en `mejora`."""
+    for previo, siguiente in zip(niveles, niveles[1:]):
+        if siguiente["evaluaciones_por_minuto"] < previo["evaluaciones_por_minuto"] * (1 + mejora):
+            return previo["sesiones"]
+    return None
+
+
+def comparar(actual: List[Dict[str, Any]], base: List[Dict[str, Any]], umbral: float) -> List[str]:
+    """Niveles con p95 o throughput peor que la línea base más allá del umbral."""
+    por_nivel = {b["sesiones"]: b for b in base}
+    regresiones = []
+    print(f"\n{'sesiones':>8} {'p95 base':>10} {'p95 actual':>11} {'eval/min base':>14} {'actual':>8}")
+    for n in actual:
+        b = por_nivel.get(n["sesiones"])
+        if b is None:
+            print(f"{n['sesiones']:>8} {'-':>10} {n['latencia_ms']['p95']:>11.0f} {'-':>14} "
+                  f"{n['evaluaciones_por_minuto']:>8.1f}   (nuevo)")
+            continue
+        peor = (n["latencia_ms"]["p95"] > b["latencia_ms"]["p95"] * (1 + umbral)
+                or n["evaluaciones_por_minuto"] < b["evaluaciones_por_minuto"] / (1 + umbral))
+        if peor:
+            regresiones.append(str(n["sesiones"]))
+        print(f"{n['sesiones']:>8} {b['latencia_ms']['p95']:>10.0f} {n['latencia_ms']['p95']:>11.0f} "
+              f"{b['evaluaciones_por_minuto']:>14.1f} {n['evaluaciones_por_minuto']:>8.1f}"
+              + ("  REGRESIÓN" if peor else ""))
+    return regresiones
+
+
+def _meta(args: argparse.Namespace) -> Dict[str, Any]:
+    return {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "streamlit": streamlit.__version__,
+        "plataforma": platform.platform(),
+        "procesador": platform.processor() or platform.machine(),
+        "cpus": os.cpu_count(),
+        "evaluaciones_por_sesion": args.evaluaciones,
+        "pausa_s": args.pausa,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Carga de sesiones concurrentes sobre app.py con AppTest.")
+    parser.add_argument("--sesiones", default=",".join(map(str, NIVELES)),
+                        help="Niveles de concurrencia (profesionales simultáneos), separados por comas")
+    parser.add_argument("--evaluaciones", type=int, default=3, help="Evaluaciones por profesional")
+    parser.add_argument("--pausa", type=float, default=0.0, help="Segundos de tipeo entre campos")
+    parser.add_argument("--mejora", type=float, default=0.10,
+                        help="Mejora mínima de throughput al subir de nivel antes de marcar el codo")
+    parser.add_argument("--guardar", help="Escribir los resultados como JSON")
+    parser.add_argument("--comparar", help="Resultados JSON contra los cuales comparar")
+    parser.add_argument("--umbral", type=float, default=0.25)
+    args = parser.parse_args()
+
+    niveles = []
+    print(f"{'sesiones':>8} {'reruns':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'eval/min':>9} "
+          f"{'MB proceso':>11} {'MB/sesión':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sorted({int(s) for s in args.sesiones.split(",") if s.strip()}):
+            r = nivel(n, args.evaluaciones, args.pausa, tmp)
+            niveles.append(r)
+            lat, mem = r["latencia_ms"], r["memoria_mb"]
+            adicional = "-" if mem["por_sesion_adicional"] is None else f"{mem['por_sesion_adicional']:.1f}"
+            print(f"{n:>8} {r['reruns']:>7} {lat['p50']:>8.0f} {lat['p95']:>8.0f} {lat['p99']:>8.0f} "
+                  f"{r['evaluaciones_por_minuto']:>9.1f} {mem['proceso_con_una_sesion']:>11.0f} {adicional:>10}")
+    n_codo = codo(niveles, args.mejora)
+    print(f"codo del throughput: {n_codo if n_codo is not None else 'no alcanzado'}"
+          f" sesiones ({os.cpu_count()} CPU)")
+
+    if args.guardar:
+        with open(args.guardar, "w", encoding="utf-8") as fh:
+            json.dump({"meta": _meta(args), "niveles": niveles, "codo": n_codo}, fh, ensure_ascii=False, indent=2)
+        print(f"Resultados guardados en {args.guardar}")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as fh:
+            base = json.load(fh)
+        if base["meta"].get("cpus") != os.cpu_count():
+            print(f"Aviso: la línea base es de una máquina con {base['meta'].get('cpus')} CPU")
+        regresiones = comparar(niveles, base["niveles"], args.umbral)
+        if regresiones:
+            print(f"\nRegresión por encima de {args.umbral:.0%} con {', '.join(regresiones)} sesiones")
+            sys.exit(1)
+        print("\nSin regresiones.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+# benchmarks/bench_cohorte.py — Pasada de cohorte en paralelo vs. cargar todo
+# Ejecutar:  python benchmarks/bench_cohorte.py --rows 1000000 [--workers 4]
+#
+# Llena una base temporal con evaluaciones sintéticas (INSERT directo, sin
+# rollups), y mide:
+#   - cohort.calcular() con 1 proceso y con --workers procesos;
+#   - la referencia: cargar todas las filas en NumPy y calcular lo mismo;
+#   - cohort.reconstruir() (pasada agrupada por clínica/mes/perfil) y la
+#     consulta del tablero sobre los rollups;
+#   - el costo de mantener los rollups al guardar con ResultStore.
+# Verifica que medias, desvíos, cuantiles e interpretaciones coincidan.
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from collections import Counter
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cognitiva import cohort  # noqa: E402
+from cognitiva.scoring import DEFAULT_MAXIMOS, DOMINIOS, ScoringConfig, interpretar  # noqa: E402
+from cognitiva.store import _COLS, Evaluacion, ResultStore  # noqa: E402
+
+
+def evaluacion(rnd: random.Random, i: int, cfg: ScoringConfig) -> Evaluacion:
+    sub = {d: rnd.randint(0, DEFAULT_MAXIMOS[d]) for d in DOMINIOS}
+    total = sum(sub.values())
+    porcentaje = round(100 * total / cfg.max_total, 2)
+    return Evaluacion(
+        uid=f"u{i}",
+        id_paciente=f"HC-{i % 50_000}",
+        fecha=f"{rnd.choice([2024, 2025])}-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}",
+        subtotales=sub,
+        total=total,
+        max_total=cfg.max_total,
+        porcentaje=porcentaje,
+        config={},
+        respuestas={},
+        clinica=rnd.choice(["Norte", "Sur", "Centro", ""]),
+        interpretacion=interpretar(porcentaje, cfg),
+        perfil=rnd.choice(["", "estandar@1", "breve@1"]),
+    )
+
+
+def llenar(path: str, n: int) -> None:
+    ResultStore(path).close()  # esquema
+    rnd = random.Random(3)
+    cfg = ScoringConfig()
+    conn = sqlite3.connect(path)
+    sql = f"INSERT INTO evaluaciones ({', '.join(_COLS)}) VALUES ({', '.join('?' for _ in _COLS)})"
+    with conn:
+        for a in range(0, n, 50_000):
+            conn.executemany(sql, (evaluacion(rnd, i, cfg).to_row() for i in range(a, min(a + 50_000, n))))
+    conn.close()
+
+
+def referencia(path: str) -> tuple:
+    """Todo en memoria: lo que la pasada evita."""
+    from cognitiva.store import DOMINIO_COLUMNAS
+
+    conn = sqlite3.connect(path)
+    cols = [DOMINIO_COLUMNAS[d] for d in DOMINIOS] + ["total", "porcentaje"]
+    filas = conn.execute(f"SELECT {', '.join(cols)}, interpretacion FROM evaluaciones").fetchall()
+    conn.close()
+    datos = np.array([f[:-1] for f in filas], dtype=np.float64)
+    return dict(zip(cohort.SERIES, datos.T)), Counter(f[-1] for f in filas)
+
+
+def verificar(est: cohort.EstadisticasCohorte, columnas: dict, interps: Counter) -> None:
+    resumen = est.resumen()
+    for s in cohort.SERIES:
+        x = columnas[s]
+        tol = cohort.PASOS.get(s, 0) + 1e-9  # el porcentaje se agrupa en celdas de 0.1
+        assert resumen[s]["n"] == len(x), s
+        assert abs(resumen[s]["media"] - x.mean()) < 1e-9, s
+        assert abs(resumen[s]["desvio"] - x.std(ddof=1)) < 1e-9, s
+        for nombre, q in cohort.CUANTILES.items():
+            esperado = np.quantile(x, q, method="inverted_cdf")
+            assert esperado - tol <= resumen[s][nombre] <= esperado + 1e-9, (s, nombre)
+    assert est.interpretaciones == interps
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Mide cognitiva.cohort sobre una base sintética.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--guardados", type=int, default=5000, help="Evaluaciones a guardar con ResultStore")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cohorte.db")
+        t0 = time.perf_counter()
+        llenar(path, args.rows)
+        t_llenar = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        columnas, interps = referencia(path)
+        t_ref = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        uno = cohort.calcular(path, workers=1)
+        t_uno = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        varios = cohort.calcular(path, workers=args.workers)
+        t_varios = time.perf_counter() - t0
+        verificar(uno, columnas, interps)
+        verificar(varios, columnas, interps)
+
+        conn = sqlite3.connect(path)
+        t0 = time.perf_counter()
+        cohort.reconstruir(conn, path, workers=args.workers)
+        t_reconstruir = time.perf_counter() - t0
+        conn.close()
+
+        store = ResultStore(path)
+        t0 = time.perf_counter()
+        tablero = store.cohorte()
+        t_tablero = time.perf_counter() - t0
+        verificar(tablero, columnas, interps)
+        n_grupos = len(store.cohorte_grupos())
+
+        # Guardados con rollups: nuevas y re-guardadas (mismo uid)
+        rnd = random.Random(9)
+        cfg = ScoringConfig()
+        t0 = time.perf_counter()
+        for i in range(args.guardados):
+            store.save(evaluacion(rnd, args.rows + i if i % 5 else rnd.randrange(args.rows), cfg))
+        store.flush()
+        t_guardar = time.perf_counter() - t0
+        columnas, interps = referencia(path)
+        verificar(store.cohorte(), columnas, interps)
+        store.close()
+
+    print(f"filas:                          {args.rows:>12,}")
+    print(f"llenado (INSERT directo):       {t_llenar:>10.2f} s")
+    print(f"todo en memoria (referencia):   {t_ref:>10.2f} s")
+    print(f"pasada, 1 proceso:              {t_uno:>10.2f} s")
+    print(f"pasada, {args.workers} procesos:{'':<14}{t_varios:>10.2f} s  ({t_uno / t_varios:.1f}x)")
+    print(f"reconstruir rollups:            {t_reconstruir:>10.2f} s  ({n_grupos} grupos)")
+    print(f"tablero desde rollups:          {t_tablero * 1000:>10.1f} ms")
+    print(f"guardados con rollups:          {args.guardados / t_guardar:>10.0f} evaluaciones/s")
+    print("resultados idénticos:           sí (media, desvío, cuantiles e interpretaciones)")
+
+
+if __name__ == "__main__":
+    main()
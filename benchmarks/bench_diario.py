@@ -0,0 +1,137 @@
+# benchmarks/bench_diario.py — Autoguardado con muchas sesiones concurrentes
+# Ejecutar:  python benchmarks/bench_diario.py [--sesiones 200] [--reruns 60] [--intervalo 0.5]
+#
+# Cada sesión es un hilo que simula los reruns de una evaluación: en cada uno
+# cambia una o dos respuestas (bench_vectorized.generar) y llama a
+# Diario.registrar con el estado completo, como el final de app.py. Mide
+# líneas, bytes y fsyncs (uno por sesión activa por intervalo, no por rerun),
+# la latencia de registrar() y la de que el cambio llegue a disco.
+#
+# Verifica: recuperar() de cada sesión == su último estado (con compactaciones
+# en el medio), que una última línea cortada se ignora y que lo agregado después
+# de retomarla no se pierde, que otro Diario sobre el mismo directorio (reinicio
+# del servidor) recupera lo mismo, y que descartar() y limpiar() borran.
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_vectorized import TARGET, generar  # noqa: E402
+
+from cognitiva.journal import Diario, leer  # noqa: E402
+
+
+def percentil(valores: List[float], p: float) -> float:
+    orden = sorted(valores)
+    return orden[min(len(orden) - 1, int(p * len(orden)))]
+
+
+def sesion(diario: Diario, uid: str, reruns: int, pausa: float, seed: int,
+           finales: Dict[str, Dict[str, Any]], latencias: List[float], durables: List[float]) -> None:
+    rnd = random.Random(seed)
+    objetivo = dict(next(iter(generar(1, seed=seed))))
+    estado: Dict[str, Any] = {"target_words": list(TARGET), "registered_words": False, "registration_time": None}
+    campos = list(objetivo)
+    for k in range(reruns):
+        # Un rerun: una o dos respuestas nuevas (o el mismo estado, sin cambios)
+        for campo in rnd.sample(campos, rnd.choice([0, 1, 1, 2])):
+            estado[f"r.{campo}"] = objetivo[campo] if rnd.random() < 0.7 else str(rnd.random())
+        if k == 3:
+            estado["registered_words"] = True
+            estado["registration_time"] = "2025-05-01T10:00:00"
+        t0 = time.perf_counter()
+        fut = diario.registrar(uid, estado)
+        t1 = time.perf_counter()
+        latencias.append(t1 - t0)
+        if k % 10 == 0:
+            fut.result()
+            durables.append(time.perf_counter() - t0)
+        time.sleep(rnd.uniform(0, 2 * pausa))
+    finales[uid] = dict(estado)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Mide cognitiva.journal con sesiones concurrentes.")
+    parser.add_argument("--sesiones", type=int, default=200)
+    parser.add_argument("--reruns", type=int, default=60, help="Reruns por sesión")
+    parser.add_argument("--pausa", type=float, default=0.05, help="Segundos medios entre reruns")
+    parser.add_argument("--intervalo", type=float, default=0.5)
+    parser.add_argument("--compactar-cada", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        diario = Diario(tmp, intervalo=args.intervalo, compactar_cada=args.compactar_cada)
+        finales: Dict[str, Dict[str, Any]] = {}
+        latencias: List[float] = []
+        durables: List[float] = []
+        uids = [uuid.uuid4().hex for _ in range(args.sesiones)]
+        hilos = [
+            threading.Thread(target=sesion, args=(diario, uid, args.reruns, args.pausa, i, finales, latencias, durables))
+            for i, uid in enumerate(uids)
+        ]
+        t0 = time.perf_counter()
+        for h in hilos:
+            h.start()
+        for h in hilos:
+            h.join()
+        diario.flush()
+        total = time.perf_counter() - t0
+
+        lineas = sum(sum(1 for _ in open(os.path.join(tmp, f"{uid}.jsonl"), "rb")) for uid in uids)
+        bytes_ = sum(os.path.getsize(os.path.join(tmp, f"{uid}.jsonl")) for uid in uids)
+        for uid in uids:
+            assert diario.recuperar(uid) == finales[uid], uid
+        assert diario.compactaciones > 0
+
+        # Reinicio del servidor: otro Diario sobre el mismo directorio
+        otro = Diario(tmp)
+        for uid in uids:
+            assert otro.recuperar(uid) == finales[uid], uid
+
+        # Caída a mitad de una escritura: la última línea queda cortada...
+        path = os.path.join(tmp, f"{uids[0]}.jsonl")
+        otro.registrar(uids[0], {**finales[uids[0]], "r.len_frase": "el perro ladra"}).result()
+        with open(path, "ab") as fh:
+            fh.write(b'{"t":1,"c":{"r.len_frase":"a me')
+        assert leer(path) == {**finales[uids[0]], "r.len_frase": "el perro ladra"}
+        otro.close()
+        # ...y tras reiniciar, la sesión retomada sigue agregando
+        otro = Diario(tmp)
+        retomado = otro.recuperar(uids[0])
+        assert retomado == {**finales[uids[0]], "r.len_frase": "el perro ladra"}
+        otro.registrar(uids[0], {**retomado, "r.len_frase": "el gato duerme"})
+        otro.registrar(uids[0], {**retomado, "r.len_frase": "el gato duerme", "r.aten_s7": "93"}).result()
+        assert leer(path) == {**retomado, "r.len_frase": "el gato duerme", "r.aten_s7": "93"}
+
+        otro.descartar(uids[1])
+        assert otro.recuperar(uids[1]) is None
+        os.utime(path, (time.time() - 8 * 86400,) * 2)
+        assert otro.limpiar(7) == 1 and otro.recuperar(uids[0]) is None
+        otro.close()
+        diario.close()
+
+    registros = args.sesiones * args.reruns
+    print(f"sesiones x reruns:                 {args.sesiones:>8,} x {args.reruns}  ({registros:,} registrar())")
+    print(f"tiempo total:                      {total:>8.2f} s")
+    print(f"líneas en disco (tras compactar):  {lineas:>8,}  ({bytes_ / 1024:.0f} KiB)")
+    print(f"escrituras / fsyncs:               {diario.escrituras:>8,} / {diario.fsyncs:,}  "
+          f"({diario.fsyncs / registros:.2f} fsync por registrar())")
+    print(f"compactaciones:                    {diario.compactaciones:>8,}")
+    print(f"registrar() p50 / p99:             {statistics.median(latencias) * 1e6:>8.0f} / "
+          f"{percentil(latencias, 0.99) * 1e6:.0f} µs")
+    print(f"hasta disco p50 / p99:             {statistics.median(durables) * 1e3:>8.0f} / "
+          f"{percentil(durables, 0.99) * 1e3:.0f} ms")
+    print("recuperación:                      ok (compactado, reinicio, línea cortada + agregados, descartar, limpiar)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# benchmarks/bench_import.py — Tiempo de import en frío del núcleo (sin Streamlit)
+# Ejecutar:  python benchmarks/bench_import.py [--repeticiones 7] [--max-ms 60] [--json salida.json]
+#
+# Cada medición es un intérprete nuevo con `python -X importtime -c "import <módulo>"`;
+# se toma el tiempo acumulado del módulo (incluye sus dependencias que no
+# estuvieran ya cargadas por `site`) y se informa la mediana. También se
+# verifica que ningún módulo del núcleo cargue streamlit ni numpy.
+# Con --max-ms sale con código 1 si algún módulo supera ese presupuesto.
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULOS = [
+    "cognitiva",
+    "cognitiva.scoring",
+    "cognitiva.export",
+    "cognitiva.report",
+    "cognitiva.batch",
+    "cognitiva.store",
+    "cognitiva.vectorized",
+    "cognitiva.recursos",
+    "cognitiva.sesion",
+]
+# Pueden importar numpy, nunca streamlit
+CON_NUMPY = {"cognitiva.vectorized"}
+PESADOS = ("streamlit", "numpy")
+
+_LINEA = re.compile(r"import time:\s+\d+ \|\s+(\d+) \|\s*(\S+)")
+
+
+def _entorno() -> dict:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = ROOT + os.pathsep + env.get("PYTHONPATH", "")
+    env.pop("PYTHONIMPORTTIME", None)
+    return env
+
+
+def medir_una(modulo: str) -> float:
+    """Milisegundos acumulados de `import modulo` en un intérprete nuevo."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+        capture_output=True, text=True, env=_entorno(), check=True,
+    )
+    for linea in reversed(proc.stderr.splitlines()):
+        m = _LINEA.match(linea)
+        if m and m.group(2) == modulo:
+            return int(m.group(1)) / 1000
+    raise RuntimeError(f"No se encontró {modulo} en la salida de -X importtime")
+
+
+def pesados_cargados(modulo: str) -> list:
+    codigo = (
+        f"import sys, {modulo}; "
+        f"print(','.join(m for m in {PESADOS!r} if m in sys.modules))"
+    )
+    proc = subprocess.run([sys.executable, "-c", codigo], capture_output=True, text=True, env=_entorno(), check=True)
+    return [m for m in proc.stdout.strip().split(",") if m]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Mide el import en frío de los módulos de cognitiva.")
+    parser.add_argument("--repeticiones", type=int, default=7)
+    parser.add_argument("--max-ms", type=float, help="Presupuesto por módulo (ms); sale con 1 si se excede")
+    parser.add_argument("--json", help="Guardar resultados en JSON")
+    args = parser.parse_args()
+
+    resultados = {}
+    fallas = []
+    print(f"{'módulo':<24} {'mediana ms':>10} {'mín ms':>8}  pesados")
+    for modulo in MODULOS:
+        tiempos = [medir_una(modulo) for _ in range(args.repeticiones)]
+        pesados = pesados_cargados(modulo)
+        permitidos = {"numpy"} if modulo in CON_NUMPY else set()
+        prohibidos = [m for m in pesados if m not in permitidos]
+        mediana = statistics.median(tiempos)
+        resultados[modulo] = {"mediana_ms": mediana, "min_ms": min(tiempos), "pesados": pesados}
+        print(f"{modulo:<24} {mediana:>10.1f} {min(tiempos):>8.1f}  {', '.join(pesados) or '-'}")
+        if prohibidos:
+            fallas.append(f"{modulo} importa {', '.join(prohibidos)}")
+        if args.max_ms is not None and modulo not in CON_NUMPY and mediana > args.max_ms:
+            fallas.append(f"{modulo}: {mediana:.1f} ms > {args.max_ms:.1f} ms")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(resultados, fh, ensure_ascii=False, indent=2)
+
+    if fallas:
+        print("\n" + "\n".join(fallas))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
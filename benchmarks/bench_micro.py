@@ -0,0 +1,337 @@
+# benchmarks/bench_micro.py — Microbenchmarks de los caminos calientes (sin Streamlit)
+# Ejecutar:  python benchmarks/bench_micro.py [--tamanios 100,1000,10000] [--guardar base.json]
+#            python benchmarks/bench_micro.py --comparar base.json [--umbral 0.25] [--piso-ms 0.05]
+#
+# Mide cada score_*, normalize_list/count_matches, la validación de fluidez,
+# la elección de una forma del banco de palabras, results_to_csv y
+# render_html_report con entradas generadas de tamaño creciente. Para los
+# score_*, el CSV y el informe, el tamaño es la cantidad de registros
+# procesados; para normalize_list/count_matches, el largo de la lista de
+# palabras; para fluidez_validar, las entradas validadas (animales,
+# repetidos, errores de tipeo y no animales); para formas_elegir, las
+# elecciones, cada una con las palabras de 5 evaluaciones previas como vistas.
+# Como timeit.Timer.autorange, cada repetición llama al caso tantas veces
+# como haga falta para durar al menos --min-ms (un caso de microsegundos no
+# se mide con una sola llamada); de --repeticiones repeticiones se toma el
+# mínimo por llamada (el menos afectado por ruido) y también la mediana.
+#
+# --guardar escribe los tiempos como JSON (línea base). --comparar vuelve a
+# medir y marca como regresión todo caso que tarde más de (1 + umbral) veces
+# su línea base y, además, más de --piso-ms por encima de ella (debajo de
+# ese piso la diferencia es ruido del sistema, no del código). Los casos
+# marcados se vuelven a medir hasta --confirmar veces, cada vez en un proceso
+# nuevo, y se queda el mejor tiempo: el mismo caso puede quedar un 50% más
+# lento en un proceso que en otro (ubicación en memoria, otra carga en la
+# máquina) y eso no debe marcar una regresión, mientras que un cambio de
+# código persiste en todos. Cada nueva medición va junto a la de un trabajo
+# de referencia fijo (también guardado en la línea base): si la máquina está
+# más lenta que al guardar, el tiempo se divide por ese factor. Si alguno
+# sigue marcado, sale con código 1. Las líneas base solo son comparables en la misma máquina e
+# intérprete (ver "meta" en el JSON).
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_vectorized import HOY, TARGET, generar  # noqa: E402
+
+from cognitiva.export import build_results_dict, results_to_csv  # noqa: E402
+from cognitiva.fluency import CapturaFluidez, load_lexicon  # noqa: E402
+from cognitiva.report import render_html_report  # noqa: E402
+from cognitiva.scoring import (  # noqa: E402
+    ScoringConfig,
+    count_matches,
+    normalize_list,
+    score_abstraccion,
+    score_atencion,
+    score_lenguaje,
+    score_memoria_diferida,
+    score_memoria_inmediata,
+    score_orientacion,
+    score_viso,
+    totales,
+)
+from cognitiva.wordbank import load_forms  # noqa: E402
+
+TAMANIOS = [100, 1000, 10000]
+ENTRADAS_FLUIDEZ = ["perro", "gatas", "elefnte", "mesa", "el león", "Hipopotamo", "osos polares", "zzzzzz"]
+VOCABULARIO = TARGET + ["gato", "mesa", "lbro", "puentes", "Manzana", "llaves", "perrro", "árbol", "sol"]
+
+# Caso -> fn(n) que arma las entradas y devuelve la función a medir
+Caso = Callable[[int], Callable[[], Any]]
+
+
+def _registros(n: int) -> List[Dict[str, Any]]:
+    return list(generar(n, seed=n))
+
+
+def _palabras(n: int) -> str:
+    rnd = random.Random(n)
+    return ", ".join(rnd.choice(VOCABULARIO) for _ in range(n))
+
+
+def _por_registro(fn: Callable[[Dict[str, Any]], Any]) -> Caso:
+    def armar(n: int) -> Callable[[], Any]:
+        registros = _registros(n)
+        return lambda: [fn(r) for r in registros]
+
+    return armar
+
+
+def _casos(cfg: ScoringConfig) -> Dict[str, Caso]:
+    def normalize(n: int) -> Callable[[], Any]:
+        texto = _palabras(n)
+        return lambda: normalize_list(texto)
+
+    def matches(n: int) -> Callable[[], Any]:
+        palabras = normalize_list(_palabras(n))
+        return lambda: count_matches(palabras, TARGET, max_distance=cfg.max_typo_distance)
+
+    def fluidez(n: int) -> Callable[[], Any]:
+        lexico = load_lexicon()
+        rnd = random.Random(n)
+        entradas = [rnd.choice(ENTRADAS_FLUIDEZ) for _ in range(n)]
+
+        def validar() -> None:
+            captura = CapturaFluidez(lexico)
+            for i, texto in enumerate(entradas):
+                captura.agregar(texto, i * 60 / n)
+
+        return validar
+
+    def formas(n: int) -> Callable[[], Any]:
+        banco = load_forms()
+        rnd = random.Random(n)
+        historias = [
+            [w for _ in range(5) for w in banco.formas[rnd.randrange(len(banco))]] for _ in range(n)
+        ]
+        return lambda: [banco.elegir(vistas, rnd) for vistas in historias]
+
+    def csv(n: int) -> Callable[[], Any]:
+        filas = []
+        for i, r in enumerate(_registros(n)):
+            sub = {"Orientación": score_orientacion(r, cfg, hoy=HOY), "Atención": score_atencion(r, cfg)}
+            total, _, pct = totales(sub, cfg)
+            filas.append(build_results_dict(sub, cfg.maximos, total, pct, id_paciente=f"HC-{i}", fecha=HOY))
+        return lambda: [results_to_csv(f) for f in filas]
+
+    def html(n: int) -> Callable[[], Any]:
+        sub = {d: 1 for d in cfg.maximos}
+        generado = datetime(2025, 3, 1, 12, 0)
+        return lambda: [
+            render_html_report(
+                sub, cfg.maximos, 7, 15.56, None, "Dra. Pérez", "Neuróloga", "MP 1234",
+                nombre=f"Paciente {i}", id_paciente=f"HC-{i}", fecha=HOY, generado=generado,
+            )
+            for i in range(n)
+        ]
+
+    return {
+        "score_orientacion": _por_registro(lambda r: score_orientacion(r, cfg, hoy=HOY)),
+        "score_atencion": _por_registro(lambda r: score_atencion(r, cfg)),
+        "score_memoria_inmediata": _por_registro(lambda r: score_memoria_inmediata(r, cfg, TARGET)),
+        "score_lenguaje": _por_registro(lambda r: score_lenguaje(r, cfg)),
+        "score_viso": _por_registro(lambda r: score_viso(r, cfg)),
+        "score_memoria_diferida": _por_registro(lambda r: score_memoria_diferida(r, cfg, TARGET)),
+        "score_abstraccion": _por_registro(lambda r: score_abstraccion(r, cfg)),
+        "normalize_list": normalize,
+        "count_matches": matches,
+        "fluidez_validar": fluidez,
+        "formas_elegir": formas,
+        "results_to_csv": csv,
+        "render_html_report": html,
+    }
+
+
+def medir(fn: Callable[[], Any], repeticiones: int, min_s: float) -> Tuple[float, float, int]:
+    """(mínimo, mediana) en segundos por llamada a fn() y llamadas por repetición."""
+    fn()  # calentamiento: cachés de módulo, regex compiladas
+
+    def repeticion(llamadas: int) -> float:
+        # Sin recolector durante la medición, como timeit: sus pausas dependen
+        # de lo que dejaron los casos anteriores, no del caso medido
+        gc.collect()
+        gc.disable()
+        try:
+            t0 = time.perf_counter()
+            for _ in range(llamadas):
+                fn()
+            return time.perf_counter() - t0
+        finally:
+            gc.enable()
+
+    # Llamadas por repetición: 1, 2, 5, 10, 20, 50, ... hasta durar min_s
+    escala = 1
+    while True:
+        llamadas = next((p * escala for p in (1, 2, 5) if repeticion(p * escala) >= min_s), 0)
+        if llamadas:
+            break
+        escala *= 10
+    tiempos = [repeticion(llamadas) / llamadas for _ in range(repeticiones)]
+    return min(tiempos), statistics.median(tiempos), llamadas
+
+
+def correr(
+    tamanios: List[int], repeticiones: int, min_s: float, filtro: str = ""
+) -> Dict[str, Dict[str, Any]]:
+    cfg = ScoringConfig()
+    resultados: Dict[str, Dict[str, Any]] = {}
+    for nombre, armar in _casos(cfg).items():
+        if filtro and filtro not in nombre:
+            continue
+        for n in tamanios:
+            minimo, mediana, llamadas = medir(armar(n), repeticiones, min_s)
+            clave = f"{nombre}[n={n}]"
+            resultados[clave] = {
+                "caso": nombre,
+                "n": n,
+                "min_s": minimo,
+                "mediana_s": mediana,
+                "llamadas": llamadas,
+                "us_por_item": minimo / n * 1e6,
+            }
+            print(f"{clave:<40} {minimo * 1e3:>10.3f} ms  {minimo / n * 1e6:>9.2f} µs/ítem")
+    return resultados
+
+
+def comparar(
+    actual: Dict[str, Dict[str, Any]],
+    base: Dict[str, Dict[str, Any]],
+    umbral: float,
+    piso_s: float = 0.0,
+    mostrar: bool = True,
+) -> List[str]:
+    """Claves cuyo mínimo supera (1 + umbral) veces la línea base y la supera
+    en más de `piso_s` segundos."""
+    regresiones = []
+    if mostrar:
+        print(f"\n{'caso':<40} {'base ms':>10} {'actual ms':>10} {'razón':>7}")
+    for clave, res in actual.items():
+        previo = base.get(clave)
+        if previo is None:
+            if mostrar:
+                print(f"{clave:<40} {'-':>10} {res['min_s'] * 1e3:>10.3f}   (nuevo)")
+            continue
+        razon = res["min_s"] / previo["min_s"] if previo["min_s"] > 0 else float("inf")
+        marca = ""
+        if razon > 1 + umbral and res["min_s"] - previo["min_s"] > piso_s:
+            regresiones.append(clave)
+            marca = "  REGRESIÓN"
+        if mostrar:
+            print(f"{clave:<40} {previo['min_s'] * 1e3:>10.3f} {res['min_s'] * 1e3:>10.3f} {razon:>6.2f}x{marca}")
+    return regresiones
+
+
+def referencia() -> Callable[[], Any]:
+    """Trabajo fijo de Python puro: su tiempo mide qué tan rápida está la máquina."""
+    datos = [f"palabra{i % 701}" for i in range(5000)]
+    return lambda: sorted({p: len(p) for p in datos}.items())
+
+
+def _medir_aparte(caso: str, n: int, repeticiones: int, min_s: float) -> Tuple[float, float, int, float]:
+    """medir() de un caso en un proceso nuevo, más el mínimo de referencia()."""
+    codigo = (
+        "import json, sys; import bench_micro as b; r, m = int(sys.argv[3]), float(sys.argv[4]); "
+        "caso = b.medir(b._casos(b.ScoringConfig())[sys.argv[1]](int(sys.argv[2])), r, m); "
+        "print(json.dumps([*caso, b.medir(b.referencia(), r, m)[0]]))"
+    )
+    salida = subprocess.run(
+        [sys.executable, "-c", codigo, caso, str(n), str(repeticiones), str(min_s)],
+        cwd=os.path.dirname(os.path.abspath(__file__)), check=True, capture_output=True, text=True,
+    ).stdout
+    minimo, mediana, llamadas, ref = json.loads(salida)
+    return minimo, mediana, llamadas, ref
+
+
+def remedir(
+    resultados: Dict[str, Dict[str, Any]], claves: List[str], repeticiones: int, min_s: float, ref_base: float = 0.0
+) -> None:
+    """Vuelve a medir `claves` y se queda con el mejor mínimo de cada una,
+    corregido por la lentitud de la máquina respecto de `ref_base`."""
+    for clave in claves:
+        res = resultados[clave]
+        minimo, mediana, llamadas, ref = _medir_aparte(res["caso"], res["n"], repeticiones, min_s)
+        factor = max(1.0, ref / ref_base) if ref_base else 1.0
+        print(f"{clave:<40} {minimo * 1e3:>10.3f} ms  (nueva medición, máquina {factor:.2f}x más lenta)")
+        minimo, mediana = minimo / factor, mediana / factor
+        if minimo < res["min_s"]:
+            res.update(min_s=minimo, mediana_s=mediana, llamadas=llamadas, us_por_item=minimo / res["n"] * 1e6)
+
+
+def _meta(tamanios: List[int], repeticiones: int, min_s: float) -> Dict[str, Any]:
+    ref = medir(referencia(), repeticiones, min_s)[0]
+    return {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "implementacion": platform.python_implementation(),
+        "plataforma": platform.platform(),
+        "procesador": platform.processor() or platform.machine(),
+        "tamanios": tamanios,
+        "repeticiones": repeticiones,
+        "min_s": min_s,
+        "referencia_s": ref,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Microbenchmarks de puntaje, exportación e informe.")
+    parser.add_argument("--tamanios", default=",".join(map(str, TAMANIOS)),
+                        help="Tamaños de entrada, separados por comas")
+    parser.add_argument("--repeticiones", type=int, default=7)
+    parser.add_argument("--min-ms", type=float, default=100,
+                        help="Duración mínima de cada repetición (se repiten llamadas hasta alcanzarla)")
+    parser.add_argument("--solo", default="", help="Medir solo los casos cuyo nombre contenga este texto")
+    parser.add_argument("--guardar", help="Escribir los resultados como línea base JSON")
+    parser.add_argument("--comparar", help="Línea base JSON contra la cual comparar")
+    parser.add_argument("--umbral", type=float, default=0.25,
+                        help="Tolerancia antes de marcar regresión (0.25 = 25%% más lento)")
+    parser.add_argument("--piso-ms", type=float, default=0.05,
+                        help="Diferencia absoluta por llamada por debajo de la cual no hay regresión")
+    parser.add_argument("--confirmar", type=int, default=3,
+                        help="Veces que se vuelve a medir un caso marcado antes de informarlo")
+    args = parser.parse_args()
+
+    tamanios = [int(t) for t in args.tamanios.split(",") if t.strip()]
+    min_s = args.min_ms / 1e3
+    resultados = correr(tamanios, args.repeticiones, min_s, args.solo)
+
+    if args.guardar:
+        with open(args.guardar, "w", encoding="utf-8") as fh:
+            json.dump({"meta": _meta(tamanios, args.repeticiones, min_s), "resultados": resultados},
+                      fh, ensure_ascii=False, indent=2)
+        print(f"\nLínea base guardada en {args.guardar}")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as fh:
+            base = json.load(fh)
+        if base["meta"].get("python") != platform.python_version():
+            print(f"Aviso: la línea base es de Python {base['meta'].get('python')}")
+        piso_s = args.piso_ms / 1e3
+        regresiones = comparar(resultados, base["resultados"], args.umbral, piso_s, mostrar=False)
+        for _ in range(args.confirmar):
+            if not regresiones:
+                break
+            print(f"\nConfirmando {len(regresiones)} caso(s) por encima del umbral:")
+            remedir(resultados, regresiones, args.repeticiones, min_s, base["meta"].get("referencia_s", 0.0))
+            regresiones = comparar(resultados, base["resultados"], args.umbral, piso_s, mostrar=False)
+        regresiones = comparar(resultados, base["resultados"], args.umbral, piso_s)
+        if regresiones:
+            print(f"\n{len(regresiones)} regresión(es) por encima de {args.umbral:.0%}: {', '.join(regresiones)}")
+            sys.exit(1)
+        print("\nSin regresiones.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+# benchmarks/bench_normas.py — Costo de ubicar una cohorte contra las normas
+# Ejecutar:  python benchmarks/bench_normas.py --rows 1000000
+#
+# Sintetiza una tabla normativa (todas las series, estratos de 5 años de edad
+# por 5 tramos de educación, un punto por puntaje entero), la compila al
+# formato binario y mide, sobre una cohorte puntuada con score_columns():
+# carga del CSV, compilación, apertura con mmap y evaluar_columnas() con
+# edades/educación al azar. Antes de informar tiempos compara una muestra de
+# filas con una búsqueda ingenua (estrato por estrato, np.interp por fila).
+
+import argparse
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_vectorized import HOY, TARGET, generar  # noqa: E402
+
+from cognitiva.norms import SERIES, NormTable, compilar, load_norms  # noqa: E402
+from cognitiva.scoring import DEFAULT_MAXIMOS, ScoringConfig  # noqa: E402
+from cognitiva.vectorized import columns_from_respuestas, score_columns  # noqa: E402
+
+EDU = [(0, 3), (4, 7), (8, 12), (13, 16), (17, 30)]
+
+
+def escribir_tabla(path: str, seed: int = 11) -> None:
+    rnd = random.Random(seed)
+    maximos = {**DEFAULT_MAXIMOS, "total": sum(DEFAULT_MAXIMOS.values())}
+    with open(path, "w", encoding="utf-8", newline="") as fh:
+        w = csv.writer(fh)
+        w.writerow(["serie", "edad_min", "edad_max", "educacion_min", "educacion_max", "puntaje", "percentil"])
+        for serie in SERIES:
+            for edad in range(50, 100, 5):
+                for edu_min, edu_max in EDU:
+                    pcts = sorted(rnd.uniform(0, 100) for _ in range(maximos[serie] + 1))
+                    for x, p in enumerate(pcts):
+                        w.writerow([serie, edad, edad + 4, edu_min, edu_max, x, round(p, 2)])
+
+
+def referencia(tabla: NormTable, serie: str, x: float, edad: int, educacion: int) -> float:
+    i = tabla.series.index(serie)
+    for e in tabla.estratos:
+        if e[0] == i and e[1] <= edad <= e[2] and e[3] <= educacion <= e[4]:
+            return float(np.interp(x, tabla.puntajes[e[5]:e[6]], tabla.percentiles[e[5]:e[6]]))
+    return float("nan")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Mide evaluar_columnas() sobre una cohorte.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    cfg = ScoringConfig()
+    records = list(generar(args.rows))
+    t0 = time.perf_counter()
+    cols = columns_from_respuestas(records, TARGET, max_distance=cfg.max_typo_distance)
+    t_cols = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    vec = score_columns(cols, cfg, hoy=HOY)
+    t_score = time.perf_counter() - t0
+
+    rng = np.random.default_rng(5)
+    edad = rng.integers(45, 100, args.rows)  # 45-49: sin norma
+    educacion = rng.integers(0, 25, args.rows)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "normas.csv")
+        escribir_tabla(csv_path)
+        t0 = time.perf_counter()
+        tabla = load_norms(csv_path)
+        t_csv = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        compilar(csv_path, os.path.join(tmp, "bin"))
+        t_compilar = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        binaria = load_norms(os.path.join(tmp, "bin"))
+        t_abrir = time.perf_counter() - t0
+
+        tabla.evaluar_columnas({s: vec[s][:10] for s in SERIES}, edad[:10], educacion[:10])  # arma la grilla
+        t0 = time.perf_counter()
+        res = tabla.evaluar_columnas(vec, edad, educacion)
+        t_normas = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        res_bin = binaria.evaluar_columnas(vec, edad, educacion)
+        t_bin = time.perf_counter() - t0
+
+        for serie in SERIES:
+            if not np.array_equal(res[serie]["percentil"], res_bin[serie]["percentil"], equal_nan=True):
+                raise SystemExit(f"CSV y binario difieren en {serie}")
+            for i in rng.integers(0, args.rows, 200):
+                esperado = referencia(tabla, serie, float(vec[serie][i]), edad[i], educacion[i])
+                got = res[serie]["percentil"][i]
+                if not (np.isnan(esperado) and np.isnan(got)) and abs(got - esperado) > 1e-9:
+                    raise SystemExit(f"Diferencia en {serie}, fila {i}: {got} != {esperado}")
+        sin_norma = int(np.isnan(res["total"]["percentil"]).sum())
+        n_estratos, n_puntos = len(tabla.estratos), len(tabla.puntajes)
+
+    print(f"filas:                         {args.rows:>12,}")
+    print(f"tabla:                         {n_estratos:>12,} estratos, {n_puntos:,} puntos")
+    print(f"carga CSV:                     {t_csv:>10.3f} s")
+    print(f"compilación a .npy:            {t_compilar:>10.3f} s")
+    print(f"apertura compilada (mmap):     {t_abrir * 1000:>10.2f} ms")
+    print(f"armado de columnas:            {t_cols:>10.3f} s")
+    print(f"score_columns (NumPy):         {t_score:>10.3f} s")
+    print(f"evaluar_columnas ({len(SERIES)} series):  {t_normas:>10.3f} s  ({t_normas / t_score:.0%} de score_columns)")
+    print(f"evaluar_columnas (mmap, frío): {t_bin:>10.3f} s")
+    print(f"filas sin norma (edad < 50):   {sin_norma:>12,}")
+    print("resultados idénticos:          sí (CSV = binario = búsqueda ingenua en la muestra)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+# benchmarks/bench_repuntaje.py — Re-puntaje con brutos vs. puntuar todo de nuevo
+# Ejecutar:  python benchmarks/bench_repuntaje.py --rows 20000
+#
+# Llena una base con ResultStore (respuestas de bench_vectorized, palabras
+# objetivo por fila; una parte sin brutos, como las evaluaciones guardadas
+# antes de esas columnas) y la re-puntúa con ResultStore.repuntuar:
+#   1. otros máximos, umbrales y animales por punto (perfil nuevo);
+#   2. la misma configuración otra vez (no debe reescribir nada);
+#   3. otra tolerancia a errores de tipeo (vuelve a contar las memorias).
+# Cada resultado se compara con una base de referencia llenada desde cero con
+# la configuración nueva: filas, brutos, rollups de cohorte y tendencias.
+# La referencia de tiempo es puntuar todas las respuestas con score_all().
+
+import argparse
+import json
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_vectorized import TARGET, generar  # noqa: E402
+
+from cognitiva import cohort  # noqa: E402
+from cognitiva.scoring import (  # noqa: E402
+    DEFAULT_WORD_BANK,
+    ScoringConfig,
+    aplicar_maximos,
+    interpretar,
+    puntos_brutos,
+    score_all,
+    totales,
+)
+from cognitiva.store import _BRUTO_COLS, _COLS, Evaluacion, ResultStore  # noqa: E402
+
+PALABRAS = [TARGET] + [list(p) for p in DEFAULT_WORD_BANK]
+ANTERIOR = ScoringConfig()
+NUEVA = ScoringConfig.from_dict({
+    "maximos": {"Orientación": 8, "Lenguaje/Ejecutivo": 6, "Abstracción": 2},
+    "animals_per_point": 4,
+    "high_threshold": 70,
+    "mid_threshold": 45,
+})
+CON_TIPEO = ScoringConfig.from_dict({**NUEVA.to_dict(), "max_typo_distance": 1})
+
+
+def llenar(path: str, n: int, cfg: ScoringConfig, perfil: str, sin_brutos: float) -> None:
+    """Mismas evaluaciones (semilla fija) puntuadas con `cfg`; una fracción sin brutos."""
+    rnd = random.Random(11)
+    store = ResultStore(path)
+    for i, r in enumerate(generar(n, seed=11)):
+        palabras = rnd.choice(PALABRAS)
+        registradas = rnd.random() < 0.9
+        fecha = f"{rnd.choice([2024, 2025])}-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}"
+        brutos = puntos_brutos(r, cfg, palabras, registradas, date.fromisoformat(fecha))
+        subtotales = aplicar_maximos(brutos, cfg)
+        total, max_total, porcentaje = totales(subtotales, cfg)
+        store.save(Evaluacion(
+            uid=f"u{i}",
+            id_paciente=f"HC-{i % max(1, n // 4)}",
+            fecha=fecha,
+            subtotales=subtotales,
+            total=total,
+            max_total=max_total,
+            porcentaje=porcentaje,
+            config={**cfg.to_dict(), "target_words": palabras, "registered_words": registradas},
+            respuestas=r,
+            clinica=rnd.choice(["Norte", "Sur", ""]),
+            interpretacion=interpretar(porcentaje, cfg),
+            perfil=perfil,
+            brutos={} if rnd.random() < sin_brutos else brutos,
+        ))
+    store.close()
+
+
+def verificar(path: str, ref: str) -> None:
+    conn, conn_ref = sqlite3.connect(path), sqlite3.connect(ref)
+    cols = [c for c in _COLS if c != "creado"]
+    sql = f"SELECT {', '.join(cols)} FROM evaluaciones ORDER BY uid"
+    for f, g in zip(conn.execute(sql), conn_ref.execute(sql)):
+        assert f == g, [(c, a, b) for c, a, b in zip(cols, f, g) if a != b]
+    assert conn.execute("SELECT count(*) FROM evaluaciones").fetchone() == conn_ref.execute(
+        "SELECT count(*) FROM evaluaciones").fetchone()
+
+    # Rollups de cohorte: mismos grupos y resúmenes (otro orden de suma)
+    sql = "SELECT clinica, mes, perfil, estado FROM cohorte ORDER BY clinica, mes, perfil"
+    grupos, grupos_ref = conn.execute(sql).fetchall(), conn_ref.execute(sql).fetchall()
+    assert [g[:3] for g in grupos] == [g[:3] for g in grupos_ref]
+    for g, h in zip(grupos, grupos_ref):
+        a = cohort.EstadisticasCohorte.from_dict(json.loads(g[3]))
+        b = cohort.EstadisticasCohorte.from_dict(json.loads(h[3]))
+        assert a.interpretaciones == b.interpretaciones, g[:3]
+        resumen = b.resumen()
+        for serie, fila in a.resumen().items():
+            for k, v in fila.items():
+                w = resumen[serie][k]
+                assert v == w or abs(v - w) < 1e-6, (g[:3], serie, k, v, w)
+
+    # Tendencias: sumas con tolerancia, basal y últimos exactos
+    sql = "SELECT id_paciente, serie, n, sx, sy, sxx, sxy, base_fecha, base_uid, base, ultimos FROM tendencias ORDER BY 1, 2"
+    for f, g in zip(conn.execute(sql), conn_ref.execute(sql)):
+        assert f[:3] == g[:3] and f[7:] == g[7:], (f, g)
+        for a, b in zip(f[3:7], g[3:7]):
+            assert abs(a - b) < 1e-6 * max(1.0, abs(b)), (f, g)
+    conn.close()
+    conn_ref.close()
+
+
+def puntuar_todo(path: str, cfg: ScoringConfig) -> float:
+    """Sin brutos: decodificar y puntuar cada evaluación (solo el cálculo)."""
+    conn = sqlite3.connect(path)
+    t0 = time.perf_counter()
+    for fecha, config, respuestas in conn.execute("SELECT fecha, config, respuestas FROM evaluaciones"):
+        c = json.loads(config)
+        score_all(json.loads(respuestas), cfg, c["target_words"], c["registered_words"], date.fromisoformat(fecha))
+    conn.close()
+    return time.perf_counter() - t0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Mide cognitiva.rescoring sobre una base sintética.")
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--sin-brutos", type=float, default=0.2, help="Fracción guardada sin brutos")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "evaluaciones.db")
+        llenar(path, args.rows, ANTERIOR, "estandar@1", args.sin_brutos)
+        ref = os.path.join(tmp, "referencia.db")
+        llenar(ref, args.rows, NUEVA, "breve@2", 0.0)
+        ref_tipeo = os.path.join(tmp, "referencia_tipeo.db")
+        llenar(ref_tipeo, args.rows, CON_TIPEO, "breve@3", 0.0)
+        t_todo = puntuar_todo(path, NUEVA)
+
+        store = ResultStore(path)
+        primera = store.repuntuar(NUEVA, "breve@2")
+        segunda = store.repuntuar(NUEVA, "breve@2")
+        store.close()
+        verificar(path, ref)
+        assert primera.actualizadas == args.rows and segunda.actualizadas == 0
+        conn = sqlite3.connect(path)
+        assert conn.execute(f"SELECT count(*) FROM evaluaciones WHERE {_BRUTO_COLS[0]} IS NULL").fetchone()[0] == 0
+        conn.close()
+
+        store = ResultStore(path)
+        tercera = store.repuntuar(CON_TIPEO, "breve@3")
+        store.close()
+        verificar(path, ref_tipeo)
+
+    print(f"filas:                                   {args.rows:>10,}")
+    print(f"puntuar todo con score_all() (sin I/O):  {t_todo:>10.2f} s")
+    for nombre, res in (("máximos/umbrales/fluidez", primera), ("misma configuración", segunda),
+                        ("tolerancia de tipeo", tercera)):
+        print(
+            f"re-puntaje, {nombre + ':':<28} {res.segundos:>10.2f} s  "
+            f"({res.actualizadas:,} reescritas, {res.completadas:,} desde respuestas)"
+        )
+    print(f"dominios recortados (1):                 {', '.join(sorted(primera.recortados))}")
+    print(f"dominios recalculados (1):               {', '.join(sorted(primera.recalculados))}")
+    print("resultados idénticos:                    sí (filas, brutos, cohorte y tendencias)")
+
+
+if __name__ == "__main__":
+    main()
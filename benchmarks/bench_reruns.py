@@ -0,0 +1,125 @@
+# benchmarks/bench_reruns.py — Reruns y CPU por evaluación: modo clásico vs formulario
+# Ejecutar:  python benchmarks/bench_reruns.py [--repeticiones 3] [--json salida.json]
+#
+# Simula con streamlit.testing (AppTest, sin servidor) a un evaluador que
+# completa todos los dominios y presiona "Calcular puntajes". En modo clásico
+# cada campo confirmado provoca un rerun (como al salir de un text_input en
+# el navegador); en modo formulario solo los botones "Guardar <dominio>".
+# La CPU es la que la propia app acumula en st.session_state.perf
+# (time.thread_time del hilo del script), es decir, CPU de servidor por sesión.
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+from datetime import date
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+APP = os.path.join(ROOT, "app.py")
+HOY = date.today()
+
+# (dominio, [(tipo de widget, etiqueta, valor), ...])
+SECCIONES = [
+    ("Orientación", [
+        ("number_input", "Año actual", HOY.year),
+        ("number_input", "Día del mes", HOY.day),
+        ("text_input", "Ciudad/Localidad", "Córdoba"),
+        ("text_input", "Lugar/Institución (p. ej., hospital, domicilio)", "Hospital"),
+    ]),
+    ("Atención", [
+        ("text_input", "Resta de 7 en 7 desde 100 (5 valores)", "93,86,79,72,65"),
+        ("text_input", "Deletree al revés la palabra 'casa' (ej.: 'asac')", "asac"),
+    ]),
+    ("Memoria inmediata", [
+        ("text_input", "Anote las palabras que repitió (separadas por coma)", "__palabras__"),
+    ]),
+    ("Lenguaje/Ejecutivo", [
+        ("number_input", "Cantidad de animales nombrados en 60 segundos", 17),
+        ("text_input", "Escriba una frase con sujeto y predicado", "El perro corre en el parque"),
+        ("checkbox", "Ejecutó correctamente los 3 pasos", True),
+    ]),
+    ("Visoconstrucción", [
+        ("checkbox", "Copia adecuada de dos pentágonos superpuestos / figura geométrica", True),
+        ("checkbox", "Realizó gestos por imitación (p. ej., encender una vela) correctamente", True),
+    ]),
+    ("Memoria diferida", [
+        ("text_input", "Recuerde las palabras iniciales (separadas por coma)", "__palabras__"),
+    ]),
+    ("Abstracción", [
+        ("text_input", "¿En qué se parecen un barco y un coche?", "medios de transporte"),
+        ("text_input", "¿En qué se parecen una uva y una manzana?", "son frutas"),
+    ]),
+]
+
+
+def _widget(at: AppTest, tipo: str, label: str):
+    for w in getattr(at, tipo):
+        if w.label == label:
+            return w
+    raise LookupError(f"No se encontró {tipo} {label!r}")
+
+
+def simular(modo_formulario: bool) -> dict:
+    os.environ["COGNITIVA_MODO_FORMULARIO"] = "1" if modo_formulario else "0"
+    at = AppTest.from_file(APP, default_timeout=60).run()
+    palabras = ", ".join(at.session_state["target_words"])
+    for dominio, campos in SECCIONES:
+        if dominio == "Memoria inmediata":
+            _widget(at, "button", "Registrar palabras escuchadas ahora").click().run()
+        for tipo, label, valor in campos:
+            _widget(at, tipo, label).set_value(palabras if valor == "__palabras__" else valor)
+            if not modo_formulario:
+                at.run()
+        if modo_formulario:
+            _widget(at, "button", f"Guardar {dominio}").click().run()
+    _widget(at, "button", "Calcular puntajes").click().run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    total = [s.value for s in at.success if s.value.startswith("Puntaje total")]
+    perf = at.session_state["perf"]
+    return {
+        "reruns": perf["reruns"],
+        "cpu_ms": perf["cpu_s"] * 1000,
+        "cpu_ms_por_rerun": perf["cpu_s"] * 1000 / perf["reruns"],
+        "resultado": total[0] if total else None,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Reruns y CPU por evaluación completa.")
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--json", help="Guardar los resultados en este archivo")
+    args = parser.parse_args()
+
+    salida = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        # La app guarda en COGNITIVA_DB y autoguarda en COGNITIVA_DIARIO: nada en el repo
+        os.environ["COGNITIVA_DB"] = os.path.join(tmp, "evaluaciones.db")
+        os.environ["COGNITIVA_DIARIO"] = os.path.join(tmp, "diario")
+        for nombre, modo in (("clasico", False), ("formulario", True)):
+            corridas = [simular(modo) for _ in range(args.repeticiones)]
+            salida[nombre] = {
+                "reruns": corridas[0]["reruns"],
+                "cpu_ms_mediana": statistics.median(c["cpu_ms"] for c in corridas),
+                "cpu_ms_por_rerun": statistics.median(c["cpu_ms_por_rerun"] for c in corridas),
+                "resultado": corridas[0]["resultado"],
+            }
+
+    for nombre, r in salida.items():
+        print(f"{nombre:<11} reruns/evaluación: {r['reruns']:>3}   CPU/sesión: {r['cpu_ms_mediana']:8.1f} ms"
+              f"   CPU/rerun: {r['cpu_ms_por_rerun']:6.1f} ms   {r['resultado']}")
+    c, f = salida["clasico"], salida["formulario"]
+    print(f"reducción: {c['reruns'] / f['reruns']:.1f}x reruns, {c['cpu_ms_mediana'] / f['cpu_ms_mediana']:.1f}x CPU")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(salida, fh, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+# benchmarks/bench_service.py — Prueba de punta a punta y carga del servicio HTTP
+# Ejecutar:  python benchmarks/bench_service.py [--solicitudes 2000] [--concurrencia 64] [--workers 4]
+#            python benchmarks/bench_service.py --url http://127.0.0.1:8600   (servicio ya levantado)
+#
+# Sin --url levanta cognitiva.service en este mismo proceso (puerto libre) y
+# lo apaga al terminar. El cliente usa conexiones keep-alive con asyncio
+# (sin dependencias), compara cada respuesta con cognitiva.batch.evaluate_record
+# para el mismo registro y muestra throughput, latencias y /v1/stats.
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from typing import Any, Dict, List, Tuple
+from urllib.parse import urlparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_vectorized import HOY, TARGET, generar  # noqa: E402
+
+from cognitiva.batch import evaluate_record  # noqa: E402
+from cognitiva.scoring import DOMINIOS  # noqa: E402
+from cognitiva.service import ScoringService  # noqa: E402
+
+
+class Cliente:
+    """Una conexión HTTP/1.1 keep-alive."""
+
+    def __init__(self, host: str, port: int):
+        self.host, self.port = host, port
+        self.reader: Any = None
+        self.writer: Any = None
+
+    async def _abrir(self) -> None:
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def pedir(self, metodo: str, ruta: str, datos: Any = None) -> Tuple[int, bytes]:
+        if self.writer is None:
+            await self._abrir()
+        cuerpo = json.dumps(datos, ensure_ascii=False).encode("utf-8") if datos is not None else b""
+        self.writer.write(
+            f"{metodo} {ruta} HTTP/1.1\r\nHost: {self.host}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(cuerpo)}\r\n\r\n".encode("latin-1") + cuerpo
+        )
+        await self.writer.drain()
+        cabecera = (await self.reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+        estado = int(cabecera[0].split(" ")[1])
+        largo = next(int(h.split(":", 1)[1]) for h in cabecera if h.lower().startswith("content-length"))
+        return estado, await self.reader.readexactly(largo)
+
+    def cerrar(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+
+
+def _registros(n: int) -> List[Dict[str, Any]]:
+    out = []
+    for i, resp in enumerate(generar(n, seed=3)):
+        rec: Dict[str, Any] = {
+            "id_paciente": f"HC-{i}",
+            "nombre": f"Paciente {i}",
+            "fecha": HOY.isoformat(),
+            "target_words": TARGET,
+            "respuestas": resp,
+        }
+        rec["informe"] = i % 2 == 0  # la mitad pide el HTML
+        out.append(rec)
+    return out
+
+
+async def cargar(host: str, port: int, registros: List[Dict[str, Any]], concurrencia: int) -> Dict[str, Any]:
+    latencias: List[float] = []
+    errores: List[str] = []
+    pendientes = list(enumerate(registros))
+
+    async def trabajador() -> None:
+        cliente = Cliente(host, port)
+        try:
+            while pendientes:
+                i, rec = pendientes.pop()
+                t0 = time.perf_counter()
+                estado, cuerpo = await cliente.pedir("POST", "/v1/puntuar", rec)
+                latencias.append(time.perf_counter() - t0)
+                res = json.loads(cuerpo)
+                if estado != 200 or not res.get("ok"):
+                    errores.append(f"{i}: {estado} {res}")
+                    continue
+                # La respuesta debe coincidir con el puntaje local del mismo registro
+                row = evaluate_record(rec)[0]
+                esperado = [row[f"{d}_puntaje"] for d in DOMINIOS]
+                if [res["subtotales"][d] for d in DOMINIOS] != esperado or res["total"] != row["total"]:
+                    errores.append(f"{i}: {res['subtotales']} != {esperado}")
+                if rec["informe"] != ("html" in res):
+                    errores.append(f"{i}: informe {'faltante' if rec['informe'] else 'no pedido'}")
+        finally:
+            cliente.cerrar()
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(trabajador() for _ in range(concurrencia)))
+    duracion = time.perf_counter() - t0
+    latencias.sort()
+    q = statistics.quantiles(latencias, n=100) if len(latencias) > 1 else latencias * 99
+    return {
+        "solicitudes": len(registros),
+        "errores": errores,
+        "duracion_s": duracion,
+        "solicitudes_por_s": len(registros) / duracion,
+        "p50_ms": q[49] * 1000,
+        "p95_ms": q[94] * 1000,
+        "p99_ms": q[98] * 1000,
+    }
+
+
+async def principal(args: argparse.Namespace) -> int:
+    service = None
+    if args.url:
+        u = urlparse(args.url)
+        host, port = u.hostname or "127.0.0.1", u.port or 80
+    else:
+        service = ScoringService(port=0, workers=args.workers, max_lote=args.max_lote, espera_ms=args.espera_ms)
+        await service.start()
+        host, port = service.host, service.port
+    try:
+        cliente = Cliente(host, port)
+        estado, _ = await cliente.pedir("GET", "/salud")
+        assert estado == 200, f"/salud respondió {estado}"
+        estado, _ = await cliente.pedir("POST", "/v1/puntuar", [])
+        assert estado == 400, f"lista vacía debería dar 400, dio {estado}"
+
+        res = await cargar(host, port, _registros(args.solicitudes), args.concurrencia)
+        _, cuerpo = await cliente.pedir("GET", "/v1/stats")
+        stats = json.loads(cuerpo)
+        cliente.cerrar()
+    finally:
+        if service is not None:
+            await service.close()
+
+    print(f"solicitudes:        {res['solicitudes']:>10,}  (concurrencia {args.concurrencia})")
+    print(f"duración:           {res['duracion_s']:>10.2f} s")
+    print(f"throughput:         {res['solicitudes_por_s']:>10.0f} solicitudes/s")
+    print(f"latencia p50/95/99: {res['p50_ms']:.1f} / {res['p95_ms']:.1f} / {res['p99_ms']:.1f} ms")
+    print(f"lotes (servidor):   {stats['lotes']:>10,}  promedio {stats['lote_promedio']} registros")
+    print(f"errores:            {len(res['errores']):>10}")
+    for e in res["errores"][:10]:
+        print("  " + e)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump({"cliente": res, "servidor": stats}, fh, ensure_ascii=False, indent=2)
+    return 1 if res["errores"] else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Prueba de punta a punta del servicio de puntaje.")
+    parser.add_argument("--url", help="Servicio ya levantado (por defecto se levanta uno local)")
+    parser.add_argument("--solicitudes", type=int, default=2000)
+    parser.add_argument("--concurrencia", type=int, default=64)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--max-lote", type=int, default=64)
+    parser.add_argument("--espera-ms", type=float, default=5.0)
+    parser.add_argument("--json", help="Guardar resultados en JSON")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(principal(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# benchmarks/bench_vectorized.py — score_all() fila a fila vs score_columns()
+# Ejecutar:  python benchmarks/bench_vectorized.py --rows 1000000
+#
+# Genera `respuestas` sintéticas (incluye series mal escritas, textos vacíos y
+# fluidez alta), arma las columnas una vez y compara ambos caminos. Antes de
+# informar tiempos verifica que los resultados sean idénticos fila a fila.
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cognitiva.scoring import DOMINIOS, ScoringConfig, score_all, totales  # noqa: E402
+from cognitiva.vectorized import columns_from_respuestas, score_columns  # noqa: E402
+
+TARGET = ["manzana", "llave", "libro", "perro", "puente"]
+HOY = date(2025, 3, 1)
+
+
+def generar(n: int, seed: int = 7):
+    rnd = random.Random(seed)
+    series = ["93,86,79,72,65", "93,86,80,72", "93, 86, 79, x", "", "100,93,86,79,72", "93,86,79,72,65,58"]
+    frases = ["", "hace frío", "El perro corre en el parque", "uno dos tres cuatro"]
+    for _ in range(n):
+        yield {
+            "ori_anio": rnd.choice([2024, 2025]),
+            "ori_mes": rnd.randint(1, 12) if rnd.random() < 0.3 else 3,
+            "ori_dia": rnd.choice([1, 2]),
+            "ori_ciudad": rnd.choice(["", "Córdoba"]),
+            "ori_lugar": rnd.choice(["", "Hospital", "  "]),
+            "aten_s7": rnd.choice(series),
+            "aten_inversa": rnd.choice(["asac", "ASAC ", "saca", ""]),
+            "mem_inmediata": ",".join(rnd.sample(TARGET + ["gato", "mesa", "lbro", "puentes"], rnd.randint(0, 8))),
+            "mem_diferida": ",".join(rnd.sample(TARGET + ["gato"], rnd.randint(0, 4))),
+            "len_animales": rnd.randint(0, 40),
+            "len_frase": rnd.choice(frases),
+            "len_orden_ok": rnd.random() < 0.5,
+            "viso_copia_ok": rnd.random() < 0.5,
+            "viso_gestos_ok": rnd.random() < 0.5,
+            "abs_barco_auto": rnd.choice(["", "medios de transporte", "flotan"]),
+            "abs_uva_manzana": rnd.choice(["", "son fruta", "redondas", "para comer"]),
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compara score_all() con score_columns().")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    cfg = ScoringConfig.from_dict({"maximos": {"Atención": 8, "Abstracción": 2}, "animals_per_point": 4})
+    records = list(generar(args.rows))
+
+    t0 = time.perf_counter()
+    cols = columns_from_respuestas(records, TARGET, max_distance=cfg.max_typo_distance)
+    t_cols = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    escalar = []
+    for r in records:
+        sub = score_all(r, cfg, TARGET, hoy=HOY)
+        escalar.append((sub, totales(sub, cfg)))
+    t_escalar = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    vec = score_columns(cols, cfg, hoy=HOY)
+    t_vec = time.perf_counter() - t0
+
+    for i, (sub, (total, max_total, pct)) in enumerate(escalar):
+        got = [int(vec[d][i]) for d in DOMINIOS]
+        if got != [sub[d] for d in DOMINIOS] or int(vec["total"][i]) != total or float(vec["porcentaje"][i]) != pct:
+            raise SystemExit(f"Diferencia en la fila {i}: {records[i]}")
+
+    print(f"filas:                      {args.rows:>12,}")
+    print(f"score_all (fila a fila):    {t_escalar:>10.3f} s")
+    print(f"score_columns (NumPy):      {t_vec:>10.3f} s")
+    print(f"aceleración:                {t_escalar / t_vec:>10.1f}x")
+    print(f"armado de columnas (1 vez): {t_cols:>10.3f} s")
+    print(f"resultados idénticos:       sí ({np.count_nonzero(vec['total'])} totales no nulos)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Núcleo de la Evaluación Cognitiva: scoring, exportación e informes sin Streamlit.
+
+Los nombres públicos se importan a demanda (PEP 562): `import cognitiva` no
+carga ningún submódulo, y `from cognitiva import score_all` carga solo
+cognitiva.scoring. Así los procesos de trabajo y los scripts no pagan el
+import de lo que no usan (ver benchmarks/bench_import.py).
+"""
+
+from importlib import import_module
+from typing import Any, List
+
+# Nombre público -> submódulo que lo define
+_EXPORTS = {
+    "DEFAULT_MAXIMOS": "scoring",
+    "DEFAULT_WORD_BANK": "scoring",
+    "DOMINIOS": "scoring",
+    "ScoringConfig": "scoring",
+    "aplicar_maximos": "scoring",
+    "count_matches": "scoring",
+    "interpretar": "scoring",
+    "normalize_list": "scoring",
+    "puntos_brutos": "scoring",
+    "score_all": "scoring",
+    "totales": "scoring",
+    "build_results_dict": "export",
+    "result_fields": "export",
+    "results_to_csv": "export",
+    "render_html_report": "report",
+    "report_filename": "report",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    modulo = _EXPORTS.get(name)
+    if modulo is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    valor = getattr(import_module(f".{modulo}", __name__), name)
+    globals()[name] = valor  # las siguientes búsquedas no pasan por aquí
+    return valor
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_EXPORTS))
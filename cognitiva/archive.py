@@ -0,0 +1,617 @@
+# cognitiva/archive.py — Archivo columnar de evaluaciones (largo plazo)
+# Requiere numpy.
+#
+# Un archivo es un directorio, como las normas compiladas (cognitiva.norms):
+#   meta.json       versión, cantidad de filas, columnas y categorías
+#   cNNN.npy        una columna tipada por archivo, abrible con mmap:
+#                     subtotales por dominio int8, puntos brutos int16,
+#                     total/max_total int16,
+#                     porcentaje int32 en centésimos, fecha datetime64[D],
+#                     respuestas numéricas (ori_*, len_animales) y booleanas;
+#                     clínica, perfil, interpretación, palabras objetivo y
+#                     configuración como códigos de categoría (uint16)
+#   cNNN.off.npy    por columna de texto, desplazamientos (n + 1) en el montón
+#   textos.bin      montón de cadenas UTF-8 de todas las columnas de texto
+#                   (uid, paciente, respuestas libres; valores no textuales de
+#                   `respuestas` van como JSON)
+# Escribir tampoco: las filas se agrupan en tramos (cohort.TRAMO) y cada tramo
+# se agrega al final de los .npy (cabecera de largo fijo, completada al cerrar)
+# y de un temporal por columna de texto; al cerrar, los temporales se copian al
+# montón. En memoria quedan un tramo y los diccionarios de categorías.
+# Leer un archivo no carga nada: cada columna se abre (con mmap) la primera
+# vez que se pide, así que una estadística de cohorte lee solo los puntajes y
+# un re-puntaje solo las respuestas que usa.
+#
+# Los enteros de `respuestas` que no se pueden convertir se guardan como
+# "sin valor" (el mínimo del tipo) y se puntúan como 0, igual que en
+# cognitiva.scoring. Al leer, una casilla ausente vuelve como False y un texto
+# ausente como "" (para el puntaje es lo mismo).
+
+import json
+import mmap
+import os
+import shutil
+from array import array
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional
+
+import numpy as np
+
+from .cohort import SERIES, TRAMO, EstadisticasCohorte
+from .keywords import DEFAULT_SEMEJANZAS, KeywordRegistry
+from .matching import compile_matcher
+from .scoring import normalize_list
+from .store import _BRUTO_COLS, DOMINIO_COLUMNAS, _connect
+from .vectorized import _parse_serie7
+
+FORMATO = 1
+META = "meta.json"
+MONTON = "textos.bin"
+
+# Columnas de la tabla evaluaciones (ver cognitiva.store) y su tipo
+_TEXTOS = ["uid", "id_paciente", "nombre"]
+_CATEGORIAS = ["clinica", "interpretacion", "perfil", "palabras", "config"]
+_NUMERICAS = {
+    **{c: "b" for c in DOMINIO_COLUMNAS.values()},
+    "total": "h",
+    "max_total": "h",
+    "porcentaje": "i",  # centésimos
+    "registered_words": "b",
+    **{c: "h" for c in _BRUTO_COLS},  # "sin valor" en evaluaciones sin brutos
+}
+# Campos de `respuestas` con tipo fijo; el resto va al montón de textos
+_RESPUESTAS_ENTERAS = {"ori_anio": "h", "ori_mes": "b", "ori_dia": "b", "len_animales": "h"}
+_RESPUESTAS_BOOL = ["len_orden_ok", "viso_copia_ok", "viso_gestos_ok"]
+
+_SIN_VALOR = {"b": -(1 << 7), "h": -(1 << 15), "i": -(1 << 31)}
+_NAT = np.iinfo(np.int64).min
+_EPOCA = date(1970, 1, 1).toordinal()
+_EPOCA_S = datetime(1970, 1, 1)
+
+
+def _dias(fecha: Any) -> int:
+    try:
+        return date.fromisoformat(str(fecha)[:10]).toordinal() - _EPOCA
+    except ValueError:
+        return _NAT
+
+
+def _segundos(ts: Any) -> int:
+    try:
+        return int((datetime.fromisoformat(str(ts)) - _EPOCA_S).total_seconds())
+    except (TypeError, ValueError):
+        return _NAT
+
+
+def _entero(valor: Any, tipo: str) -> int:
+    try:
+        v = int(valor)
+    except (TypeError, ValueError):
+        return _SIN_VALOR[tipo]
+    return v if _SIN_VALOR[tipo] < v < -_SIN_VALOR[tipo] else _SIN_VALOR[tipo]
+
+
+def _json(valor: Any) -> Any:
+    return json.loads(valor) if isinstance(valor, str) else dict(valor or {})
+
+
+# Cabecera .npy de largo fijo: la cantidad de filas se conoce al cerrar
+_CABECERA = 128
+
+
+def _cabecera(dtype: np.dtype, n: int) -> bytes:
+    texto = repr({"descr": np.lib.format.dtype_to_descr(dtype), "fortran_order": False, "shape": (n,)})
+    texto = texto.ljust(_CABECERA - 11) + "\n"
+    return np.lib.format.MAGIC_PREFIX + b"\x01\x00" + np.uint16(len(texto)).tobytes() + texto.encode("latin1")
+
+
+class _Npy:
+    """Columna .npy escrita por tramos: cada tramo se agrega al final del
+    archivo y la cabecera (con la cantidad de filas) se completa al cerrar."""
+
+    def __init__(self, path: str, dtype: Any):
+        self.path = path
+        self._crear(dtype)
+
+    def _crear(self, dtype: Any) -> None:
+        self.dtype = np.dtype(dtype)
+        self.n = 0
+        with open(self.path, "wb") as fh:
+            fh.write(bytes(_CABECERA))
+
+    def agregar(self, datos: Any) -> None:
+        if not len(datos):
+            return
+        x = np.asarray(datos)
+        if x.dtype != self.dtype:
+            # int8 -> bool, int64 -> datetime64: mismos bytes; uint16 -> uint32: conversión
+            x = x.view(self.dtype) if x.dtype.itemsize == self.dtype.itemsize else x.astype(self.dtype)
+        with open(self.path, "ab") as fh:
+            fh.write(x.tobytes())
+        self.n += len(x)
+
+    def ensanchar(self, dtype: Any) -> None:
+        """Reescribe lo ya escrito con un tipo más ancho, de a un tramo por vez."""
+        previo = self.path + ".tmp"
+        os.replace(self.path, previo)
+        anterior, n = self.dtype, self.n
+        self._crear(dtype)
+        with open(previo, "rb") as fh:
+            fh.seek(_CABECERA)
+            for _ in range(0, n, TRAMO):
+                self.agregar(np.frombuffer(fh.read(TRAMO * anterior.itemsize), dtype=anterior))
+        os.remove(previo)
+
+    def cerrar(self) -> None:
+        with open(self.path, "r+b") as fh:
+            fh.write(_cabecera(self.dtype, self.n))
+
+
+class _Texto:
+    """Columna de texto: bytes en un archivo propio (se copian al montón al
+    cerrar) y desplazamientos (n + 1) en su .off.npy."""
+
+    def __init__(self, base: str, filas_previas: int = 0, es_json: bool = False):
+        self.datos_path = base + ".bin.tmp"
+        open(self.datos_path, "wb").close()
+        self.off = _Npy(base + ".off.npy", np.int64)
+        for a in range(0, filas_previas + 1, TRAMO):  # filas anteriores: vacías
+            self.off.agregar(np.zeros(min(TRAMO, filas_previas + 1 - a), dtype=np.int64))
+        self.largo = 0
+        self.es_json = es_json
+        self._datos = bytearray()
+        self._off = array("q")
+
+    def agregar(self, valor: Any) -> None:
+        if valor is not None:
+            self._datos += (json.dumps(valor, ensure_ascii=False) if self.es_json else str(valor)).encode("utf-8")
+        self._off.append(self.largo + len(self._datos))
+
+    def volcar(self) -> None:
+        with open(self.datos_path, "ab") as fh:
+            fh.write(self._datos)
+        self.largo += len(self._datos)
+        self.off.agregar(self._off)
+        self._datos, self._off = bytearray(), array("q")
+
+
+class _Categoria:
+    def __init__(self, path: str) -> None:
+        self.valores: Dict[str, int] = {}
+        self.col = _Npy(path, np.uint16)
+        self.codigos = array("H")
+
+    def agregar(self, valor: str) -> None:
+        codigo = self.valores.setdefault(valor, len(self.valores))
+        if codigo > 0xFFFF and self.codigos.typecode == "H":
+            self.codigos = array("I", self.codigos)
+            self.col.ensanchar(np.uint32)
+        self.codigos.append(codigo)
+
+    def volcar(self) -> None:
+        self.col.agregar(self.codigos)
+        self.codigos = array(self.codigos.typecode)
+
+
+class _Escritor:
+    """Columnas de un archivo en construcción; volcar() escribe el tramo
+    acumulado y lo descarta, así la memoria no crece con la cantidad de filas
+    (solo los diccionarios de categorías)."""
+
+    def __init__(self, directorio: str):
+        self.directorio = directorio
+        self._archivos = iter(range(10_000))
+        self.meta: Dict[str, Dict[str, Any]] = {}
+        self.n = 0
+        self.textos = {c: _Texto(self._nuevo(c, "texto")) for c in _TEXTOS}
+        self.columnas: Dict[str, _Npy] = {}
+        self.tramo: Dict[str, array] = {}
+        self._numerica("fecha", "q", "datetime64[D]")
+        self._numerica("creado", "q", "datetime64[s]")
+        for c, t in _NUMERICAS.items():
+            if c == "porcentaje":
+                self._numerica(c, t, escala=100)
+            elif c == "registered_words":
+                self._numerica(c, t, bool)
+            elif c in _BRUTO_COLS:
+                self._numerica(c, t, sin_valor=_SIN_VALOR[t])
+            else:
+                self._numerica(c, t)
+        self.categorias = {c: _Categoria(self._nuevo(c, "categoria") + ".npy") for c in _CATEGORIAS}
+        for c, t in _RESPUESTAS_ENTERAS.items():
+            self._numerica(f"respuestas.{c}", t, sin_valor=_SIN_VALOR[t])
+        for c in _RESPUESTAS_BOOL:
+            self._numerica(f"respuestas.{c}", "b", bool)
+        self.r_textos: Dict[str, _Texto] = {}
+
+    def _path(self, archivo: str) -> str:
+        return os.path.join(self.directorio, archivo)
+
+    def _nuevo(self, nombre: str, tipo: str, **extra: Any) -> str:
+        archivo = f"c{next(self._archivos):03d}"
+        self.meta[nombre] = {"archivo": archivo, "tipo": tipo, **extra}
+        return self._path(archivo)
+
+    def _numerica(self, nombre: str, tipo: str, dtype: Any = None, **extra: Any) -> None:
+        """Columna numérica: se acumula en un array(tipo) y se guarda como dtype."""
+        self.columnas[nombre] = _Npy(self._nuevo(nombre, "num", **extra) + ".npy", dtype or tipo)
+        self.tramo[nombre] = array(tipo)
+
+    def agregar(self, fila: Mapping[str, Any]) -> None:
+        for c in _TEXTOS:
+            self.textos[c].agregar(fila.get(c, ""))
+        config = _json(fila.get("config"))
+        palabras = config.pop("target_words", None) or []
+        registered = config.pop("registered_words", True)
+        self.categorias["palabras"].agregar(", ".join(palabras))
+        self.categorias["config"].agregar(json.dumps(config, ensure_ascii=False, sort_keys=True))
+        for c in ("clinica", "interpretacion", "perfil"):
+            self.categorias[c].agregar(str(fila.get(c) or ""))
+        tramo = self.tramo
+        tramo["fecha"].append(_dias(fila.get("fecha")))
+        tramo["creado"].append(_segundos(fila.get("creado")))
+        for c in DOMINIO_COLUMNAS.values():
+            tramo[c].append(int(fila[c]))
+        tramo["total"].append(int(fila["total"]))
+        tramo["max_total"].append(int(fila["max_total"]))
+        tramo["porcentaje"].append(round(float(fila["porcentaje"]) * 100))
+        tramo["registered_words"].append(bool(registered))
+        for c in _BRUTO_COLS:
+            tramo[c].append(_entero(fila.get(c), "h"))
+
+        respuestas = _json(fila.get("respuestas"))
+        for c, t in _RESPUESTAS_ENTERAS.items():
+            tramo[f"respuestas.{c}"].append(_entero(respuestas.pop(c, None), t))
+        for c in _RESPUESTAS_BOOL:
+            tramo[f"respuestas.{c}"].append(bool(respuestas.pop(c, False)))
+        for c, valor in respuestas.items():
+            if c not in self.r_textos:
+                es_json = not isinstance(valor, str)
+                base = self._nuevo(f"respuestas.{c}", "json" if es_json else "texto")
+                self.r_textos[c] = _Texto(base, self.n, es_json=es_json)
+        for c, col in self.r_textos.items():
+            col.agregar(respuestas.get(c))
+        self.n += 1
+
+    def volcar(self) -> None:
+        for nombre, datos in self.tramo.items():
+            self.columnas[nombre].agregar(np.frombuffer(datos, dtype=datos.typecode) if len(datos) else ())
+            self.tramo[nombre] = array(datos.typecode)
+        for cat in self.categorias.values():
+            cat.volcar()
+        for col in [*self.textos.values(), *self.r_textos.values()]:
+            col.volcar()
+
+    def cerrar(self) -> int:
+        self.volcar()
+        for col in self.columnas.values():
+            col.cerrar()
+        for c, cat in self.categorias.items():
+            cat.col.cerrar()
+            self.meta[c]["categorias"] = list(cat.valores)
+        # Montón: las columnas de texto una detrás de otra; los desplazamientos
+        # de cada una se corren (en el lugar, con mmap) a su comienzo
+        base = 0
+        with open(self._path(MONTON), "wb") as fh:
+            for col in [*self.textos.values(), *self.r_textos.values()]:
+                with open(col.datos_path, "rb") as fin:
+                    shutil.copyfileobj(fin, fh)
+                os.remove(col.datos_path)
+                col.off.cerrar()
+                if base:
+                    off = np.load(col.off.path, mmap_mode="r+")
+                    off += base
+                    off.flush()
+                    del off
+                base += col.largo
+        orden = ["fecha", "creado", *_NUMERICAS, *_CATEGORIAS, *(f"respuestas.{c}" for c in _RESPUESTAS_ENTERAS),
+                 *(f"respuestas.{c}" for c in _RESPUESTAS_BOOL), *_TEXTOS, *(f"respuestas.{c}" for c in self.r_textos)]
+        meta = {"formato": FORMATO, "filas": self.n, "columnas": {c: self.meta[c] for c in orden}}
+        with open(self._path(META), "w", encoding="utf-8") as fh:
+            json.dump(meta, fh, ensure_ascii=False)  # al final: sin meta.json no hay archivo
+        return self.n
+
+
+def escribir(directorio: str, filas: Iterable[Mapping[str, Any]], tramo: int = TRAMO) -> int:
+    """Archiva evaluaciones con las columnas de la tabla de ResultStore.
+
+    Cada fila trae uid, id_paciente, nombre, clinica, fecha, creado, los
+    subtotales por columna (orientacion, ...), total, max_total, porcentaje,
+    interpretacion, perfil, config y respuestas (dict o JSON). Las columnas
+    se escriben a disco cada `tramo` filas. Devuelve la cantidad de filas.
+    """
+    os.makedirs(directorio, exist_ok=True)
+    escritor = _Escritor(directorio)
+    for fila in filas:
+        escritor.agregar(fila)
+        if escritor.n % tramo == 0:
+            escritor.volcar()
+    return escritor.cerrar()
+
+
+def archivar(
+    db: str,
+    directorio: str,
+    desde: Optional[str] = None,
+    hasta: Optional[str] = None,
+    clinica: Optional[str] = None,
+    perfil: Optional[str] = None,
+) -> int:
+    """Archiva las evaluaciones de una base de ResultStore (mismos filtros que iter_results)."""
+    where, params = [], []
+    if desde:
+        where.append("fecha >= ?")
+        params.append(str(desde))
+    if hasta:
+        where.append("fecha <= ?")
+        params.append(str(hasta))
+    if clinica:
+        where.append("clinica = ?")
+        params.append(clinica)
+    if perfil is not None:
+        where.append("perfil = ?")
+        params.append(perfil)
+    sql = "SELECT * FROM evaluaciones" + (f" WHERE {' AND '.join(where)}" if where else "") + " ORDER BY fecha, id"
+    conn = _connect(db)
+
+    def filas() -> Iterator[Mapping[str, Any]]:
+        # Fila por fila desde el cursor: escribir() ya agrupa por tramos
+        yield from map(dict, conn.execute(sql, params))
+
+    try:
+        return escribir(directorio, filas())
+    finally:
+        conn.close()
+
+
+class ArchivoColumnar:
+    """Archivo abierto; cada columna se mapea a memoria la primera vez que se usa."""
+
+    def __init__(self, directorio: str):
+        self.directorio = directorio
+        with open(os.path.join(directorio, META), encoding="utf-8") as fh:
+            meta = json.load(fh)
+        if meta.get("formato") != FORMATO:
+            raise ValueError(f"Formato de archivo no soportado: {meta.get('formato')!r}")
+        self.n: int = meta["filas"]
+        self._meta: Dict[str, Dict[str, Any]] = meta["columnas"]
+        self._abiertas: Dict[str, np.ndarray] = {}
+        self._monton: Optional[mmap.mmap] = None
+
+    def __len__(self) -> int:
+        return self.n
+
+    @property
+    def columnas(self) -> List[str]:
+        return list(self._meta)
+
+    def _abrir(self, nombre: str) -> np.ndarray:
+        if nombre not in self._abiertas:
+            info = self._meta[nombre]
+            sufijo = ".npy" if info["tipo"] in ("num", "categoria") else ".off.npy"
+            self._abiertas[nombre] = np.load(os.path.join(self.directorio, info["archivo"] + sufijo), mmap_mode="r")
+        return self._abiertas[nombre]
+
+    def _bytes(self) -> Any:
+        if self._monton is None:
+            with open(os.path.join(self.directorio, MONTON), "rb") as fh:
+                # mmap no admite archivos vacíos
+                self._monton = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) if os.fstat(fh.fileno()).st_size else b""
+        return self._monton
+
+    def columna(self, nombre: str) -> Any:
+        """Arreglo (mmap) de una columna numérica; valores para categorías y textos."""
+        info = self._meta[nombre]
+        if info["tipo"] == "categoria":
+            return np.asarray(info["categorias"], dtype=object)[self._abrir(nombre)]
+        if info["tipo"] in ("texto", "json"):
+            return self.textos(nombre)
+        x = self._abrir(nombre)
+        return x / info["escala"] if "escala" in info else x
+
+    def codigos(self, nombre: str) -> np.ndarray:
+        return self._abrir(nombre)
+
+    def categorias(self, nombre: str) -> List[str]:
+        return self._meta[nombre]["categorias"]
+
+    def textos(self, nombre: str, filas: Optional[np.ndarray] = None) -> List[Any]:
+        """Valores de una columna de texto (todas las filas o los índices dados)."""
+        off = self._abrir(nombre)
+        monton = self._bytes()
+        es_json = self._meta[nombre]["tipo"] == "json"
+        if filas is None:
+            o = off.tolist()
+            valores = [monton[o[i]:o[i + 1]].decode("utf-8") for i in range(self.n)]
+        else:
+            ini, fin = off[:-1][filas].tolist(), off[1:][filas].tolist()
+            valores = [monton[a:b].decode("utf-8") for a, b in zip(ini, fin)]
+        return [json.loads(v) if v else None for v in valores] if es_json else valores
+
+    def mascara(
+        self,
+        desde: Optional[str] = None,
+        hasta: Optional[str] = None,
+        clinica: Optional[str] = None,
+        perfil: Optional[str] = None,
+    ) -> np.ndarray:
+        """Filas dentro del rango de fechas (inclusive), clínica y perfil."""
+        m = np.ones(self.n, dtype=bool)
+        if desde or hasta:
+            fecha = self._abrir("fecha")
+            if desde:
+                m &= fecha >= np.datetime64(str(desde)[:10], "D")
+            if hasta:
+                m &= fecha <= np.datetime64(str(hasta)[:10], "D")
+        for nombre, valor in (("clinica", clinica), ("perfil", perfil)):
+            if valor is not None:
+                cats = self.categorias(nombre)
+                m &= self.codigos(nombre) == cats.index(valor) if valor in cats else False
+        return m
+
+    def subtotales(self, mascara: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """Puntajes guardados con las claves de score_columns() (DOMINIOS, total, ...)."""
+        sel = slice(None) if mascara is None else mascara
+        out = {d: np.asarray(self._abrir(c)[sel]) for d, c in DOMINIO_COLUMNAS.items()}
+        for c in ("total", "max_total", "porcentaje"):
+            out[c] = np.asarray(self.columna(c)[sel])
+        return out
+
+    def estadisticas(
+        self,
+        desde: Optional[str] = None,
+        hasta: Optional[str] = None,
+        clinica: Optional[str] = None,
+        perfil: Optional[str] = None,
+    ) -> EstadisticasCohorte:
+        """Estadísticas de cohorte leyendo solo los puntajes y la interpretación."""
+        m = self.mascara(desde, hasta, clinica, perfil)
+        cols = {s: self.columna(c) for s, c in zip(SERIES, [*DOMINIO_COLUMNAS.values(), "total", "porcentaje"])}
+        interp = self.codigos("interpretacion")
+        cats = self.categorias("interpretacion")
+        est = EstadisticasCohorte()
+        for a in range(0, self.n, TRAMO):
+            bloque = m[a:a + TRAMO]
+            if bloque.any():
+                est.agregar_columnas({s: x[a:a + TRAMO][bloque] for s, x in cols.items()})
+                cuentas = np.bincount(interp[a:a + TRAMO][bloque], minlength=len(cats))
+                est.interpretaciones.update({cats[i]: int(k) for i, k in enumerate(cuentas) if k})
+        return est
+
+    def _enteros(self, nombre: str, sel: Any) -> np.ndarray:
+        x = np.asarray(self._abrir(nombre)[sel], dtype=np.int64)
+        return np.where(x == self._meta[nombre]["sin_valor"], 0, x)
+
+    def _textos_campo(self, campo: str, filas: np.ndarray) -> List[str]:
+        nombre = f"respuestas.{campo}"
+        if nombre not in self._meta:
+            return [""] * len(filas)
+        return [v if isinstance(v, str) else "" if v is None else str(v) for v in self.textos(nombre, filas)]
+
+    def columnas_puntaje(
+        self,
+        mascara: Optional[np.ndarray] = None,
+        max_distance: int = 0,
+        registry: Optional[KeywordRegistry] = None,
+    ) -> Dict[str, np.ndarray]:
+        """Columnas de entrada de score_columns() sin pasar por diccionarios.
+
+        Lee solo las respuestas que puntúan; los textos repetidos se evalúan
+        una vez. Cada fila usa sus propias palabras objetivo guardadas.
+        """
+        registry = registry or DEFAULT_SEMEJANZAS
+        filas = np.arange(self.n) if mascara is None else np.flatnonzero(mascara)
+        cols: Dict[str, np.ndarray] = {
+            c: self._enteros(f"respuestas.{c}", filas) for c in ("ori_anio", "ori_mes", "ori_dia", "len_animales")
+        }
+        for c in _RESPUESTAS_BOOL:
+            cols[c] = np.asarray(self._abrir(f"respuestas.{c}")[filas])
+        cols["registered_words"] = np.asarray(self._abrir("registered_words")[filas])
+
+        def por_texto(campo: str, fn: Any) -> List[Any]:
+            memo: Dict[str, Any] = {}
+            return [memo[t] if t in memo else memo.setdefault(t, fn(t)) for t in self._textos_campo(campo, filas)]
+
+        cols["ori_ciudad_ok"] = np.array(por_texto("ori_ciudad", lambda t: bool(t.strip())), dtype=bool)
+        cols["ori_lugar_ok"] = np.array(por_texto("ori_lugar", lambda t: bool(t.strip())), dtype=bool)
+        cols["aten_s7"] = np.array(por_texto("aten_s7", _parse_serie7), dtype=np.int64).reshape(-1, 5)
+        cols["aten_inversa_ok"] = np.array(
+            por_texto("aten_inversa", lambda t: t.strip().lower() == "asac"), dtype=bool
+        )
+        cols["len_frase_ok"] = np.array(por_texto("len_frase", lambda t: len(t.strip().split()) >= 4), dtype=bool)
+        for item in registry.items:
+            cols[f"{item.campo}_ok"] = np.array(por_texto(item.campo, lambda t: bool(item.buscar(t))), dtype=bool)
+
+        # Memoria: cada lista de palabras objetivo con su matcher
+        palabras = np.asarray(self.codigos("palabras")[filas])
+        matchers = [compile_matcher(normalize_list(p), max_distance) for p in self.categorias("palabras")]
+        for campo in ("mem_inmediata", "mem_diferida"):
+            memo: Dict[Any, int] = {}
+            aciertos = []
+            for codigo, t in zip(palabras.tolist(), self._textos_campo(campo, filas)):
+                clave = (codigo, t)
+                if clave not in memo:
+                    memo[clave] = matchers[codigo].count(normalize_list(t))
+                aciertos.append(memo[clave])
+            cols[f"{campo}_aciertos"] = np.array(aciertos, dtype=np.int64)
+        return cols
+
+    def respuestas(self, i: int) -> Dict[str, Any]:
+        """`respuestas` de la fila i, como se guardaron."""
+        out: Dict[str, Any] = {}
+        for nombre, info in self._meta.items():
+            if not nombre.startswith("respuestas."):
+                continue
+            campo = nombre[len("respuestas."):]
+            if info["tipo"] in ("texto", "json"):
+                off = self._abrir(nombre)
+                a, b = int(off[i]), int(off[i + 1])
+                if a == b and info["tipo"] == "json":
+                    continue
+                v = self._bytes()[a:b].decode("utf-8")
+                out[campo] = json.loads(v) if info["tipo"] == "json" else v
+            else:
+                v = self._abrir(nombre)[i]
+                if "sin_valor" in info:
+                    if v != info["sin_valor"]:
+                        out[campo] = int(v)
+                else:
+                    out[campo] = bool(v)
+        return out
+
+    def fila(self, i: int) -> Dict[str, Any]:
+        """La fila i con las claves de la tabla de ResultStore (config y respuestas como dict)."""
+        out: Dict[str, Any] = {c: self.textos(c, np.array([i]))[0] for c in _TEXTOS}
+        cats = {c: self.categorias(c)[int(self.codigos(c)[i])] for c in _CATEGORIAS}
+        fecha, creado = self._abrir("fecha")[i], self._abrir("creado")[i]
+        out["fecha"] = "" if np.isnat(fecha) else str(fecha)
+        out["creado"] = "" if np.isnat(creado) else str(creado)
+        for c in ("clinica", "interpretacion", "perfil"):
+            out[c] = cats[c]
+        for c in _NUMERICAS:
+            if c != "registered_words" and c in self._meta:
+                out[c] = int(self._abrir(c)[i])
+        for c in _BRUTO_COLS:
+            # Sin valor, o archivo anterior a los brutos
+            if c not in self._meta or out[c] == self._meta[c]["sin_valor"]:
+                out[c] = None
+        out["porcentaje"] = out["porcentaje"] / 100
+        config = json.loads(cats["config"])
+        config["target_words"] = normalize_list(cats["palabras"])
+        config["registered_words"] = bool(self._abrir("registered_words")[i])
+        out["config"] = config
+        out["respuestas"] = self.respuestas(i)
+        return out
+
+
+def abrir(directorio: str) -> ArchivoColumnar:
+    return ArchivoColumnar(directorio)
+
+
+def tamanio(directorio: str) -> int:
+    """Bytes ocupados por el archivo en disco."""
+    return sum(e.stat().st_size for e in os.scandir(directorio) if e.is_file())
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="python -m cognitiva.archive",
+        description="Archiva las evaluaciones de una base de ResultStore en formato columnar.",
+    )
+    parser.add_argument("db", help="Base SQLite de ResultStore")
+    parser.add_argument("destino", help="Directorio del archivo (se crea)")
+    parser.add_argument("--desde", help="Fecha inicial AAAA-MM-DD (inclusive)")
+    parser.add_argument("--hasta", help="Fecha final AAAA-MM-DD (inclusive)")
+    parser.add_argument("--clinica")
+    parser.add_argument("--perfil")
+    args = parser.parse_args(argv)
+
+    n = archivar(args.db, args.destino, args.desde, args.hasta, args.clinica, args.perfil)
+    print(f"{n} evaluaciones archivadas en {args.destino} ({tamanio(args.destino) / 1024:.0f} KiB)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,465 @@
+# cognitiva/batch.py — Puntaje por lotes de archivos JSONL/CSV (sin Streamlit)
+# Ejecutar:  python -m cognitiva.batch respuestas.jsonl -o resultados.csv --workers 4
+#
+# Cada registro tiene la forma de `respuestas` de app.py más sus propios
+# metadatos. JSONL:
+#   {"id_paciente": "HC-1", "nombre": "...", "fecha": "2025-03-01",
+#    "target_words": ["sol", "mapa", ...], "registered_words": true,
+#    "config": {"maximos": {...}, "animals_per_point": 5, ...},
+#    "respuestas": {"ori_anio": 2025, "aten_s7": "93,86,79,72,65", ...}}
+# CSV: una columna por campo de `respuestas`, `target_words` separadas por
+# coma y `config` como JSON (opcional).
+#
+# En lugar de `config`, un registro puede nombrar un perfil de
+# cognitiva.profiles ("perfil": "estandar@2", o "estandar" para la última
+# versión; ver --perfiles). Cada bloque agrupa sus registros por perfil y
+# resuelve la configuración una vez por grupo, no por registro; la clave del
+# perfil sale en la columna `perfil` del CSV.
+#
+# La entrada se lee de a un registro y se envía a los procesos en bloques;
+# nunca hay más de `max_pending` bloques en vuelo, así que la memoria no
+# depende del tamaño del archivo.
+#
+# Con --reports-zip cada proceso también arma el informe HTML de sus
+# registros y el proceso principal los agrega a un ZIP a medida que llegan
+# (el logo se codifica una vez y se entrega a los procesos al iniciarlos).
+
+import csv
+import json
+import os
+import sys
+import zipfile
+from collections import deque
+from dataclasses import dataclass
+from datetime import date
+from functools import lru_cache
+from itertools import islice
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from .export import build_results_dict, write_csv
+from .keywords import KeywordRegistry, load_registry
+from .profiles import ProfileSet, load_profiles
+from .report import logo_to_base64, render_html_report, report_filename
+from .scoring import ScoringConfig, normalize_list, score_all, totales
+
+META_FIELDS = ("id_paciente", "nombre", "fecha", "target_words", "registered_words", "config", "perfil")
+BOOL_FIELDS = ("len_orden_ok", "viso_copia_ok", "viso_gestos_ok")
+_TRUE = {"1", "true", "t", "si", "sí", "s", "yes", "y", "x"}
+
+
+# ------------------------------------------------------------
+# LECTURA
+# ------------------------------------------------------------
+
+def _as_bool(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in _TRUE
+    return bool(value)
+
+
+def iter_jsonl(fh: TextIO) -> Iterator[Tuple[int, str]]:
+    # Se entrega la línea cruda: el json.loads corre en el proceso de trabajo
+    # y una línea inválida se reporta como error de ese registro.
+    for lineno, line in enumerate(fh, 1):
+        if line.strip():
+            yield lineno, line
+
+
+def iter_csv(fh: TextIO) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    reader = csv.DictReader(fh)
+    for lineno, row in enumerate(reader, 2):
+        rec: Dict[str, Any] = {k: row[k] for k in META_FIELDS if row.get(k)}
+        respuestas = {k: v for k, v in row.items() if k not in META_FIELDS and k is not None}
+        for k in BOOL_FIELDS:
+            if k in respuestas:
+                respuestas[k] = _as_bool(respuestas[k])
+        rec["respuestas"] = respuestas
+        yield lineno, rec
+
+
+def iter_records(fh: TextIO, fmt: str) -> Iterator[Tuple[int, Any]]:
+    if fmt == "csv":
+        return iter_csv(fh)
+    return iter_jsonl(fh)
+
+
+# ------------------------------------------------------------
+# SCORING DE UN REGISTRO
+# ------------------------------------------------------------
+
+# (lineno, fila de resultados, error, informe HTML en UTF-8)
+Resultado = Tuple[int, Optional[Dict[str, Any]], Optional[str], Optional[bytes]]
+
+
+@dataclass
+class ReportOptions:
+    """Logo y firma comunes a todos los informes de un lote."""
+
+    logo_b64: Optional[str] = None
+    sig_nombre: str = ""
+    sig_rol: str = ""
+    sig_matricula: str = ""
+
+
+# Estado de cada proceso de trabajo. Lo usan también los procesos de
+# cognitiva.service, por eso init_worker y los accesores son públicos.
+_REPORT: Optional[ReportOptions] = None
+
+
+def init_worker(report: Optional[ReportOptions]) -> None:
+    """Initializer de los procesos: logo y firma de los informes (None = sin informes)."""
+    global _REPORT
+    _REPORT = report
+
+
+def report_options() -> Optional[ReportOptions]:
+    """Las ReportOptions que recibió init_worker en este proceso."""
+    return _REPORT
+
+
+@lru_cache(maxsize=8)
+def worker_registry(path: Optional[str]) -> Optional[KeywordRegistry]:
+    """Registro de semejanzas de `path`, compilado una vez por proceso (None sin path)."""
+    return load_registry(path) if path else None
+
+
+@lru_cache(maxsize=8)
+def worker_profiles(directorio: Optional[str]) -> ProfileSet:
+    """Perfiles de `directorio`, leídos y validados una vez por proceso."""
+    return load_profiles(directorio)
+
+
+def evaluate_record(
+    rec: Dict[str, Any],
+    default_config: Optional[Dict[str, Any]] = None,
+    registry: Optional[KeywordRegistry] = None,
+    cfg: Optional[ScoringConfig] = None,
+    perfil: str = "",
+) -> Tuple[Dict[str, Any], Dict[str, int], ScoringConfig]:
+    """Puntúa un registro: (fila de build_results_dict, subtotales, config).
+
+    `cfg` (ya resuelta, p. ej. de un perfil) evita parsear la config del
+    registro; un `config` propio del registro tiene prioridad igual.
+    """
+    respuestas = rec.get("respuestas")
+    if respuestas is None:
+        respuestas = {k: v for k, v in rec.items() if k not in META_FIELDS}
+
+    if cfg is None or rec.get("config"):
+        config = rec.get("config") or default_config
+        if isinstance(config, str):
+            config = json.loads(config)
+        cfg = ScoringConfig.from_dict(config)
+        perfil = ""
+
+    # Sin palabras objetivo, Memoria se puntuaría contra una lista ajena: error del registro
+    target_words = rec.get("target_words") or []
+    if isinstance(target_words, str):
+        target_words = normalize_list(target_words)
+    if not target_words:
+        raise ValueError("Registro sin target_words")
+    registered = _as_bool(rec.get("registered_words", True))
+
+    fecha = rec.get("fecha") or date.today().isoformat()
+    hoy = date.fromisoformat(str(fecha)[:10])
+
+    subtotales = score_all(respuestas, cfg, target_words, registered, hoy, registry)
+    total, _, porcentaje = totales(subtotales, cfg)
+    row = build_results_dict(
+        subtotales,
+        cfg.maximos,
+        total,
+        porcentaje,
+        id_paciente=rec.get("id_paciente", ""),
+        nombre=rec.get("nombre", ""),
+        fecha=fecha,
+        perfil=perfil,
+    )
+    return row, subtotales, cfg
+
+
+def score_record(
+    rec: Dict[str, Any],
+    default_config: Optional[Dict[str, Any]] = None,
+    registry: Optional[KeywordRegistry] = None,
+) -> Dict[str, Any]:
+    """Puntúa un registro y devuelve la fila de build_results_dict."""
+    return evaluate_record(rec, default_config, registry)[0]
+
+
+def render_report(row: Dict[str, Any], subtotales: Dict[str, int], cfg: ScoringConfig, opts: ReportOptions) -> bytes:
+    """Informe HTML (UTF-8) de un registro puntuado por evaluate_record."""
+    html = render_html_report(
+        subtotales,
+        cfg.maximos,
+        row["total"],
+        row["porcentaje"],
+        opts.logo_b64,
+        opts.sig_nombre,
+        opts.sig_rol,
+        opts.sig_matricula,
+        nombre=row["nombre"],
+        id_paciente=row["id_paciente"],
+        fecha=row["fecha"],
+    )
+    return html.encode("utf-8")
+
+
+def _error(lineno: int, exc: Exception) -> Resultado:
+    return (lineno, None, f"{type(exc).__name__}: {exc}", None)
+
+
+def _score_chunk(
+    chunk: List[Tuple[int, Any]],
+    default_config: Optional[Dict[str, Any]],
+    semejanzas_path: Optional[str] = None,
+    perfiles_dir: Optional[str] = None,
+    default_perfil: Optional[str] = None,
+) -> List[Resultado]:
+    registry = worker_registry(semejanzas_path)
+    out: List[Optional[Resultado]] = [None] * len(chunk)
+
+    # Registros agrupados por perfil (clave "" = config por defecto)
+    grupos: Dict[str, List[Tuple[int, int, Dict[str, Any]]]] = {}
+    for i, (lineno, rec) in enumerate(chunk):
+        try:
+            if isinstance(rec, str):
+                rec = json.loads(rec)
+            clave = str(rec.get("perfil") or default_perfil or "").strip()
+        except Exception as exc:
+            out[i] = _error(lineno, exc)
+            continue
+        grupos.setdefault(clave, []).append((i, lineno, rec))
+
+    for clave, registros in grupos.items():
+        try:
+            if clave:
+                perfil = worker_profiles(perfiles_dir).resolver(clave)
+                cfg, etiqueta = perfil.config, perfil.clave
+            else:
+                cfg, etiqueta = ScoringConfig.from_dict(default_config), ""
+        except Exception as exc:
+            for i, lineno, _ in registros:
+                out[i] = _error(lineno, exc)
+            continue
+        for i, lineno, rec in registros:
+            try:
+                row, subtotales, cfg_rec = evaluate_record(rec, default_config, registry, cfg, etiqueta)
+                html = render_report(row, subtotales, cfg_rec, _REPORT) if _REPORT is not None else None
+                out[i] = (lineno, row, None, html)
+            except Exception as exc:
+                out[i] = _error(lineno, exc)
+    return out  # type: ignore[return-value]
+
+
+def _chunks(records: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    it = iter(records)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def score_stream(
+    records: Iterable[Tuple[int, Any]],
+    default_config: Optional[Dict[str, Any]] = None,
+    workers: int = 1,
+    chunksize: int = 256,
+    max_pending: Optional[int] = None,
+    semejanzas_path: Optional[str] = None,
+    report: Optional[ReportOptions] = None,
+    perfiles_dir: Optional[str] = None,
+    default_perfil: Optional[str] = None,
+    contexto: Optional[str] = None,
+) -> Iterator[Resultado]:
+    """Puntúa `(lineno, registro o línea JSON)` y produce `(lineno, fila, error, html)`
+    en orden de entrada. `html` es None salvo que se pidan informes (`report`).
+
+    `default_perfil` se aplica a los registros sin `perfil` (en lugar de
+    `default_config`); los perfiles se buscan en `perfiles_dir`. `contexto` es
+    el método de inicio de los procesos ("spawn" desde un proceso con hilos,
+    como el servidor de Streamlit: fork copiaría locks tomados por otros hilos).
+    """
+    extra = (default_config, semejanzas_path, perfiles_dir, default_perfil)
+    if workers <= 1:
+        previo = _REPORT
+        init_worker(report)
+        try:
+            for chunk in _chunks(records, chunksize):
+                yield from _score_chunk(chunk, *extra)
+        finally:
+            init_worker(previo)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor  # solo con procesos (multiprocessing es pesado)
+
+    max_pending = max_pending or workers * 2
+    mp_context = None
+    if contexto:
+        import multiprocessing
+
+        mp_context = multiprocessing.get_context(contexto)
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=mp_context, initializer=init_worker, initargs=(report,)
+    ) as pool:
+        pending: deque = deque()
+        for chunk in _chunks(records, chunksize):
+            pending.append(pool.submit(_score_chunk, chunk, *extra))
+            if len(pending) >= max_pending:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+# ------------------------------------------------------------
+# INFORMES EN ZIP
+# ------------------------------------------------------------
+
+def iter_reports_to_zip(stream: Iterable[Resultado], fh: BinaryIO) -> Iterator[Resultado]:
+    """Agrega al ZIP el informe de cada resultado y lo deja pasar.
+
+    El ZIP se escribe en modo streaming (sirve también para archivos no
+    posicionables como stdout); solo el informe en curso está en memoria.
+    """
+    with zipfile.ZipFile(fh, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for res in stream:
+            lineno, row, _, html = res
+            if row is not None and html is not None:
+                prefijo = f"{lineno:06d}_{row['id_paciente']}_" if row["id_paciente"] else f"{lineno:06d}_"
+                zf.writestr(report_filename(row["nombre"], prefijo), html)
+            yield res
+
+
+def write_reports_zip(
+    records: Iterable[Tuple[int, Any]],
+    fh: BinaryIO,
+    report: ReportOptions,
+    default_config: Optional[Dict[str, Any]] = None,
+    workers: int = 1,
+    semejanzas_path: Optional[str] = None,
+    perfiles_dir: Optional[str] = None,
+    default_perfil: Optional[str] = None,
+    contexto: Optional[str] = None,
+) -> Tuple[int, List[Tuple[int, str]]]:
+    """Puntúa y escribe un ZIP con un informe por registro.
+
+    Devuelve (informes escritos, [(lineno, error), ...]).
+    """
+    n_ok, errores = 0, []
+    stream = score_stream(
+        records, default_config, workers=workers, semejanzas_path=semejanzas_path, report=report,
+        perfiles_dir=perfiles_dir, default_perfil=default_perfil, contexto=contexto,
+    )
+    for lineno, row, error, _ in iter_reports_to_zip(stream, fh):
+        if error is not None:
+            errores.append((lineno, error))
+        else:
+            n_ok += 1
+    return n_ok, errores
+
+
+# ------------------------------------------------------------
+# CLI
+# ------------------------------------------------------------
+
+def _detect_format(path: str, fmt: str) -> str:
+    if fmt != "auto":
+        return fmt
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="python -m cognitiva.batch",
+        description="Puntúa por lotes evaluaciones en JSONL/CSV y escribe un CSV de resultados.",
+    )
+    parser.add_argument("input", help="Archivo JSONL/CSV de respuestas ('-' para stdin)")
+    parser.add_argument("-o", "--output", default="-", help="CSV de salida ('-' para stdout)")
+    parser.add_argument("--gzip", action="store_true", help="Comprimir la salida con gzip")
+    parser.add_argument("--format", choices=["auto", "jsonl", "csv"], default="auto")
+    parser.add_argument("--config", help="JSON con la configuración por defecto (maximos, fluidez, umbrales)")
+    parser.add_argument("--semejanzas", help="JSON con los ítems de Abstracción (ver cognitiva.keywords)")
+    parser.add_argument("--perfiles", default=os.environ.get("COGNITIVA_PERFILES", "perfiles"),
+                        help="Directorio de perfiles JSON (ver cognitiva.profiles)")
+    parser.add_argument("--perfil", help="Perfil por defecto (nombre o nombre@version) para registros sin 'perfil'")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunksize", type=int, default=256)
+    informes = parser.add_argument_group("informes HTML")
+    informes.add_argument("--reports-zip", help="Escribir también un ZIP con un informe HTML por registro")
+    informes.add_argument("--logo", help="Logo PNG/JPG para los informes")
+    informes.add_argument("--firma-nombre", default="")
+    informes.add_argument("--firma-rol", default="")
+    informes.add_argument("--firma-matricula", default="")
+    args = parser.parse_args(argv)
+
+    default_config = None
+    if args.config:
+        with open(args.config, encoding="utf-8") as fh:
+            default_config = json.load(fh)
+    if args.perfil:
+        # Falla antes de leer la entrada si el perfil no existe o es inválido
+        try:
+            args.perfil = worker_profiles(args.perfiles).resolver(args.perfil).clave
+        except (KeyError, ValueError) as exc:
+            parser.error(str(exc))
+
+    report = None
+    if args.reports_zip:
+        logo_b64 = None
+        if args.logo:
+            with open(args.logo, "rb") as fh:
+                logo_b64 = logo_to_base64(fh.read())
+        report = ReportOptions(logo_b64, args.firma_nombre, args.firma_rol, args.firma_matricula)
+
+    fmt = _detect_format(args.input, args.format)
+    fin = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8", newline="")
+    fout = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+    fzip = open(args.reports_zip, "wb") if args.reports_zip else None
+    n_ok = n_err = 0
+    por_perfil: Dict[str, int] = {}
+
+    def filas(stream: Iterable[Resultado]) -> Iterator[Dict[str, Any]]:
+        nonlocal n_ok, n_err
+        for lineno, row, error, _ in stream:
+            if error is not None:
+                n_err += 1
+                print(f"{args.input}:{lineno}: {error}", file=sys.stderr)
+                continue
+            n_ok += 1
+            por_perfil[row["perfil"]] = por_perfil.get(row["perfil"], 0) + 1
+            yield row
+
+    try:
+        stream = score_stream(
+            iter_records(fin, fmt),
+            default_config,
+            workers=args.workers,
+            chunksize=args.chunksize,
+            semejanzas_path=args.semejanzas,
+            report=report,
+            perfiles_dir=args.perfiles,
+            default_perfil=args.perfil,
+        )
+        if fzip is not None:
+            stream = iter_reports_to_zip(stream, fzip)
+        write_csv(filas(stream), fout, gzip=args.gzip)
+    finally:
+        if fin is not sys.stdin:
+            fin.close()
+        if fout is not sys.stdout.buffer:
+            fout.close()
+        if fzip is not None:
+            fzip.close()
+
+    print(f"{n_ok} evaluaciones puntuadas, {n_err} con errores", file=sys.stderr)
+    if len(por_perfil) > 1 or "" not in por_perfil:
+        for clave, n in sorted(por_perfil.items()):
+            print(f"  {clave or '(config por defecto)'}: {n}", file=sys.stderr)
+    return 1 if n_err else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+# cognitiva/cache.py — Caché LRU de subtotales y artefactos (CSV, HTML)
+# La clave es un hash estable del contenido (respuestas, palabras objetivo,
+# perfil/config, logo...), no de la sesión: volver a calcular sin cambios, o
+# la misma evaluación desde otra pestaña, reutiliza el resultado.
+#
+# Límites: cantidad de entradas, bytes totales (len() de bytes/str; el resto
+# cuenta como `tamanio_default`) y antigüedad (`ttl` segundos desde que se
+# guardó). Al superarse, se descartan las menos usadas recientemente.
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+def clave(*partes: Any) -> str:
+    """Hash estable de valores JSON (dicts con claves en cualquier orden)."""
+    datos = json.dumps(partes, sort_keys=True, ensure_ascii=False, default=str, separators=(",", ":"))
+    return hashlib.blake2b(datos.encode("utf-8"), digest_size=16).hexdigest()
+
+
+@dataclass
+class Estadisticas:
+    aciertos: int = 0
+    fallos: int = 0
+    expirados: int = 0
+    desalojados: int = 0
+    entradas: int = 0
+    bytes: int = 0
+
+    @property
+    def tasa_aciertos(self) -> float:
+        total = self.aciertos + self.fallos
+        return self.aciertos / total if total else 0.0
+
+
+class ArtifactCache:
+    """LRU acotada por entradas, bytes y antigüedad; segura entre hilos."""
+
+    def __init__(
+        self,
+        max_entradas: int = 512,
+        max_bytes: int = 32 * 1024 * 1024,
+        ttl: Optional[float] = 600.0,
+        tamanio_default: int = 512,
+    ):
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.tamanio_default = tamanio_default
+        # clave -> (valor, bytes, guardado en)
+        self._datos: "OrderedDict[Hashable, Tuple[Any, int, float]]" = OrderedDict()
+        self._bytes = 0
+        self._stats = Estadisticas()
+        self._lock = threading.Lock()
+
+    def _tamanio(self, valor: Any) -> int:
+        if isinstance(valor, (bytes, bytearray, str)):
+            return len(valor)
+        return self.tamanio_default
+
+    def _quitar(self, key: Hashable) -> None:
+        _, n, _ = self._datos.pop(key)
+        self._bytes -= n
+
+    def get(self, key: Hashable) -> Any:
+        """Valor guardado, o None si no está o expiró."""
+        with self._lock:
+            entrada = self._datos.get(key)
+            if entrada is not None and self.ttl is not None and time.monotonic() - entrada[2] > self.ttl:
+                self._quitar(key)
+                self._stats.expirados += 1
+                entrada = None
+            if entrada is None:
+                self._stats.fallos += 1
+                return None
+            self._datos.move_to_end(key)
+            self._stats.aciertos += 1
+            return entrada[0]
+
+    def put(self, key: Hashable, valor: Any) -> None:
+        n = self._tamanio(valor)
+        with self._lock:
+            if key in self._datos:
+                self._quitar(key)
+            if n > self.max_bytes:
+                return  # no entra ni solo
+            self._datos[key] = (valor, n, time.monotonic())
+            self._bytes += n
+            while len(self._datos) > self.max_entradas or self._bytes > self.max_bytes:
+                self._quitar(next(iter(self._datos)))
+                self._stats.desalojados += 1
+
+    def get_or_compute(self, key: Hashable, calcular: Callable[[], Any]) -> Any:
+        # Dos sesiones pueden calcular la misma clave a la vez; el resultado es
+        # el mismo, así que no se bloquea durante el cálculo.
+        valor = self.get(key)
+        if valor is None:
+            valor = calcular()
+            self.put(key, valor)
+        return valor
+
+    def clear(self) -> None:
+        with self._lock:
+            self._datos.clear()
+            self._bytes = 0
+
+    def stats(self) -> Estadisticas:
+        with self._lock:
+            s = self._stats
+            return Estadisticas(s.aciertos, s.fallos, s.expirados, s.desalojados, len(self._datos), self._bytes)
+
+    def stats_dict(self) -> Dict[str, Any]:
+        s = self.stats()
+        return {**s.__dict__, "tasa_aciertos": s.tasa_aciertos}
@@ -0,0 +1,507 @@
+# cognitiva/cohort.py — Estadísticas de cohorte en una sola pasada
+# Requiere numpy.
+#
+# Por serie (dominios, total y porcentaje) se acumulan:
+#   - momentos de Welford (n, media, M2). Dos resúmenes se combinan con la
+#     fórmula de Chan et al., sin volver a ver los datos;
+#   - un histograma exacto sobre una grilla fija (paso 1 para los puntajes,
+#     que son enteros acotados; 0.1 para el porcentaje). Hace de sketch de
+#     cuantiles sin error y de tamaño fijo: mínimo, máximo y cuantiles salen
+#     de los conteos, y combinar dos es sumarlos;
+#   - conteos por categoría de interpretación.
+# Todos los acumuladores se pueden combinar y descontar (de a un valor o por
+# bloques).
+#
+# Dos usos:
+#   - calcular(): pasada completa sobre la base por tramos de id, en paralelo
+#     (un proceso por tramo, cada uno con su conexión de lectura), combinando
+#     los resúmenes al final. Cada proceso tiene a lo sumo un bloque de filas
+#     en memoria.
+#   - rollups: la tabla `cohorte` guarda un resumen por (clínica, mes, perfil)
+#     que el escritor de ResultStore actualiza en la misma transacción que
+#     cada lote de evaluaciones (cada grupo tocado se lee y escribe una vez
+#     por lote), como cognitiva.trends. El tablero combina los grupos del
+#     filtro: ve cada resultado nuevo sin recorrer la tabla.
+
+import json
+import math
+import sqlite3
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from .scoring import DOMINIOS
+from .trends import _valores
+
+SERIES = DOMINIOS + ["total", "porcentaje"]
+PASOS = {"porcentaje": 0.1}  # el resto, paso 1
+CUANTILES = {"p10": 0.1, "p25": 0.25, "mediana": 0.5, "p75": 0.75, "p90": 0.9}
+TRAMO = 50_000  # filas por tramo de la pasada completa
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cohorte (
+    clinica TEXT NOT NULL,
+    mes TEXT NOT NULL,
+    perfil TEXT NOT NULL,
+    estado TEXT NOT NULL,
+    PRIMARY KEY (clinica, mes, perfil)
+) WITHOUT ROWID;
+"""
+
+Grupo = Tuple[str, str, str]  # (clínica, "AAAA-MM", perfil)
+
+
+@dataclass
+class Momentos:
+    """Media y varianza de Welford; combinables y descontables."""
+
+    n: int = 0
+    media: float = 0.0
+    m2: float = 0.0
+
+    @property
+    def varianza(self) -> Optional[float]:
+        return self.m2 / (self.n - 1) if self.n > 1 else None  # muestral
+
+    @property
+    def desvio(self) -> Optional[float]:
+        v = self.varianza
+        return None if v is None else math.sqrt(max(v, 0.0))
+
+    def combinar(self, otro: "Momentos") -> None:
+        if otro.n == 0:
+            return
+        n = self.n + otro.n
+        delta = otro.media - self.media
+        self.media += delta * otro.n / n
+        self.m2 += otro.m2 + delta * delta * self.n * otro.n / n
+        self.n = n
+
+    def agregar(self, x: Any) -> None:
+        """Un bloque de valores: su media y M2 (dos pasadas) y luego combinar."""
+        x = np.asarray(x, dtype=np.float64)
+        if x.size:
+            media = float(x.mean())
+            self.combinar(Momentos(int(x.size), media, float(np.square(x - media).sum())))
+
+    def descontar(self, otro: "Momentos") -> None:
+        """Inversa de combinar: quita un bloque ya sumado."""
+        n = self.n - otro.n
+        if n <= 0:
+            self.n, self.media, self.m2 = 0, 0.0, 0.0
+            return
+        media = (self.n * self.media - otro.n * otro.media) / n
+        delta = otro.media - media
+        self.m2 = max(self.m2 - otro.m2 - delta * delta * n * otro.n / self.n, 0.0)
+        self.n, self.media = n, media
+
+    def quitar(self, valor: float) -> None:
+        """Inversa de agregar un solo valor."""
+        if self.n <= 1:
+            self.n, self.media, self.m2 = 0, 0.0, 0.0
+            return
+        n = self.n - 1
+        media = (self.n * self.media - valor) / n
+        self.m2 = max(self.m2 - (valor - media) * (valor - self.media), 0.0)
+        self.n, self.media = n, media
+
+
+class Conteos:
+    """Histograma exacto en celdas de ancho `paso`; combinable."""
+
+    def __init__(self, paso: float = 1.0, inicio: int = 0, conteos: Optional[Iterable[int]] = None):
+        self.paso = paso
+        self.inicio = inicio  # celda de conteos[0]
+        self.conteos = np.array([] if conteos is None else conteos, dtype=np.int64)
+
+    def _celdas(self, x: Any) -> np.ndarray:
+        # El margen evita que 33.3 / 0.1 = 332.99999... caiga en la celda anterior
+        return np.floor(np.asarray(x, dtype=np.float64) / self.paso + 1e-6).astype(np.int64)
+
+    def _ampliar(self, lo: int, hi: int) -> None:
+        fin = self.inicio + len(self.conteos)
+        if not len(self.conteos):
+            self.inicio, self.conteos = lo, np.zeros(hi - lo + 1, dtype=np.int64)
+        elif lo < self.inicio or hi >= fin:
+            inicio = min(lo, self.inicio)
+            conteos = np.zeros(max(hi + 1, fin) - inicio, dtype=np.int64)
+            conteos[self.inicio - inicio:fin - inicio] = self.conteos
+            self.inicio, self.conteos = inicio, conteos
+
+    def agregar(self, x: Any, signo: int = 1) -> None:
+        celdas = self._celdas(np.atleast_1d(x))
+        if celdas.size:
+            lo, hi = int(celdas.min()), int(celdas.max())
+            self._ampliar(lo, hi)
+            self.conteos[lo - self.inicio:hi - self.inicio + 1] += signo * np.bincount(celdas - lo, minlength=hi - lo + 1)
+
+    def agregar_valor(self, valor: float, signo: int = 1) -> None:
+        """Un solo valor, sin pasar por arreglos (camino del escritor)."""
+        celda = math.floor(valor / self.paso + 1e-6)
+        self._ampliar(celda, celda)
+        self.conteos[celda - self.inicio] += signo
+
+    def quitar(self, valor: float) -> None:
+        self.agregar_valor(valor, -1)
+
+    def combinar(self, otro: "Conteos", signo: int = 1) -> None:
+        if len(otro.conteos):
+            self._ampliar(otro.inicio, otro.inicio + len(otro.conteos) - 1)
+            i = otro.inicio - self.inicio
+            self.conteos[i:i + len(otro.conteos)] += signo * otro.conteos
+
+    @property
+    def n(self) -> int:
+        return int(self.conteos.sum())
+
+    def _valor(self, celda: int) -> float:
+        return round(celda * self.paso, 6)
+
+    def cuantil(self, q: float) -> Optional[float]:
+        """Menor valor con al menos q·n observaciones ≤ él (exacto con paso 1)."""
+        n = self.n
+        if n == 0:
+            return None
+        k = max(1, math.ceil(q * n))
+        return self._valor(self.inicio + int(np.searchsorted(np.cumsum(self.conteos), k)))
+
+    def barras(self, ancho: Optional[float] = None) -> List[Tuple[float, int]]:
+        """(valor, conteo) de las celdas no vacías; con `ancho`, agrupadas en
+        intervalos de ese ancho (valor = comienzo del intervalo)."""
+        pares = [(self._valor(self.inicio + int(i)), int(self.conteos[i])) for i in np.flatnonzero(self.conteos)]
+        if not ancho:
+            return pares
+        agrupado: Counter = Counter()
+        for v, c in pares:
+            agrupado[round(math.floor(v / ancho + 1e-6) * ancho, 6)] += c
+        return sorted(agrupado.items())
+
+    def to_dict(self) -> Dict[str, Any]:
+        nz = np.flatnonzero(self.conteos)
+        if not nz.size:
+            return {"paso": self.paso, "inicio": 0, "conteos": []}
+        return {"paso": self.paso, "inicio": self.inicio + int(nz[0]), "conteos": self.conteos[nz[0]:nz[-1] + 1].tolist()}
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "Conteos":
+        return cls(data["paso"], data["inicio"], data["conteos"])
+
+
+class EstadisticasCohorte:
+    """Momentos e histograma por serie más conteo de interpretaciones."""
+
+    def __init__(self) -> None:
+        self.momentos: Dict[str, Momentos] = {s: Momentos() for s in SERIES}
+        self.conteos: Dict[str, Conteos] = {s: Conteos(PASOS.get(s, 1.0)) for s in SERIES}
+        self.interpretaciones: Counter = Counter()
+
+    @property
+    def n(self) -> int:
+        return self.momentos["total"].n
+
+    def agregar_columnas(self, columnas: Mapping[str, Any], interpretaciones: Iterable[str] = ()) -> None:
+        """Un bloque: serie -> arreglo de valores (todas del mismo largo)."""
+        for s in SERIES:
+            x = np.asarray(columnas[s], dtype=np.float64)
+            self.momentos[s].agregar(x)
+            self.conteos[s].agregar(x)
+        self.interpretaciones.update(interpretaciones)
+
+    def agregar(self, ev: Mapping[str, Any]) -> None:
+        """Una evaluación (dict de ResultStore: "<dominio>_puntaje", total, ...)."""
+        for s, v in _valores(ev).items():
+            self.momentos[s].combinar(Momentos(1, v, 0.0))
+            self.conteos[s].agregar_valor(v)
+        self.interpretaciones[ev.get("interpretacion") or ""] += 1
+
+    def quitar(self, ev: Mapping[str, Any]) -> None:
+        for s, v in _valores(ev).items():
+            self.momentos[s].quitar(v)
+            self.conteos[s].quitar(v)
+        clave = ev.get("interpretacion") or ""
+        self.interpretaciones[clave] -= 1
+        if self.interpretaciones[clave] <= 0:
+            del self.interpretaciones[clave]
+
+    def combinar(self, otro: "EstadisticasCohorte") -> "EstadisticasCohorte":
+        for s in SERIES:
+            self.momentos[s].combinar(otro.momentos[s])
+            self.conteos[s].combinar(otro.conteos[s])
+        self.interpretaciones.update(otro.interpretaciones)
+        return self
+
+    def descontar(self, otro: "EstadisticasCohorte") -> "EstadisticasCohorte":
+        """Inversa de combinar (p. ej., los valores anteriores de filas re-puntuadas)."""
+        for s in SERIES:
+            self.momentos[s].descontar(otro.momentos[s])
+            self.conteos[s].combinar(otro.conteos[s], -1)
+        self.interpretaciones.subtract(otro.interpretaciones)
+        for clave in [c for c, k in self.interpretaciones.items() if k <= 0]:
+            del self.interpretaciones[clave]
+        return self
+
+    def resumen(self) -> Dict[str, Dict[str, Any]]:
+        """Serie -> n, media, desvío, mínimo, cuantiles y máximo."""
+        out = {}
+        for s in SERIES:
+            m, c = self.momentos[s], self.conteos[s]
+            fila: Dict[str, Any] = {"n": m.n, "media": m.media if m.n else None, "desvio": m.desvio}
+            fila["minimo"] = c.cuantil(0.0)
+            fila.update({nombre: c.cuantil(q) for nombre, q in CUANTILES.items()})
+            fila["maximo"] = c.cuantil(1.0)
+            out[s] = fila
+        return out
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "momentos": {s: [m.n, m.media, m.m2] for s, m in self.momentos.items()},
+            "conteos": {s: c.to_dict() for s, c in self.conteos.items()},
+            "interpretaciones": dict(self.interpretaciones),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "EstadisticasCohorte":
+        est = cls()
+        for s, (n, media, m2) in data["momentos"].items():
+            est.momentos[s] = Momentos(n, media, m2)
+        for s, c in data["conteos"].items():
+            est.conteos[s] = Conteos.from_dict(c)
+        est.interpretaciones.update(data["interpretaciones"])
+        return est
+
+
+# ----- pasada completa -----
+
+def _filtro(
+    desde: Optional[str], hasta: Optional[str], clinica: Optional[str], perfil: Optional[str]
+) -> Tuple[str, List[Any]]:
+    # Fechas vacías no filtran; clínica y perfil "" sí (evaluaciones sin ellos)
+    where, params = [], []
+    for cond, valor in (("fecha >= ?", desde), ("fecha <= ?", hasta)):
+        if valor:
+            where.append(cond)
+            params.append(str(valor))
+    for cond, valor in (("clinica = ?", clinica), ("perfil = ?", perfil)):
+        if valor is not None:
+            where.append(cond)
+            params.append(valor)
+    return " AND ".join(where), params
+
+
+def _tramo(path: str, lo: int, hi: int, where: str, params: List[Any], agrupar: bool) -> Dict[Any, EstadisticasCohorte]:
+    """Resúmenes de las filas con lo <= id < hi, por grupo o en uno solo (clave ())."""
+    from .store import DOMINIO_COLUMNAS, _connect  # evita import circular
+
+    columnas = [DOMINIO_COLUMNAS[d] for d in DOMINIOS] + ["total", "porcentaje"]
+    sql = (
+        f"SELECT {', '.join(columnas)}, interpretacion, clinica, substr(fecha, 1, 7), perfil "
+        f"FROM evaluaciones WHERE id >= ? AND id < ?" + (f" AND {where}" if where else "")
+    )
+    out: Dict[Any, EstadisticasCohorte] = {}
+    conn = _connect(path)
+    conn.row_factory = None
+    try:
+        cur = conn.execute(sql, [lo, hi, *params])
+        while True:
+            # Agrupando, el tramo entero de una vez: menos bloques chicos por grupo
+            filas = cur.fetchmany(hi - lo if agrupar else 10_000)
+            if not filas:
+                break
+            if agrupar:
+                por_grupo: Dict[Any, List[tuple]] = {}
+                for f in filas:
+                    por_grupo.setdefault(f[-3:], []).append(f)
+            else:
+                por_grupo = {(): filas}
+            for grupo, bloque in por_grupo.items():
+                datos = np.array([f[:len(SERIES)] for f in bloque], dtype=np.float64)
+                out.setdefault(grupo, EstadisticasCohorte()).agregar_columnas(
+                    dict(zip(SERIES, datos.T)), (f[len(SERIES)] or "" for f in bloque)
+                )
+    finally:
+        conn.close()
+    return out
+
+
+def _pasada(
+    path: str, where: str, params: List[Any], workers: int, tramo: int, agrupar: bool
+) -> Dict[Any, EstadisticasCohorte]:
+    from .store import _connect
+
+    conn = _connect(path)
+    try:
+        lo, hi = conn.execute("SELECT min(id), max(id) FROM evaluaciones").fetchone()
+    finally:
+        conn.close()
+    if lo is None:
+        return {}
+    tramos = [(path, a, min(a + tramo, hi + 1), where, params, agrupar) for a in range(lo, hi + 1, tramo)]
+    if workers <= 1 or len(tramos) == 1:
+        partes: Iterable[Dict[Any, EstadisticasCohorte]] = (_tramo(*t) for t in tramos)
+        return _combinar_partes(partes)
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(tramos))) as pool:
+        return _combinar_partes(pool.map(_tramo, *zip(*tramos)))
+
+
+def _combinar_partes(partes: Iterable[Dict[Any, EstadisticasCohorte]]) -> Dict[Any, EstadisticasCohorte]:
+    out: Dict[Any, EstadisticasCohorte] = {}
+    for parte in partes:
+        for grupo, est in parte.items():
+            if grupo in out:
+                out[grupo].combinar(est)
+            else:
+                out[grupo] = est
+    return out
+
+
+def calcular(
+    path: str,
+    desde: Optional[str] = None,
+    hasta: Optional[str] = None,
+    clinica: Optional[str] = None,
+    perfil: Optional[str] = None,
+    workers: int = 1,
+    tramo: int = TRAMO,
+) -> EstadisticasCohorte:
+    """Pasada completa sobre la base (fechas inclusivas), en `workers` procesos."""
+    where, params = _filtro(desde, hasta, clinica, perfil)
+    return _pasada(path, where, params, workers, tramo, agrupar=False).get((), EstadisticasCohorte())
+
+
+# ----- rollups por (clínica, mes, perfil) -----
+
+def _grupo(ev: Mapping[str, Any]) -> Grupo:
+    return (ev.get("clinica") or "", str(ev["fecha"])[:7], ev.get("perfil") or "")
+
+
+def _cargar_grupo(conn: sqlite3.Connection, grupo: Grupo) -> EstadisticasCohorte:
+    row = conn.execute(
+        "SELECT estado FROM cohorte WHERE clinica = ? AND mes = ? AND perfil = ?", grupo
+    ).fetchone()
+    return EstadisticasCohorte.from_dict(json.loads(row[0])) if row else EstadisticasCohorte()
+
+
+def _guardar_grupo(conn: sqlite3.Connection, grupo: Grupo, est: EstadisticasCohorte) -> None:
+    if est.n <= 0:
+        conn.execute("DELETE FROM cohorte WHERE clinica = ? AND mes = ? AND perfil = ?", grupo)
+    else:
+        conn.execute(
+            "INSERT OR REPLACE INTO cohorte (clinica, mes, perfil, estado) VALUES (?, ?, ?, ?)",
+            (*grupo, json.dumps(est.to_dict(), ensure_ascii=False, separators=(",", ":"))),
+        )
+
+
+def actualizar(
+    conn: sqlite3.Connection,
+    nueva: Dict[str, Any],
+    anterior: Optional[Dict[str, Any]] = None,
+    pendientes: Optional[Dict[Grupo, EstadisticasCohorte]] = None,
+) -> None:
+    """Aplica una evaluación ya escrita a los rollups, dentro de la transacción
+    en curso; `anterior` (misma evaluación antes del cambio) se descuenta.
+
+    Con `pendientes`, los grupos tocados quedan en ese dict y se escriben una
+    sola vez con guardar() al cerrar el lote; sin él, se escriben ya.
+    """
+    grupos = {} if pendientes is None else pendientes
+    for ev, quitar in ((anterior, True), (nueva, False)):
+        if ev is None:
+            continue
+        grupo = _grupo(ev)
+        if grupo not in grupos:
+            grupos[grupo] = _cargar_grupo(conn, grupo)
+        if quitar:
+            grupos[grupo].quitar(ev)
+        else:
+            grupos[grupo].agregar(ev)
+    if pendientes is None:
+        guardar(conn, grupos)
+
+
+def guardar(conn: sqlite3.Connection, grupos: Dict[Grupo, EstadisticasCohorte]) -> None:
+    for grupo, est in grupos.items():
+        _guardar_grupo(conn, grupo, est)
+
+
+def reconstruir(conn: sqlite3.Connection, path: str, workers: int = 1) -> None:
+    """Rollups desde cero con una pasada agrupada (bases previas a la tabla)."""
+    grupos = _pasada(path, "", [], workers, TRAMO, agrupar=True)
+    with conn:
+        conn.execute("DELETE FROM cohorte")
+        guardar(conn, grupos)
+
+
+def grupos(conn: sqlite3.Connection) -> List[Grupo]:
+    return [tuple(r) for r in conn.execute("SELECT clinica, mes, perfil FROM cohorte ORDER BY mes, clinica, perfil")]
+
+
+def cargar(
+    conn: sqlite3.Connection,
+    desde_mes: Optional[str] = None,
+    hasta_mes: Optional[str] = None,
+    clinica: Optional[str] = None,
+    perfil: Optional[str] = None,
+) -> EstadisticasCohorte:
+    """Combina los rollups del filtro (meses "AAAA-MM", inclusive)."""
+    where, params = _filtro(None, None, clinica, perfil)
+    for cond, valor in (("mes >= ?", desde_mes), ("mes <= ?", hasta_mes)):
+        if valor:
+            where += (" AND " if where else "") + cond
+            params.append(valor)
+    sql = "SELECT estado FROM cohorte" + (f" WHERE {where}" if where else "")
+    est = EstadisticasCohorte()
+    for (estado,) in conn.execute(sql, params):
+        est.combinar(EstadisticasCohorte.from_dict(json.loads(estado)))
+    return est
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+    import os
+
+    parser = argparse.ArgumentParser(
+        prog="python -m cognitiva.cohort",
+        description="Estadísticas de cohorte por dominio en una pasada sobre el almacén SQLite.",
+    )
+    parser.add_argument("db", help="Base SQLite de ResultStore")
+    parser.add_argument("--desde", help="Fecha inicial AAAA-MM-DD (inclusive)")
+    parser.add_argument("--hasta", help="Fecha final AAAA-MM-DD (inclusive)")
+    parser.add_argument("--clinica")
+    parser.add_argument("--perfil")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--json", help="Guardar resumen, histogramas e interpretaciones en JSON")
+    args = parser.parse_args(argv)
+
+    est = calcular(args.db, args.desde, args.hasta, args.clinica, args.perfil, workers=args.workers)
+    resumen = est.resumen()
+
+    def fmt(v: Any) -> str:
+        return "—" if v is None else f"{v:.2f}" if isinstance(v, float) else str(v)
+
+    cols = ["n", "media", "desvio", "minimo", *CUANTILES, "maximo"]
+    print(f"{'serie':<20}" + "".join(f"{c:>9}" for c in cols))
+    for s, fila in resumen.items():
+        print(f"{s:<20}" + "".join(f"{fmt(fila[c]):>9}" for c in cols))
+    for interp, n in est.interpretaciones.most_common():
+        print(f"{n:>9}  {interp or '(sin interpretación)'}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(
+                {
+                    "resumen": resumen,
+                    "histogramas": {s: est.conteos[s].barras() for s in SERIES},
+                    "interpretaciones": dict(est.interpretaciones),
+                },
+                fh,
+                ensure_ascii=False,
+                indent=2,
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
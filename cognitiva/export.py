@@ -0,0 +1,100 @@
+# cognitiva/export.py — Filas de resultados y CSV
+# iter_csv() genera el CSV por bloques a medida que llegan las filas (con
+# gzip opcional), así que exportar cientos de miles de evaluaciones no
+# necesita tenerlas todas en memoria. Las columnas salen de result_fields(),
+# que depende solo de DOMINIOS: cambiar MAXIMOS no mueve columnas. `perfil`
+# es la clave "nombre@version" del perfil de configuración ("" si no hubo).
+
+import csv
+import io
+import zlib
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional
+
+from .scoring import DOMINIOS
+
+CHUNK_SIZE = 64 * 1024
+
+
+def result_fields() -> List[str]:
+    """Columnas de build_results_dict, en el mismo orden."""
+    return (
+        ["id_paciente", "nombre", "fecha"]
+        + [f"{dom}_puntaje" for dom in DOMINIOS]
+        + ["total", "max_total", "porcentaje", "perfil"]
+    )
+
+
+def build_results_dict(
+    subtotales: Dict[str, int],
+    maximos: Dict[str, int],
+    total: int,
+    porcentaje: float,
+    id_paciente: str = "",
+    nombre: str = "",
+    fecha: Any = "",
+    perfil: str = "",
+) -> Dict[str, Any]:
+    return {
+        "id_paciente": id_paciente,
+        "nombre": nombre,
+        "fecha": str(fecha),
+        **{f"{k}_puntaje": v for k, v in subtotales.items()},
+        "total": total,
+        "max_total": sum(maximos.values()),
+        "porcentaje": round(porcentaje, 2),
+        "perfil": perfil,
+    }
+
+
+def iter_csv(
+    rows: Iterable[Dict[str, Any]],
+    fieldnames: Optional[List[str]] = None,
+    gzip: bool = False,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """CSV en bloques de ~chunk_size bytes (UTF-8, o gzip si se pide).
+
+    Las columnas son fijas: claves faltantes quedan vacías y las que no
+    están en fieldnames se ignoran.
+    """
+    fieldnames = fieldnames or result_fields()
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=fieldnames, restval="", extrasaction="ignore")
+    gz = zlib.compressobj(wbits=31) if gzip else None  # wbits=31: formato .gz
+
+    def drain() -> bytes:
+        data = buf.getvalue().encode("utf-8")
+        buf.seek(0)
+        buf.truncate()
+        return gz.compress(data) if gz else data
+
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(row)
+        if buf.tell() >= chunk_size:
+            chunk = drain()
+            if chunk:
+                yield chunk
+    tail = drain()
+    if gz:
+        tail += gz.flush()
+    if tail:
+        yield tail
+
+
+def write_csv(
+    rows: Iterable[Dict[str, Any]],
+    fh: BinaryIO,
+    fieldnames: Optional[List[str]] = None,
+    gzip: bool = False,
+) -> int:
+    """Escribe el CSV en un archivo binario abierto; devuelve los bytes escritos."""
+    written = 0
+    for chunk in iter_csv(rows, fieldnames, gzip):
+        fh.write(chunk)
+        written += len(chunk)
+    return written
+
+
+def results_to_csv(results: Dict[str, Any]) -> bytes:
+    return b"".join(iter_csv([results], fieldnames=list(results.keys())))
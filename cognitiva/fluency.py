@@ -0,0 +1,220 @@
+# cognitiva/fluency.py — Captura cronometrada de fluidez semántica (animales)
+# El evaluador tipea cada animal a medida que el evaluado lo dice; cada
+# entrada queda con su tiempo desde el inicio y se valida contra un léxico:
+#   - índice exacto (dict) de formas plegadas (sin tildes, ver matching.fold)
+#     -> lema; plurales y femeninos regulares se generan al cargar
+#     ("gatas" -> "gato", "leones" -> "león"),
+#   - tolerancia a un error de tipeo con un índice de borrados (cada forma
+#     con una letra menos -> formas): una consulta mira len(palabra) + 1
+#     claves y verifica las candidatas con matching._myers_distance, sin
+#     recorrer el léxico.
+# Validar una entrada cuesta microsegundos (ver benchmarks/bench_micro.py,
+# caso "fluidez_validar"). Los repetidos se cuentan por lema ("gato, gatas"
+# = 1 animal) y la cantidad de válidos alimenta `len_animales`, que sigue
+# puntuando score_lenguaje con animals_per_point / max_fluency_points.
+
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .matching import TYPO_MIN_LEN, _myers_distance, _peq, fold
+
+LEXICO_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "animales.txt")
+
+# Estados de una entrada
+ANIMAL = "animal"
+REPETIDO = "repetido"
+NO_ANIMAL = "no_animal"
+FUERA_DE_TIEMPO = "fuera_de_tiempo"
+
+_ARTICULOS = {"el", "la", "los", "las", "un", "una", "unos", "unas"}
+
+
+def _plural(palabra: str, aguda: bool) -> List[str]:
+    if palabra.endswith(("s", "x")):
+        return []  # invariables: "ciempiés", "albatros", "mantis"
+    if palabra.endswith("z"):
+        return [palabra[:-1] + "ces"]
+    if palabra[-1] in "aeo":
+        return [palabra + "s"]
+    if palabra[-1] in "iu":
+        return [palabra + "es", palabra + "s"] if aguda else [palabra + "s"]
+    return [palabra + "es"]
+
+
+def _plural_frase(frase: str, original: str) -> List[str]:
+    """Plurales de una forma plegada ("oso polar" -> "osos", "osos polares")."""
+    palabras = frase.split(" ")
+    agudas = [p[-1:] in "áéíóú" for p in original.split(" ")]
+    cabeza = _plural(palabras[0], agudas[0])
+    if len(palabras) == 1:
+        return cabeza
+    formas = [" ".join([c] + palabras[1:]) for c in cabeza]
+    # Concordancia hasta el primer "de": "estrellas de mar", "leones marinos"
+    corte = palabras.index("de") if "de" in palabras else len(palabras)
+    todas = [(_plural(p, a) or [p])[0] for p, a in zip(palabras[:corte], agudas)] + palabras[corte:]
+    return formas + [" ".join(todas)]
+
+
+def _femenino(palabra: str) -> Optional[str]:
+    if " " in palabra:
+        return None
+    if palabra.endswith("o"):
+        return palabra[:-1] + "a"
+    if palabra.endswith("on"):
+        return palabra + "a"
+    return None
+
+
+def _borrados(palabra: str) -> Set[str]:
+    return {palabra[:i] + palabra[i + 1:] for i in range(len(palabra))}
+
+
+def normalizar_entrada(texto: str) -> str:
+    """Forma plegada, con espacios simples y sin artículo inicial."""
+    palabras = fold(str(texto)).split()
+    if len(palabras) > 1 and palabras[0] in _ARTICULOS:
+        palabras = palabras[1:]
+    return " ".join(palabras)
+
+
+class Lexico:
+    """Léxico de animales compilado: forma plegada -> lema."""
+
+    def __init__(self, lemas: Iterable[Tuple[str, ...]], max_distance: int = 1):
+        # Cada elemento: (lema, variantes irregulares...)
+        self.lemas: List[str] = []
+        self._formas: Dict[str, str] = {}
+        self.max_distance = min(1, max(0, int(max_distance)))
+        generadas: List[Tuple[str, str]] = []
+        for grupo in lemas:
+            lema = grupo[0].strip()
+            if not lema or normalizar_entrada(lema) in self._formas:
+                continue
+            self.lemas.append(lema)
+            for variante in grupo:
+                self._formas.setdefault(normalizar_entrada(variante), lema)
+            for variante in grupo:
+                base = normalizar_entrada(variante)
+                derivadas = _plural_frase(base, variante.strip().lower())
+                fem = _femenino(base)
+                if fem:
+                    derivadas += [fem] + _plural(fem, False)
+                generadas.extend((f, lema) for f in derivadas)
+        # Las formas generadas no pisan lemas ("caballa" no es "caballo")
+        for forma, lema in generadas:
+            self._formas.setdefault(forma, lema)
+
+        self._borrados: Dict[str, List[str]] = {}
+        if self.max_distance:
+            for forma in self._formas:
+                if len(forma) >= TYPO_MIN_LEN:
+                    for b in _borrados(forma):
+                        self._borrados.setdefault(b, []).append(forma)
+
+    def __len__(self) -> int:
+        return len(self.lemas)
+
+    @property
+    def formas(self) -> int:
+        return len(self._formas)
+
+    def buscar(self, texto: str) -> Optional[str]:
+        """Lema del animal nombrado, o None si no está en el léxico."""
+        w = normalizar_entrada(texto)
+        lema = self._formas.get(w)
+        if lema is not None or not self.max_distance or len(w) < TYPO_MIN_LEN:
+            return lema
+        return self._aproximado(w)
+
+    def _aproximado(self, w: str) -> Optional[str]:
+        # Inserción: w sin una letra es una forma. Borrado o sustitución:
+        # w (o w sin una letra) es un borrado de la forma.
+        claves = _borrados(w)
+        candidatas = [c for c in claves if c in self._formas and len(c) >= TYPO_MIN_LEN]
+        for clave in (w, *claves):
+            candidatas.extend(self._borrados.get(clave, ()))
+        if not candidatas:
+            return None
+        peq, m = _peq(w), len(w)
+        mejor = min(candidatas, key=lambda c: (_myers_distance(peq, m, c), c))
+        return self._formas[mejor] if _myers_distance(peq, m, mejor) <= self.max_distance else None
+
+
+def _leer(path: str) -> List[Tuple[str, ...]]:
+    with open(path, encoding="utf-8") as fh:
+        return [
+            tuple(v.strip() for v in linea.split(",") if v.strip())
+            for linea in (l.split("#", 1)[0].strip() for l in fh)
+            if linea
+        ]
+
+
+@lru_cache(maxsize=8)
+def _cargar(path: str, max_distance: int) -> Lexico:
+    return Lexico(_leer(path), max_distance)
+
+
+def load_lexicon(path: Optional[str] = None, max_distance: int = 1) -> Lexico:
+    """Léxico compartido (una vez por proceso y archivo); por defecto animales.txt."""
+    return _cargar(os.path.abspath(path or LEXICO_PATH), min(1, max(0, int(max_distance))))
+
+
+@dataclass
+class Entrada:
+    t: float  # segundos desde el inicio
+    texto: str
+    lema: Optional[str]
+    estado: str
+
+
+class CapturaFluidez:
+    """Entradas cronometradas de una prueba de fluidez."""
+
+    def __init__(self, lexico: Lexico, duracion: float = 60, ancho_intervalo: float = 15):
+        self.lexico = lexico
+        self.duracion = float(duracion)
+        self.ancho_intervalo = float(ancho_intervalo)
+        self.entradas: List[Entrada] = []
+        self._vistos: Set[str] = set()
+
+    def agregar(self, texto: str, t: float) -> List[Entrada]:
+        """Valida y registra lo tipeado en el segundo t (admite "gato, perro")."""
+        nuevas = []
+        for parte in str(texto).split(","):
+            if not parte.strip():
+                continue
+            lema = self.lexico.buscar(parte)
+            if t > self.duracion:
+                estado = FUERA_DE_TIEMPO
+            elif lema is None:
+                estado = NO_ANIMAL
+            elif lema in self._vistos:
+                estado = REPETIDO
+            else:
+                estado = ANIMAL
+                self._vistos.add(lema)
+            nuevas.append(Entrada(round(float(t), 1), parte.strip(), lema, estado))
+        self.entradas.extend(nuevas)
+        return nuevas
+
+    @property
+    def validos(self) -> int:
+        return len(self._vistos)
+
+    def conteo(self, estado: str) -> int:
+        return sum(1 for e in self.entradas if e.estado == estado)
+
+    def intervalos(self) -> List[int]:
+        """Animales válidos por intervalo (0-15 s, 15-30 s, ...)."""
+        n = max(1, int(-(-self.duracion // self.ancho_intervalo)))
+        cuentas = [0] * n
+        for e in self.entradas:
+            if e.estado == ANIMAL:
+                cuentas[min(int(e.t // self.ancho_intervalo), n - 1)] += 1
+        return cuentas
+
+    def registro(self) -> List[Dict[str, object]]:
+        """Entradas como diccionarios (para guardar junto con las respuestas)."""
+        return [{"t": e.t, "texto": e.texto, "lema": e.lema, "estado": e.estado} for e in self.entradas]
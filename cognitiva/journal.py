@@ -0,0 +1,334 @@
+# cognitiva/journal.py — Diario de autoguardado de evaluaciones en curso
+# Un archivo por evaluación (<directorio>/<sesion>.jsonl), solo de agregado:
+# cada línea lleva únicamente los campos que cambiaron desde la anterior
+#   {"t": 1730000000.1, "c": {"r.aten_s7": "93,86"}, "b": ["r.len_animales_registro"]}
+# ("c" = cambiados, "b" = borrados; "r": 1 = la línea reemplaza todo el estado
+# anterior). El estado es un dict plano de valores JSON (respuestas, palabras
+# objetivo, registration_time, datos del paciente).
+#
+# Escrituras: un único hilo escritor, como ResultStore. registrar() calcula
+# la diferencia con el último estado de la sesión (en memoria) y encola la
+# línea; el escritor junta lo que llegue de todas las sesiones durante
+# `intervalo` segundos, agrega las líneas de cada archivo con una sola
+# escritura y hace un fsync por archivo tocado. Con muchas sesiones, el costo
+# es un fsync por sesión activa por intervalo, no uno por rerun. El Future de
+# registrar() se resuelve después del fsync.
+#
+# Errores: si una escritura falla (disco lleno, permisos), su Future falla,
+# el escritor trunca la línea que haya quedado a medias y marca la sesión; el
+# próximo registro de esa sesión escribe el estado completo con "r": 1 en
+# lugar de la diferencia, así el cambio perdido se vuelve a escribir.
+#
+# Compactación: cuando un archivo acumula `compactar_cada` líneas, el
+# escritor lo reemplaza por una sola línea con el estado completo (archivo
+# temporal + fsync + os.replace), sin competir con los agregados.
+#
+# Recuperación: recuperar(sesion) aplica las líneas en orden. Una caída a mitad
+# de una escritura deja una última línea sin "\n"; antes de volver a agregar,
+# la primera lectura del archivo en el proceso lo trunca hasta el último "\n"
+# (si no, el agregado siguiente quedaría pegado a la línea rota y se perdería).
+# leer() saltea las líneas que no son JSON válido en lugar de detenerse.
+#
+# Limpieza: los diarios sin cambios en `max_dias` se borran al abrir el diario
+# y, después, cada `limpiar_cada` segundos desde el escritor; también se
+# olvida el estado en memoria de las sesiones sin registros en ese plazo.
+
+import json
+import os
+import queue
+import re
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, Mapping, Optional, Set, Tuple
+
+SESION_VALIDA = re.compile(r"^[0-9a-f]{32}$")  # uuid4().hex: nunca una ruta
+EXTENSION = ".jsonl"
+
+
+def _ruta(directorio: str, sesion: str) -> str:
+    if not SESION_VALIDA.match(sesion):
+        raise ValueError(f"Sesión inválida: {sesion!r}")
+    return os.path.join(directorio, sesion + EXTENSION)
+
+
+def _fsync_directorio(directorio: str) -> None:
+    # Hace durables las altas y renombres de archivos (no existe en Windows)
+    if hasattr(os, "O_DIRECTORY"):
+        fd = os.open(directorio, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+def _diferencia(anterior: Mapping[str, Any], estado: Mapping[str, Any]) -> Tuple[Dict[str, Any], List[str]]:
+    cambiados = {k: v for k, v in estado.items() if k not in anterior or anterior[k] != v}
+    borrados = [k for k in anterior if k not in estado]
+    return cambiados, borrados
+
+
+def leer(path: str) -> Dict[str, Any]:
+    """Estado de un archivo de diario (las líneas cortadas o ilegibles se saltean)."""
+    estado: Dict[str, Any] = {}
+    with open(path, "rb") as fh:
+        for linea in fh:
+            try:
+                entrada = json.loads(linea)
+            except ValueError:
+                continue  # escritura cortada por una caída
+            if entrada.get("r"):
+                estado.clear()
+            estado.update(entrada.get("c", {}))
+            for k in entrada.get("b", ()):
+                estado.pop(k, None)
+    return estado
+
+
+def reparar(path: str) -> bool:
+    """Trunca una última línea sin "\n" (escritura cortada); True si truncó."""
+    with open(path, "rb+") as fh:
+        datos = fh.read()
+        if not datos or datos.endswith(b"\n"):
+            return False
+        fh.truncate(datos.rfind(b"\n") + 1)
+        fh.flush()
+        os.fsync(fh.fileno())
+    return True
+
+
+class Diario:
+    """Autoguardado de evaluaciones en curso con fsync agrupado."""
+
+    def __init__(
+        self,
+        directorio: str,
+        intervalo: float = 0.5,
+        compactar_cada: int = 200,
+        max_dias: float = 7,
+        limpiar_cada: float = 3600,
+    ):
+        self.directorio = directorio
+        self.intervalo = intervalo
+        self.compactar_cada = compactar_cada
+        self.max_dias = max_dias
+        self.limpiar_cada = limpiar_cada
+        os.makedirs(directorio, exist_ok=True)
+        # Último estado registrado por sesión (para calcular diferencias), cuándo
+        # se registró por última vez y las sesiones con una escritura fallida
+        self._estados: Dict[str, Dict[str, Any]] = {}
+        self._usos: Dict[str, float] = {}
+        self._fallidas: Set[str] = set()
+        self._lock = threading.Lock()
+        self.limpiar(max_dias)
+        self._proxima_limpieza = time.monotonic() + limpiar_cada
+        self._lineas: Dict[str, int] = {}  # líneas desde la última compactación (solo el escritor)
+        self.escrituras = 0
+        self.fsyncs = 0
+        self.compactaciones = 0
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="Diario-writer", daemon=True)
+        self._writer.start()
+
+    # ----- escritura -----
+
+    def registrar(self, sesion: str, estado: Mapping[str, Any]) -> "Future[None]":
+        """Encola los campos que cambiaron desde el último registro de la sesión;
+        el Future se resuelve cuando están en disco (ya resuelto si no hay cambios)."""
+        return self._registrar(sesion, estado, parcial=False)
+
+    def actualizar(self, sesion: str, campos: Mapping[str, Any]) -> "Future[None]":
+        """Como registrar(), pero solo con algunos campos: el resto queda como estaba
+        (p. ej., desde un fragmento que no recorre todo el formulario)."""
+        return self._registrar(sesion, campos, parcial=True)
+
+    def _registrar(self, sesion: str, estado: Mapping[str, Any], parcial: bool) -> "Future[None]":
+        path = _ruta(self.directorio, sesion)
+        fut: "Future[None]" = Future()
+        with self._lock:
+            self._usos[sesion] = time.time()
+            anterior = self._estados.get(sesion)
+            if anterior is None:
+                anterior = self._estados[sesion] = self._abrir(path)
+            if parcial:
+                estado = {**anterior, **estado}
+            cambiados, borrados = _diferencia(anterior, estado)
+            completo = sesion in self._fallidas
+            if not cambiados and not borrados and not completo:
+                fut.set_result(None)
+                return fut
+            self._estados[sesion] = dict(estado)
+            self._fallidas.discard(sesion)
+        entrada: Dict[str, Any] = {"t": round(time.time(), 3), "c": cambiados}
+        if completo:
+            # Una escritura anterior falló: el disco no tiene el estado de `anterior`
+            entrada.update(c=dict(estado), r=1)
+        elif borrados:
+            entrada["b"] = borrados
+        linea = json.dumps(entrada, ensure_ascii=False, separators=(",", ":"), default=str) + "\n"
+        self._queue.put((sesion, linea.encode("utf-8"), fut))
+        return fut
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """Espera a que todo lo encolado hasta ahora esté en disco."""
+        fut: "Future[None]" = Future()
+        self._queue.put((None, b"", fut))
+        fut.result(timeout)
+
+    def descartar(self, sesion: str) -> None:
+        """Borra el diario de la sesión (p. ej., al empezar otra evaluación)."""
+        _ruta(self.directorio, sesion)  # valida antes de encolar
+        fut: "Future[None]" = Future()
+        self._queue.put((sesion, None, fut))
+        fut.result()
+        with self._lock:
+            self._olvidar(sesion)
+
+    def close(self) -> None:
+        self.flush()
+        self._queue.put(None)
+        self._writer.join()
+
+    def _write_loop(self) -> None:
+        while True:
+            try:
+                item = self._queue.get(timeout=max(0.0, self._proxima_limpieza - time.monotonic()))
+            except queue.Empty:
+                self._limpiar_periodico()
+                continue
+            if item is None:
+                break
+            batch = [item]
+            stop = False
+            # Junta lo que llegue durante `intervalo`
+            deadline = time.monotonic() + self.intervalo
+            while True:
+                try:
+                    nxt = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if nxt is None:
+                    stop = True
+                    break
+                batch.append(nxt)
+            self._escribir(batch)
+            if stop:
+                break
+            if time.monotonic() >= self._proxima_limpieza:
+                self._limpiar_periodico()
+
+    def _limpiar_periodico(self) -> None:
+        # En el hilo escritor: ningún agregado compite con el borrado
+        self._proxima_limpieza = time.monotonic() + self.limpiar_cada
+        try:
+            self.limpiar(self.max_dias)
+        except OSError:
+            pass  # se reintenta en la próxima vuelta
+
+    def _escribir(self, batch: List[tuple]) -> None:
+        # Por sesión: las líneas en orden; None = borrar el archivo
+        por_sesion: Dict[str, List[Optional[bytes]]] = {}
+        for sesion, linea, _ in batch:
+            if sesion is not None:
+                por_sesion.setdefault(sesion, []).append(linea)
+        errores: Dict[str, Exception] = {}
+        nuevos = False
+        for sesion, lineas in por_sesion.items():
+            path = _ruta(self.directorio, sesion)
+            try:
+                if None in lineas:
+                    corte = len(lineas) - 1 - lineas[::-1].index(None)
+                    if os.path.exists(path):
+                        os.remove(path)
+                    self._lineas.pop(sesion, None)
+                    lineas = lineas[corte + 1:]
+                    if not lineas:
+                        continue
+                nuevos |= not os.path.exists(path)
+                with open(path, "ab") as fh:
+                    fh.write(b"".join(lineas))  # type: ignore[arg-type]
+                    fh.flush()
+                    os.fsync(fh.fileno())
+                self.escrituras += 1
+                self.fsyncs += 1
+                self._lineas[sesion] = self._lineas.get(sesion, 0) + len(lineas)
+                if self._lineas[sesion] >= self.compactar_cada:
+                    self._compactar(sesion, path)
+            except OSError as exc:
+                errores[sesion] = exc
+                try:
+                    reparar(path)  # sin la línea a medias, el próximo agregado queda legible
+                except OSError:
+                    pass
+        if errores:
+            with self._lock:
+                self._fallidas.update(errores)
+        if nuevos:
+            _fsync_directorio(self.directorio)
+        for sesion, _, fut in batch:
+            if sesion in errores:
+                fut.set_exception(errores[sesion])
+            else:
+                fut.set_result(None)
+
+    def _compactar(self, sesion: str, path: str) -> None:
+        estado = leer(path)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as fh:
+            entrada = {"t": round(time.time(), 3), "c": estado}
+            fh.write((json.dumps(entrada, ensure_ascii=False, separators=(",", ":"), default=str) + "\n").encode("utf-8"))
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, path)
+        _fsync_directorio(self.directorio)
+        self._lineas[sesion] = 1
+        self.compactaciones += 1
+
+    # ----- lectura -----
+
+    @staticmethod
+    def _abrir(path: str) -> Dict[str, Any]:
+        # Primera vez que el proceso ve la sesión (con el lock tomado): el
+        # escritor todavía no agrega a este archivo, así que se puede reparar.
+        if not os.path.exists(path):
+            return {}
+        reparar(path)
+        return leer(path)
+
+    def recuperar(self, sesion: str) -> Optional[Dict[str, Any]]:
+        """Último estado registrado de la sesión (el del diario en disco si este
+        proceso todavía no la vio), o None si no hay diario."""
+        try:
+            path = _ruta(self.directorio, sesion)
+        except ValueError:
+            return None
+        with self._lock:
+            estado = self._estados.get(sesion)
+            if estado is None:
+                if not os.path.exists(path):
+                    return None
+                estado = self._estados[sesion] = self._abrir(path)
+                self._usos[sesion] = time.time()
+            return dict(estado)
+
+    def _olvidar(self, sesion: str) -> None:
+        # Con el lock tomado
+        self._estados.pop(sesion, None)
+        self._usos.pop(sesion, None)
+        self._fallidas.discard(sesion)
+
+    def limpiar(self, max_dias: float) -> int:
+        """Borra los diarios sin cambios en `max_dias` días y olvida las sesiones
+        sin registros en ese plazo; devuelve cuántos archivos borró."""
+        limite = time.time() - max_dias * 86400
+        borrados = 0
+        for entrada in os.scandir(self.directorio):
+            if entrada.name.endswith((EXTENSION, ".tmp")) and entrada.stat().st_mtime < limite:
+                os.remove(entrada.path)
+                with self._lock:
+                    self._olvidar(entrada.name[: -len(EXTENSION)])
+                borrados += 1
+        with self._lock:
+            for sesion in [s for s, t in self._usos.items() if t < limite]:
+                self._olvidar(sesion)
+        return borrados
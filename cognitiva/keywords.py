@@ -0,0 +1,130 @@
+# cognitiva/keywords.py — Registro de ítems de semejanzas (Abstracción)
+# Cada ítem tiene su campo en `respuestas`, la pregunta y una lista de
+# palabras clave. Las claves de un ítem se compilan una sola vez en una
+# expresión regular con forma de trie (prefijos comunes factorizados), así
+# que buscar en una respuesta recorre el texto una vez, sin importar cuántas
+# claves tenga el ítem.
+#
+# Normalización: minúsculas, sin tildes (ver matching.fold) y espacios
+# simples. Una clave se busca como raíz al comienzo de una palabra, con
+# cualquier terminación: plurales, derivados y pronombres enclíticos
+# ("fruta" -> "frutas", "frutales"; "comer" -> "comerlas"; "mover" ->
+# "movernos"), como la búsqueda por subcadena original. No se reconoce en
+# medio de una palabra ("recomer"); "comer" sí reconoce "comercio".
+#
+# Un registro propio se carga desde JSON:
+#   {"items": [{"campo": "abs_mesa_silla", "pregunta": "¿En qué se parecen...?",
+#               "claves": ["mueble", "muebles"], "puntos": 2}, ...]}
+
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List
+
+from .matching import fold
+
+_ESPACIOS = re.compile(r"\s+")
+_TERMINACION = r"\w*"
+
+
+def normalizar_texto(texto: str) -> str:
+    return _ESPACIOS.sub(" ", fold(str(texto)))
+
+
+def _trie_pattern(palabras: Iterable[str]) -> str:
+    trie: Dict[str, Any] = {}
+    for p in palabras:
+        nodo = trie
+        for c in p:
+            nodo = nodo.setdefault(c, {})
+        nodo[""] = {}
+
+    def build(nodo: Dict[str, Any]) -> str:
+        fin = "" in nodo
+        ramas = [re.escape(c) + build(hijo) for c, hijo in sorted(nodo.items()) if c]
+        if not ramas:
+            return ""
+        if len(ramas) == 1 and not fin:
+            return ramas[0]
+        alt = "(?:" + "|".join(ramas) + ")"
+        return alt + "?" if fin else alt
+
+    return build(trie)
+
+
+@dataclass
+class ItemSemejanza:
+    campo: str
+    pregunta: str
+    claves: List[str]
+    puntos: int = 2
+    _regex: "re.Pattern[str]" = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        claves = sorted({normalizar_texto(k) for k in self.claves if str(k).strip()})
+        if not claves:
+            raise ValueError(f"El ítem {self.campo!r} no tiene palabras clave")
+        self._regex = re.compile(r"\b(" + _trie_pattern(claves) + r")" + _TERMINACION)
+
+    def buscar(self, texto: Any) -> List[str]:
+        """Palabras clave encontradas en la respuesta (normalizadas, sin repetir)."""
+        norm = normalizar_texto(texto or "")
+        if not norm:
+            return []
+        return list(dict.fromkeys(m.group(1) for m in self._regex.finditer(norm)))
+
+
+class KeywordRegistry:
+    """Ítems de semejanzas compilados, en orden de presentación."""
+
+    def __init__(self, items: Iterable[ItemSemejanza]):
+        self.items = list(items)
+        campos = [it.campo for it in self.items]
+        if len(set(campos)) != len(campos):
+            raise ValueError("Hay campos de semejanzas repetidos")
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "KeywordRegistry":
+        return cls(
+            ItemSemejanza(
+                campo=str(it["campo"]),
+                pregunta=str(it.get("pregunta", it["campo"])),
+                claves=list(it["claves"]),
+                puntos=int(it.get("puntos", 2)),
+            )
+            for it in data["items"]
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "items": [
+                {"campo": it.campo, "pregunta": it.pregunta, "claves": list(it.claves), "puntos": it.puntos}
+                for it in self.items
+            ]
+        }
+
+    def coincidencias(self, r: Dict[str, Any]) -> Dict[str, List[str]]:
+        """Por cada ítem, las palabras clave halladas en su respuesta."""
+        return {it.campo: it.buscar(r.get(it.campo, "")) for it in self.items}
+
+    def puntos(self, r: Dict[str, Any]) -> int:
+        return sum(it.puntos for it in self.items if it.buscar(r.get(it.campo, "")))
+
+
+def load_registry(path: str) -> KeywordRegistry:
+    with open(path, encoding="utf-8") as fh:
+        return KeywordRegistry.from_dict(json.load(fh))
+
+
+DEFAULT_SEMEJANZAS = KeywordRegistry([
+    ItemSemejanza(
+        campo="abs_barco_auto",
+        pregunta="¿En qué se parecen un barco y un coche?",
+        claves=["transporte", "vehículo", "mover", "desplazarse"],
+    ),
+    ItemSemejanza(
+        campo="abs_uva_manzana",
+        pregunta="¿En qué se parecen una uva y una manzana?",
+        claves=["fruta", "alimento", "comer"],
+    ),
+])
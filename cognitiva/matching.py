@@ -0,0 +1,118 @@
+# cognitiva/matching.py — Reconocimiento de palabras recordadas
+# Cada lista de palabras objetivo se compila una vez en un WordMatcher:
+#   - índice exacto (set/dict) sobre palabras con acentos plegados
+#     ("cafe" == "café", "LÁPIZ" == "lapiz"; la ñ se conserva),
+#   - tolerancia a errores de tipeo por distancia de edición acotada,
+#     calculada con el algoritmo bit-paralelo de Myers/Hyyrö (una máscara
+#     de bits por palabra objetivo, O(len(palabra)) por comparación).
+# compile_matcher() cachea los matchers por lista, así que puntuar miles de
+# registros con las mismas palabras no recompila nada.
+
+import unicodedata
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Por debajo de este largo solo se aceptan coincidencias exactas:
+# con 3-4 letras una edición ya cambia la palabra ("sol" -> "sal").
+TYPO_MIN_LEN = 5
+
+_MEMO_MAX = 4096
+
+
+@lru_cache(maxsize=16384)
+def fold(word: str) -> str:
+    """Minúsculas sin tildes ni diéresis; conserva la ñ."""
+    word = word.strip().lower().replace("ñ", "\0")
+    decomposed = unicodedata.normalize("NFKD", word)
+    plain = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return plain.replace("\0", "ñ")
+
+
+def _peq(pattern: str) -> Dict[str, int]:
+    masks: Dict[str, int] = {}
+    for i, c in enumerate(pattern):
+        masks[c] = masks.get(c, 0) | (1 << i)
+    return masks
+
+
+def _myers_distance(peq: Dict[str, int], m: int, text: str) -> int:
+    """Distancia de Levenshtein entre el patrón (largo m, máscaras peq) y text."""
+    if m == 0:
+        return len(text)
+    mask = (1 << m) - 1
+    high = 1 << (m - 1)
+    pv, mv, score = mask, 0, m
+    for c in text:
+        eq = peq.get(c, 0)
+        xv = eq | mv
+        xh = ((((eq & pv) + pv) & mask) ^ pv) | eq
+        ph = mv | (~(xh | pv) & mask)
+        mh = pv & xh
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+        ph = ((ph << 1) | 1) & mask
+        mh = (mh << 1) & mask
+        pv = mh | (~(xv | ph) & mask)
+        mv = ph & xv
+    return score
+
+
+class WordMatcher:
+    """Lista de palabras objetivo compilada para reconocer respuestas."""
+
+    def __init__(self, target_words: Sequence[str], max_distance: int = 0):
+        self.target_words = list(target_words)
+        self.max_distance = max(0, int(max_distance))
+        self._folded = [fold(w) for w in self.target_words]
+        self._index: Dict[str, int] = {}
+        for i, w in enumerate(self._folded):
+            self._index.setdefault(w, i)
+        self._patterns: List[Tuple[str, int, Dict[str, int]]] = [
+            (w, len(w), _peq(w)) for w in self._folded
+        ]
+        self._memo: Dict[str, Optional[int]] = {}
+
+    def match(self, word: str) -> Optional[int]:
+        """Índice de la palabra objetivo reconocida, o None."""
+        w = fold(word)
+        hit = self._index.get(w)
+        if hit is not None or not self.max_distance or len(w) < TYPO_MIN_LEN:
+            return hit
+        if w in self._memo:
+            return self._memo[w]
+
+        best, best_d = None, self.max_distance + 1
+        for i, (target, m, peq) in enumerate(self._patterns):
+            if m < TYPO_MIN_LEN or abs(m - len(w)) >= best_d:
+                continue
+            d = _myers_distance(peq, m, w)
+            if d < best_d:
+                best, best_d = i, d
+        if len(self._memo) < _MEMO_MAX:
+            self._memo[w] = best
+        return best
+
+    def matched(self, user_words: Iterable[str]) -> List[int]:
+        """Índices de palabras objetivo reconocidas, sin repetir."""
+        seen: Dict[int, None] = {}
+        for word in user_words:
+            i = self.match(word)
+            if i is not None:
+                seen.setdefault(i, None)
+        return list(seen)
+
+    def count(self, user_words: Iterable[str]) -> int:
+        # Cada palabra objetivo suma una sola vez ("perro, perro" = 1 acierto).
+        return len(self.matched(user_words))
+
+
+@lru_cache(maxsize=256)
+def _compile(target_words: Tuple[str, ...], max_distance: int) -> WordMatcher:
+    return WordMatcher(target_words, max_distance)
+
+
+def compile_matcher(target_words: Sequence[str], max_distance: int = 0) -> WordMatcher:
+    """WordMatcher compartido para una lista de palabras objetivo."""
+    return _compile(tuple(target_words), int(max_distance))
@@ -0,0 +1,195 @@
+# cognitiva/metrics.py — Tiempos por sección y por función de puntaje
+# Histogramas de duración con cubetas fijas (como los de Prometheus): sumar
+# una observación es O(log cubetas) y memoria constante, y p50/p95/p99 se
+# estiman interpolando dentro de la cubeta, igual que histogram_quantile().
+#
+# Cada sesión tiene su Metricas con `padre` = GLOBAL (todas las sesiones del
+# proceso). Con la medición apagada (COGNITIVA_METRICS=0), seccion() devuelve
+# un contexto nulo compartido y observar() retorna de inmediato.
+#
+# Salidas: texto Prometheus o JSON, a un archivo (como mucho cada `cada`
+# segundos, reemplazo atómico) o por HTTP en un puerto local (/metrics y
+# /metrics.json).
+
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, Any, ContextManager, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+# Límites superiores de las cubetas, en segundos (la última es +Inf)
+CUBETAS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+CUANTILES = (0.5, 0.95, 0.99)
+
+_NULO = nullcontext()
+
+
+class Histograma:
+    __slots__ = ("conteos", "suma", "n")
+
+    def __init__(self) -> None:
+        self.conteos = [0] * (len(CUBETAS) + 1)
+        self.suma = 0.0
+        self.n = 0
+
+    def observar(self, segundos: float) -> None:
+        self.conteos[bisect_left(CUBETAS, segundos)] += 1
+        self.suma += segundos
+        self.n += 1
+
+    def cuantil(self, q: float) -> Optional[float]:
+        """Estimación lineal dentro de la cubeta que contiene el rango q·n."""
+        if not self.n:
+            return None
+        rango = q * self.n
+        acumulado = 0
+        for i, c in enumerate(self.conteos):
+            if acumulado + c >= rango and c:
+                if i == len(CUBETAS):  # +Inf: se informa el último límite finito
+                    return CUBETAS[-1]
+                inferior = CUBETAS[i - 1] if i else 0.0
+                return inferior + (CUBETAS[i] - inferior) * (rango - acumulado) / c
+            acumulado += c
+        return CUBETAS[-1]
+
+    def resumen(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {"n": self.n, "suma_s": self.suma}
+        for q in CUANTILES:
+            out[f"p{int(q * 100)}_s"] = self.cuantil(q)
+        return out
+
+
+class _Seccion:
+    __slots__ = ("metricas", "nombre", "t0")
+
+    def __init__(self, metricas: "Metricas", nombre: str):
+        self.metricas = metricas
+        self.nombre = nombre
+
+    def __enter__(self) -> None:
+        self.t0 = time.perf_counter()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.metricas.observar(self.nombre, time.perf_counter() - self.t0)
+
+
+class Metricas:
+    """Histogramas por nombre; cada observación se propaga al padre."""
+
+    def __init__(self, activo: bool = True, padre: Optional["Metricas"] = None):
+        self.activo = activo
+        self.padre = padre
+        self._hist: Dict[str, Histograma] = {}
+        self._lock = threading.Lock()
+
+    def observar(self, nombre: str, segundos: float) -> None:
+        if not self.activo:
+            return
+        with self._lock:
+            h = self._hist.get(nombre)
+            if h is None:
+                h = self._hist[nombre] = Histograma()
+            h.observar(segundos)
+        if self.padre is not None:
+            self.padre.observar(nombre, segundos)
+
+    def seccion(self, nombre: str) -> ContextManager[None]:
+        """Mide el bloque `with`; sin costo apreciable si está apagado."""
+        return _Seccion(self, nombre) if self.activo else _NULO
+
+    def nombres(self) -> List[str]:
+        with self._lock:
+            return list(self._hist)
+
+    def resumen(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {nombre: h.resumen() for nombre, h in self._hist.items()}
+
+    def to_json(self) -> str:
+        return json.dumps({"seccion_segundos": self.resumen()}, ensure_ascii=False, indent=2)
+
+    def to_prometheus(self, prefijo: str = "cognitiva") -> str:
+        metrica = f"{prefijo}_seccion_segundos"
+        lineas = [
+            f"# HELP {metrica} Duración por sección (app, funciones de puntaje o servicio).",
+            f"# TYPE {metrica} histogram",
+        ]
+        with self._lock:
+            for nombre, h in sorted(self._hist.items()):
+                etiqueta = nombre.replace("\\", "\\\\").replace('"', '\\"')
+                acumulado = 0
+                for limite, c in zip(CUBETAS + (float("inf"),), h.conteos):
+                    acumulado += c
+                    le = "+Inf" if limite == float("inf") else repr(limite)
+                    lineas.append(f'{metrica}_bucket{{seccion="{etiqueta}",le="{le}"}} {acumulado}')
+                lineas.append(f'{metrica}_sum{{seccion="{etiqueta}"}} {h.suma!r}')
+                lineas.append(f'{metrica}_count{{seccion="{etiqueta}"}} {h.n}')
+        return "\n".join(lineas) + "\n"
+
+
+def _activo_por_entorno() -> bool:
+    return os.environ.get("COGNITIVA_METRICS", "1") != "0"
+
+
+GLOBAL = Metricas(activo=_activo_por_entorno())
+
+
+class EscritorArchivo:
+    """Vuelca las métricas a un archivo (.json o texto Prometheus), con límite de frecuencia."""
+
+    def __init__(self, metricas: Metricas, path: str, cada: float = 5.0):
+        self.metricas = metricas
+        self.path = path
+        self.cada = cada
+        self._ultimo = 0.0
+        self._lock = threading.Lock()
+
+    def escribir(self, forzar: bool = False) -> bool:
+        ahora = time.monotonic()
+        if not forzar and ahora - self._ultimo < self.cada:
+            return False
+        with self._lock:
+            self._ultimo = ahora
+            texto = self.metricas.to_json() if self.path.endswith(".json") else self.metricas.to_prometheus()
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as fh:
+                fh.write(texto)
+            os.replace(tmp, self.path)
+        return True
+
+
+def servir(metricas: Metricas, puerto: int, host: str = "127.0.0.1") -> "ThreadingHTTPServer":
+    """Expone /metrics (Prometheus) y /metrics.json en un hilo de fondo."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer  # solo si se pide el puerto
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802 (nombre fijado por http.server)
+            if self.path.startswith("/metrics.json"):
+                cuerpo, tipo = metricas.to_json(), "application/json"
+            elif self.path.startswith("/metrics"):
+                cuerpo, tipo = metricas.to_prometheus(), "text/plain; version=0.0.4"
+            else:
+                self.send_error(404)
+                return
+            datos = cuerpo.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", f"{tipo}; charset=utf-8")
+            self.send_header("Content-Length", str(len(datos)))
+            self.end_headers()
+            self.wfile.write(datos)
+
+        def log_message(self, *args: Any) -> None:
+            pass
+
+    server = ThreadingHTTPServer((host, puerto), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metricas-http", daemon=True).start()
+    return server
@@ -0,0 +1,304 @@
+# cognitiva/norms.py — Tablas normativas: percentil y z por edad y educación
+# Requiere numpy.
+#
+# Fuente (CSV), una fila por punto de la curva de cada estrato:
+#   serie,edad_min,edad_max,educacion_min,educacion_max,puntaje,percentil
+#   total,60,69,0,7,18,5
+#   total,60,69,0,7,25,50
+#   ...
+# `serie` es un dominio de DOMINIOS o "total"; los rangos de edad y años de
+# educación son inclusivos. Dentro de un estrato los puntajes deben ser
+# estrictamente crecientes y los percentiles no decrecientes (0-100).
+#
+# Al cargar, todas las curvas quedan en dos arreglos planos ordenados
+# (puntajes y percentiles) más un índice de estratos con su tramo [inicio,
+# fin). compilar() los guarda como .npy en un directorio, y load_norms() de
+# ese directorio los abre con mmap: cargar una tabla grande no la copia a
+# memoria. Una consulta de cohorte resuelve el estrato una vez por par
+# (edad, educación) distinto y luego hace una sola búsqueda binaria con
+# interpolación lineal (np.interp) sobre todas las curvas a la vez.
+# Fuera del rango de la curva el percentil se satura en sus extremos.
+#
+# El z informado es el equivalente normal del percentil (z tal que
+# Φ(z) = percentil/100), acotado a ±3.5.
+
+import csv
+import json
+import os
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from .scoring import DOMINIOS
+
+SERIES = DOMINIOS + ["total"]
+Z_MAX = 3.5
+_MAX_GRILLA = 1 << 22  # posiciones enteras precalculadas como máximo
+
+# Columnas del índice de estratos
+_SERIE, _EDAD_MIN, _EDAD_MAX, _EDU_MIN, _EDU_MAX, _INICIO, _FIN = range(7)
+
+
+def _z_desde_percentil(p: np.ndarray) -> np.ndarray:
+    """Inversa de la normal estándar (aproximación de Acklam, error < 1.2e-9)."""
+    a = (-3.969683028665376e01, 2.209460984245205e02, -2.759285104469687e02,
+         1.383577518672690e02, -3.066479806614716e01, 2.506628277459239e00)
+    b = (-5.447609879822406e01, 1.615858368580409e02, -1.556989798598866e02,
+         6.680131188771972e01, -1.328068155288572e01)
+    c = (-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e00,
+         -2.549732539343734e00, 4.374664141464968e00, 2.938163982698783e00)
+    d = (7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e00, 3.754408661907416e00)
+
+    q = np.clip(np.asarray(p, dtype=np.float64) / 100.0, 1e-12, 1 - 1e-12)
+    z = np.empty_like(q)
+    bajo = q < 0.02425
+    alto = q > 1 - 0.02425
+    medio = ~(bajo | alto)
+
+    r = q[medio] - 0.5
+    s = r * r
+    z[medio] = (((((a[0] * s + a[1]) * s + a[2]) * s + a[3]) * s + a[4]) * s + a[5]) * r / (
+        ((((b[0] * s + b[1]) * s + b[2]) * s + b[3]) * s + b[4]) * s + 1
+    )
+    for mask, signo, qq in ((bajo, 1.0, q[bajo]), (alto, -1.0, 1 - q[alto])):
+        t = np.sqrt(-2 * np.log(qq))
+        z[mask] = signo * (((((c[0] * t + c[1]) * t + c[2]) * t + c[3]) * t + c[4]) * t + c[5]) / (
+            (((d[0] * t + d[1]) * t + d[2]) * t + d[3]) * t + 1
+        )
+    return np.clip(z, -Z_MAX, Z_MAX)
+
+
+def _enteros(a: np.ndarray) -> bool:
+    return a.dtype.kind in "iub" or (a.dtype.kind == "f" and bool(np.all(a == np.floor(a))))
+
+
+def _pares(edad: Any, educacion: Any, forma: Tuple[int, ...]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Pares (edad, educación) distintos y, por fila, el índice de su par.
+    Con edades y años enteros en un rango chico se indexa una grilla sin
+    ordenar; si no, np.unique."""
+    edad = np.broadcast_to(np.asarray(edad), forma).ravel()
+    educacion = np.broadcast_to(np.asarray(educacion), forma).ravel()
+    if edad.size and _enteros(edad) and _enteros(educacion):
+        e0, u0 = int(edad.min()), int(educacion.min())
+        alto, ancho = int(edad.max()) - e0 + 1, int(educacion.max()) - u0 + 1
+        if alto * ancho <= 1 << 16:
+            inv = edad.astype(np.intp) * ancho
+            inv += educacion.astype(np.intp)
+            inv -= e0 * ancho + u0
+            return np.repeat(np.arange(alto) + e0, ancho), np.tile(np.arange(ancho) + u0, alto), inv
+    pares, inv = np.unique(edad.astype(np.float64) + 1j * educacion.astype(np.float64), return_inverse=True)
+    return pares.real, pares.imag, inv.ravel()
+
+
+class NormTable:
+    """Curvas normativas por serie y estrato (edad, años de educación)."""
+
+    def __init__(self, series: List[str], estratos: np.ndarray, puntajes: np.ndarray, percentiles: np.ndarray):
+        self.series = list(series)
+        self.estratos = estratos  # int32 (m, 7), ordenado por serie
+        self.puntajes = puntajes  # float64, curvas concatenadas
+        self.percentiles = percentiles
+        self._por_serie: Dict[str, np.ndarray] = {
+            s: np.flatnonzero(estratos[:, _SERIE] == i) for i, s in enumerate(self.series)
+        }
+        self._eje: Optional[Tuple[np.ndarray, np.ndarray, Optional[np.ndarray], Optional[np.ndarray]]] = None
+
+    # ----- construcción -----
+
+    @classmethod
+    def from_rows(cls, rows: List[Mapping[str, Any]]) -> "NormTable":
+        curvas: Dict[Tuple[str, int, int, int, int], List[Tuple[float, float]]] = {}
+        for i, r in enumerate(rows, 2):
+            serie = str(r["serie"]).strip()
+            if serie not in SERIES:
+                raise ValueError(f"Fila {i}: serie desconocida {serie!r}")
+            clave = (serie, int(r["edad_min"]), int(r["edad_max"]), int(r["educacion_min"]), int(r["educacion_max"]))
+            percentil = float(r["percentil"])
+            if not 0 <= percentil <= 100:
+                raise ValueError(f"Fila {i}: percentil fuera de 0-100")
+            curvas.setdefault(clave, []).append((float(r["puntaje"]), percentil))
+
+        series = [s for s in SERIES if any(k[0] == s for k in curvas)]
+        estratos, puntajes, percentiles = [], [], []
+        inicio = 0
+        for clave in sorted(curvas, key=lambda k: (series.index(k[0]),) + k[1:]):
+            puntos = sorted(curvas[clave])
+            xs = [x for x, _ in puntos]
+            ps = [p for _, p in puntos]
+            if any(b <= a for a, b in zip(xs, xs[1:])):
+                raise ValueError(f"Estrato {clave}: puntajes repetidos")
+            if any(b < a for a, b in zip(ps, ps[1:])):
+                raise ValueError(f"Estrato {clave}: los percentiles deben crecer con el puntaje")
+            estratos.append([series.index(clave[0]), *clave[1:], inicio, inicio + len(xs)])
+            puntajes.extend(xs)
+            percentiles.extend(ps)
+            inicio += len(xs)
+        return cls(
+            series,
+            np.asarray(estratos, dtype=np.int32).reshape(-1, 7),
+            np.asarray(puntajes, dtype=np.float64),
+            np.asarray(percentiles, dtype=np.float64),
+        )
+
+    @classmethod
+    def from_csv(cls, path: str) -> "NormTable":
+        with open(path, encoding="utf-8", newline="") as fh:
+            return cls.from_rows(list(csv.DictReader(fh)))
+
+    def save(self, directorio: str) -> None:
+        """Formato compilado: .npy abribles con mmap más las series en JSON."""
+        os.makedirs(directorio, exist_ok=True)
+        np.save(os.path.join(directorio, "estratos.npy"), self.estratos)
+        np.save(os.path.join(directorio, "puntajes.npy"), self.puntajes)
+        np.save(os.path.join(directorio, "percentiles.npy"), self.percentiles)
+        with open(os.path.join(directorio, "series.json"), "w", encoding="utf-8") as fh:
+            json.dump(self.series, fh, ensure_ascii=False)
+
+    @classmethod
+    def open(cls, directorio: str) -> "NormTable":
+        with open(os.path.join(directorio, "series.json"), encoding="utf-8") as fh:
+            series = json.load(fh)
+        return cls(
+            series,
+            np.load(os.path.join(directorio, "estratos.npy")),
+            np.load(os.path.join(directorio, "puntajes.npy"), mmap_mode="r"),
+            np.load(os.path.join(directorio, "percentiles.npy"), mmap_mode="r"),
+        )
+
+    # ----- consultas -----
+
+    def _eje_global(self) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray], Optional[np.ndarray]]:
+        """Todas las curvas en un solo eje creciente: cada estrato se desplaza
+        para empezar una unidad después del final del anterior. Así una sola
+        búsqueda resuelve filas de estratos distintos. Si los puntajes son
+        enteros, además se precalculan percentil y z para cada posición
+        entera del eje (grilla), y una consulta de enteros es solo indexar.
+        Se arma en la primera consulta (con mmap, es la única copia en memoria)."""
+        if self._eje is None:
+            inicio = self.estratos[:, _INICIO]
+            fin = self.estratos[:, _FIN]
+            desplazamiento = np.zeros(len(inicio))
+            if len(inicio) > 1:
+                desplazamiento[1:] = np.cumsum(self.puntajes[fin[:-1] - 1] - self.puntajes[inicio[1:]] + 1)
+            eje = np.asarray(self.puntajes) + np.repeat(desplazamiento, fin - inicio)
+            grilla_p = grilla_z = None
+            if len(eje) and np.all(eje == np.floor(eje)) and eje[-1] - eje[0] < _MAX_GRILLA:
+                grilla_p = np.append(np.interp(np.arange(eje[0], eje[-1] + 1), eje, self.percentiles), np.nan)
+                grilla_z = _z_desde_percentil(grilla_p)
+            self._eje = (eje, desplazamiento, grilla_p, grilla_z)
+        return self._eje
+
+    def _estrato_por_par(self, serie: str, edad: np.ndarray, educacion: np.ndarray) -> np.ndarray:
+        """Índice del estrato (primero que coincide) por par; -1 si ninguno."""
+        filas = self._por_serie.get(serie)
+        if filas is None or len(filas) == 0:
+            return np.full(len(edad), -1, dtype=np.intp)
+        e = self.estratos[filas]
+        dentro = (
+            (edad[:, None] >= e[:, _EDAD_MIN]) & (edad[:, None] <= e[:, _EDAD_MAX])
+            & (educacion[:, None] >= e[:, _EDU_MIN]) & (educacion[:, None] <= e[:, _EDU_MAX])
+        )
+        return np.where(dentro.any(axis=1), filas[dentro.argmax(axis=1)], -1)
+
+    def _buscar(self, x: np.ndarray, estrato_par: np.ndarray, inv: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(percentil, z) por fila. `estrato_par` es el estrato de cada par
+        (edad, educación), -1 sin norma, e `inv` el par de cada fila: todo lo
+        que depende del estrato se arma por par y se reparte con un índice."""
+        ok = estrato_par >= 0
+        if not ok.any():
+            return np.full(x.shape, np.nan), np.full(x.shape, np.nan)
+        eje, desplazamiento, grilla_p, grilla_z = self._eje_global()
+        s = np.where(ok, estrato_par, 0)
+        lo = eje[self.estratos[s, _INICIO]]
+        hi = eje[self.estratos[s, _FIN] - 1]
+        if grilla_p is not None and x.size and _enteros(x):
+            x0 = int(x.min())
+            ancho = int(x.max()) - x0 + 1
+            if len(ok) * ancho <= _MAX_GRILLA:
+                # Posición en la grilla por (par, puntaje); los pares sin norma
+                # van a la última (NaN). Cada fila queda en un solo índice.
+                nan = len(grilla_p) - 1
+                base = np.where(ok, desplazamiento[s] - eje[0], 0)
+                lo = np.where(ok, lo - eje[0], nan)
+                hi = np.where(ok, hi - eje[0], nan)
+                xs = np.arange(ancho) + x0
+                pos = np.clip(xs + base[:, None], lo[:, None], hi[:, None]).astype(np.intp).ravel()
+                fila = inv * ancho
+                fila += x.astype(np.intp, copy=False)
+                fila -= x0
+                return np.take(grilla_p[pos], fila), np.take(grilla_z[pos], fila)
+        x = x.astype(np.float64, copy=False)
+        lo = np.where(ok, lo, np.nan)
+        hi = np.where(ok, hi, np.nan)
+        p = np.interp(np.clip(x + desplazamiento[s][inv], lo[inv], hi[inv]), eje, self.percentiles)
+        return p, _z_desde_percentil(p)
+
+    def percentiles_de(self, serie: str, puntajes: Any, edad: Any, educacion: Any) -> np.ndarray:
+        """Percentil por fila (NaN si la serie o el estrato no tienen norma)."""
+        x = np.atleast_1d(np.asarray(puntajes))
+        pares_edad, pares_edu, inv = _pares(edad, educacion, x.shape)
+        return self._buscar(x, self._estrato_por_par(serie, pares_edad, pares_edu), inv)[0]
+
+    def evaluar_columnas(
+        self, puntajes: Mapping[str, Any], edad: Any, educacion: Any
+    ) -> Dict[str, Dict[str, np.ndarray]]:
+        """Para cada serie presente en `puntajes` (p. ej. la salida de
+        score_columns): {"percentil": arreglo, "z": arreglo}."""
+        out: Dict[str, Dict[str, np.ndarray]] = {}
+        pares = None
+        for serie in self.series:
+            if serie not in puntajes:
+                continue
+            x = np.atleast_1d(np.asarray(puntajes[serie]))
+            if pares is None:  # el estrato de cada fila depende solo de (edad, educación)
+                pares = _pares(edad, educacion, x.shape)
+            pares_edad, pares_edu, inv = pares
+            p, z = self._buscar(x, self._estrato_por_par(serie, pares_edad, pares_edu), inv)
+            out[serie] = {"percentil": p, "z": z}
+        return out
+
+    def evaluar(
+        self, subtotales: Mapping[str, int], total: int, edad: Optional[float], educacion: Optional[float]
+    ) -> Dict[str, Tuple[float, float]]:
+        """Una evaluación: serie -> (percentil, z), solo series con norma para el estrato."""
+        if edad is None or educacion is None:
+            return {}
+        puntajes = {**subtotales, "total": total}
+        res = self.evaluar_columnas({s: [v] for s, v in puntajes.items()}, edad, educacion)
+        return {
+            s: (float(r["percentil"][0]), float(r["z"][0]))
+            for s, r in res.items()
+            if not np.isnan(r["percentil"][0])
+        }
+
+
+def compilar(csv_path: str, directorio: str) -> NormTable:
+    tabla = NormTable.from_csv(csv_path)
+    tabla.save(directorio)
+    return tabla
+
+
+def load_norms(path: str) -> NormTable:
+    """CSV fuente o directorio compilado (abierto con mmap)."""
+    if os.path.isdir(path):
+        return NormTable.open(path)
+    return NormTable.from_csv(path)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="python -m cognitiva.norms",
+        description="Compila una tabla normativa CSV al formato binario (directorio de .npy).",
+    )
+    parser.add_argument("csv", help="Tabla normativa CSV")
+    parser.add_argument("salida", help="Directorio de salida")
+    args = parser.parse_args(argv)
+    tabla = compilar(args.csv, args.salida)
+    print(f"{len(tabla.estratos)} estratos, {len(tabla.puntajes)} puntos, series: {', '.join(tabla.series)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,113 @@
+# cognitiva/profiles.py — Perfiles de configuración con nombre y versión
+# Cada variante del protocolo (máximos, fluidez, umbrales) se describe en un
+# JSON, se valida una sola vez al cargarla y se identifica como
+# "<nombre>@<version>". Esa clave es la que se guarda con cada resultado y la
+# que usan los lotes para agrupar registros sin volver a leer su config.
+#
+#   {"nombre": "estandar", "version": 2, "descripcion": "...",
+#    "config": {"maximos": {"Atención": 8}, "animals_per_point": 4, ...}}
+#
+# Un cambio de parámetros debe subir la versión: dos archivos con la misma
+# clave y distinta config se rechazan.
+
+import json
+import os
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional
+
+from .scoring import ScoringConfig
+
+_NOMBRE = re.compile(r"^[\w-]+$")
+
+
+@dataclass(frozen=True)
+class Perfil:
+    nombre: str
+    version: int
+    config: ScoringConfig
+    descripcion: str = ""
+
+    @property
+    def clave(self) -> str:
+        return f"{self.nombre}@{self.version}"
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Perfil":
+        nombre = str(data.get("nombre", "")).strip()
+        if not _NOMBRE.match(nombre):
+            raise ValueError(f"Nombre de perfil inválido: {nombre!r} (letras, números, _ o -)")
+        version = data.get("version")
+        if not isinstance(version, int) or isinstance(version, bool) or version < 1:
+            raise ValueError(f"Perfil {nombre!r}: 'version' debe ser un entero >= 1")
+        cfg = ScoringConfig.from_dict(data.get("config"))
+        _validar_config(nombre, cfg)
+        return cls(nombre, version, cfg, str(data.get("descripcion", "")))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "nombre": self.nombre,
+            "version": self.version,
+            "descripcion": self.descripcion,
+            "config": self.config.to_dict(),
+        }
+
+
+def _validar_config(nombre: str, cfg: ScoringConfig) -> None:
+    malos = [dom for dom, v in cfg.maximos.items() if v < 1]
+    if malos:
+        raise ValueError(f"Perfil {nombre!r}: máximos deben ser >= 1 ({', '.join(malos)})")
+    if cfg.animals_per_point < 1 or cfg.max_fluency_points < 1:
+        raise ValueError(f"Perfil {nombre!r}: parámetros de fluidez deben ser >= 1")
+    if not 0 <= cfg.mid_threshold < cfg.high_threshold <= 100:
+        raise ValueError(f"Perfil {nombre!r}: se espera 0 <= mid_threshold < high_threshold <= 100")
+    if not 0 <= cfg.max_typo_distance <= 2:
+        raise ValueError(f"Perfil {nombre!r}: max_typo_distance debe estar entre 0 y 2")
+
+
+def load_profile(path: str) -> Perfil:
+    with open(path, encoding="utf-8") as fh:
+        try:
+            return Perfil.from_dict(json.load(fh))
+        except ValueError as exc:
+            raise ValueError(f"{path}: {exc}") from None
+
+
+class ProfileSet:
+    """Perfiles por clave; `resolver("nombre")` da la versión más alta."""
+
+    def __init__(self, perfiles: Iterable[Perfil]):
+        self._por_clave: Dict[str, Perfil] = {}
+        for p in perfiles:
+            previo = self._por_clave.get(p.clave)
+            if previo is not None and previo != p:
+                raise ValueError(f"Perfil {p.clave} definido dos veces con distinta config; suba la versión")
+            self._por_clave[p.clave] = p
+        self._ultima: Dict[str, Perfil] = {}
+        for p in self._por_clave.values():
+            if p.nombre not in self._ultima or p.version > self._ultima[p.nombre].version:
+                self._ultima[p.nombre] = p
+
+    def __len__(self) -> int:
+        return len(self._por_clave)
+
+    def claves(self) -> List[str]:
+        return sorted(self._por_clave, key=lambda k: (self._por_clave[k].nombre, -self._por_clave[k].version))
+
+    def resolver(self, clave: str) -> Perfil:
+        """Perfil por "nombre@version" o, sin versión, el más reciente de ese nombre."""
+        perfil = self._por_clave.get(clave) if "@" in clave else self._ultima.get(clave)
+        if perfil is None:
+            raise KeyError(f"Perfil desconocido: {clave!r}")
+        return perfil
+
+
+def load_profiles(directorio: Optional[str]) -> ProfileSet:
+    """Todos los *.json del directorio (vacío si no existe)."""
+    if not directorio or not os.path.isdir(directorio):
+        return ProfileSet([])
+    return ProfileSet(
+        load_profile(os.path.join(directorio, f))
+        for f in sorted(os.listdir(directorio))
+        if f.endswith(".json")
+    )
@@ -0,0 +1,167 @@
+# cognitiva/recursos.py — Recursos compartidos por todas las sesiones de un proceso
+# app.py y las páginas (pages/) los piden acá en lugar de crearlos cada una:
+# un único ResultStore (y su hilo escritor) por base, un único Diario por
+# directorio, una caché de artefactos, y el banco de palabras, el léxico, los
+# perfiles, las semejanzas y las normas compilados una vez.
+#
+# Cada accesor lee su ruta de una variable de entorno (la misma que documenta
+# el README) y guarda el objeto con lru_cache: vive lo que vive el proceso.
+# No se usa st.cache_resource a propósito: "Clear cache" en Streamlit crearía
+# un segundo escritor sobre la misma base. Este módulo no importa Streamlit;
+# los submódulos se importan al pedir cada recurso.
+
+import os
+from functools import lru_cache
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .cache import ArtifactCache
+    from .fluency import Lexico
+    from .journal import Diario
+    from .keywords import KeywordRegistry
+    from .metrics import EscritorArchivo
+    from .norms import NormTable
+    from .profiles import ProfileSet
+    from .store import ResultStore
+    from .wordbank import BancoFormas
+
+
+def _env(nombre: str, defecto: str) -> str:
+    return os.environ.get(nombre, defecto)
+
+
+@lru_cache(maxsize=None)
+def _store(path: str) -> "ResultStore":
+    from .store import ResultStore
+
+    return ResultStore(path)
+
+
+def store() -> "ResultStore":
+    """Almacén de resultados (COGNITIVA_DB, por defecto evaluaciones.db)."""
+    return _store(os.path.abspath(_env("COGNITIVA_DB", "evaluaciones.db")))
+
+
+@lru_cache(maxsize=None)
+def _diario(directorio: str) -> "Diario":
+    from .journal import Diario
+
+    return Diario(directorio)
+
+
+def diario() -> "Optional[Diario]":
+    """Autoguardado (COGNITIVA_DIARIO, por defecto diario/; vacío lo apaga)."""
+    directorio = _env("COGNITIVA_DIARIO", "diario")
+    return _diario(os.path.abspath(directorio)) if directorio else None
+
+
+@lru_cache(maxsize=None)
+def _cache(max_mb: float, ttl: float) -> "ArtifactCache":
+    from .cache import ArtifactCache
+
+    return ArtifactCache(max_bytes=int(max_mb * 1024 * 1024), ttl=ttl or None)
+
+
+def cache() -> "ArtifactCache":
+    """Caché de puntajes e informes (COGNITIVA_CACHE_MB, COGNITIVA_CACHE_TTL)."""
+    return _cache(float(_env("COGNITIVA_CACHE_MB", "32")), float(_env("COGNITIVA_CACHE_TTL", "600")))
+
+
+def semejanzas_path() -> str:
+    return _env("COGNITIVA_SEMEJANZAS", "semejanzas.json")
+
+
+@lru_cache(maxsize=None)
+def _semejanzas(path: str) -> "KeywordRegistry":
+    from .keywords import DEFAULT_SEMEJANZAS, load_registry
+
+    return load_registry(path) if os.path.exists(path) else DEFAULT_SEMEJANZAS
+
+
+def semejanzas() -> "KeywordRegistry":
+    """Ítems de Abstracción (COGNITIVA_SEMEJANZAS si existe, si no los incluidos)."""
+    return _semejanzas(semejanzas_path())
+
+
+@lru_cache(maxsize=None)
+def _lexico(path: Optional[str]) -> "Lexico":
+    from .fluency import load_lexicon
+
+    return load_lexicon(path)
+
+
+def lexico() -> "Lexico":
+    """Léxico de animales (COGNITIVA_ANIMALES o el incluido)."""
+    return _lexico(os.environ.get("COGNITIVA_ANIMALES"))
+
+
+@lru_cache(maxsize=None)
+def _formas(path: Optional[str]) -> "BancoFormas":
+    from .wordbank import load_forms
+
+    return load_forms(path)
+
+
+def formas() -> "BancoFormas":
+    """Banco de formas alternativas (COGNITIVA_FORMAS o formas.json)."""
+    return _formas(os.environ.get("COGNITIVA_FORMAS"))
+
+
+def perfiles_dir() -> str:
+    return _env("COGNITIVA_PERFILES", "perfiles")
+
+
+@lru_cache(maxsize=None)
+def _perfiles(directorio: str) -> "ProfileSet":
+    from .profiles import load_profiles
+
+    return load_profiles(directorio)
+
+
+def perfiles() -> "ProfileSet":
+    """Perfiles de configuración (COGNITIVA_PERFILES, por defecto perfiles/)."""
+    return _perfiles(perfiles_dir())
+
+
+@lru_cache(maxsize=None)
+def _normas(path: str) -> "Optional[NormTable]":
+    if not os.path.exists(path):
+        return None
+    from .norms import load_norms  # numpy: solo si hay tabla normativa
+
+    return load_norms(path)
+
+
+def normas() -> "Optional[NormTable]":
+    """Tabla normativa (COGNITIVA_NORMAS, por defecto normas.csv), o None si no existe."""
+    return _normas(_env("COGNITIVA_NORMAS", "normas.csv"))
+
+
+@lru_cache(maxsize=None)
+def _salida_metricas(path: str, puerto: int) -> "Optional[EscritorArchivo]":
+    from .metrics import GLOBAL, EscritorArchivo, servir
+
+    if puerto:
+        servir(GLOBAL, puerto)
+    return EscritorArchivo(GLOBAL, path) if path else None
+
+
+def salida_metricas() -> "Optional[EscritorArchivo]":
+    """Servidor /metrics (COGNITIVA_METRICS_PORT) y volcado a archivo
+    (COGNITIVA_METRICS_FILE), iniciados una vez por proceso."""
+    from .metrics import GLOBAL
+
+    if not GLOBAL.activo:
+        return None
+    return _salida_metricas(_env("COGNITIVA_METRICS_FILE", ""), int(_env("COGNITIVA_METRICS_PORT", "0")))
+
+
+def configuracion() -> List[Tuple[str, str]]:
+    """(variable, valor efectivo) de cada recurso, para diagnóstico."""
+    return [
+        ("COGNITIVA_DB", _env("COGNITIVA_DB", "evaluaciones.db")),
+        ("COGNITIVA_DIARIO", _env("COGNITIVA_DIARIO", "diario")),
+        ("COGNITIVA_SEMEJANZAS", semejanzas_path()),
+        ("COGNITIVA_PERFILES", perfiles_dir()),
+        ("COGNITIVA_NORMAS", _env("COGNITIVA_NORMAS", "normas.csv")),
+    ]
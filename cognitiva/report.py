@@ -0,0 +1,133 @@
+# cognitiva/report.py — Informe HTML imprimible
+# La plantilla se arma una sola vez al importar (string.Template) y cada
+# informe solo sustituye valores. El logo se codifica en base64 una vez por
+# contenido (clave: hash SHA-256), no en cada clic ni en cada informe.
+
+import base64
+import hashlib
+import re
+from collections import OrderedDict
+from datetime import datetime
+from string import Template
+from typing import Dict, Optional
+
+from .scoring import DOMINIOS
+
+_LOGO_CACHE: "OrderedDict[str, str]" = OrderedDict()
+_LOGO_CACHE_MAX = 16
+
+_FIRMA = Template("""
+      <div style='margin-top:40px;'>
+        <div style='border-top:1px solid #333; width:320px;'></div>
+        <div><strong>$sig_nombre</strong></div>
+        <div>$sig_rol</div>
+        <div>$sig_matricula</div>
+      </div>
+    """)
+
+REPORT_TEMPLATE = Template("""
+<!doctype html>
+<html lang='es'>
+<head>
+<meta charset='utf-8'/>
+<title>Evaluación Cognitiva — Informe</title>
+<style>
+  body { font-family: Arial, sans-serif; margin: 40px; }
+  header { display:flex; align-items:center; justify-content:space-between; margin-bottom:24px; }
+  h1 { font-size: 20px; margin: 0; }
+  .meta { color:#555; font-size: 12px; }
+  table { width:100%; border-collapse: collapse; margin-top: 16px; }
+  th, td { border:1px solid #ccc; padding:8px; text-align:left; }
+  th { background:#f5f5f5; }
+  .totals { margin-top:16px; font-weight:bold; }
+  .footer { margin-top:48px; font-size:12px; color:#666; }
+</style>
+</head>
+<body>
+  <header>
+    <div>$logo_html</div>
+    <div>
+      <h1>Evaluación Cognitiva — Informe</h1>
+      <div class='meta'>Generado: $today_str</div>
+    </div>
+  </header>
+
+  <section>
+    <p><strong>Paciente:</strong> $nombre — <strong>ID/HC:</strong> $id_paciente — <strong>Fecha evaluación:</strong> $fecha</p>
+  </section>
+
+  <table>
+    <thead><tr><th>Dominio</th><th>Puntaje</th><th>Máximo</th></tr></thead>
+    <tbody>
+      $rows_html
+    </tbody>
+  </table>
+
+  <div class='totals'>Total: $total / $max_total — $porcentaje%</div>
+
+  $firma_html
+
+  <div class='footer'>
+    <p>Herramienta educativa. No reemplaza evaluación médica profesional.</p>
+  </div>
+</body>
+</html>
+""")
+
+
+def logo_to_base64(data: Optional[bytes]) -> Optional[str]:
+    """Logo en base64, cacheado por hash del contenido."""
+    if not data:
+        return None
+    key = hashlib.sha256(data).hexdigest()
+    cached = _LOGO_CACHE.get(key)
+    if cached is None:
+        cached = base64.b64encode(data).decode("utf-8")
+        _LOGO_CACHE[key] = cached
+        if len(_LOGO_CACHE) > _LOGO_CACHE_MAX:
+            _LOGO_CACHE.popitem(last=False)
+    else:
+        _LOGO_CACHE.move_to_end(key)
+    return cached
+
+
+def report_filename(nombre: str, prefijo: str = "") -> str:
+    base = (nombre or "paciente").replace(" ", "_")
+    base = re.sub(r"[^\w.-]", "", base) or "paciente"
+    return f"informe_evaluacion_{prefijo}{base}.html"
+
+
+def render_html_report(
+    subtotales: Dict[str, int],
+    maximos: Dict[str, int],
+    total: int,
+    porcentaje: float,
+    logo_b64: Optional[str],
+    sig_nombre: str,
+    sig_rol: str,
+    sig_matricula: str,
+    nombre: str = "",
+    id_paciente: str = "",
+    fecha: object = "",
+    generado: Optional[datetime] = None,
+) -> str:
+    today_str = (generado or datetime.now()).strftime("%Y-%m-%d %H:%M")
+    logo_html = f'<img src="data:image/png;base64,{logo_b64}" style="height:64px;" />' if logo_b64 else ""
+    rows_html = "".join(
+        f"<tr><td>{dom}</td><td>{subtotales.get(dom,0)}</td><td>{maximos.get(dom,0)}</td></tr>" for dom in DOMINIOS
+    )
+    firma_html = _FIRMA.substitute(
+        sig_nombre=sig_nombre or "", sig_rol=sig_rol or "", sig_matricula=sig_matricula or ""
+    )
+    return REPORT_TEMPLATE.substitute(
+        logo_html=logo_html,
+        today_str=today_str,
+        nombre=nombre,
+        id_paciente=id_paciente,
+        fecha=fecha,
+        rows_html=rows_html,
+        total=total,
+        max_total=sum(maximos.values()),
+        porcentaje=f"{porcentaje:.2f}",
+        firma_html=firma_html,
+    )
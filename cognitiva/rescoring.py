@@ -0,0 +1,311 @@
+# cognitiva/rescoring.py — Re-puntaje de una cohorte con otra configuración
+# Requiere numpy.
+#
+# Cada evaluación guarda sus puntos brutos por dominio (sin el máximo de
+# cfg.maximos, ver scoring.puntos_brutos). Con ellos, cambiar la
+# configuración de un centro no obliga a volver a puntuar las respuestas:
+#   - máximos por dominio: los subtotales salen de recortar los brutos
+#     (np.minimum por columna), y con ellos el total, el porcentaje y la
+#     interpretación;
+#   - umbrales: solo cambia la interpretación;
+#   - animales por punto / máximo de fluidez: se corrige solo la parte de
+#     fluidez de Lenguaje/Ejecutivo, con `len_animales` (json_extract, sin
+#     decodificar las respuestas);
+#   - tolerancia a errores de tipeo: se vuelven a contar solo las palabras de
+#     los dos dominios de memoria.
+# Las evaluaciones guardadas antes de los brutos se puntúan una vez desde sus
+# respuestas (con la fecha de la evaluación como "hoy") y quedan completas.
+#
+# repuntuar() trabaja por tramos de id dentro de la transacción del escritor
+# de ResultStore (ResultStore.repuntuar): reescribe solo las filas que
+# cambian y ajusta los rollups de cohort (descontando y sumando bloques por
+# grupo) y de trends (una vez por paciente) en la misma transacción.
+
+import json
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from . import cohort, trends
+from .keywords import DEFAULT_SEMEJANZAS, KeywordRegistry
+from .scoring import (
+    DOMINIOS,
+    ScoringConfig,
+    interpretar,
+    puntos_brutos,
+    puntos_memoria_diferida,
+    puntos_memoria_inmediata,
+)
+from .store import _BRUTO_COLS, _DOM_COLS
+
+_LENGUAJE = DOMINIOS.index("Lenguaje/Ejecutivo")
+_MEM_INM = DOMINIOS.index("Memoria inmediata")
+_MEM_DIF = DOMINIOS.index("Memoria diferida")
+
+
+@dataclass
+class Resultado:
+    filas: int = 0  # evaluaciones del filtro
+    actualizadas: int = 0  # reescritas (cambió algún puntaje, el perfil o la configuración)
+    completadas: int = 0  # sin brutos guardados: puntuadas desde las respuestas
+    recortados: Set[str] = field(default_factory=set)  # dominios con otro máximo
+    recalculados: Set[str] = field(default_factory=set)  # dominios con otros brutos
+    segundos: float = 0.0
+
+
+def cambios(anterior: ScoringConfig, nueva: ScoringConfig) -> Tuple[Set[str], Set[str]]:
+    """(dominios con otro máximo, dominios cuyos brutos cambian) entre dos configuraciones."""
+    recortados = {d for d in DOMINIOS if anterior.maximos.get(d) != nueva.maximos[d]}
+    recalculados = set()
+    if (anterior.animals_per_point, anterior.max_fluency_points) != (nueva.animals_per_point, nueva.max_fluency_points):
+        recalculados.add("Lenguaje/Ejecutivo")
+    if anterior.max_typo_distance != nueva.max_typo_distance:
+        recalculados.update({"Memoria inmediata", "Memoria diferida"})
+    return recortados, recalculados
+
+
+def interpretar_columnas(porcentaje: np.ndarray, cfg: ScoringConfig) -> np.ndarray:
+    """interpretar() para un arreglo de porcentajes."""
+    umbrales = (float(cfg.high_threshold), float(cfg.mid_threshold), float("-inf"))
+    textos = np.array([interpretar(u, cfg) for u in umbrales], dtype=object)
+    nivel = np.where(porcentaje >= cfg.high_threshold, 0, np.where(porcentaje >= cfg.mid_threshold, 1, 2))
+    return textos[nivel]
+
+
+def _fluidez(len_animales: np.ndarray, validos: np.ndarray, cfg: ScoringConfig) -> np.ndarray:
+    # scoring.puntos_fluidez por columna (valores no enteros: 0 puntos)
+    if int(cfg.animals_per_point) == 0:
+        return np.zeros(len(len_animales), dtype=np.int64)
+    pts = np.minimum(len_animales // int(cfg.animals_per_point), int(cfg.max_fluency_points))
+    return np.where(validos, pts, 0)
+
+
+def _entero(valor: Any) -> Optional[int]:
+    try:
+        return int(valor)
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass(eq=False)
+class _Config:
+    """Una configuración guardada (texto JSON) y su versión re-puntuada."""
+
+    anterior: ScoringConfig
+    palabras: List[str]
+    registradas: bool
+    nueva_json: str
+
+
+def repuntuar(
+    conn: sqlite3.Connection,
+    cfg: ScoringConfig,
+    perfil: str = "",
+    desde: Optional[str] = None,
+    hasta: Optional[str] = None,
+    clinica: Optional[str] = None,
+    solo_perfil: Optional[str] = None,
+    registry: Optional[KeywordRegistry] = None,
+    tramo: int = cohort.TRAMO,
+) -> Resultado:
+    """Re-puntúa con `cfg` las evaluaciones del filtro, dentro de la transacción
+    en curso de `conn`. Las filas quedan con la configuración `cfg` (más sus
+    palabras objetivo) y la clave de perfil `perfil`."""
+    t0 = time.perf_counter()
+    registry = registry or DEFAULT_SEMEJANZAS
+    res = Resultado()
+    where, params = cohort._filtro(desde, hasta, clinica, solo_perfil)
+    lo, hi = conn.execute("SELECT min(id), max(id) FROM evaluaciones").fetchone()
+    if lo is None:
+        return res
+
+    configs: Dict[str, _Config] = {}
+    maximos = np.array([cfg.maximos[d] for d in DOMINIOS], dtype=np.int64)
+    sql = (
+        f"SELECT id, uid, id_paciente, fecha, clinica, perfil, interpretacion, {', '.join(_DOM_COLS)}, "
+        f"total, max_total, porcentaje, {', '.join(_BRUTO_COLS)}, config, json_extract(respuestas, '$.len_animales'), "
+        # Las respuestas completas solo si hay que puntuar desde ellas
+        f"CASE WHEN {_BRUTO_COLS[0]} IS NULL OR IFNULL(json_extract(config, '$.max_typo_distance'), 0) != ? "
+        f"THEN respuestas END "
+        f"FROM evaluaciones WHERE id >= ? AND id < ?" + (f" AND {where}" if where else "")
+    )
+    update = (
+        f"UPDATE evaluaciones SET {', '.join(f'{c} = ?' for c in _DOM_COLS + _BRUTO_COLS)}, "
+        "total = ?, max_total = ?, porcentaje = ?, interpretacion = ?, perfil = ?, config = ? WHERE id = ?"
+    )
+    nd = len(DOMINIOS)
+    for a in range(lo, hi + 1, tramo):
+        filas = conn.execute(sql, [int(cfg.max_typo_distance), a, a + tramo, *params]).fetchall()
+        if not filas:
+            continue
+        m = len(filas)
+        res.filas += m
+        anteriores = np.array([f[7:7 + nd] for f in filas], dtype=np.int64)
+        brutos = np.empty((m, nd), dtype=np.int64)
+        grupo_config: List[_Config] = []
+        for i, f in enumerate(filas):
+            texto_config = f[10 + 2 * nd]
+            c = configs.get(texto_config)
+            if c is None:
+                guardada = json.loads(texto_config)
+                palabras = list(guardada.get("target_words") or [])
+                registradas = bool(guardada.get("registered_words", True))
+                nueva = {**cfg.to_dict(), "target_words": palabras, "registered_words": registradas}
+                c = configs[texto_config] = _Config(
+                    ScoringConfig.from_dict(guardada), palabras, registradas,
+                    json.dumps(nueva, ensure_ascii=False, sort_keys=True, default=str),
+                )
+                recortados, recalculados = cambios(c.anterior, cfg)
+                res.recortados |= recortados
+                res.recalculados |= recalculados
+            grupo_config.append(c)
+            guardados = f[10 + nd:10 + 2 * nd]
+            if guardados[0] is None:
+                # Anterior a los brutos: se puntúa una vez, con su configuración y fecha
+                res.completadas += 1
+                hoy = date.fromisoformat(str(f[3])[:10])
+                b = puntos_brutos(json.loads(f[-1]), c.anterior, c.palabras, c.registradas, hoy, registry)
+                brutos[i] = [b[d] for d in DOMINIOS]
+            else:
+                brutos[i] = guardados
+
+        # Fluidez: se resta la parte con la configuración anterior y se suma la nueva
+        len_animales = [_entero(f[11 + 2 * nd]) for f in filas]
+        validos = np.array([v is not None for v in len_animales])
+        n_animales = np.array([v or 0 for v in len_animales], dtype=np.int64)
+        for c in set(grupo_config):
+            if "Lenguaje/Ejecutivo" not in cambios(c.anterior, cfg)[1]:
+                continue
+            sel = np.array([g is c for g in grupo_config])
+            brutos[sel, _LENGUAJE] += (
+                _fluidez(n_animales[sel], validos[sel], cfg) - _fluidez(n_animales[sel], validos[sel], c.anterior)
+            )
+
+        # Memoria: otra tolerancia a errores de tipeo obliga a volver a contar
+        for i, f in enumerate(filas):
+            c = grupo_config[i]
+            if c.anterior.max_typo_distance != cfg.max_typo_distance:
+                r = json.loads(f[-1])
+                brutos[i, _MEM_INM] = puntos_memoria_inmediata(r, cfg, c.palabras, c.registradas)
+                brutos[i, _MEM_DIF] = puntos_memoria_diferida(r, cfg, c.palabras)
+
+        subtotales = np.minimum(brutos, maximos)
+        total = subtotales.sum(axis=1)
+        max_total = cfg.max_total
+        pct = total / max_total * 100 if max_total else np.zeros(m)
+        porcentaje = [round(p, 2) for p in pct.tolist()]  # como Evaluacion.to_row
+        interps = interpretar_columnas(pct, cfg)
+
+        cambiadas, pares, movidas = [], [], []
+        for i, f in enumerate(filas):
+            c = grupo_config[i]
+            puntajes_iguales = (
+                (subtotales[i] == anteriores[i]).all()
+                and int(total[i]) == f[7 + nd]
+                and max_total == f[8 + nd]
+                and porcentaje[i] == f[9 + nd]
+                and interps[i] == f[6]
+            )
+            if (
+                puntajes_iguales
+                and perfil == f[5]
+                and c.nueva_json == f[10 + 2 * nd]
+                and f[10 + nd:10 + 2 * nd] == tuple(int(x) for x in brutos[i])
+            ):
+                continue
+            cambiadas.append((
+                *(int(x) for x in subtotales[i]), *(int(x) for x in brutos[i]),
+                int(total[i]), max_total, porcentaje[i], interps[i], perfil, c.nueva_json, f[0],
+            ))
+            if not puntajes_iguales or perfil != f[5]:
+                movidas.append(i)
+            if not puntajes_iguales:
+                antes = {"id_paciente": f[2], "fecha": f[3], "total": f[7 + nd], "porcentaje": f[9 + nd]}
+                antes.update({f"{d}_puntaje": int(anteriores[i, k]) for k, d in enumerate(DOMINIOS)})
+                despues = {"id_paciente": f[2], "fecha": f[3], "total": int(total[i]), "porcentaje": porcentaje[i]}
+                despues.update({f"{d}_puntaje": int(subtotales[i, k]) for k, d in enumerate(DOMINIOS)})
+                pares.append((antes, despues))
+        if not cambiadas:
+            continue
+        conn.executemany(update, cambiadas)
+        res.actualizadas += len(cambiadas)
+        trends.actualizar_lote(conn, pares)
+
+        # Rollups de cohorte: por grupo, se descuenta el bloque anterior y se suma el nuevo
+        columnas_antes = {
+            **{d: anteriores[:, k] for k, d in enumerate(DOMINIOS)},
+            "total": np.array([f[7 + nd] for f in filas], dtype=np.float64),
+            "porcentaje": np.array([f[9 + nd] for f in filas], dtype=np.float64),
+        }
+        columnas_despues = {
+            **{d: subtotales[:, k] for k, d in enumerate(DOMINIOS)},
+            "total": total,
+            "porcentaje": np.array(porcentaje, dtype=np.float64),
+        }
+        bloques: Dict[cohort.Grupo, Tuple[List[int], List[int]]] = {}
+        for i in movidas:
+            f = filas[i]
+            bloques.setdefault((f[4] or "", str(f[3])[:7], f[5] or ""), ([], []))[0].append(i)
+            bloques.setdefault((f[4] or "", str(f[3])[:7], perfil), ([], []))[1].append(i)
+        for grupo, (quitar, sumar) in bloques.items():
+            est = cohort._cargar_grupo(conn, grupo)
+            if quitar:
+                viejo = cohort.EstadisticasCohorte()
+                viejo.agregar_columnas(
+                    {s: x[quitar] for s, x in columnas_antes.items()}, (filas[i][6] or "" for i in quitar)
+                )
+                est.descontar(viejo)
+            if sumar:
+                est.agregar_columnas({s: x[sumar] for s, x in columnas_despues.items()}, interps[sumar])
+            cohort._guardar_grupo(conn, grupo, est)
+
+    res.segundos = time.perf_counter() - t0
+    return res
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    from .profiles import load_profiles
+    from .store import ResultStore
+
+    parser = argparse.ArgumentParser(
+        prog="python -m cognitiva.rescoring",
+        description="Re-puntúa las evaluaciones guardadas con otra configuración (máximos, umbrales, fluidez).",
+    )
+    parser.add_argument("db", help="Base SQLite de ResultStore")
+    grupo = parser.add_mutually_exclusive_group(required=True)
+    grupo.add_argument("--perfil", help="Perfil de configuración (nombre o nombre@version)")
+    grupo.add_argument("--config", help="Configuración en JSON (como ScoringConfig.to_dict)")
+    parser.add_argument("--perfiles", default="perfiles", help="Directorio de perfiles")
+    parser.add_argument("--desde", help="Fecha inicial AAAA-MM-DD (inclusive)")
+    parser.add_argument("--hasta", help="Fecha final AAAA-MM-DD (inclusive)")
+    parser.add_argument("--clinica")
+    parser.add_argument("--solo-perfil", help="Solo las evaluaciones guardadas con esta clave de perfil")
+    args = parser.parse_args(argv)
+
+    if args.perfil:
+        p = load_profiles(args.perfiles).resolver(args.perfil)
+        cfg, clave = p.config, p.clave
+    else:
+        cfg, clave = ScoringConfig.from_dict(json.loads(args.config)), ""
+    store = ResultStore(args.db)
+    try:
+        res = store.repuntuar(cfg, clave, args.desde, args.hasta, args.clinica, args.solo_perfil)
+    finally:
+        store.close()
+    print(
+        f"{res.filas} evaluaciones, {res.actualizadas} actualizadas "
+        f"({res.completadas} puntuadas desde las respuestas) en {res.segundos:.2f} s"
+    )
+    print(f"máximos cambiados: {', '.join(sorted(res.recortados)) or '—'}")
+    print(f"brutos recalculados: {', '.join(sorted(res.recalculados)) or '—'}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,297 @@
+# cognitiva/scoring.py — Reglas de puntaje de la evaluación cognitiva
+# Sin dependencia de Streamlit: la configuración y las palabras objetivo se
+# reciben como parámetros en lugar de leerse del estado de la sesión.
+
+from dataclasses import dataclass, field
+from datetime import date
+from typing import List, Optional, Any, Callable, ContextManager, Dict, Tuple
+
+from .keywords import DEFAULT_SEMEJANZAS, KeywordRegistry
+from .matching import compile_matcher
+
+# ------------------------------------------------------------
+# DOMINIOS (orden de render y de exportación)
+# ------------------------------------------------------------
+DOMINIOS = [
+    "Orientación",
+    "Atención",
+    "Memoria inmediata",
+    "Lenguaje/Ejecutivo",
+    "Visoconstrucción",
+    "Memoria diferida",
+    "Abstracción",
+]
+
+DEFAULT_MAXIMOS = {
+    "Orientación": 10,
+    "Atención": 10,
+    "Memoria inmediata": 5,
+    "Lenguaje/Ejecutivo": 8,
+    "Visoconstrucción": 5,
+    "Memoria diferida": 3,
+    "Abstracción": 4,
+}
+
+# ------------------------------------------------------------
+# BANCO DE PALABRAS (DEFAULT)
+# ------------------------------------------------------------
+DEFAULT_WORD_BANK = [
+    ["manzana", "llave", "libro", "perro", "puente"],
+    ["café", "planta", "reloj", "silla", "calle"],
+    ["azul", "ventana", "lápiz", "camisa", "nube"],
+]
+
+SERIE_7_ESPERADA = [93, 86, 79, 72, 65]
+
+
+@dataclass
+class ScoringConfig:
+    """Parámetros de puntaje que antes vivían en los widgets del sidebar."""
+
+    maximos: Dict[str, int] = field(default_factory=lambda: dict(DEFAULT_MAXIMOS))
+    animals_per_point: int = 5
+    max_fluency_points: int = 4
+    high_threshold: int = 90
+    mid_threshold: int = 75
+    max_typo_distance: int = 0  # errores de tipeo tolerados en memoria (0 = exacto; opt-in)
+
+    @property
+    def max_total(self) -> int:
+        return sum(self.maximos.values())
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "ScoringConfig":
+        data = data or {}
+        maximos = dict(DEFAULT_MAXIMOS)
+        for dom, val in (data.get("maximos") or {}).items():
+            if dom not in maximos:
+                raise ValueError(f"Dominio desconocido en 'maximos': {dom!r}")
+            maximos[dom] = int(val)
+        return cls(
+            maximos=maximos,
+            animals_per_point=int(data.get("animals_per_point", 5)),
+            max_fluency_points=int(data.get("max_fluency_points", 4)),
+            high_threshold=int(data.get("high_threshold", 90)),
+            mid_threshold=int(data.get("mid_threshold", 75)),
+            max_typo_distance=int(data.get("max_typo_distance", 0)),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "maximos": dict(self.maximos),
+            "animals_per_point": self.animals_per_point,
+            "max_fluency_points": self.max_fluency_points,
+            "high_threshold": self.high_threshold,
+            "mid_threshold": self.mid_threshold,
+            "max_typo_distance": self.max_typo_distance,
+        }
+
+
+# ------------------------------------------------------------
+# UTILIDADES BÁSICAS
+# ------------------------------------------------------------
+
+def normalize_list(txt: str) -> List[str]:
+    return [t.strip().lower() for t in txt.split(",") if t.strip()]
+
+
+def count_matches(user_words: List[str], target_words: List[str], max_distance: int = 0) -> int:
+    """Palabras objetivo reconocidas (sin tildes; con max_distance errores de tipeo)."""
+    return compile_matcher(target_words, max_distance).count(user_words)
+
+
+def _as_int(value: Any, default: int = 0) -> int:
+    # Los archivos CSV traen strings vacíos (o texto) donde el widget tendría un
+    # número: cuentan como respuesta incorrecta, no como error del registro.
+    # cognitiva.vectorized usa esta misma conversión para sus columnas.
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+# ------------------------------------------------------------
+# SCORING
+# ------------------------------------------------------------
+
+# Cada puntos_* devuelve los puntos brutos del dominio, sin el máximo de
+# cfg.maximos; score_* los recorta. Guardar los brutos permite re-puntuar con
+# otros máximos sin volver a leer las respuestas (ver cognitiva.rescoring).
+
+def puntos_orientacion(r: Dict[str, Any], cfg: ScoringConfig, hoy: Optional[date] = None) -> int:
+    pts = 0
+    hoy = hoy or date.today()
+    if _as_int(r.get("ori_anio", 0)) == hoy.year:
+        pts += 2
+    if _as_int(r.get("ori_mes", 0)) == hoy.month:
+        pts += 2
+    if _as_int(r.get("ori_dia", 0)) == hoy.day:
+        pts += 2
+    if str(r.get("ori_ciudad", "")).strip():
+        pts += 2
+    if str(r.get("ori_lugar", "")).strip():
+        pts += 2
+    return pts
+
+
+def score_orientacion(r: Dict[str, Any], cfg: ScoringConfig, hoy: Optional[date] = None) -> int:
+    return min(puntos_orientacion(r, cfg, hoy), cfg.maximos["Orientación"])
+
+
+def puntos_atencion(r: Dict[str, Any], cfg: ScoringConfig) -> int:
+    pts = 0
+    try:
+        valores = [int(x) for x in normalize_list(str(r.get("aten_s7", "")))]
+        aciertos = sum(1 for i, v in enumerate(valores[:5]) if v == SERIE_7_ESPERADA[i])
+        pts += min(aciertos, 5)
+    except Exception:
+        pass
+    if str(r.get("aten_inversa", "")).strip().lower() == "asac":
+        pts += 5
+    return pts
+
+
+def score_atencion(r: Dict[str, Any], cfg: ScoringConfig) -> int:
+    return min(puntos_atencion(r, cfg), cfg.maximos["Atención"])
+
+
+def puntos_memoria_inmediata(
+    r: Dict[str, Any], cfg: ScoringConfig, target_words: List[str], registered: bool = True
+) -> int:
+    if not registered:
+        return 0
+    user_words = normalize_list(str(r.get("mem_inmediata", "")))
+    return count_matches(user_words, target_words, cfg.max_typo_distance)  # 1 punto por palabra
+
+
+def score_memoria_inmediata(
+    r: Dict[str, Any], cfg: ScoringConfig, target_words: List[str], registered: bool = True
+) -> int:
+    return min(puntos_memoria_inmediata(r, cfg, target_words, registered), cfg.maximos["Memoria inmediata"])
+
+
+def puntos_fluidez(len_animales: Any, cfg: ScoringConfig) -> int:
+    """Parte de Lenguaje/Ejecutivo que depende de la cantidad de animales."""
+    try:
+        return min(int(len_animales) // int(cfg.animals_per_point), int(cfg.max_fluency_points))
+    except Exception:
+        return 0
+
+
+def puntos_lenguaje(r: Dict[str, Any], cfg: ScoringConfig) -> int:
+    pts = puntos_fluidez(r.get("len_animales", 0), cfg)
+    frase = str(r.get("len_frase", "")).strip()
+    if len(frase.split()) >= 4:
+        pts += 2
+    if bool(r.get("len_orden_ok", False)):
+        pts += 2
+    return pts
+
+
+def score_lenguaje(r: Dict[str, Any], cfg: ScoringConfig) -> int:
+    return min(puntos_lenguaje(r, cfg), cfg.maximos["Lenguaje/Ejecutivo"])
+
+
+def puntos_viso(r: Dict[str, Any], cfg: ScoringConfig) -> int:
+    pts = 0
+    if bool(r.get("viso_copia_ok", False)):
+        pts += 3
+    if bool(r.get("viso_gestos_ok", False)):
+        pts += 2
+    return pts
+
+
+def score_viso(r: Dict[str, Any], cfg: ScoringConfig) -> int:
+    return min(puntos_viso(r, cfg), cfg.maximos["Visoconstrucción"])
+
+
+def puntos_memoria_diferida(r: Dict[str, Any], cfg: ScoringConfig, target_words: List[str]) -> int:
+    user_words = normalize_list(str(r.get("mem_diferida", "")))
+    return count_matches(user_words, target_words, cfg.max_typo_distance)  # 1 punto por palabra
+
+
+def score_memoria_diferida(r: Dict[str, Any], cfg: ScoringConfig, target_words: List[str]) -> int:
+    return min(puntos_memoria_diferida(r, cfg, target_words), cfg.maximos["Memoria diferida"])
+
+
+def abstraccion_aciertos(r: Dict[str, Any], registry: Optional[KeywordRegistry] = None) -> Dict[str, bool]:
+    """Por cada ítem de semejanzas, si la respuesta contiene una palabra clave."""
+    registry = registry or DEFAULT_SEMEJANZAS
+    return {campo: bool(claves) for campo, claves in registry.coincidencias(r).items()}
+
+
+def puntos_abstraccion(r: Dict[str, Any], cfg: ScoringConfig, registry: Optional[KeywordRegistry] = None) -> int:
+    return (registry or DEFAULT_SEMEJANZAS).puntos(r)
+
+
+def score_abstraccion(r: Dict[str, Any], cfg: ScoringConfig, registry: Optional[KeywordRegistry] = None) -> int:
+    return min(puntos_abstraccion(r, cfg, registry), cfg.maximos["Abstracción"])
+
+
+def puntos_brutos(
+    r: Dict[str, Any],
+    cfg: ScoringConfig,
+    target_words: List[str],
+    registered: bool = True,
+    hoy: Optional[date] = None,
+    registry: Optional[KeywordRegistry] = None,
+    medir: Optional[Callable[[str], ContextManager[None]]] = None,
+) -> Dict[str, int]:
+    """Puntos por dominio sin recortar, en el orden de DOMINIOS.
+
+    `medir(nombre)`, si se pasa, envuelve cada dominio con el nombre de su
+    score_* (ver cognitiva.metrics).
+    """
+    llamadas = (
+        ("Orientación", score_orientacion, puntos_orientacion, (r, cfg, hoy)),
+        ("Atención", score_atencion, puntos_atencion, (r, cfg)),
+        ("Memoria inmediata", score_memoria_inmediata, puntos_memoria_inmediata, (r, cfg, target_words, registered)),
+        ("Lenguaje/Ejecutivo", score_lenguaje, puntos_lenguaje, (r, cfg)),
+        ("Visoconstrucción", score_viso, puntos_viso, (r, cfg)),
+        ("Memoria diferida", score_memoria_diferida, puntos_memoria_diferida, (r, cfg, target_words)),
+        ("Abstracción", score_abstraccion, puntos_abstraccion, (r, cfg, registry)),
+    )
+    if medir is None:
+        return {dom: fn(*args) for dom, _, fn, args in llamadas}
+    out = {}
+    for dom, score, fn, args in llamadas:
+        with medir(score.__name__):
+            out[dom] = fn(*args)
+    return out
+
+
+def aplicar_maximos(brutos: Dict[str, int], cfg: ScoringConfig) -> Dict[str, int]:
+    """Subtotales: cada dominio recortado a su máximo."""
+    return {dom: min(pts, cfg.maximos[dom]) for dom, pts in brutos.items()}
+
+
+def score_all(
+    r: Dict[str, Any],
+    cfg: ScoringConfig,
+    target_words: List[str],
+    registered: bool = True,
+    hoy: Optional[date] = None,
+    registry: Optional[KeywordRegistry] = None,
+    medir: Optional[Callable[[str], ContextManager[None]]] = None,
+) -> Dict[str, int]:
+    """Subtotales por dominio en el orden de DOMINIOS.
+
+    `medir(nombre)`, si se pasa, envuelve cada score_* (ver cognitiva.metrics).
+    """
+    return aplicar_maximos(puntos_brutos(r, cfg, target_words, registered, hoy, registry, medir), cfg)
+
+
+def totales(subtotales: Dict[str, int], cfg: ScoringConfig) -> Tuple[int, int, float]:
+    total = sum(subtotales.values())
+    max_total = cfg.max_total
+    porcentaje = (total / max_total) * 100 if max_total else 0
+    return total, max_total, porcentaje
+
+
+def interpretar(porcentaje: float, cfg: ScoringConfig) -> str:
+    # Interpretación con umbrales configurables
+    if porcentaje >= cfg.high_threshold:
+        return "Dentro de parámetros esperados (alto rendimiento)."
+    elif porcentaje >= cfg.mid_threshold:
+        return "Leve compromiso o rendimiento limítrofe."
+    return "Sugerente de compromiso cognitivo, evaluar clínicamente."
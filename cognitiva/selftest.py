@@ -0,0 +1,72 @@
+# cognitiva/selftest.py — Casos de verificación rápida de las reglas de puntaje
+# Los usa el checkbox "Ejecutar auto‑tests" de app.py, pero no dependen de
+# Streamlit: casos(cfg) devuelve (nombre, obtenido, esperado) por caso.
+
+from datetime import date
+from typing import List, Optional, Tuple
+
+from .scoring import (
+    ScoringConfig,
+    score_abstraccion,
+    score_atencion,
+    score_lenguaje,
+    score_memoria_diferida,
+    score_memoria_inmediata,
+    score_orientacion,
+    score_viso,
+)
+
+# Palabras fijas para pruebas de memoria (independientes de la sesión)
+TARGET_WORDS = ["manzana", "llave", "libro", "perro", "puente"]
+
+
+def casos(cfg: ScoringConfig, hoy: Optional[date] = None) -> List[Tuple[str, int, int]]:
+    hoy = hoy or date.today()
+    maximos = cfg.maximos
+    target_words = TARGET_WORDS
+    results = []
+
+    # 1) Orientación — todo correcto
+    r1 = {
+        "ori_anio": hoy.year,
+        "ori_mes": hoy.month,
+        "ori_dia": hoy.day,
+        "ori_ciudad": "Córdoba",
+        "ori_lugar": "Hospital",
+    }
+    results.append(("Orientación full", score_orientacion(r1, cfg, hoy), maximos["Orientación"]))
+
+    # 2) Atención — serie + inversa correctas
+    r2 = {"aten_s7": "93,86,79,72,65", "aten_inversa": "asac"}
+    results.append(("Atención full", score_atencion(r2, cfg), maximos["Atención"]))
+
+    # 3) Memoria inmediata — 5/5 (capado por máximo)
+    r3 = {"mem_inmediata": ",".join(target_words)}
+    results.append((
+        "Memoria inmediata full",
+        score_memoria_inmediata(r3, cfg, target_words, registered=True),
+        maximos["Memoria inmediata"],
+    ))
+
+    # 4) Lenguaje/Ejecutivo — fluidez máxima (según animals_per_point y max_fluency_points) + frase + orden
+    r4 = {
+        "len_animales": cfg.animals_per_point * cfg.max_fluency_points,
+        "len_frase": "El paciente escribe una oración completa",
+        "len_orden_ok": True,
+    }
+    exp4 = min(cfg.max_fluency_points + 2 + 2, maximos["Lenguaje/Ejecutivo"])
+    results.append(("Lenguaje/Ejecutivo full-ish", score_lenguaje(r4, cfg), exp4))
+
+    # 5) Visoconstrucción — ambos OK
+    r5 = {"viso_copia_ok": True, "viso_gestos_ok": True}
+    results.append(("Visoconstrucción full", score_viso(r5, cfg), maximos["Visoconstrucción"]))
+
+    # 6) Memoria diferida — palabras completas (capado por máximo)
+    r6 = {"mem_diferida": ",".join(target_words)}
+    results.append(("Memoria diferida full", score_memoria_diferida(r6, cfg, target_words), maximos["Memoria diferida"]))
+
+    # 7) Abstracción — con palabras clave
+    r7 = {"abs_barco_auto": "Ambos son medios de transporte", "abs_uva_manzana": "Ambas son fruta"}
+    results.append(("Abstracción full", score_abstraccion(r7, cfg), maximos["Abstracción"]))
+
+    return results
@@ -0,0 +1,399 @@
+# cognitiva/service.py — Servicio HTTP de puntaje (asyncio, sin dependencias)
+# Ejecutar:  python -m cognitiva.service --port 8600 --workers 4 [--perfil estandar]
+#
+# Pensado para que una historia clínica electrónica envíe evaluaciones
+# completas y reciba subtotales, interpretación y el informe HTML:
+#
+#   POST /v1/puntuar   cuerpo: un registro con el formato de cognitiva.batch
+#                      (o una lista de registros). "informe": false omite el HTML.
+#   GET  /v1/stats     throughput, tamaño de lote y latencias p50/p95/p99 (JSON)
+#   GET  /metrics      las mismas latencias en texto Prometheus
+#   GET  /salud        200 si el servicio responde
+#
+# Las solicitudes que llegan juntas se agrupan en micro-lotes (hasta
+# `max_lote` registros o `espera_ms` desde el primero) y cada lote se puntúa y
+# renderiza en un ProcessPoolExecutor, fuera del event loop. Con workers=0 se
+# procesa en un hilo (útil para pruebas).
+
+import asyncio
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from . import batch
+from .batch import ReportOptions, evaluate_record
+from .metrics import Metricas
+from .report import logo_to_base64
+from .scoring import ScoringConfig, interpretar, totales
+
+MAX_CUERPO = 1024 * 1024
+_RAZONES = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 501: "Not Implemented", 503: "Service Unavailable"}
+
+
+# ------------------------------------------------------------
+# PROCESO DE TRABAJO
+# ------------------------------------------------------------
+
+def procesar_lote(
+    lote: List[Tuple[Dict[str, Any], bool]],
+    default_config: Optional[Dict[str, Any]] = None,
+    semejanzas_path: Optional[str] = None,
+    perfiles_dir: Optional[str] = None,
+    default_perfil: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Puntúa `(registro, con_informe)` y devuelve una respuesta por registro.
+
+    La config de cada perfil (y la de por defecto) se resuelve una vez por lote.
+    """
+    registry = batch.worker_registry(semejanzas_path)
+    opts = batch.report_options() or ReportOptions()
+    resueltas: Dict[str, Tuple[ScoringConfig, str]] = {}
+    out = []
+    for rec, con_informe in lote:
+        try:
+            clave = str(rec.get("perfil") or default_perfil or "").strip()
+            if clave not in resueltas:
+                if clave:
+                    perfil = batch.worker_profiles(perfiles_dir).resolver(clave)
+                    resueltas[clave] = (perfil.config, perfil.clave)
+                else:
+                    resueltas[clave] = (ScoringConfig.from_dict(default_config), "")
+            row, subtotales, cfg = evaluate_record(rec, default_config, registry, *resueltas[clave])
+            total, max_total, porcentaje = totales(subtotales, cfg)
+            res: Dict[str, Any] = {
+                "ok": True,
+                "id_paciente": row["id_paciente"],
+                "fecha": row["fecha"],
+                "perfil": row["perfil"],
+                "subtotales": subtotales,
+                "maximos": cfg.maximos,
+                "total": total,
+                "max_total": max_total,
+                "porcentaje": round(porcentaje, 2),
+                "interpretacion": interpretar(porcentaje, cfg),
+            }
+            if con_informe:
+                res["html"] = batch.render_report(row, subtotales, cfg, opts).decode("utf-8")
+            out.append(res)
+        except Exception as exc:
+            out.append({"ok": False, "error": f"{type(exc).__name__}: {exc}"})
+    return out
+
+
+# ------------------------------------------------------------
+# SERVICIO
+# ------------------------------------------------------------
+
+class ScoringService:
+    """Servidor HTTP/1.1 mínimo con micro-lotes hacia un pool de procesos."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8600,
+        workers: int = os.cpu_count() or 1,
+        max_lote: int = 64,
+        espera_ms: float = 5.0,
+        max_cola: int = 10_000,
+        default_config: Optional[Dict[str, Any]] = None,
+        semejanzas_path: Optional[str] = None,
+        perfiles_dir: Optional[str] = None,
+        default_perfil: Optional[str] = None,
+        report: Optional[ReportOptions] = None,
+    ):
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.max_lote = max_lote
+        self.espera = espera_ms / 1000
+        self.max_cola = max_cola
+        self._args = (default_config, semejanzas_path, perfiles_dir, default_perfil)
+        self._report = report
+        self.metricas = Metricas()
+        self._cola: "Optional[asyncio.Queue[Tuple[Dict[str, Any], bool, asyncio.Future]]]" = None
+        self._pool: Optional[Executor] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._tareas: List[asyncio.Task] = []
+        self._conexiones: Dict[asyncio.Task, asyncio.StreamWriter] = {}
+        self._inicio = time.monotonic()
+        self._recientes: Deque[Tuple[float, int]] = deque()  # (fin del lote, registros) del último minuto
+        self.contadores = {"solicitudes": 0, "evaluaciones": 0, "errores": 0, "lotes": 0, "rechazadas": 0}
+
+    # ----- ciclo de vida -----
+
+    async def start(self) -> None:
+        if self.workers > 0:
+            from concurrent.futures import ProcessPoolExecutor
+
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers, initializer=batch.init_worker, initargs=(self._report,)
+            )
+            en_vuelo = self.workers * 2
+        else:
+            batch.init_worker(self._report)
+            self._pool = ThreadPoolExecutor(max_workers=1)
+            en_vuelo = 1
+        self._cola = asyncio.Queue(self.max_cola)
+        self._inicio = time.monotonic()
+        # Varios despachadores: mientras un lote está en el pool se arma el siguiente
+        self._tareas = [asyncio.create_task(self._despachar()) for _ in range(en_vuelo)]
+        self._server = await asyncio.start_server(self._conexion, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+        # Conexiones keep-alive abiertas: se cierran para que sus handlers terminen
+        for writer in list(self._conexiones.values()):
+            writer.close()
+        await asyncio.gather(*self._conexiones, return_exceptions=True)
+        if self._server is not None:
+            await self._server.wait_closed()
+        for t in self._tareas:
+            t.cancel()
+        await asyncio.gather(*self._tareas, return_exceptions=True)
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+
+    # ----- micro-lotes -----
+
+    def _encolar(self, rec: Dict[str, Any], con_informe: bool) -> asyncio.Future:
+        """Encola un registro sin ceder el loop; asyncio.QueueFull si no hay lugar."""
+        assert self._cola is not None, "start() no fue llamado"
+        fut: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._cola.put_nowait((rec, con_informe, fut))
+        return fut
+
+    async def _esperar(self, fut: asyncio.Future, t0: float) -> Dict[str, Any]:
+        res = await fut
+        self.metricas.observar("evaluacion", time.perf_counter() - t0)
+        return res
+
+    async def puntuar(self, rec: Dict[str, Any], con_informe: bool = True) -> Dict[str, Any]:
+        """Encola un registro y espera su resultado."""
+        return await self._esperar(self._encolar(rec, con_informe), time.perf_counter())
+
+    async def _despachar(self) -> None:
+        assert self._cola is not None
+        loop = asyncio.get_running_loop()
+        while True:
+            primero = await self._cola.get()
+            lote = [primero]
+            limite = loop.time() + self.espera
+            while len(lote) < self.max_lote:
+                restante = limite - loop.time()
+                if restante <= 0:
+                    break
+                try:
+                    lote.append(await asyncio.wait_for(self._cola.get(), restante))
+                except asyncio.TimeoutError:
+                    break
+            t0 = time.perf_counter()
+            try:
+                resultados = await loop.run_in_executor(
+                    self._pool, procesar_lote, [(r, inf) for r, inf, _ in lote], *self._args
+                )
+            except Exception as exc:  # el pool murió o no se pudo serializar el lote
+                resultados = [{"ok": False, "error": f"{type(exc).__name__}: {exc}"}] * len(lote)
+            self.metricas.observar("lote", time.perf_counter() - t0)
+            self.contadores["lotes"] += 1
+            self.contadores["evaluaciones"] += len(lote)
+            self.contadores["errores"] += sum(1 for r in resultados if not r["ok"])
+            ahora = time.monotonic()
+            self._recientes.append((ahora, len(lote)))
+            while self._recientes and ahora - self._recientes[0][0] > 60:
+                self._recientes.popleft()
+            for (_, _, fut), res in zip(lote, resultados):
+                if not fut.done():
+                    fut.set_result(res)
+
+    def stats(self) -> Dict[str, Any]:
+        uptime = time.monotonic() - self._inicio
+        ultimo_minuto = sum(n for _, n in self._recientes)
+        c = self.contadores
+        return {
+            **c,
+            "uptime_s": round(uptime, 1),
+            "en_cola": self._cola.qsize() if self._cola is not None else 0,
+            "lote_promedio": round(c["evaluaciones"] / c["lotes"], 2) if c["lotes"] else 0,
+            "evaluaciones_por_s": round(c["evaluaciones"] / uptime, 2) if uptime else 0,
+            "evaluaciones_por_s_ultimo_minuto": round(ultimo_minuto / min(uptime, 60), 2) if uptime else 0,
+            "latencias": self.metricas.resumen(),
+        }
+
+    # ----- HTTP -----
+
+    async def _conexion(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        tarea = asyncio.current_task()
+        assert tarea is not None
+        self._conexiones[tarea] = writer
+        try:
+            while True:
+                try:
+                    cabecera = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                lineas = cabecera.decode("latin-1").split("\r\n")
+                try:
+                    metodo, ruta, version = lineas[0].split(" ", 2)
+                except ValueError:
+                    await self._responder(writer, 400, {"error": "Línea de solicitud inválida"}, cerrar=True)
+                    break
+                headers = {}
+                for linea in lineas[1:]:
+                    if ":" in linea:
+                        k, v = linea.split(":", 1)
+                        headers[k.strip().lower()] = v.strip()
+                if headers.get("transfer-encoding", "identity").lower() != "identity":
+                    # Sin soporte de chunked: el cuerpo no se puede delimitar, se cierra
+                    await self._responder(
+                        writer, 501, {"error": "Transfer-Encoding no soportado; envíe Content-Length"}, cerrar=True
+                    )
+                    break
+                largo_txt = headers.get("content-length", "0").strip() or "0"
+                if not (largo_txt.isascii() and largo_txt.isdigit()):
+                    await self._responder(writer, 400, {"error": "Content-Length inválido"}, cerrar=True)
+                    break
+                largo = int(largo_txt)
+                cerrar = headers.get("connection", "").lower() == "close" or version == "HTTP/1.0"
+                if largo > MAX_CUERPO:
+                    await self._responder(writer, 413, {"error": f"Cuerpo mayor a {MAX_CUERPO} bytes"}, cerrar=True)
+                    break
+                cuerpo = await reader.readexactly(largo) if largo else b""
+                t0 = time.perf_counter()
+                estado, datos, tipo = await self._rutear(metodo, ruta.split("?", 1)[0], cuerpo)
+                self.metricas.observar("solicitud", time.perf_counter() - t0)
+                await self._responder(writer, estado, datos, tipo, cerrar)
+                if cerrar:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._conexiones.pop(tarea, None)
+            writer.close()
+
+    async def _rutear(self, metodo: str, ruta: str, cuerpo: bytes) -> Tuple[int, Any, str]:
+        if ruta == "/v1/puntuar":
+            if metodo != "POST":
+                return 405, {"error": "Use POST"}, "json"
+            self.contadores["solicitudes"] += 1
+            try:
+                datos = json.loads(cuerpo or b"null")
+            except ValueError as exc:
+                return 400, {"error": f"JSON inválido: {exc}"}, "json"
+            registros = datos if isinstance(datos, list) else [datos]
+            if not registros or not all(isinstance(r, dict) for r in registros):
+                return 400, {"error": "Se espera un registro (objeto) o una lista de registros"}, "json"
+            assert self._cola is not None
+            # Control de lugar y encolado sin await de por medio: otra solicitud
+            # no puede ocupar la cola entre los dos, así que todos los registros
+            # entran (y se esperan) o la solicitud entera recibe 503.
+            if self._cola.qsize() + len(registros) > self.max_cola:
+                self.contadores["rechazadas"] += 1
+                return 503, {"error": "Cola llena, reintente"}, "json"
+            t0 = time.perf_counter()
+            futuros = [self._encolar(r, bool(r.get("informe", True))) for r in registros]
+            resultados = await asyncio.gather(*(self._esperar(f, t0) for f in futuros))
+            return 200, (resultados if isinstance(datos, list) else resultados[0]), "json"
+        if metodo != "GET":
+            return 405, {"error": "Use GET"}, "json"
+        if ruta == "/v1/stats":
+            return 200, self.stats(), "json"
+        if ruta == "/metrics":
+            return 200, self.metricas.to_prometheus("cognitiva_servicio"), "texto"
+        if ruta == "/salud":
+            return 200, {"ok": True}, "json"
+        return 404, {"error": f"Ruta desconocida: {ruta}"}, "json"
+
+    @staticmethod
+    async def _responder(
+        writer: asyncio.StreamWriter, estado: int, datos: Any, tipo: str = "json", cerrar: bool = False
+    ) -> None:
+        if tipo == "json":
+            cuerpo = json.dumps(datos, ensure_ascii=False).encode("utf-8")
+            content_type = "application/json; charset=utf-8"
+        else:
+            cuerpo = str(datos).encode("utf-8")
+            content_type = "text/plain; version=0.0.4; charset=utf-8"
+        cabecera = (
+            f"HTTP/1.1 {estado} {_RAZONES.get(estado, '')}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(cuerpo)}\r\n"
+            f"Connection: {'close' if cerrar else 'keep-alive'}\r\n\r\n"
+        )
+        writer.write(cabecera.encode("latin-1") + cuerpo)
+        await writer.drain()
+
+
+# ------------------------------------------------------------
+# CLI
+# ------------------------------------------------------------
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="python -m cognitiva.service",
+        description="Servicio HTTP de puntaje con micro-lotes.",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8600)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Procesos de trabajo (0 = un hilo, sin procesos)")
+    parser.add_argument("--max-lote", type=int, default=64)
+    parser.add_argument("--espera-ms", type=float, default=5.0, help="Espera máxima para completar un lote")
+    parser.add_argument("--config", help="JSON con la configuración por defecto")
+    parser.add_argument("--semejanzas", help="JSON con los ítems de Abstracción")
+    parser.add_argument("--perfiles", default=os.environ.get("COGNITIVA_PERFILES", "perfiles"))
+    parser.add_argument("--perfil", help="Perfil por defecto para registros sin 'perfil'")
+    parser.add_argument("--logo", help="Logo PNG/JPG para los informes")
+    parser.add_argument("--firma-nombre", default="")
+    parser.add_argument("--firma-rol", default="")
+    parser.add_argument("--firma-matricula", default="")
+    args = parser.parse_args(argv)
+
+    default_config = None
+    if args.config:
+        with open(args.config, encoding="utf-8") as fh:
+            default_config = json.load(fh)
+    if args.perfil:
+        try:
+            args.perfil = batch.worker_profiles(args.perfiles).resolver(args.perfil).clave
+        except (KeyError, ValueError) as exc:
+            parser.error(str(exc))
+    logo_b64 = None
+    if args.logo:
+        with open(args.logo, "rb") as fh:
+            logo_b64 = logo_to_base64(fh.read())
+
+    service = ScoringService(
+        args.host, args.port, args.workers, args.max_lote, args.espera_ms,
+        default_config=default_config,
+        semejanzas_path=args.semejanzas,
+        perfiles_dir=args.perfiles,
+        default_perfil=args.perfil,
+        report=ReportOptions(logo_b64, args.firma_nombre, args.firma_rol, args.firma_matricula),
+    )
+
+    async def correr() -> None:
+        await service.start()
+        print(f"Escuchando en http://{args.host}:{service.port} ({args.workers} procesos)", file=sys.stderr)
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await service.close()
+
+    try:
+        asyncio.run(correr())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,225 @@
+# cognitiva/sesion.py — Lógica de una evaluación en curso, sin Streamlit
+# app.py dibuja los widgets y delega acá lo que no es interfaz: elegir la forma
+# de palabras para el paciente, armar y restaurar el autoguardado, puntuar con
+# la caché compartida, construir la Evaluacion que va al almacén, los
+# artefactos CSV/HTML y el ZIP de informes por lote. Los recursos (almacén,
+# caché, semejanzas, perfiles) se piden a cognitiva.recursos.
+
+import os
+import random
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import IO, TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from . import recursos
+from .cache import clave
+from .export import build_results_dict, results_to_csv
+from .scoring import DEFAULT_WORD_BANK, ScoringConfig, aplicar_maximos, interpretar, puntos_brutos, totales
+from .store import Evaluacion
+
+if TYPE_CHECKING:
+    from .wordbank import BancoFormas
+
+
+# ------------------------------------------------------------
+# PALABRAS OBJETIVO
+# ------------------------------------------------------------
+def _banco() -> "Optional[BancoFormas]":
+    try:
+        return recursos.formas()
+    except (OSError, ValueError, KeyError):  # la app ya lo informó al cargar
+        return None
+
+
+def palabras_nuevas(vistas: Iterable[str] = ()) -> List[str]:
+    """Una forma sin palabras que el paciente ya haya visto; sin banco de
+    formas, una lista de DEFAULT_WORD_BANK."""
+    banco = _banco()
+    if banco is None or not len(banco):
+        return list(random.choice(DEFAULT_WORD_BANK))
+    return banco.elegir(vistas)[1]
+
+
+def otra_forma(activas: Sequence[str], id_paciente: str) -> List[str]:
+    """Otra forma: ni la activa ni las que el paciente ya vio."""
+    vistas = set(activas)
+    if id_paciente:
+        vistas |= recursos.store().palabras_vistas(id_paciente)
+    return palabras_nuevas(vistas)
+
+
+def forma_para_paciente(activas: Sequence[str], id_paciente: str) -> Optional[List[str]]:
+    """Si el paciente ya vio la forma activa, otra que no haya visto; si no, None."""
+    banco = _banco()
+    if not id_paciente or banco is None:
+        return None
+    vistas = recursos.store().palabras_vistas(id_paciente)
+    if banco.formas_vistas(activas) & banco.formas_vistas(vistas):
+        return palabras_nuevas(vistas)
+    return None
+
+
+# ------------------------------------------------------------
+# AUTOGUARDADO (claves "r.<campo>" respuestas, "p.<campo>" paciente)
+# ------------------------------------------------------------
+def estado_autoguardado(
+    respuestas: Mapping[str, Any], paciente: Mapping[str, Any], palabras: Mapping[str, Any]
+) -> Dict[str, Any]:
+    """Estado plano de la evaluación para cognitiva.journal.Diario.registrar."""
+    estado: Dict[str, Any] = {f"r.{campo}": valor for campo, valor in respuestas.items()}
+    estado.update({f"p.{campo}": valor for campo, valor in paciente.items()})
+    registro = palabras.get("registration_time")
+    estado.update({
+        "target_words": list(palabras["target_words"]),
+        "palabras_paciente": palabras["palabras_paciente"],
+        "palabras_personalizadas": bool(palabras["palabras_personalizadas"]),
+        "registered_words": bool(palabras["registered_words"]),
+        "registration_time": registro.isoformat(timespec="seconds") if registro else None,
+    })
+    return estado
+
+
+def palabras_restauradas(estado: Mapping[str, Any]) -> Dict[str, Any]:
+    """Inverso de la parte de palabras de estado_autoguardado."""
+    registro = estado.get("registration_time")
+    return {
+        "target_words": estado.get("target_words") or palabras_nuevas(),
+        "palabras_paciente": estado.get("palabras_paciente", ""),
+        "palabras_personalizadas": bool(estado.get("palabras_personalizadas")),
+        "registered_words": bool(estado.get("registered_words")),
+        "registration_time": datetime.fromisoformat(registro) if registro else None,
+    }
+
+
+# ------------------------------------------------------------
+# PUNTAJE Y PERSISTENCIA
+# ------------------------------------------------------------
+@dataclass
+class Resultado:
+    brutos: Dict[str, int]
+    subtotales: Dict[str, int]
+    total: int
+    max_total: int
+    porcentaje: float
+    interpretacion: str
+    clave: str  # hash de todo lo que determina los subtotales
+
+
+def puntuar(
+    respuestas: Mapping[str, Any],
+    cfg: ScoringConfig,
+    target_words: Sequence[str],
+    registered: bool,
+    perfil: str = "",
+    medir: Optional[Callable[[str], Any]] = None,
+) -> Resultado:
+    """Puntos brutos (cacheados por contenido), subtotales recortados y totales."""
+    # Orientación depende de la fecha de hoy: entra en la clave
+    clave_puntaje = clave(
+        respuestas, list(target_words), bool(registered), perfil or cfg.to_dict(), recursos.semejanzas_path(),
+        date.today(),
+    )
+    brutos = recursos.cache().get_or_compute(
+        ("puntaje", clave_puntaje),
+        lambda: puntos_brutos(
+            respuestas, cfg, target_words, registered=bool(registered), registry=recursos.semejanzas(), medir=medir
+        ),
+    )
+    subtotales = aplicar_maximos(brutos, cfg)
+    total, max_total, porcentaje = totales(subtotales, cfg)
+    return Resultado(brutos, subtotales, total, max_total, porcentaje, interpretar(porcentaje, cfg), clave_puntaje)
+
+
+def percentiles(
+    subtotales: Mapping[str, int], total: int, edad: Optional[float], educacion: Optional[float]
+) -> Optional[Dict[str, Tuple[float, float]]]:
+    """serie -> (percentil, z) con la tabla normativa; None si no hay tabla."""
+    normas = recursos.normas()
+    return None if normas is None else normas.evaluar(subtotales, total, edad, educacion)
+
+
+def evaluacion(
+    uid: str,
+    resultado: Resultado,
+    cfg: ScoringConfig,
+    respuestas: Mapping[str, Any],
+    target_words: Sequence[str],
+    registered: bool,
+    id_paciente: str,
+    nombre: str = "",
+    clinica: str = "",
+    fecha: Any = "",
+    perfil: str = "",
+) -> Evaluacion:
+    """La fila del almacén: puntajes, brutos para re-puntuar y la configuración usada."""
+    return Evaluacion(
+        uid=uid,
+        id_paciente=id_paciente,
+        nombre=nombre,
+        clinica=clinica,
+        fecha=str(fecha),
+        subtotales=resultado.subtotales,
+        brutos=resultado.brutos,
+        total=resultado.total,
+        max_total=resultado.max_total,
+        porcentaje=resultado.porcentaje,
+        interpretacion=resultado.interpretacion,
+        perfil=perfil,
+        config={**cfg.to_dict(), "target_words": list(target_words), "registered_words": bool(registered)},
+        respuestas=dict(respuestas),
+    )
+
+
+# ------------------------------------------------------------
+# ARTEFACTOS (CSV e informe HTML, cacheados por contenido)
+# ------------------------------------------------------------
+def csv_resultado(
+    clave_meta: str, resultado: Resultado, cfg: ScoringConfig, id_paciente: str, nombre: str, fecha: Any, perfil: str
+) -> bytes:
+    return recursos.cache().get_or_compute(
+        ("csv", clave_meta),
+        lambda: results_to_csv(build_results_dict(
+            resultado.subtotales, cfg.maximos, resultado.total, resultado.porcentaje,
+            id_paciente=id_paciente, nombre=nombre, fecha=fecha, perfil=perfil,
+        )),
+    )
+
+
+def html_resultado(
+    clave_html: str,
+    resultado: Resultado,
+    cfg: ScoringConfig,
+    logo_b64: Callable[[], Optional[str]],
+    firma: Tuple[str, str, str],
+    id_paciente: str,
+    nombre: str,
+    fecha: Any,
+) -> bytes:
+    """Informe imprimible; `logo_b64` solo se llama si el informe no está en caché.
+    (La fecha "Generado" es la del primer cálculo con estos datos.)"""
+    from .report import render_html_report
+
+    return recursos.cache().get_or_compute(
+        ("html", clave_html),
+        lambda: render_html_report(
+            resultado.subtotales, cfg.maximos, resultado.total, resultado.porcentaje, logo_b64(), *firma,
+            nombre=nombre, id_paciente=id_paciente, fecha=fecha,
+        ).encode("utf-8"),
+    )
+
+
+def informes_lote(
+    fin: IO[str], fmt: str, destino: IO[bytes], opciones: Any, cfg: ScoringConfig, perfil: str = ""
+) -> Tuple[int, List[Tuple[int, str]]]:
+    """ZIP de informes de un JSONL/CSV subido, con los perfiles y semejanzas del proceso."""
+    from .batch import iter_records, write_reports_zip
+
+    semejanzas_path = recursos.semejanzas_path()
+    return write_reports_zip(
+        iter_records(fin, fmt), destino, opciones, cfg.to_dict(),
+        workers=os.cpu_count() or 1,
+        contexto="spawn",  # el servidor tiene hilos (almacén, diario, métricas): no fork
+        semejanzas_path=semejanzas_path if os.path.exists(semejanzas_path) else None,
+        perfiles_dir=recursos.perfiles_dir(),
+        default_perfil=perfil or None,
+    )
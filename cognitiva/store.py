@@ -0,0 +1,430 @@
+# cognitiva/store.py — Almacén local de resultados en SQLite (modo WAL)
+# Guarda subtotales, los puntos brutos por dominio (sin recortar al máximo,
+# para re-puntuar con cognitiva.rescoring), la configuración usada (maximos,
+# umbrales, palabras objetivo), la clave del perfil de configuración
+# ("nombre@version", ver cognitiva.profiles) y las `respuestas` crudas de
+# cada evaluación.
+#
+# Escrituras: un único hilo escritor con su propia conexión. save() encola
+# y devuelve un Future; el escritor junta lo que llegue de todas las sesiones
+# (hasta `batch_size` filas o `flush_interval` segundos) y lo confirma en una
+# sola transacción; si una fila falla, el lote se deshace y se reintenta de a
+# una fila, así que solo falla el Future de esa fila.
+#
+# Lecturas: una conexión por hilo; en WAL no bloquean al escritor. El
+# historial de un paciente usa el índice (id_paciente, fecha).
+# En la misma transacción se actualizan los rollups de cognitiva.trends y
+# los de cognitiva.cohort (estadísticas por clínica, mes y perfil).
+
+import json
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Set
+
+from . import trends
+from .keywords import KeywordRegistry
+from .scoring import DOMINIOS, ScoringConfig, normalize_list
+
+if TYPE_CHECKING:
+    # Requieren numpy: se importan al abrir el almacén, no con el módulo
+    from . import cohort, rescoring
+
+# Dominio -> columna SQL
+DOMINIO_COLUMNAS = {
+    "Orientación": "orientacion",
+    "Atención": "atencion",
+    "Memoria inmediata": "memoria_inmediata",
+    "Lenguaje/Ejecutivo": "lenguaje",
+    "Visoconstrucción": "visoconstruccion",
+    "Memoria diferida": "memoria_diferida",
+    "Abstracción": "abstraccion",
+}
+
+_DOM_COLS = [DOMINIO_COLUMNAS[d] for d in DOMINIOS]
+# Puntos brutos; NULL en evaluaciones guardadas antes de estas columnas
+_BRUTO_COLS = [f"{c}_bruto" for c in _DOM_COLS]
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS evaluaciones (
+    id INTEGER PRIMARY KEY,
+    uid TEXT NOT NULL UNIQUE,
+    id_paciente TEXT NOT NULL,
+    nombre TEXT NOT NULL DEFAULT '',
+    clinica TEXT NOT NULL DEFAULT '',
+    fecha TEXT NOT NULL,
+    creado TEXT NOT NULL,
+    {", ".join(f"{c} INTEGER NOT NULL" for c in _DOM_COLS)},
+    total INTEGER NOT NULL,
+    max_total INTEGER NOT NULL,
+    porcentaje REAL NOT NULL,
+    interpretacion TEXT NOT NULL DEFAULT '',
+    perfil TEXT NOT NULL DEFAULT '',
+    config TEXT NOT NULL,
+    respuestas TEXT NOT NULL,
+    {", ".join(f"{c} INTEGER" for c in _BRUTO_COLS)}
+);
+CREATE INDEX IF NOT EXISTS idx_evaluaciones_paciente ON evaluaciones (id_paciente, fecha);
+CREATE INDEX IF NOT EXISTS idx_evaluaciones_fecha ON evaluaciones (fecha, clinica);
+"""
+
+# Columnas agregadas después de la primera versión del esquema: (nombre, definición)
+_MIGRACIONES = [
+    ("perfil", "TEXT NOT NULL DEFAULT ''"),
+    *((c, "INTEGER") for c in _BRUTO_COLS),
+]
+
+_COLS = (
+    ["uid", "id_paciente", "nombre", "clinica", "fecha", "creado"]
+    + _DOM_COLS
+    + ["total", "max_total", "porcentaje", "interpretacion", "perfil", "config", "respuestas"]
+    + _BRUTO_COLS
+)
+
+# Reintentar la misma evaluación (mismo uid) la actualiza en lugar de duplicarla.
+_UPSERT = (
+    f"INSERT INTO evaluaciones ({', '.join(_COLS)}) VALUES ({', '.join('?' for _ in _COLS)}) "
+    f"ON CONFLICT(uid) DO UPDATE SET "
+    + ", ".join(f"{c} = excluded.{c}" for c in _COLS if c != "uid")
+)
+
+
+@dataclass
+class Evaluacion:
+    uid: str
+    id_paciente: str
+    fecha: str
+    subtotales: Dict[str, int]
+    total: int
+    max_total: int
+    porcentaje: float
+    config: Dict[str, Any]
+    respuestas: Dict[str, Any]
+    nombre: str = ""
+    clinica: str = ""
+    interpretacion: str = ""
+    perfil: str = ""
+    creado: str = field(default_factory=lambda: datetime.now().isoformat(timespec="seconds"))
+    brutos: Dict[str, int] = field(default_factory=dict)  # puntos sin recortar (scoring.puntos_brutos)
+
+    def to_row(self) -> tuple:
+        return (
+            self.uid, self.id_paciente, self.nombre, self.clinica, str(self.fecha), self.creado,
+            *(int(self.subtotales.get(d, 0)) for d in DOMINIOS),
+            self.total, self.max_total, round(self.porcentaje, 2), self.interpretacion, self.perfil,
+            json.dumps(self.config, ensure_ascii=False, sort_keys=True, default=str),
+            json.dumps(self.respuestas, ensure_ascii=False, sort_keys=True, default=str),
+            *(None if self.brutos.get(d) is None else int(self.brutos[d]) for d in DOMINIOS),
+        )
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def _row_to_result(row: sqlite3.Row) -> Dict[str, Any]:
+    """Fila de la tabla con las columnas de build_results_dict (más extras)."""
+    out: Dict[str, Any] = {
+        "id_paciente": row["id_paciente"],
+        "nombre": row["nombre"],
+        "fecha": row["fecha"],
+    }
+    for dom in DOMINIOS:
+        out[f"{dom}_puntaje"] = row[DOMINIO_COLUMNAS[dom]]
+    out.update(
+        total=row["total"],
+        max_total=row["max_total"],
+        porcentaje=row["porcentaje"],
+        perfil=row["perfil"],
+        clinica=row["clinica"],
+        interpretacion=row["interpretacion"],
+    )
+    return out
+
+
+class ResultStore:
+    """Resultados persistidos con escrituras agrupadas por lotes."""
+
+    def __init__(self, path: str, batch_size: int = 256, flush_interval: float = 0.05):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        from . import cohort
+
+        init = _connect(path)
+        init.executescript(SCHEMA + trends.SCHEMA + cohort.SCHEMA)
+        self._migrate(init)
+        self._rebuild_trends_if_missing(init)
+        self._rebuild_cohort_if_missing(init)
+        init.close()
+        self._local = threading.local()
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="ResultStore-writer", daemon=True)
+        self._writer.start()
+
+    # ----- escritura -----
+
+    def save(self, ev: Evaluacion) -> "Future[None]":
+        """Encola la evaluación; el Future se resuelve al confirmarse el lote."""
+        fut: "Future[None]" = Future()
+        self._queue.put((ev.to_row(), fut))
+        return fut
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """Espera a que todo lo encolado hasta ahora esté confirmado."""
+        self.save_barrier().result(timeout)
+
+    def save_barrier(self) -> "Future[None]":
+        fut: "Future[None]" = Future()
+        self._queue.put((None, fut))
+        return fut
+
+    def ejecutar(self, tarea: Callable[[sqlite3.Connection], Any]) -> "Future[Any]":
+        """Corre tarea(conn) en el hilo escritor, en una transacción propia,
+        después de lo encolado antes; el Future lleva su resultado."""
+        fut: "Future[Any]" = Future()
+        self._queue.put((tarea, fut))
+        return fut
+
+    def repuntuar(
+        self,
+        cfg: ScoringConfig,
+        perfil: str = "",
+        desde: Optional[str] = None,
+        hasta: Optional[str] = None,
+        clinica: Optional[str] = None,
+        solo_perfil: Optional[str] = None,
+        registry: Optional[KeywordRegistry] = None,
+    ) -> "rescoring.Resultado":
+        """Re-puntúa con `cfg` las evaluaciones del filtro (ver cognitiva.rescoring);
+        quedan guardadas con la clave de perfil `perfil`."""
+        from . import rescoring
+
+        return self.ejecutar(
+            lambda conn: rescoring.repuntuar(conn, cfg, perfil, desde, hasta, clinica, solo_perfil, registry)
+        ).result()
+
+    def close(self) -> None:
+        self.flush()
+        self._queue.put(None)
+        self._writer.join()
+
+    def _write_loop(self) -> None:
+        conn = _connect(self.path)
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            batch = [item]
+            stop = False
+            # Junta lo que llegue durante flush_interval (o hasta batch_size)
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    nxt = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if nxt is None:
+                    stop = True
+                    break
+                batch.append(nxt)
+            guardados = [(row, fut) for row, fut in batch if isinstance(row, tuple)]
+            try:
+                self._write_rows(conn, [row for row, _ in guardados])
+            except Exception:
+                # La transacción del lote se deshizo: de a una fila, para que una
+                # inválida no haga fallar los guardados de las otras sesiones.
+                for row, fut in guardados:
+                    try:
+                        self._write_rows(conn, [row])
+                    except Exception as exc:
+                        fut.set_exception(exc)
+                    else:
+                        fut.set_result(None)
+            else:
+                for _, fut in guardados:
+                    fut.set_result(None)
+            for row, fut in batch:
+                if row is None:  # save_barrier: lo anterior ya se procesó
+                    fut.set_result(None)
+            # Tareas de mantenimiento (re-puntaje): cada una en su transacción
+            for tarea, fut in batch:
+                if callable(tarea):
+                    try:
+                        with conn:
+                            resultado = tarea(conn)
+                    except Exception as exc:
+                        fut.set_exception(exc)
+                    else:
+                        fut.set_result(resultado)  # después del commit
+            if stop:
+                break
+        conn.close()
+
+    def _write_rows(self, conn: sqlite3.Connection, rows: List[tuple]) -> None:
+        from . import cohort
+
+        if not rows:
+            return
+        with conn:
+            grupos: "Dict[cohort.Grupo, cohort.EstadisticasCohorte]" = {}
+            for row in rows:
+                self._write_row(conn, row, grupos)
+            cohort.guardar(conn, grupos)
+
+    @staticmethod
+    def _write_row(
+        conn: sqlite3.Connection, row: tuple, grupos: "Dict[cohort.Grupo, cohort.EstadisticasCohorte]"
+    ) -> None:
+        from . import cohort
+
+        uid = row[0]
+        prev = conn.execute("SELECT * FROM evaluaciones WHERE uid = ?", (uid,)).fetchone()
+        conn.execute(_UPSERT, row)
+        nueva = _row_to_result(dict(zip(_COLS, row)))
+        anterior = _row_to_result(prev) if prev is not None else None
+        trends.actualizar(conn, uid, nueva, anterior)
+        cohort.actualizar(conn, nueva, anterior, grupos)
+
+    @staticmethod
+    def _migrate(conn: sqlite3.Connection) -> None:
+        existentes = {r["name"] for r in conn.execute("PRAGMA table_info(evaluaciones)")}
+        with conn:
+            for columna, definicion in _MIGRACIONES:
+                if columna not in existentes:
+                    conn.execute(f"ALTER TABLE evaluaciones ADD COLUMN {columna} {definicion}")
+
+    @staticmethod
+    def _rebuild_trends_if_missing(conn: sqlite3.Connection) -> None:
+        # Bases creadas antes de los rollups: se calculan una sola vez.
+        if conn.execute("SELECT 1 FROM tendencias LIMIT 1").fetchone():
+            return
+        with conn:
+            for row in conn.execute("SELECT * FROM evaluaciones ORDER BY fecha, id").fetchall():
+                trends.actualizar(conn, row["uid"], _row_to_result(row))
+
+    def _rebuild_cohort_if_missing(self, conn: sqlite3.Connection) -> None:
+        from . import cohort
+
+        if conn.execute("SELECT 1 FROM cohorte LIMIT 1").fetchone():
+            return
+        if conn.execute("SELECT 1 FROM evaluaciones LIMIT 1").fetchone():
+            cohort.reconstruir(conn, self.path)
+
+    # ----- lectura -----
+
+    def tendencias(self, id_paciente: str) -> Dict[str, trends.Tendencia]:
+        """Rollups del paciente por serie (dominios, total y porcentaje)."""
+        return trends.cargar(self._conn(), id_paciente)
+
+    def cohorte(
+        self,
+        desde_mes: Optional[str] = None,
+        hasta_mes: Optional[str] = None,
+        clinica: Optional[str] = None,
+        perfil: Optional[str] = None,
+    ) -> "cohort.EstadisticasCohorte":
+        """Estadísticas de cohorte desde los rollups (meses "AAAA-MM", inclusive)."""
+        from . import cohort
+
+        return cohort.cargar(self._conn(), desde_mes, hasta_mes, clinica, perfil)
+
+    def cohorte_grupos(self) -> "List[cohort.Grupo]":
+        """(clínica, mes, perfil) con al menos una evaluación."""
+        from . import cohort
+
+        return cohort.grupos(self._conn())
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = _connect(self.path)
+            self._local.conn = conn
+        return conn
+
+    def history(self, id_paciente: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Evaluaciones de un paciente, de la más antigua a la más reciente."""
+        if limit is None:
+            sql = "SELECT * FROM evaluaciones WHERE id_paciente = ? ORDER BY fecha, id"
+            params: List[Any] = [id_paciente]
+        else:
+            # Las últimas `limit`, devueltas igual en orden cronológico
+            sql = (
+                "SELECT * FROM (SELECT * FROM evaluaciones WHERE id_paciente = ? "
+                "ORDER BY fecha DESC, id DESC LIMIT ?) ORDER BY fecha, id"
+            )
+            params = [id_paciente, int(limit)]
+        return [_row_to_result(r) for r in self._conn().execute(sql, params)]
+
+    def iter_results(
+        self,
+        desde: Optional[str] = None,
+        hasta: Optional[str] = None,
+        clinica: Optional[str] = None,
+        fetch_size: int = 1000,
+        perfil: Optional[str] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Resultados por rango de fecha (inclusive), clínica y perfil, sin cargarlos todos."""
+        where, params = [], []
+        if desde:
+            where.append("fecha >= ?")
+            params.append(str(desde))
+        if hasta:
+            where.append("fecha <= ?")
+            params.append(str(hasta))
+        if clinica:
+            where.append("clinica = ?")
+            params.append(clinica)
+        if perfil is not None:
+            where.append("perfil = ?")
+            params.append(perfil)
+        sql = "SELECT * FROM evaluaciones"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY fecha, id"
+        # Conexión propia: el generador puede consumirse a la par de otras consultas
+        conn = _connect(self.path)
+        try:
+            cur = conn.execute(sql, params)
+            while True:
+                rows = cur.fetchmany(fetch_size)
+                if not rows:
+                    break
+                for r in rows:
+                    yield _row_to_result(r)
+        finally:
+            conn.close()
+
+    def palabras_vistas(self, id_paciente: str) -> Set[str]:
+        """Palabras objetivo de las evaluaciones guardadas del paciente.
+
+        Las filas se encuentran por el índice (id_paciente, fecha), pero las
+        palabras no tienen columna propia: json_extract decodifica la
+        configuración guardada de cada evaluación del paciente en cada llamada.
+        El costo crece con las visitas del paciente; la app lo llama al cambiar
+        de paciente y en "Aplicar palabras", no en cada rerun.
+        """
+        sql = "SELECT json_extract(config, '$.target_words') FROM evaluaciones WHERE id_paciente = ?"
+        vistas: Set[str] = set()
+        for (palabras,) in self._conn().execute(sql, (id_paciente,)):
+            # json_extract devuelve la lista como JSON; un texto, tal cual
+            if palabras:
+                vistas.update(json.loads(palabras) if palabras.startswith("[") else normalize_list(palabras))
+        return vistas
+
+    def get(self, uid: str) -> Optional[Dict[str, Any]]:
+        row = self._conn().execute("SELECT * FROM evaluaciones WHERE uid = ?", (uid,)).fetchone()
+        if row is None:
+            return None
+        out = _row_to_result(row)
+        out["config"] = json.loads(row["config"])
+        out["respuestas"] = json.loads(row["respuestas"])
+        return out
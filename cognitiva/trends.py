@@ -0,0 +1,196 @@
+# cognitiva/trends.py — Tendencias longitudinales por paciente (rollups)
+# Por paciente y dominio se guarda un resumen que se actualiza al guardar
+# cada evaluación, sin releer el historial:
+#   - n y las sumas Σx, Σy, Σx², Σxy (x = fecha en años) para la pendiente
+#     de mínimos cuadrados, actualizadas en O(1),
+#   - el puntaje basal (evaluación más antigua) y los últimos ULTIMOS_N,
+#     tomados del índice (id_paciente, fecha) con consultas acotadas.
+# Leer la tendencia de un paciente es una búsqueda por clave primaria.
+
+import json
+import sqlite3
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+from .scoring import DOMINIOS
+
+ULTIMOS_N = 10
+SERIES = DOMINIOS + ["total", "porcentaje"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tendencias (
+    id_paciente TEXT NOT NULL,
+    serie TEXT NOT NULL,
+    n INTEGER NOT NULL,
+    sx REAL NOT NULL,
+    sy REAL NOT NULL,
+    sxx REAL NOT NULL,
+    sxy REAL NOT NULL,
+    base_fecha TEXT NOT NULL,
+    base_uid TEXT NOT NULL,
+    base REAL NOT NULL,
+    ultimos TEXT NOT NULL,
+    PRIMARY KEY (id_paciente, serie)
+) WITHOUT ROWID;
+"""
+
+
+_EPOCA = date(2020, 1, 1).toordinal()  # centra x para que Σx² no pierda precisión
+
+
+def _anios(fecha: str) -> float:
+    return (date.fromisoformat(str(fecha)[:10]).toordinal() - _EPOCA) / 365.25
+
+
+@dataclass
+class Tendencia:
+    serie: str
+    n: int = 0
+    sx: float = 0.0
+    sy: float = 0.0
+    sxx: float = 0.0
+    sxy: float = 0.0
+    base_fecha: str = ""
+    base_uid: str = ""
+    base: float = 0.0
+    ultimos: List[List[Any]] = field(default_factory=list)  # [fecha, valor, uid], cronológico
+
+    @property
+    def ultimo(self) -> Optional[float]:
+        return self.ultimos[-1][1] if self.ultimos else None
+
+    @property
+    def pendiente_anual(self) -> Optional[float]:
+        """Pendiente de mínimos cuadrados, en puntos por año."""
+        den = self.n * self.sxx - self.sx * self.sx
+        if self.n < 2 or abs(den) < 1e-12:
+            return None
+        return (self.n * self.sxy - self.sx * self.sy) / den
+
+    @property
+    def cambio_desde_base(self) -> Optional[float]:
+        return None if self.ultimo is None else self.ultimo - self.base
+
+    def agregar(self, fecha: str, valor: float, signo: int = 1) -> None:
+        x = _anios(fecha)
+        self.n += signo
+        self.sx += signo * x
+        self.sy += signo * valor
+        self.sxx += signo * x * x
+        self.sxy += signo * x * valor
+
+    def quitar(self, fecha: str, valor: float) -> None:
+        self.agregar(fecha, valor, -1)
+
+
+def _valores(ev: Dict[str, Any]) -> Dict[str, float]:
+    """Serie -> valor, desde un dict con claves "<dominio>_puntaje", total y porcentaje."""
+    out = {dom: float(ev[f"{dom}_puntaje"]) for dom in DOMINIOS}
+    out["total"] = float(ev["total"])
+    out["porcentaje"] = float(ev["porcentaje"])
+    return out
+
+
+def _refrescar_extremos(conn: sqlite3.Connection, id_paciente: str, tend: Dict[str, Tendencia]) -> None:
+    # Basal y últimas N desde el índice (id_paciente, fecha): a lo sumo N+1 filas.
+    from .store import _row_to_result  # evita import circular
+
+    primera = conn.execute(
+        "SELECT * FROM evaluaciones WHERE id_paciente = ? ORDER BY fecha, id LIMIT 1", (id_paciente,)
+    ).fetchone()
+    ultimas = conn.execute(
+        "SELECT * FROM evaluaciones WHERE id_paciente = ? ORDER BY fecha DESC, id DESC LIMIT ?",
+        (id_paciente, ULTIMOS_N),
+    ).fetchall()
+    if primera is None:
+        return
+    base = _valores(_row_to_result(primera))
+    recientes = [(r["fecha"], r["uid"], _valores(_row_to_result(r))) for r in reversed(ultimas)]
+    for serie, t in tend.items():
+        t.base_fecha, t.base_uid, t.base = primera["fecha"], primera["uid"], base[serie]
+        t.ultimos = [[fecha, vals[serie], uid] for fecha, uid, vals in recientes]
+
+
+def cargar(conn: sqlite3.Connection, id_paciente: str) -> Dict[str, Tendencia]:
+    out = {}
+    for row in conn.execute(
+        "SELECT serie, n, sx, sy, sxx, sxy, base_fecha, base_uid, base, ultimos "
+        "FROM tendencias WHERE id_paciente = ?",
+        (id_paciente,),
+    ):
+        serie, n, sx, sy, sxx, sxy, base_fecha, base_uid, base, ultimos = tuple(row)
+        out[serie] = Tendencia(serie, n, sx, sy, sxx, sxy, base_fecha, base_uid, base, json.loads(ultimos))
+    return out
+
+
+def _guardar(conn: sqlite3.Connection, id_paciente: str, tendencias: Dict[str, Tendencia]) -> None:
+    conn.executemany(
+        "INSERT OR REPLACE INTO tendencias "
+        "(id_paciente, serie, n, sx, sy, sxx, sxy, base_fecha, base_uid, base, ultimos) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        [
+            (id_paciente, t.serie, t.n, t.sx, t.sy, t.sxx, t.sxy, t.base_fecha, t.base_uid, t.base,
+             json.dumps(t.ultimos))
+            for t in tendencias.values()
+        ],
+    )
+    vacias = [t.serie for t in tendencias.values() if t.n <= 0]
+    if vacias:
+        conn.executemany(
+            "DELETE FROM tendencias WHERE id_paciente = ? AND serie = ?", [(id_paciente, s) for s in vacias]
+        )
+
+
+def actualizar(
+    conn: sqlite3.Connection,
+    uid: str,
+    nueva: Dict[str, Any],
+    anterior: Optional[Dict[str, Any]] = None,
+) -> None:
+    """Aplica una evaluación ya escrita en `evaluaciones` a los rollups,
+    dentro de la transacción en curso.
+
+    `anterior` es la versión previa de la misma evaluación (mismo uid), si la
+    había: se descuenta antes de sumar la nueva.
+    """
+    if anterior is not None:
+        tend = cargar(conn, anterior["id_paciente"])
+        for serie, valor in _valores(anterior).items():
+            if serie in tend:
+                tend[serie].quitar(anterior["fecha"], valor)
+        if anterior["id_paciente"] != nueva["id_paciente"]:
+            _refrescar_extremos(conn, anterior["id_paciente"], tend)
+            _guardar(conn, anterior["id_paciente"], tend)
+            tend = cargar(conn, nueva["id_paciente"])
+    else:
+        tend = cargar(conn, nueva["id_paciente"])
+    for serie, valor in _valores(nueva).items():
+        tend.setdefault(serie, Tendencia(serie)).agregar(nueva["fecha"], valor)
+    _refrescar_extremos(conn, nueva["id_paciente"], tend)
+    _guardar(conn, nueva["id_paciente"], tend)
+
+
+def actualizar_lote(conn: sqlite3.Connection, cambios: List[Tuple[Dict[str, Any], Dict[str, Any]]]) -> None:
+    """Como actualizar() para muchas evaluaciones ya reescritas (anterior, nueva),
+    del mismo paciente y fecha en cada par: cada paciente se lee, se refresca
+    y se escribe una sola vez (re-puntaje de una cohorte)."""
+    por_paciente: Dict[str, List[Tuple[Dict[str, Any], Dict[str, Any]]]] = {}
+    for anterior, nueva in cambios:
+        por_paciente.setdefault(nueva["id_paciente"], []).append((anterior, nueva))
+    for id_paciente, pares in por_paciente.items():
+        tend = cargar(conn, id_paciente)
+        for anterior, nueva in pares:
+            # Misma fecha: n, Σx y Σx² no cambian; Σy y Σxy, en la diferencia
+            x = _anios(nueva["fecha"])
+            antes = _valores(anterior)
+            for serie, valor in _valores(nueva).items():
+                if serie not in tend:
+                    tend[serie] = Tendencia(serie)
+                    tend[serie].agregar(nueva["fecha"], valor)
+                    continue
+                dy = valor - antes[serie]
+                tend[serie].sy += dy
+                tend[serie].sxy += x * dy
+        _refrescar_extremos(conn, id_paciente, tend)
+        _guardar(conn, id_paciente, tend)
@@ -0,0 +1,183 @@
+# cognitiva/vectorized.py — Scoring columnar con NumPy para cohortes
+# Mismas reglas que cognitiva.scoring, aplicadas a columnas completas en
+# lugar de un diccionario `respuestas` por vez. Requiere numpy.
+#
+# Columnas de entrada (largo n, una fila por evaluación):
+#   ori_anio, ori_mes, ori_dia          enteros
+#   ori_ciudad_ok, ori_lugar_ok         bool (texto no vacío)
+#   aten_s7                             enteros (n, 5); SERIE_SIN_VALOR si falta
+#   aten_inversa_ok                     bool ("asac")
+#   mem_inmediata_aciertos              enteros (WordMatcher.count)
+#   mem_diferida_aciertos               enteros (WordMatcher.count)
+#   registered_words                    bool (opcional, por defecto True)
+#   len_animales                        enteros
+#   len_frase_ok                        bool (frase de 4+ palabras)
+#   len_orden_ok, viso_copia_ok, viso_gestos_ok   bool
+#   <campo>_ok por ítem de semejanzas              bool (palabra clave hallada),
+#                                                 p. ej. abs_barco_auto_ok
+#
+# columns_from_respuestas() arma estas columnas desde diccionarios `respuestas`.
+
+from datetime import date
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+import numpy as np
+
+from .scoring import (
+    DOMINIOS,
+    SERIE_7_ESPERADA,
+    ScoringConfig,
+    _as_int,
+    abstraccion_aciertos,
+    normalize_list,
+)
+from .keywords import DEFAULT_SEMEJANZAS, KeywordRegistry
+from .matching import compile_matcher
+
+SERIE_SIN_VALOR = -1  # ningún valor esperado de la serie es negativo
+
+_SERIE = np.array(SERIE_7_ESPERADA, dtype=np.int64)
+
+
+def _col(cols: Mapping[str, Any], name: str, n: int, dtype: Any, default: Any = 0) -> np.ndarray:
+    if name not in cols:
+        return np.full(n, default, dtype=dtype)
+    return np.asarray(cols[name], dtype=dtype)
+
+
+def puntos_columnas(
+    cols: Mapping[str, Any],
+    cfg: ScoringConfig,
+    hoy: Optional[date] = None,
+    registry: Optional[KeywordRegistry] = None,
+) -> Dict[str, np.ndarray]:
+    """Puntos brutos (sin los máximos por dominio) de n evaluaciones, como
+    puntos_brutos() fila a fila."""
+    hoy = hoy or date.today()
+    registry = registry or DEFAULT_SEMEJANZAS
+    n = len(next(iter(cols.values())))
+
+    def as_int(name: str) -> np.ndarray:
+        return _col(cols, name, n, np.int64)
+
+    def as_bool(name: str, default: bool = False) -> np.ndarray:
+        return _col(cols, name, n, bool, default)
+
+    # Orientación: 2 puntos por cada acierto
+    ori = 2 * (
+        (as_int("ori_anio") == hoy.year).astype(np.int64)
+        + (as_int("ori_mes") == hoy.month)
+        + (as_int("ori_dia") == hoy.day)
+        + as_bool("ori_ciudad_ok")
+        + as_bool("ori_lugar_ok")
+    )
+
+    # Atención: aciertos posicionales de la serie + 5 por "asac"
+    if "aten_s7" in cols:
+        s7 = np.asarray(cols["aten_s7"], dtype=np.int64).reshape(n, -1)[:, :5]
+        aciertos = (s7 == _SERIE[: s7.shape[1]]).sum(axis=1)
+    else:
+        aciertos = np.zeros(n, dtype=np.int64)
+    aten = np.minimum(aciertos, 5) + 5 * as_bool("aten_inversa_ok")
+
+    mem_inm = np.where(as_bool("registered_words", True), as_int("mem_inmediata_aciertos"), 0)
+
+    lenguaje = (
+        np.minimum(as_int("len_animales") // int(cfg.animals_per_point), int(cfg.max_fluency_points))
+        + 2 * as_bool("len_frase_ok")
+        + 2 * as_bool("len_orden_ok")
+    )
+
+    viso = 3 * as_bool("viso_copia_ok").astype(np.int64) + 2 * as_bool("viso_gestos_ok")
+    mem_dif = as_int("mem_diferida_aciertos")
+    abstr = np.zeros(n, dtype=np.int64)
+    for item in registry.items:
+        abstr += item.puntos * as_bool(f"{item.campo}_ok")
+
+    brutos = [ori, aten, mem_inm, lenguaje, viso, mem_dif, abstr]
+    return dict(zip(DOMINIOS, brutos))
+
+
+def aplicar_maximos_columnas(brutos: Mapping[str, Any], cfg: ScoringConfig) -> Dict[str, np.ndarray]:
+    """Subtotales recortados, total, max_total y porcentaje desde puntos brutos."""
+    mx = cfg.maximos
+    out: Dict[str, np.ndarray] = {
+        dom: np.minimum(np.asarray(brutos[dom], dtype=np.int64), mx[dom]) for dom in DOMINIOS
+    }
+    total = np.sum([out[dom] for dom in DOMINIOS], axis=0)
+    n = len(total)
+    max_total = cfg.max_total
+    out["total"] = total
+    out["max_total"] = np.full(n, max_total, dtype=np.int64)
+    out["porcentaje"] = (total / max_total) * 100 if max_total else np.zeros(n)
+    return out
+
+
+def score_columns(
+    cols: Mapping[str, Any],
+    cfg: ScoringConfig,
+    hoy: Optional[date] = None,
+    registry: Optional[KeywordRegistry] = None,
+) -> Dict[str, np.ndarray]:
+    """Subtotales por dominio, total y porcentaje para n evaluaciones.
+
+    Devuelve un arreglo por cada entrada de DOMINIOS más "total",
+    "max_total" y "porcentaje", idénticos a score_all()/totales() fila a fila.
+    """
+    return aplicar_maximos_columnas(puntos_columnas(cols, cfg, hoy, registry), cfg)
+
+
+# ------------------------------------------------------------
+# ARMADO DE COLUMNAS DESDE `respuestas`
+# ------------------------------------------------------------
+
+def _parse_serie7(txt: str) -> List[int]:
+    try:
+        valores = [int(x) for x in normalize_list(txt)][:5]
+    except ValueError:
+        # score_atencion descarta la serie completa si un valor no es entero
+        valores = []
+    return valores + [SERIE_SIN_VALOR] * (5 - len(valores))
+
+
+def columns_from_respuestas(
+    records: Iterable[Dict[str, Any]],
+    target_words: List[str],
+    registered: bool = True,
+    max_distance: int = 0,
+    registry: Optional[KeywordRegistry] = None,
+) -> Dict[str, np.ndarray]:
+    """Convierte diccionarios `respuestas` en las columnas de score_columns().
+
+    max_distance debe coincidir con ScoringConfig.max_typo_distance.
+    """
+    matcher = compile_matcher(target_words, max_distance)
+    registry = registry or DEFAULT_SEMEJANZAS
+    rows: Dict[str, list] = {k: [] for k in (
+        "ori_anio", "ori_mes", "ori_dia", "ori_ciudad_ok", "ori_lugar_ok",
+        "aten_s7", "aten_inversa_ok", "mem_inmediata_aciertos", "mem_diferida_aciertos",
+        "len_animales", "len_frase_ok", "len_orden_ok", "viso_copia_ok", "viso_gestos_ok",
+    )}
+    rows.update({f"{item.campo}_ok": [] for item in registry.items})
+    for r in records:
+        rows["ori_anio"].append(_as_int(r.get("ori_anio", 0)))
+        rows["ori_mes"].append(_as_int(r.get("ori_mes", 0)))
+        rows["ori_dia"].append(_as_int(r.get("ori_dia", 0)))
+        rows["ori_ciudad_ok"].append(bool(str(r.get("ori_ciudad", "")).strip()))
+        rows["ori_lugar_ok"].append(bool(str(r.get("ori_lugar", "")).strip()))
+        rows["aten_s7"].append(_parse_serie7(str(r.get("aten_s7", ""))))
+        rows["aten_inversa_ok"].append(str(r.get("aten_inversa", "")).strip().lower() == "asac")
+        rows["mem_inmediata_aciertos"].append(matcher.count(normalize_list(str(r.get("mem_inmediata", "")))))
+        rows["mem_diferida_aciertos"].append(matcher.count(normalize_list(str(r.get("mem_diferida", "")))))
+        rows["len_animales"].append(_as_int(r.get("len_animales", 0)))
+        rows["len_frase_ok"].append(len(str(r.get("len_frase", "")).strip().split()) >= 4)
+        rows["len_orden_ok"].append(bool(r.get("len_orden_ok", False)))
+        rows["viso_copia_ok"].append(bool(r.get("viso_copia_ok", False)))
+        rows["viso_gestos_ok"].append(bool(r.get("viso_gestos_ok", False)))
+        for campo, ok in abstraccion_aciertos(r, registry).items():
+            rows[f"{campo}_ok"].append(ok)
+
+    cols = {k: np.asarray(v, dtype=bool if k.endswith("_ok") else np.int64) for k, v in rows.items()}
+    cols["aten_s7"] = cols["aten_s7"].reshape(-1, 5)
+    cols["registered_words"] = np.full(len(cols["ori_anio"]), bool(registered))
+    return cols
@@ -0,0 +1,240 @@
+# cognitiva/wordbank.py — Banco de palabras con formas alternativas balanceadas
+# Fuente (palabras.txt): una palabra por línea con su banda de frecuencia de
+# uso (1 alta, 2 media), agrupadas por categoría semántica ("[ropa]"). Las
+# sílabas se cuentan al compilar (silabas()).
+#
+# compilar() arma de antemano las formas de 5 palabras:
+#   - todas con la misma PLANTILLA de (banda, sílabas) por posición, así que
+#     frecuencia y largo quedan igualados entre formas;
+#   - cinco categorías distintas por forma, eligiendo en cada posición la
+#     categoría con más palabras libres (el uso de categorías queda parejo);
+#   - ninguna palabra en dos formas, y dentro de una forma no hay dos palabras
+#     confundibles con la tolerancia de tipeo (distancia ≤ 2 o mismo comienzo).
+# Las guarda en formas.json, que viaja con la app (como las normas compiladas,
+# ver cognitiva.norms).
+#
+# En la app, load_forms() lee formas.json una vez por proceso y arma el
+# índice palabra plegada -> forma. elegir(vistas) marca las formas con alguna
+# palabra que el paciente ya vio (una búsqueda en dict por palabra vista) y
+# recorre una rotación que empieza al azar hasta la primera forma no marcada:
+# en el peor caso (casi todas vistas) recorre las n formas, O(vistas + n). Con
+# 42 formas es despreciable, y solo se llama al cambiar de paciente o al pedir
+# otra forma, no en cada rerun.
+
+import json
+import os
+import random
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from .matching import _myers_distance, _peq, fold
+
+FUENTE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "palabras.txt")
+FORMAS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "formas.json")
+FORMATO = 1
+
+# (banda de frecuencia, sílabas) de cada posición de una forma
+PLANTILLA: Tuple[Tuple[int, int], ...] = ((1, 2), (1, 2), (1, 3), (2, 2), (2, 3))
+DISTANCIA_MINIMA = 3  # entre dos palabras de la misma forma
+PREFIJO = 3  # ni dos palabras que empiecen igual
+
+_FUERTES = set("aeoáéóíú")  # í/ú tildadas forman hiato
+_VOCALES = _FUERTES | set("iuü")
+
+
+def silabas(palabra: str) -> int:
+    """Sílabas de una palabra española (núcleos vocálicos, con diptongos e hiatos)."""
+    w = palabra.strip().lower()
+    w = re.sub(r"(?<=[qg])u(?=[eéiíy])", "", w)  # u muda: que, gui
+    w = re.sub(r"y$", "i", w)  # rey, muy
+    n, previa = 0, ""
+    for c in w:
+        if c not in _VOCALES:
+            previa = ""
+            continue
+        # Nueva sílaba salvo diptongo (alguna de las dos débil y sin tilde)
+        if not previa or (previa in _FUERTES and c in _FUERTES):
+            n += 1
+        previa = c
+    return max(1, n)
+
+
+@dataclass(frozen=True)
+class Palabra:
+    texto: str
+    categoria: str
+    banda: int
+    silabas: int
+
+
+def leer_fuente(path: Optional[str] = None) -> List[Palabra]:
+    palabras, categoria, vistas = [], "", set()
+    with open(path or FUENTE_PATH, encoding="utf-8") as fh:
+        for lineno, linea in enumerate(fh, 1):
+            linea = linea.split("#", 1)[0].strip()
+            if not linea:
+                continue
+            if linea.startswith("["):
+                categoria = linea.strip("[]").strip()
+                continue
+            partes = linea.split()
+            if len(partes) != 2 or partes[1] not in ("1", "2") or not categoria:
+                raise ValueError(f"línea {lineno}: se espera 'palabra banda' (1 o 2) dentro de una [categoría]")
+            texto = partes[0]
+            if fold(texto) in vistas:
+                raise ValueError(f"línea {lineno}: {texto!r} repetida")
+            vistas.add(fold(texto))
+            palabras.append(Palabra(texto, categoria, int(partes[1]), silabas(texto)))
+    return palabras
+
+
+def _confundibles(a: str, b: str) -> bool:
+    a, b = fold(a), fold(b)
+    return a[:PREFIJO] == b[:PREFIJO] or _myers_distance(_peq(a), len(a), b) < DISTANCIA_MINIMA
+
+
+def armar_formas(
+    palabras: Sequence[Palabra], plantilla: Sequence[Tuple[int, int]] = PLANTILLA, semilla: int = 0
+) -> List[List[Palabra]]:
+    """Formas balanceadas hasta que alguna posición de la plantilla se quede sin palabras."""
+    rnd = random.Random(semilla)
+    # (banda, sílabas) -> categoría -> palabras libres (orden al azar, fijo por semilla)
+    libres: Dict[Tuple[int, int], Dict[str, List[Palabra]]] = {}
+    for p in palabras:
+        libres.setdefault((p.banda, p.silabas), {}).setdefault(p.categoria, []).append(p)
+    for por_categoria in libres.values():
+        for lista in por_categoria.values():
+            rnd.shuffle(lista)
+    # Primero las posiciones más escasas
+    orden = sorted(range(len(plantilla)), key=lambda i: sum(map(len, libres.get(plantilla[i], {}).values())))
+
+    formas: List[List[Palabra]] = []
+    while True:
+        elegidas: Dict[int, Palabra] = {}
+        for i in orden:
+            por_categoria = libres.get(plantilla[i], {})
+            usadas = {p.categoria for p in elegidas.values()}
+            candidata = None
+            for categoria in sorted(por_categoria, key=lambda c: (-len(por_categoria[c]), c)):
+                if categoria in usadas:
+                    continue
+                candidata = next(
+                    (p for p in por_categoria[categoria]
+                     if not any(_confundibles(p.texto, q.texto) for q in elegidas.values())),
+                    None,
+                )
+                if candidata is not None:
+                    break
+            if candidata is None:
+                return formas
+            elegidas[i] = candidata
+        for p in elegidas.values():
+            libres[(p.banda, p.silabas)][p.categoria].remove(p)
+        formas.append([elegidas[i] for i in range(len(plantilla))])
+
+
+class BancoFormas:
+    """Formas alternativas compiladas e índice palabra -> forma."""
+
+    def __init__(self, formas: Sequence[Sequence[str]], categorias: Optional[Sequence[Sequence[str]]] = None):
+        self.formas: List[List[str]] = [list(f) for f in formas]
+        self.categorias = [list(c) for c in categorias] if categorias else []
+        self._forma_de: Dict[str, int] = {}
+        for i, forma in enumerate(self.formas):
+            for w in forma:
+                self._forma_de.setdefault(fold(w), i)
+
+    def __len__(self) -> int:
+        return len(self.formas)
+
+    def formas_vistas(self, vistas: Iterable[str]) -> Set[int]:
+        """Formas con alguna de las palabras dadas."""
+        out = set()
+        for w in vistas:
+            i = self._forma_de.get(fold(str(w)))
+            if i is not None:
+                out.add(i)
+        return out
+
+    def elegir(self, vistas: Iterable[str] = (), rnd: Optional[random.Random] = None) -> Tuple[int, List[str]]:
+        """(índice, palabras) de una forma sin palabras vistas; si el paciente
+        ya las vio todas, una al azar.
+
+        Cuesta una búsqueda por palabra vista más, como máximo, una pasada por
+        las formas del banco (desde un inicio al azar hasta la primera libre).
+        """
+        if not self.formas:
+            raise ValueError("Banco de formas vacío")
+        descartar = self.formas_vistas(vistas)
+        n = len(self.formas)
+        inicio = (rnd or random).randrange(n)
+        for k in range(n):
+            i = (inicio + k) % n
+            if i not in descartar:
+                return i, list(self.formas[i])
+        return inicio, list(self.formas[inicio])
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, object]) -> "BancoFormas":
+        if data.get("formato") != FORMATO:
+            raise ValueError(f"Formato de formas no soportado: {data.get('formato')!r}")
+        return cls(data["formas"], data.get("categorias"))  # type: ignore[arg-type]
+
+
+def compilar(
+    fuente: Optional[str] = None, destino: Optional[str] = None, plantilla: Sequence[Tuple[int, int]] = PLANTILLA
+) -> BancoFormas:
+    """Arma las formas de `fuente` (palabras.txt) y las guarda en `destino` (formas.json)."""
+    formas = armar_formas(leer_fuente(fuente), plantilla)
+    banco = BancoFormas([[p.texto for p in f] for f in formas], [[p.categoria for p in f] for f in formas])
+    # Una forma por línea: los cambios del banco se leen en el diff
+    def lista(filas: List[List[str]]) -> str:
+        return ",\n".join("  " + json.dumps(f, ensure_ascii=False) for f in filas)
+
+    with open(destino or FORMAS_PATH, "w", encoding="utf-8") as fh:
+        fh.write(
+            f'{{\n "formato": {FORMATO},\n "plantilla": {json.dumps([list(s) for s in plantilla])},\n'
+            f' "formas": [\n{lista(banco.formas)}\n ],\n "categorias": [\n{lista(banco.categorias)}\n ]\n}}\n'
+        )
+    return banco
+
+
+@lru_cache(maxsize=8)
+def _cargar(path: str) -> BancoFormas:
+    with open(path, encoding="utf-8") as fh:
+        return BancoFormas.from_dict(json.load(fh))
+
+
+def load_forms(path: Optional[str] = None) -> BancoFormas:
+    """Formas compiladas (una vez por proceso y archivo); por defecto formas.json."""
+    return _cargar(os.path.abspath(path or FORMAS_PATH))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="python -m cognitiva.wordbank",
+        description="Compila el banco de palabras en formas alternativas balanceadas.",
+    )
+    parser.add_argument("fuente", nargs="?", default=FUENTE_PATH, help="Palabras por categoría (palabras.txt)")
+    parser.add_argument("destino", nargs="?", default=FORMAS_PATH, help="Formas compiladas (formas.json)")
+    args = parser.parse_args(argv)
+
+    palabras = leer_fuente(args.fuente)
+    banco = compilar(args.fuente, args.destino)
+    usadas = {fold(w) for f in banco.formas for w in f}
+    por_categoria: Dict[str, int] = {}
+    for cats in banco.categorias:
+        for c in cats:
+            por_categoria[c] = por_categoria.get(c, 0) + 1
+    print(f"{len(palabras)} palabras, {len(banco)} formas ({len(usadas)} palabras usadas) -> {args.destino}")
+    print("plantilla (banda, sílabas): " + ", ".join(f"({b}, {s})" for b, s in PLANTILLA))
+    print("usos por categoría: " + ", ".join(f"{c} {n}" for c, n in sorted(por_categoria.items())))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
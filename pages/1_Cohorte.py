@@ -0,0 +1,112 @@
+# pages/1_Cohorte.py — Tablero de cohorte: distribución de puntajes por dominio
+# Lee los rollups de cognitiva.cohort, que el almacén actualiza al guardar cada
+# evaluación: no recorre la tabla de resultados ni carga filas en memoria.
+
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, List
+
+import streamlit as st
+
+from cognitiva import cohort, recursos
+
+st.set_page_config(page_title="Cohorte — Evaluación Cognitiva", page_icon="📊", layout="wide")
+st.title("📊 Cohorte")
+st.caption("Distribución de puntajes de las evaluaciones guardadas.")
+
+
+# El mismo almacén (y hilo escritor) que app.py: uno por proceso
+store = recursos.store()
+
+TODAS = "Todas"
+grupos = store.cohorte_grupos()
+meses = sorted({g[1] for g in grupos})
+
+with st.sidebar:
+    st.header("Filtros")
+    clinica = st.selectbox(
+        "Centro/Clínica", [TODAS] + sorted({g[0] for g in grupos}), format_func=lambda c: c or "(sin centro)"
+    )
+    perfil = st.selectbox(
+        "Perfil", [TODAS] + sorted({g[2] for g in grupos}), format_func=lambda p: p or "(personalizado)"
+    )
+    desde_mes = hasta_mes = None
+    if len(meses) > 1:
+        desde_mes, hasta_mes = st.select_slider("Meses", options=meses, value=(meses[0], meses[-1]))
+    auto = st.checkbox("Actualizar cada 10 s", help="Muestra las evaluaciones nuevas sin recargar la página.")
+
+clinica_f = None if clinica == TODAS else clinica
+perfil_f = None if perfil == TODAS else perfil
+
+
+def _fmt(v: Any) -> str:
+    return "—" if v is None else f"{v:.2f}" if isinstance(v, float) else str(v)
+
+
+def filas_resumen(est: cohort.EstadisticasCohorte) -> List[Dict[str, Any]]:
+    columnas = {"n": "n", "media": "Media", "desvio": "Desvío", "minimo": "Mín"}
+    columnas.update({c: c.capitalize() if c == "mediana" else c.upper() for c in cohort.CUANTILES})
+    columnas["maximo"] = "Máx"
+    return [
+        {"Serie": serie, **{titulo: _fmt(fila[c]) for c, titulo in columnas.items()}}
+        for serie, fila in est.resumen().items()
+    ]
+
+
+@st.fragment(run_every=10 if auto else None)
+def tablero() -> None:
+    t0 = time.perf_counter()
+    est = store.cohorte(desde_mes, hasta_mes, clinica_f, perfil_f)
+    ms = (time.perf_counter() - t0) * 1000
+    if est.n == 0:
+        st.info("No hay evaluaciones guardadas para este filtro.")
+        return
+
+    resumen = est.resumen()
+    c1, c2, c3 = st.columns(3)
+    c1.metric("Evaluaciones", f"{est.n:,}")
+    c2.metric("Total (media ± desvío)", f"{resumen['total']['media']:.1f} ± {_fmt(resumen['total']['desvio'])}")
+    c3.metric("Porcentaje (mediana)", f"{resumen['porcentaje']['mediana']:.1f}%")
+
+    st.subheader("Por dominio")
+    st.table(filas_resumen(est))
+
+    st.subheader("Interpretación")
+    st.table([
+        {"Interpretación": interp or "(sin interpretación)", "Evaluaciones": n, "%": f"{100 * n / est.n:.1f}"}
+        for interp, n in est.interpretaciones.most_common()
+    ])
+
+    st.subheader("Histograma")
+    serie = st.selectbox("Serie", cohort.SERIES, index=cohort.SERIES.index("total"))
+    barras = est.conteos[serie].barras(ancho=5 if serie == "porcentaje" else None)
+    st.bar_chart(
+        {"valor": [v for v, _ in barras], "evaluaciones": [c for _, c in barras]}, x="valor", y="evaluaciones"
+    )
+    st.caption(f"{len(grupos)} grupos (clínica, mes, perfil) combinados en {ms:.1f} ms · {datetime.now():%H:%M:%S}")
+
+
+tablero()
+
+with st.expander("Pasada completa sobre la base"):
+    st.caption(
+        "Recorre la tabla de evaluaciones por tramos en paralelo (cognitiva.cohort.calcular): "
+        "sirve para fechas exactas y para verificar los rollups."
+    )
+    c1, c2 = st.columns(2)
+    desde = c1.date_input("Desde", value=None)
+    hasta = c2.date_input("Hasta", value=None)
+    if st.button("Calcular"):
+        t0 = time.perf_counter()
+        est = cohort.calcular(
+            store.path,
+            desde=str(desde) if desde else None,
+            hasta=str(hasta) if hasta else None,
+            clinica=clinica_f,
+            perfil=perfil_f,
+            workers=os.cpu_count() or 1,
+        )
+        st.write(f"{est.n:,} evaluaciones en {time.perf_counter() - t0:.2f} s")
+        if est.n:
+            st.table(filas_resumen(est))
@@ -0,0 +1,8 @@
+# tests/conftest.py — Configuración común de pytest
+# Ejecutar desde la raíz:  python -m pytest -q
+# (como los benchmarks, importa `cognitiva` desde el árbol, sin instalarlo)
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,49 @@
+# tests/test_archive.py — Archivo columnar escrito por tramos
+
+import numpy as np
+import pytest
+
+from cognitiva import archive
+from cognitiva.store import DOMINIO_COLUMNAS
+
+
+def _fila(i: int) -> dict:
+    respuestas = {"ori_anio": 2025 if i % 3 else "x", "len_orden_ok": i % 2 == 0, "aten_s7": f"93,{i}"}
+    if i >= 5:
+        respuestas["mem_diferida"] = f"palabra {i}"  # campo que aparece a mitad del archivo
+    if i % 4 == 0:
+        respuestas["len_animales_registro"] = [{"texto": "gato", "t": i}]
+    return {
+        "uid": f"u{i}", "id_paciente": f"HC-{i % 3}", "nombre": "Ñandú" * (i % 2), "clinica": "Norte" if i % 2 else "",
+        "fecha": f"2025-03-{i % 28 + 1:02d}", "creado": "2025-03-01T10:00:00",
+        **{c: i % 4 for c in DOMINIO_COLUMNAS.values()}, "total": i, "max_total": 45, "porcentaje": i / 0.45,
+        "interpretacion": "x", "perfil": "", "config": {"target_words": ["sol", str(i % 2)]}, "respuestas": respuestas,
+    }
+
+
+@pytest.mark.parametrize("tramo", [1, 4, 1000])
+def test_por_tramos_igual_que_de_una_vez(tmp_path, tramo):
+    filas = [_fila(i) for i in range(11)]
+    archive.escribir(str(tmp_path / "uno"), filas, tramo=10_000)
+    archive.escribir(str(tmp_path / "tramos"), filas, tramo=tramo)
+    a, b = archive.abrir(str(tmp_path / "uno")), archive.abrir(str(tmp_path / "tramos"))
+    assert len(b) == 11 and a.columnas == b.columnas
+    for i in range(11):
+        assert b.fila(i) == a.fila(i)
+    assert b.respuestas(2)["mem_diferida"] == "" and b.respuestas(7)["mem_diferida"] == "palabra 7"
+    assert b.respuestas(4)["len_animales_registro"] == [{"texto": "gato", "t": 4}]
+    assert np.array_equal(b.columna("total"), np.arange(11))
+
+
+def test_archivo_vacio(tmp_path):
+    assert archive.escribir(str(tmp_path), []) == 0
+    assert len(archive.abrir(str(tmp_path))) == 0
+
+
+def test_ensanchar_categoria(tmp_path):
+    col = archive._Npy(str(tmp_path / "c.npy"), np.uint16)
+    col.agregar(np.arange(5, dtype=np.uint16))
+    col.ensanchar(np.uint32)
+    col.agregar(np.array([70_000], dtype=np.uint32))
+    col.cerrar()
+    assert np.load(str(tmp_path / "c.npy")).tolist() == [0, 1, 2, 3, 4, 70_000]
@@ -0,0 +1,24 @@
+# tests/test_batch.py — Puntaje por lotes: registros incompletos
+
+import pytest
+
+from cognitiva.batch import _score_chunk, evaluate_record
+
+RESPUESTAS = {"mem_diferida": "casa, perro", "abs_barco_auto": "transporte"}
+
+
+@pytest.mark.parametrize("palabras", [None, [], ""])
+def test_sin_palabras_objetivo_es_error(palabras):
+    rec = {"respuestas": RESPUESTAS, "fecha": "2025-03-01"}
+    if palabras is not None:
+        rec["target_words"] = palabras
+    with pytest.raises(ValueError, match="target_words"):
+        evaluate_record(rec)
+
+
+def test_error_por_linea_sin_cortar_el_bloque():
+    bien = {"respuestas": RESPUESTAS, "target_words": "casa, perro, sol", "fecha": "2025-03-01"}
+    mal = {"respuestas": RESPUESTAS, "fecha": "2025-03-01"}
+    (l1, fila, err1, _), (l2, vacia, err2, _) = _score_chunk([(1, bien), (2, mal)], None)
+    assert (l1, err1) == (1, None) and fila["total"] > 0
+    assert (l2, vacia, err2) == (2, None, "ValueError: Registro sin target_words")
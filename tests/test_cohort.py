@@ -0,0 +1,100 @@
+# tests/test_cohort.py — Momentos y histogramas de cohorte contra statistics
+
+import math
+import random
+import statistics
+
+import numpy as np
+import pytest
+
+from cognitiva.cohort import Conteos, Momentos
+
+DATOS = [random.Random(3).gauss(20, 6) for _ in range(200)]
+
+
+def _momentos(valores) -> Momentos:
+    m = Momentos()
+    m.agregar(valores)
+    return m
+
+
+def _igual(m: Momentos, valores) -> None:
+    assert m.n == len(valores)
+    assert m.media == pytest.approx(statistics.fmean(valores), rel=1e-12)
+    assert m.varianza == pytest.approx(statistics.variance(valores), rel=1e-9)
+
+
+@pytest.mark.parametrize("corte", [1, 50, 199])
+def test_combinar_igual_que_de_una_vez(corte):
+    m = _momentos(DATOS[:corte])
+    m.combinar(_momentos(DATOS[corte:]))
+    _igual(m, DATOS)
+
+
+def test_agregar_de_a_bloques():
+    m = Momentos()
+    for i in range(0, len(DATOS), 7):
+        m.agregar(DATOS[i:i + 7])
+    _igual(m, DATOS)
+    m.agregar([])
+    _igual(m, DATOS)
+
+
+def test_descontar_bloque():
+    m = _momentos(DATOS)
+    m.descontar(_momentos(DATOS[120:]))
+    _igual(m, DATOS[:120])
+    m.descontar(_momentos(DATOS[:120]))
+    assert (m.n, m.media, m.m2, m.varianza) == (0, 0.0, 0.0, None)
+
+
+def test_quitar_valores():
+    m = _momentos(DATOS)
+    for x in DATOS[:150]:
+        m.quitar(x)
+    _igual(m, DATOS[150:])
+    m = _momentos([4.0])
+    m.quitar(4.0)
+    assert m.n == 0 and m.desvio is None
+
+
+def test_valores_iguales_no_dan_varianza_negativa():
+    m = _momentos([7.0] * 10)
+    m.quitar(7.0)
+    m.descontar(_momentos([7.0] * 3))
+    assert m.varianza == 0.0 and m.desvio == 0.0
+
+
+def test_conteos_cuantiles_exactos():
+    valores = random.Random(5).choices(range(46), k=301)
+    c = Conteos()
+    c.agregar(valores)
+    assert c.n == 301
+    for q in (0.1, 0.25, 0.5, 0.75, 0.9):
+        assert c.cuantil(q) == sorted(valores)[max(1, math.ceil(q * 301)) - 1]
+    assert c.cuantil(0.0) == min(valores) and c.cuantil(1.0) == max(valores)
+    assert Conteos().cuantil(0.5) is None
+
+
+def test_conteos_paso_decimal():
+    c = Conteos(paso=0.1)
+    c.agregar([33.3, 33.3, 66.7, 100.0])
+    assert c.barras() == [(33.3, 2), (66.7, 1), (100.0, 1)]
+    assert c.barras(ancho=50) == [(0, 2), (50, 1), (100, 1)]
+    c.agregar_valor(0.3)
+    assert c.cuantil(0.2) == 0.3
+
+
+def test_conteos_combinar_descontar_y_serializar():
+    a, b = Conteos(), Conteos()
+    a.agregar([5, 6, 6])
+    b.agregar([-2, 6, 40])
+    a.combinar(b)
+    assert a.barras() == [(-2.0, 1), (5.0, 1), (6.0, 3), (40.0, 1)]
+    copia = Conteos.from_dict(a.to_dict())
+    assert copia.barras() == a.barras() and copia.n == 6
+    a.combinar(b, signo=-1)
+    a.quitar(5)
+    assert a.barras() == [(6.0, 2)]
+    assert a.to_dict() == {"paso": 1.0, "inicio": 6, "conteos": [2]}
+    assert np.array_equal(Conteos.from_dict(a.to_dict()).conteos, [2])
@@ -0,0 +1,156 @@
+# tests/test_journal.py — Autoguardado: diferencias, compactación y recuperación
+
+import os
+import time
+import uuid
+
+import pytest
+
+from cognitiva.journal import Diario, leer
+
+
+@pytest.fixture
+def diario(tmp_path):
+    d = Diario(str(tmp_path), intervalo=0.01)
+    yield d
+    d.close()
+
+
+def _path(d: Diario, sesion: str) -> str:
+    return os.path.join(d.directorio, sesion + ".jsonl")
+
+
+def test_solo_agrega_cambios(diario):
+    sesion = uuid.uuid4().hex
+    diario.registrar(sesion, {"a": 1, "b": 2}).result()
+    diario.registrar(sesion, {"a": 1, "b": 2}).result()  # sin cambios: no escribe
+    diario.registrar(sesion, {"a": 1, "b": 3}).result()
+    diario.registrar(sesion, {"b": 3}).result()
+    with open(_path(diario, sesion), encoding="utf-8") as fh:
+        lineas = fh.read().splitlines()
+    assert len(lineas) == 3
+    assert '"b":["a"]' in lineas[-1]
+    assert leer(_path(diario, sesion)) == {"b": 3}
+
+
+def test_actualizar_conserva_el_resto(diario):
+    sesion = uuid.uuid4().hex
+    diario.registrar(sesion, {"a": 1, "b": 2})
+    diario.actualizar(sesion, {"b": 5}).result()
+    assert leer(_path(diario, sesion)) == {"a": 1, "b": 5}
+
+
+def test_compactacion(tmp_path):
+    d = Diario(str(tmp_path), intervalo=0.0, compactar_cada=5)
+    sesion = uuid.uuid4().hex
+    for i in range(12):
+        d.registrar(sesion, {"n": i, "fijo": "x"}).result()
+    d.close()
+    with open(_path(d, sesion), encoding="utf-8") as fh:
+        assert len(fh.read().splitlines()) < 5
+    assert d.compactaciones >= 2
+    assert leer(_path(d, sesion)) == {"n": 11, "fijo": "x"}
+
+
+def test_linea_cortada_seguida_de_agregados(tmp_path):
+    sesion = uuid.uuid4().hex
+    d = Diario(str(tmp_path), intervalo=0.0)
+    d.registrar(sesion, {"a": 1}).result()
+    d.close()
+    path = _path(d, sesion)
+    with open(path, "ab") as fh:
+        fh.write(b'{"t":1,"c":{"a":')  # caída a mitad de la escritura
+
+    d = Diario(str(tmp_path), intervalo=0.0)
+    assert d.recuperar(sesion) == {"a": 1}
+    d.registrar(sesion, {"a": 2})
+    d.registrar(sesion, {"a": 2, "b": 3}).result()
+    d.close()
+    assert leer(path) == {"a": 2, "b": 3}
+    assert Diario(str(tmp_path)).recuperar(sesion) == {"a": 2, "b": 3}
+
+
+def test_leer_saltea_lineas_ilegibles(tmp_path):
+    path = tmp_path / "x.jsonl"
+    path.write_bytes(b'{"c":{"a":1}}\n{"c":{"a":\n{"c":{"b":2}}\n')
+    assert leer(str(path)) == {"a": 1, "b": 2}
+
+
+def test_recuperar_sesion_invalida_o_inexistente(diario):
+    assert diario.recuperar("../../etc/passwd") is None
+    assert diario.recuperar(uuid.uuid4().hex) is None
+    with pytest.raises(ValueError):
+        diario.registrar("../x", {})
+
+
+def test_descartar_y_limpiar(diario):
+    s1, s2 = uuid.uuid4().hex, uuid.uuid4().hex
+    diario.registrar(s1, {"a": 1})
+    diario.registrar(s2, {"a": 1}).result()
+    diario.descartar(s1)
+    assert diario.recuperar(s1) is None
+    viejo = _path(diario, s2)
+    os.utime(viejo, (1, 1))
+    assert diario.limpiar(7) == 1
+    assert diario.recuperar(s2) is None
+
+
+def _disco_lleno(monkeypatch, escribe: bytes = b""):
+    # El agregado siguiente deja `escribe` en el archivo y falla como ENOSPC
+    real = open
+
+    class Falla:
+        def __init__(self, fh):
+            self.fh = fh
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            self.fh.close()
+
+        def write(self, datos):
+            self.fh.write(escribe)
+            raise OSError(28, "No space left on device")
+
+    def abrir(path, modo="r", *args, **kwargs):
+        if modo == "ab":
+            monkeypatch.undo()
+            return Falla(real(path, modo, *args, **kwargs))
+        return real(path, modo, *args, **kwargs)
+
+    monkeypatch.setattr("cognitiva.journal.open", abrir, raising=False)
+
+
+def test_escritura_fallida_se_reescribe_completa(diario, monkeypatch):
+    sesion = uuid.uuid4().hex
+    diario.registrar(sesion, {"a": 1, "b": 2}).result()
+    _disco_lleno(monkeypatch, escribe=b'{"t":1,"c":{"a":')
+    with pytest.raises(OSError):
+        diario.registrar(sesion, {"a": 5, "c": 3}).result()
+    assert leer(_path(diario, sesion)) == {"a": 1, "b": 2}  # sin la línea a medias
+    # Mismo estado que el fallido: igual se escribe, y entero
+    diario.registrar(sesion, {"a": 5, "c": 3}).result()
+    assert leer(_path(diario, sesion)) == {"a": 5, "c": 3}
+    diario.actualizar(sesion, {"d": 4}).result()
+    assert Diario(diario.directorio).recuperar(sesion) == {"a": 5, "c": 3, "d": 4}
+
+
+def test_limpiar_olvida_sesiones_inactivas(diario):
+    sesion = uuid.uuid4().hex
+    diario.registrar(sesion, {"a": 1}).result()
+    assert sesion in diario._estados
+    assert diario.limpiar(0) == 1
+    assert sesion not in diario._estados and sesion not in diario._usos
+
+
+def test_limpieza_periodica(tmp_path):
+    d = Diario(str(tmp_path), intervalo=0.0, max_dias=0, limpiar_cada=0.05)
+    sesion = uuid.uuid4().hex
+    d.registrar(sesion, {"a": 1}).result()
+    for _ in range(100):
+        if not os.path.exists(_path(d, sesion)):
+            break
+        time.sleep(0.02)
+    d.close()
+    assert not os.path.exists(_path(d, sesion)) and sesion not in d._estados
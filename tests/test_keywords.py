@@ -0,0 +1,76 @@
+# tests/test_keywords.py — Semejanzas: registro de palabras clave vs. el puntaje original
+
+import pytest
+
+from cognitiva.keywords import DEFAULT_SEMEJANZAS, ItemSemejanza, KeywordRegistry
+from cognitiva.scoring import ScoringConfig, score_abstraccion
+
+
+def _original(r):
+    """score_abstraccion de la versión inicial de app.py (subcadenas en minúsculas)."""
+    pts = 0
+    barco_auto = str(r.get("abs_barco_auto", "")).lower()
+    if any(k in barco_auto for k in ["transporte", "vehículo", "vehiculo", "mover", "desplazarse"]):
+        pts += 2
+    uva_manzana = str(r.get("abs_uva_manzana", "")).lower()
+    if any(k in uva_manzana for k in ["fruta", "alimento", "comer"]):
+        pts += 2
+    return min(pts, 4)
+
+
+BARCO_AUTO = [
+    "Ambos son medios de transporte",
+    "transportes",
+    "son vehículos",
+    "Vehiculo",
+    "sirven para movernos",
+    "para moverse",
+    "nos movemos en ellos",
+    "para desplazarse",
+    "tienen motor",
+    "",
+]
+UVA_MANZANA = [
+    "Ambas son fruta",
+    "son frutas",
+    "son frutales",
+    "para comerlas",
+    "se pueden comer",
+    "son alimentos",
+    "alimenticias",
+    "son redondas",
+    "",
+]
+
+
+@pytest.mark.parametrize("barco_auto", BARCO_AUTO)
+@pytest.mark.parametrize("uva_manzana", UVA_MANZANA)
+def test_igual_que_el_puntaje_original(barco_auto, uva_manzana):
+    r = {"abs_barco_auto": barco_auto, "abs_uva_manzana": uva_manzana}
+    assert score_abstraccion(r, ScoringConfig()) == _original(r)
+
+
+def test_sin_tildes_y_con_mayusculas():
+    r = {"abs_barco_auto": "VEHÍCULOS", "abs_uva_manzana": "Frútas"}
+    assert score_abstraccion(r, ScoringConfig()) == 4
+
+
+def test_solo_al_comienzo_de_palabra():
+    item = ItemSemejanza("x", "?", ["comer"])
+    assert item.buscar("recomer") == []
+    assert item.buscar("para comerla") == ["comer"]
+
+
+def test_devuelve_cada_clave_una_vez():
+    item = DEFAULT_SEMEJANZAS.items[0]
+    assert item.buscar("transporte, transportes y vehículo") == ["transporte", "vehiculo"]
+
+
+def test_registro_propio():
+    reg = KeywordRegistry.from_dict({"items": [{"campo": "abs_mesa_silla", "claves": ["mueble"], "puntos": 1}]})
+    assert reg.puntos({"abs_mesa_silla": "son muebles"}) == 1
+    assert reg.coincidencias({"abs_mesa_silla": "madera"}) == {"abs_mesa_silla": []}
+    with pytest.raises(ValueError):
+        KeywordRegistry.from_dict({"items": [{"campo": "a", "claves": ["x"]}, {"campo": "a", "claves": ["y"]}]})
+    with pytest.raises(ValueError):
+        ItemSemejanza("a", "?", ["  "])
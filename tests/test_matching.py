@@ -0,0 +1,69 @@
+# tests/test_matching.py — Palabras recordadas y acuerdo entre puntaje escalar y columnar
+
+from datetime import date
+
+import numpy as np
+import pytest
+
+from cognitiva.matching import compile_matcher, fold
+from cognitiva.scoring import DOMINIOS, ScoringConfig, count_matches, score_all
+from cognitiva.vectorized import columns_from_respuestas, score_columns
+
+TARGET = ["casa", "perro", "libro", "sol", "llave"]
+
+
+def test_fold():
+    assert fold(" LÁPIZ ") == "lapiz"
+    assert fold("pingüino") == "pinguino"
+    assert fold("Niño") == "niño"
+
+
+def test_exacto_por_defecto():
+    assert ScoringConfig().max_typo_distance == 0
+    assert ScoringConfig.from_dict({}).max_typo_distance == 0
+    assert count_matches(["perro", "Libro", "llavé"], TARGET) == 3
+    assert count_matches(["pero", "libros"], TARGET) == 0
+
+
+def test_tolerancia_de_tipeo_opcional():
+    assert count_matches(["perrp", "libros", "llaev"], TARGET, max_distance=1) == 2  # llaev: 2 ediciones
+    # Menos de 5 letras (respuesta u objetivo): siempre exacto
+    assert count_matches(["pero"], TARGET, max_distance=1) == 0
+    assert count_matches(["caza", "sal"], TARGET, max_distance=2) == 0
+    assert compile_matcher(TARGET, 1).match("perrro") == 1
+
+
+def test_cada_objetivo_suma_una_vez():
+    assert count_matches(["perro", "PERRO", "perro"], TARGET) == 1
+
+
+RESPUESTAS = [
+    {},
+    {"ori_anio": "", "ori_mes": None, "ori_dia": "abc", "len_animales": "muchos"},
+    {"ori_anio": "2025", "ori_mes": 3, "ori_dia": 1.0, "len_animales": "12", "ori_ciudad": "Córdoba"},
+    {
+        "ori_anio": 2025, "ori_mes": 3, "ori_dia": 1, "aten_s7": "93,86,79,72,65", "aten_inversa": "asac",
+        "mem_inmediata": "casa, pero, libro", "mem_diferida": "perrro, llave", "len_animales": 17,
+        "len_frase": "El perro come su comida", "len_orden_ok": True, "viso_copia_ok": True,
+        "abs_barco_auto": "transporte", "abs_uva_manzana": "frutas",
+    },
+]
+
+
+@pytest.mark.parametrize("tipeo", [0, 1])
+def test_escalar_y_columnar_coinciden(tipeo):
+    cfg = ScoringConfig(max_typo_distance=tipeo)
+    hoy = date(2025, 3, 1)
+    cols = columns_from_respuestas(RESPUESTAS, TARGET, max_distance=tipeo)
+    columnar = score_columns(cols, cfg, hoy=hoy)
+    for i, r in enumerate(RESPUESTAS):
+        escalar = score_all(r, cfg, TARGET, registered=True, hoy=hoy)
+        assert {d: int(columnar[d][i]) for d in DOMINIOS} == escalar, r
+
+
+def test_texto_no_numerico_puntua_cero():
+    cfg = ScoringConfig()
+    r = {"ori_anio": "dos mil", "ori_mes": "marzo", "ori_dia": "1"}
+    assert score_all(r, cfg, TARGET, hoy=date(2025, 3, 1))["Orientación"] == 2
+    cols = columns_from_respuestas([r], TARGET)
+    assert np.array_equal(cols["ori_anio"], [0])
@@ -0,0 +1,104 @@
+# tests/test_norms.py — Percentiles normativos: interpolación, grilla y estratos
+
+import numpy as np
+import pytest
+
+from cognitiva.norms import NormTable, Z_MAX, _z_desde_percentil, load_norms
+
+FILAS = [
+    # total: dos estratos de educación para 60-69 y uno para 70-79
+    ("total", 60, 69, 0, 7, 18, 5), ("total", 60, 69, 0, 7, 25, 50), ("total", 60, 69, 0, 7, 30, 95),
+    ("total", 60, 69, 8, 30, 22, 5), ("total", 60, 69, 8, 30, 28, 50), ("total", 60, 69, 8, 30, 33, 95),
+    ("total", 70, 79, 0, 30, 15, 10), ("total", 70, 79, 0, 30, 24, 90),
+    ("Atención", 60, 79, 0, 30, 4, 20), ("Atención", 60, 79, 0, 30, 9, 80),
+]
+CAMPOS = ("serie", "edad_min", "edad_max", "educacion_min", "educacion_max", "puntaje", "percentil")
+
+
+def _tabla(filas=FILAS) -> NormTable:
+    return NormTable.from_rows([dict(zip(CAMPOS, f)) for f in filas])
+
+
+def _esperado(serie: str, x: float, edad: float, educacion: float) -> float:
+    """np.interp sobre la curva del primer estrato que coincide (saturada en los extremos)."""
+    for s, e0, e1, u0, u1, *_ in FILAS:
+        if s == serie and e0 <= edad <= e1 and u0 <= educacion <= u1:
+            curva = [(f[5], f[6]) for f in FILAS if f[:5] == (s, e0, e1, u0, u1)]
+            return float(np.interp(x, [c[0] for c in curva], [c[1] for c in curva]))
+    return float("nan")
+
+
+def test_interpolacion_y_saturacion():
+    t = _tabla()
+    assert t.percentiles_de("total", [18, 20, 25, 27, 30], 65, 5).tolist() == pytest.approx(
+        [5, 5 + 45 * 2 / 7, 50, 50 + 45 * 2 / 5, 95]
+    )
+    assert t.percentiles_de("total", [0, 17, 31, 45], 65, 5).tolist() == [5, 5, 95, 95]
+    assert t.percentiles_de("total", 25, 65, 12)[0] == pytest.approx(5 + 45 * 3 / 6)
+
+
+@pytest.mark.parametrize("puntajes", [np.arange(10, 36), np.arange(10, 36) + 0.5])
+def test_grilla_e_interpolacion_coinciden(puntajes):
+    # Enteros: camino de la grilla precalculada; con .5, np.interp sobre el eje global
+    t = _tabla()
+    rnd = np.random.default_rng(7)
+    x = rnd.choice(puntajes, 400)
+    edad = rnd.integers(55, 85, 400)
+    educacion = rnd.integers(0, 20, 400)
+    p = t.percentiles_de("total", x, edad, educacion)
+    esperado = [_esperado("total", *f) for f in zip(x, edad, educacion)]
+    np.testing.assert_allclose(p, esperado, rtol=1e-12)
+    assert np.isnan(p).sum() == ((edad < 60) | (edad > 79)).sum()
+
+
+def test_edades_no_enteras_usan_unique():
+    t = _tabla()
+    p = t.percentiles_de("total", [25, 25, 20], [65.5, 69.5, 72.0], [3, 3, 10])
+    assert p[0] == pytest.approx(50) and np.isnan(p[1])
+    assert p[2] == pytest.approx(_esperado("total", 20, 72, 10))
+
+
+def test_evaluar_solo_series_con_norma():
+    t = _tabla()
+    res = t.evaluar({"Atención": 9, "Orientación": 10}, 25, 65, 5)
+    assert set(res) == {"Atención", "total"}
+    assert res["total"] == pytest.approx((50.0, 0.0), abs=1e-9)
+    assert res["Atención"][0] == pytest.approx(80)
+    assert t.evaluar({"Atención": 9}, 25, None, 5) == {}
+    assert t.evaluar({"Atención": 9}, 25, 90, 5) == {}
+
+
+def test_evaluar_columnas():
+    t = _tabla()
+    res = t.evaluar_columnas({"total": [18, 33], "Atención": [4, 6.5]}, [65, 65], [5, 10])
+    np.testing.assert_allclose(res["total"]["percentil"], [5, 95])
+    np.testing.assert_allclose(res["Atención"]["percentil"], [20, 50])
+    np.testing.assert_allclose(res["total"]["z"], _z_desde_percentil(np.array([5.0, 95.0])))
+
+
+def test_z_desde_percentil():
+    z = _z_desde_percentil(np.array([50, 97.5, 2.5, 84.134474, 0, 100]))
+    np.testing.assert_allclose(z[:4], [0, 1.959964, -1.959964, 1.0], atol=1e-6)
+    assert z[4] == -Z_MAX and z[5] == Z_MAX
+
+
+def test_compilada_igual_que_csv(tmp_path):
+    t = _tabla()
+    t.save(str(tmp_path / "bin"))
+    abierta = load_norms(str(tmp_path / "bin"))
+    assert isinstance(abierta.puntajes, np.memmap) and abierta.series == t.series
+    x, edad, educacion = np.arange(10, 36), 65, 5
+    np.testing.assert_array_equal(
+        abierta.percentiles_de("total", x, edad, educacion), t.percentiles_de("total", x, edad, educacion)
+    )
+
+
+@pytest.mark.parametrize("fila, mensaje", [
+    (("memoria", 60, 69, 0, 7, 1, 5), "serie desconocida"),
+    (("total", 60, 69, 0, 7, 25, 120), "fuera de 0-100"),
+    (("total", 60, 69, 0, 7, 25, 40), "repetidos"),
+    (("total", 60, 69, 0, 7, 27, 40), "crecer"),
+])
+def test_tabla_invalida(fila, mensaje):
+    with pytest.raises(ValueError, match=mensaje):
+        _tabla(FILAS + [fila])
@@ -0,0 +1,115 @@
+# tests/test_rescoring.py — Re-puntaje con brutos igual a puntuar desde cero
+
+import sqlite3
+from datetime import date
+
+import pytest
+
+from cognitiva.rescoring import cambios
+from cognitiva.scoring import ScoringConfig, aplicar_maximos, interpretar, puntos_brutos, totales
+from cognitiva.store import _COLS, Evaluacion, ResultStore
+
+PALABRAS = [["casa", "perro", "libro", "sol", "llave"], ["mapa", "tigre", "cuaderno", "nube", "silla"]]
+RESPUESTAS = [
+    {},
+    {"len_animales": "muchos", "mem_inmediata": "casa, perrp, libro", "mem_diferida": "llaev"},
+    {"ori_anio": 2025, "ori_mes": 3, "ori_dia": 1, "aten_s7": "93,86,79,72,65", "len_animales": 17,
+     "mem_inmediata": "mapa, tigre, cuadreno", "mem_diferida": "tigres, nube", "abs_barco_auto": "transporte"},
+    {"len_animales": "12", "len_frase": "El perro come su comida", "len_orden_ok": True, "viso_copia_ok": True,
+     "mem_inmediata": "casa, perro, libro, sol, llave", "mem_diferida": "perrro, casa, silla"},
+]
+ANTERIOR = ScoringConfig()
+NUEVA = ScoringConfig.from_dict({
+    "maximos": {"Orientación": 8, "Lenguaje/Ejecutivo": 6, "Abstracción": 2},
+    "animals_per_point": 4,
+    "high_threshold": 70,
+    "mid_threshold": 45,
+})
+CON_TIPEO = ScoringConfig.from_dict({**NUEVA.to_dict(), "max_typo_distance": 1})
+N = 24
+SIN_BRUTOS = {0, 5, 11}  # guardadas antes de las columnas de brutos
+
+
+def _llenar(path: str, cfg: ScoringConfig, perfil: str, sin_brutos=frozenset()) -> None:
+    store = ResultStore(path)
+    for i in range(N):
+        r, palabras, registradas = RESPUESTAS[i % len(RESPUESTAS)], PALABRAS[i % 2], i % 5 != 0
+        fecha = f"202{4 + i % 2}-{i % 12 + 1:02d}-{i % 28 + 1:02d}"
+        brutos = puntos_brutos(r, cfg, palabras, registradas, date.fromisoformat(fecha))
+        subtotales = aplicar_maximos(brutos, cfg)
+        total, max_total, porcentaje = totales(subtotales, cfg)
+        store.save(Evaluacion(
+            uid=f"u{i:02d}",
+            id_paciente=f"HC-{i % 4}",
+            fecha=fecha,
+            subtotales=subtotales,
+            total=total,
+            max_total=max_total,
+            porcentaje=porcentaje,
+            config={**cfg.to_dict(), "target_words": palabras, "registered_words": registradas},
+            respuestas=r,
+            clinica=["Norte", "Sur", ""][i % 3],
+            interpretacion=interpretar(porcentaje, cfg),
+            perfil=perfil,
+            brutos={} if i in sin_brutos else brutos,
+        ))
+    store.close()
+
+
+def _filas(path: str) -> list:
+    cols = [c for c in _COLS if c != "creado"]
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute(f"SELECT {', '.join(cols)} FROM evaluaciones ORDER BY uid").fetchall()
+    finally:
+        conn.close()
+
+
+def _rollups(store: ResultStore) -> tuple:
+    # Sumas redondeadas: descontar y volver a sumar cambia el orden de suma
+    cohorte = store.cohorte()
+    resumen = {
+        serie: {k: round(v, 6) if isinstance(v, float) else v for k, v in fila.items()}
+        for serie, fila in cohorte.resumen().items()
+    }
+    tendencias = {
+        p: {s: (t.n, round(t.sy, 6), round(t.sxy, 6), t.base, t.ultimos) for s, t in store.tendencias(p).items()}
+        for p in (f"HC-{i}" for i in range(4))
+    }
+    return cohorte.n, cohorte.interpretaciones, resumen, tendencias
+
+
+@pytest.mark.parametrize("cfg, perfil", [(NUEVA, "breve@2"), (CON_TIPEO, "breve@3")])
+def test_repuntuar_igual_que_llenar_con_la_nueva(tmp_path, cfg, perfil):
+    path, ref = str(tmp_path / "evaluaciones.db"), str(tmp_path / "referencia.db")
+    _llenar(path, ANTERIOR, "estandar@1", SIN_BRUTOS)
+    _llenar(ref, cfg, perfil)
+
+    store, esperado = ResultStore(path), ResultStore(ref)
+    res = store.repuntuar(cfg, perfil)
+    assert (res.filas, res.actualizadas, res.completadas) == (N, N, len(SIN_BRUTOS))
+    assert _filas(path) == _filas(ref)
+    assert _rollups(store) == _rollups(esperado)
+
+    # La misma configuración otra vez no reescribe nada
+    assert store.repuntuar(cfg, perfil).actualizadas == 0
+    store.close()
+    esperado.close()
+
+
+def test_repuntuar_solo_un_filtro(tmp_path):
+    path = str(tmp_path / "evaluaciones.db")
+    _llenar(path, ANTERIOR, "estandar@1")
+    store = ResultStore(path)
+    res = store.repuntuar(NUEVA, "breve@2", clinica="Norte", desde="2025-01-01")
+    assert res.filas == res.actualizadas == sum(1 for i in range(N) if i % 3 == 0 and i % 2 == 1)
+    perfiles = {f["perfil"] for f in store.iter_results()}
+    store.close()
+    assert perfiles == {"estandar@1", "breve@2"}
+
+
+def test_cambios():
+    assert cambios(ANTERIOR, ANTERIOR) == (set(), set())
+    recortados, recalculados = cambios(ANTERIOR, CON_TIPEO)
+    assert recortados == {"Orientación", "Lenguaje/Ejecutivo", "Abstracción"}
+    assert recalculados == {"Lenguaje/Ejecutivo", "Memoria inmediata", "Memoria diferida"}
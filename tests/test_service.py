@@ -0,0 +1,106 @@
+# tests/test_service.py — Servicio HTTP: solicitudes válidas y malformadas
+
+import asyncio
+import json
+
+import pytest
+
+from cognitiva.service import ScoringService
+
+REGISTRO = {
+    "respuestas": {"aten_s7": "93,86,79,72,65", "abs_barco_auto": "transporte"},
+    "target_words": ["casa", "perro", "libro", "sol", "llave"],
+    "informe": False,
+}
+
+
+async def _pedir(port: int, crudo: bytes) -> tuple:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(crudo)
+    await writer.drain()
+    cabecera = await reader.readuntil(b"\r\n\r\n")
+    estado = int(cabecera.split(b" ", 2)[1])
+    largo = int(cabecera.lower().split(b"content-length:")[1].split(b"\r\n")[0])
+    cuerpo = json.loads(await reader.readexactly(largo))
+    writer.close()
+    return estado, cuerpo
+
+
+def _post(cuerpo: bytes, extra: str = "") -> bytes:
+    return (f"POST /v1/puntuar HTTP/1.1\r\nHost: x\r\n{extra}"
+            f"Content-Length: {len(cuerpo)}\r\n\r\n").encode() + cuerpo
+
+
+def _con_servicio(fn):
+    async def correr():
+        servicio = ScoringService(port=0, workers=0)
+        await servicio.start()
+        try:
+            return await fn(servicio.port)
+        finally:
+            await servicio.close()
+
+    return asyncio.run(correr())
+
+
+def test_puntuar():
+    estado, cuerpo = _con_servicio(lambda port: _pedir(port, _post(json.dumps(REGISTRO).encode())))
+    assert estado == 200 and cuerpo["ok"]
+    assert cuerpo["subtotales"]["Abstracción"] == 2
+
+
+def test_puntuar_con_informe():
+    registro = {**REGISTRO, "informe": True, "id_paciente": "HC-9"}
+    estado, cuerpo = _con_servicio(lambda port: _pedir(port, _post(json.dumps(registro).encode())))
+    assert estado == 200 and "HC-9" in cuerpo["html"]
+
+
+def test_registro_sin_palabras_objetivo():
+    registro = {k: v for k, v in REGISTRO.items() if k != "target_words"}
+    estado, cuerpo = _con_servicio(lambda port: _pedir(port, _post(json.dumps(registro).encode())))
+    assert estado == 200 and not cuerpo["ok"]
+    assert cuerpo["error"] == "ValueError: Registro sin target_words"
+
+
+@pytest.mark.parametrize("crudo, esperado", [
+    (b"POST /v1/puntuar HTTP/1.1\r\nContent-Length: abc\r\n\r\n", 400),
+    (b"POST /v1/puntuar HTTP/1.1\r\nContent-Length: -5\r\n\r\n", 400),
+    (b"POST /v1/puntuar HTTP/1.1\r\nContent-Length: 1e3\r\n\r\n", 400),
+    (b"POST /v1/puntuar HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n5\r\nhello\r\n0\r\n\r\n", 501),
+    (b"POST /v1/puntuar HTTP/1.1\r\nContent-Length: 99999999\r\n\r\n", 413),
+    (b"BASURA\r\n\r\n", 400),
+    (_post(b"{no es json"), 400),
+    (_post(b"[1, 2]"), 400),
+    (b"GET /v1/puntuar HTTP/1.1\r\n\r\n", 405),
+    (b"GET /nada HTTP/1.1\r\n\r\n", 404),
+])
+def test_solicitudes_malformadas(crudo, esperado):
+    estado, cuerpo = _con_servicio(lambda port: _pedir(port, crudo))
+    assert estado == esperado
+    assert "error" in cuerpo
+
+
+def test_cola_llena_con_solicitudes_concurrentes():
+    lote = json.dumps([REGISTRO] * 6).encode()
+
+    async def correr():
+        servicio = ScoringService(port=0, workers=0, max_cola=8)
+        await servicio.start()
+        try:
+            return await asyncio.gather(*(_pedir(servicio.port, _post(lote)) for _ in range(4)))
+        finally:
+            await servicio.close()
+
+    respuestas = asyncio.run(correr())
+    estados = sorted(estado for estado, _ in respuestas)
+    assert set(estados) <= {200, 503} and estados[0] == 200
+    for estado, cuerpo in respuestas:
+        assert len(cuerpo) == 6 if estado == 200 else "error" in cuerpo
+
+
+def test_sigue_atendiendo_tras_un_error():
+    async def dos(port):
+        await _pedir(port, b"POST /v1/puntuar HTTP/1.1\r\nContent-Length: x\r\n\r\n")
+        return await _pedir(port, b"GET /salud HTTP/1.1\r\n\r\n")
+
+    assert _con_servicio(dos) == (200, {"ok": True})
@@ -0,0 +1,65 @@
+# tests/test_store.py — Almacén: lotes del escritor, fallas aisladas y rollups
+
+import pytest
+
+from cognitiva.scoring import DOMINIOS
+from cognitiva.store import Evaluacion, ResultStore
+
+
+def _ev(uid: str, fecha: str = "2025-03-01", total=12, paciente: str = "HC-1") -> Evaluacion:
+    return Evaluacion(
+        uid=uid,
+        id_paciente=paciente,
+        fecha=fecha,
+        subtotales={d: 2 for d in DOMINIOS},
+        total=total,
+        max_total=45,
+        porcentaje=26.67,
+        config={"target_words": ["sol"], "registered_words": True},
+        respuestas={"aten_s7": "93"},
+        clinica="Norte",
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    # Intervalo largo: todo lo guardado en el test cae en el mismo lote
+    s = ResultStore(str(tmp_path / "evaluaciones.db"), flush_interval=0.3)
+    yield s
+    s.close()
+
+
+def test_una_fila_invalida_no_hace_fallar_el_lote(store):
+    buenos = [store.save(_ev("a")), store.save(_ev("b", paciente="HC-2"))]
+    malo = store.save(_ev("c", fecha="no-es-fecha"))
+    otro = store.save(_ev("d", fecha="2025-04-01"))
+    barrera = store.save_barrier()
+    for fut in buenos + [otro, barrera]:
+        assert fut.result(timeout=10) is None
+    with pytest.raises(ValueError):
+        malo.result(timeout=10)
+    assert store.get("a") is not None and store.get("d") is not None
+    assert store.get("c") is None
+    # Rollups solo con las filas confirmadas
+    assert store.cohorte().n == 3
+    assert store.tendencias("HC-1")["total"].n == 2
+
+
+def test_recalcular_actualiza_sin_duplicar(store):
+    store.save(_ev("a", total=10))
+    store.save(_ev("a", total=14)).result(timeout=10)
+    historial = store.history("HC-1")
+    assert len(historial) == 1 and historial[0]["total"] == 14
+    assert store.cohorte().n == 1
+    assert store.tendencias("HC-1")["total"].ultimo == 14
+
+
+def test_tarea_que_falla_no_afecta_guardados(store):
+    def tarea(conn):
+        raise RuntimeError("falla")
+
+    fut_tarea = store.ejecutar(tarea)
+    fut = store.save(_ev("x"))
+    assert fut.result(timeout=10) is None
+    with pytest.raises(RuntimeError):
+        fut_tarea.result(timeout=10)
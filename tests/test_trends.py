@@ -0,0 +1,71 @@
+# tests/test_trends.py — Rollups de tendencias: lote de re-puntaje igual a guardar de nuevo
+
+import pytest
+
+from cognitiva import trends
+from cognitiva.scoring import DOMINIOS
+from cognitiva.store import DOMINIO_COLUMNAS, Evaluacion, ResultStore
+
+FECHAS = ["2023-05-10", "2024-01-02", "2024-07-15", "2025-03-01", "2025-03-01"]
+
+
+def _ev(i: int, puntos: int) -> Evaluacion:
+    subtotales = {d: (puntos + i + j) % 6 for j, d in enumerate(DOMINIOS)}
+    total = sum(subtotales.values())
+    return Evaluacion(
+        uid=f"u{i:02d}",
+        id_paciente=f"HC-{i % 3}",
+        fecha=FECHAS[i % len(FECHAS)],
+        subtotales=subtotales,
+        total=total,
+        max_total=45,
+        porcentaje=round(total / 45 * 100, 2),
+        config={"target_words": ["sol"], "registered_words": True},
+        respuestas={},
+    )
+
+
+def _resultado(ev: Evaluacion) -> dict:
+    # Las claves de store._row_to_result que usan los rollups
+    out = {f"{d}_puntaje": v for d, v in ev.subtotales.items()}
+    out.update(id_paciente=ev.id_paciente, fecha=ev.fecha, total=ev.total, porcentaje=ev.porcentaje)
+    return out
+
+
+def _llenar(path: str, evs) -> ResultStore:
+    store = ResultStore(path)
+    for ev in evs:
+        store.save(ev)
+    store.flush()
+    return store
+
+
+def _tendencias(store: ResultStore) -> dict:
+    return {
+        p: {s: (t.n, t.sx, round(t.sy, 9), t.sxx, round(t.sxy, 9), t.base_uid, t.base, t.ultimos)
+            for s, t in store.tendencias(p).items()}
+        for p in ("HC-0", "HC-1", "HC-2")
+    }
+
+
+@pytest.mark.parametrize("cambiadas", [range(15), range(0, 15, 4), []])
+def test_actualizar_lote_igual_que_guardar_de_nuevo(tmp_path, cambiadas):
+    nuevas = {i: _ev(i, 3) for i in cambiadas}
+    store = _llenar(str(tmp_path / "a.db"), [_ev(i, 0) for i in range(15)])
+    esperado = _llenar(str(tmp_path / "b.db"), [nuevas.get(i) or _ev(i, 0) for i in range(15)])
+    pares = [(store.get(f"u{i:02d}"), nuevas[i]) for i in cambiadas]
+
+    def reescribir(conn):
+        # Como rescoring.repuntuar: las filas ya reescritas, luego los rollups
+        for _, ev in pares:
+            sets = ", ".join(f"{DOMINIO_COLUMNAS[d]} = ?" for d in DOMINIOS)
+            conn.execute(
+                f"UPDATE evaluaciones SET {sets}, total = ?, porcentaje = ? WHERE uid = ?",
+                [ev.subtotales[d] for d in DOMINIOS] + [ev.total, ev.porcentaje, ev.uid],
+            )
+        trends.actualizar_lote(conn, [(anterior, _resultado(ev)) for anterior, ev in pares])
+
+    store.ejecutar(reescribir).result()
+    assert _tendencias(store) == _tendencias(esperado)
+    store.close()
+    esperado.close()